@@ -0,0 +1,75 @@
+"""
+İki kıyaslama sonucunu karşılaştırır.
+
+    python -m benchmarks.compare benchmarks/results/eski.json benchmarks/results/yeni.json
+"""
+import argparse
+import json
+from typing import Dict, List, Optional, Tuple
+
+# (bölüm, anahtar yolu, büyük olan daha mı iyi)
+METRICS: List[Tuple[str, str, bool]] = [
+    ('writer', 'lines_per_sec', True),
+    ('event_sink', 'events_per_sec', True),
+    ('tcp_connect', 'connects_per_sec', True),
+    ('analytics', 'samples_per_sec', True),
+    ('startup', 'collector.import_ms', False),
+    ('startup', 'collector.rss_mb', False),
+    ('collector', 'probes_per_sec', True),
+    ('collector', 'cpu_percent', False),
+    ('collector', 'scheduler_lag_ms.p99', False),
+    ('collector', 'check_latency_ms.p99', False),
+    ('collector', 'e2e_latency_ms.p99', False),
+    ('collector', 'rss_per_target_bytes', False)
+]
+
+
+def _lookup(data: Dict, path: str) -> Optional[float]:
+    for key in path.split('.'):
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+
+def _rows(base: Dict, head: Dict):
+    for section, path, higher_is_better in METRICS:
+        if section == 'collector':
+            base_scales = {item['targets']: item for item in base.get(section, [])}
+            pairs = [
+                (f'{section}[{item["targets"]}].{path}', base_scales.get(item['targets']), item)
+                for item in head.get(section, [])
+            ]
+        else:
+            pairs = [(f'{section}.{path}', base.get(section), head.get(section))]
+        for name, old, new in pairs:
+            old_value = _lookup(old or {}, path)
+            new_value = _lookup(new or {}, path)
+            if old_value is None or new_value is None:
+                continue
+            change = (new_value - old_value) / old_value * 100 if old_value else 0.0
+            better = change > 0 if higher_is_better else change < 0
+            yield name, old_value, new_value, change, better
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="İki kıyaslama sonucunu karşılaştırır")
+    parser.add_argument('base', help="Referans sonuç dosyası")
+    parser.add_argument('head', help="Yeni sonuç dosyası")
+    parser.add_argument('--threshold', type=float, default=5.0,
+                        help="Bu yüzdeden büyük kötüleşmeleri işaretle")
+    args = parser.parse_args()
+
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.head, encoding='utf-8') as f:
+        head = json.load(f)
+
+    print(f"{'metrik':<45}{'önce':>14}{'sonra':>14}{'değişim':>10}")
+    for name, old_value, new_value, change, better in _rows(base, head):
+        flag = ' !' if not better and abs(change) > args.threshold else ''
+        print(f"{name:<45}{old_value:>14}{new_value:>14}{change:>+9.1f}%{flag}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""Kıyaslamalar için çevrim dışı yardımcılar: yerel yanıtlayıcılar ve sahte arka uçlar."""
+import asyncio
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import ipaddress
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.event_sink import PostgresEventSink
+
+
+def loopback_targets(count: int) -> List[Dict]:
+    """
+    127.0.0.0/8 içinden `count` hedef üretir. Linux çekirdeği bu bloğun
+    tamamına echo yanıtı verdiği için her adres ayrı bir ICMP yanıtlayıcıdır.
+    """
+    base = int(ipaddress.IPv4Address('127.0.1.1'))
+    return [
+        {'name': f'bench-{i}', 'address': str(ipaddress.IPv4Address(base + i)), 'interval': 1.0}
+        for i in range(count)
+    ]
+
+
+class DictConfig:
+    def __init__(self, values: Dict[str, Any]):
+        """`Config.get` ile aynı noktalı anahtar erişimini sağlayan bellek içi yapılandırma."""
+        self.config = values
+
+    def get(self, key: str, default: Any = None) -> Any:
+        current = self.config
+        try:
+            for k in key.split('.'):
+                current = current[k]
+            return current
+        except (KeyError, TypeError):
+            return default
+
+
+class TcpResponder:
+    def __init__(self, host: str = '127.0.0.1'):
+        """Bağlantıyı kabul edip hemen kapatan yerel TCP yanıtlayıcısı."""
+        self.host = host
+        self.port = 0
+        self.accepted = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.accepted += 1
+        writer.close()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, 0, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+class _InfluxHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        self.server.record(body.decode())
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeInfluxServer(ThreadingHTTPServer):
+    def __init__(self, measurement: str = 'network_metrics'):
+        """
+        InfluxDB yazma ucunun yerel karşılığı. Gelen satırları sayar ve
+        `measurement` satırlarının zaman damgasından uçtan uca gecikmeyi ölçer.
+        """
+        super().__init__(('127.0.0.1', 0), _InfluxHandler)
+        self.daemon_threads = True
+        self._prefix = f'{measurement},'
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.lines = 0
+        self.bytes = 0
+        self.e2e_ms: List[float] = []
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def record(self, body: str) -> None:
+        now_ns = time.time_ns()
+        lines = body.split('\n')
+        latencies = [
+            (now_ns - int(line.rsplit(' ', 1)[1])) / 1e6
+            for line in lines if line.startswith(self._prefix)
+        ]
+        with self._lock:
+            self.requests += 1
+            self.lines += len(lines)
+            self.bytes += len(body)
+            self.e2e_ms.extend(latencies)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class FakeEventSink(PostgresEventSink):
+    def __init__(self, *args, insert_delay: float = 0.0, **kwargs):
+        """
+        PostgreSQL yerine olayları bellekte sayan olay yazıcısı. Kuyruklama ve
+        toplu yazma yolu gerçek yazıcıyla aynıdır; yalnızca INSERT taklit edilir.
+
+        Args:
+            insert_delay: Her grubun yazılmasına eklenecek gecikme (saniye)
+        """
+        super().__init__(*args, **kwargs)
+        self.insert_delay = insert_delay
+        self.inserted_rows = 0
+
+    def open(self) -> None:
+        pass
+
+    def execute(self, sql: str, params: Optional[Tuple] = None) -> None:
+        pass
+
+    def _insert_rows(self, rows: List[Tuple]) -> None:
+        if self.insert_delay:
+            time.sleep(self.insert_delay)
+        self.inserted_rows += len(rows)
+
+    def close(self) -> None:
+        pass
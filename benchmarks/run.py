@@ -0,0 +1,424 @@
+"""
+Çevrim dışı performans kıyaslamaları.
+
+Tüm arka uçlar yereldir: ICMP hedefleri loopback adresleridir, InfluxDB
+yazma ucu ve PostgreSQL olay yazıcısı sahte karşılıklarıyla değiştirilir.
+Sonuçlar karşılaştırılabilmesi için JSON olarak yazılır.
+
+    python -m benchmarks.run --targets 100 1000 10000 --duration 10
+    python -m benchmarks.compare eski.json yeni.json
+"""
+import argparse
+import asyncio
+from datetime import datetime, timezone
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Sequence
+from unittest import mock
+
+from influxdb_client import InfluxDBClient
+from influxdb_client.client.write_api import SYNCHRONOUS
+import psutil
+
+from benchmarks.fakes import (DictConfig, FakeEventSink, FakeInfluxServer,
+                              TcpResponder, loopback_targets)
+from src.core import data_store as data_store_module
+from src.core.analytics import analyze
+from src.core.capture import CaptureWriter
+from src.core.connection_probe import TcpProbe
+from src.core.influx_writer import InfluxBatchWriter
+from src.core.local_store import LocalDataStore
+from src.core.pipeline import CollectorPipeline, build_data_store
+from src.core.probe_result import ProbeResult, Status
+from src.core.stats import percentile
+from src.core.transitions import TransitionTracker
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# Giriş noktasını yeni bir yorumlayıcıda yükler; süre ve bellek çocuk süreçte ölçülür
+STARTUP_SCRIPT = """
+import importlib, json, sys, time
+started = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - started
+import psutil
+print(json.dumps({'seconds': elapsed, 'rss': psutil.Process().memory_info().rss}))
+"""
+
+
+def _summary(values: Sequence[float]) -> Dict[str, float]:
+    """Dağılımın özetini (ms) döndürür."""
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+    return {
+        'count': len(ordered),
+        'p50': round(percentile(ordered, 50), 3),
+        'p95': round(percentile(ordered, 95), 3),
+        'p99': round(percentile(ordered, 99), 3),
+        'max': round(ordered[-1], 3)
+    }
+
+
+def _config(influx_url: str, batch_size: int, flush_interval: float) -> DictConfig:
+    return DictConfig({
+        'influxdb': {
+            'url': influx_url,
+            'token': 'bench-token',
+            'org': 'bench-org',
+            'bucket': 'bench-bucket',
+            'batch_size': batch_size,
+            'flush_interval': flush_interval,
+            'max_queue_size': 1_000_000,
+            'drop_policy': 'drop_oldest'
+        },
+        'postgresql': {'dsn': 'postgresql://bench@localhost/bench'},
+        'spool': {'enabled': False},
+        'rollups': {'enabled': True, 'resolutions': [1, 60, 3600]},
+        'alerts': {
+            'latency_threshold': 100,
+            'packet_loss_threshold': 5,
+            'consecutive_failures': 3,
+            'latency_change_threshold': 50
+        },
+        'app': {
+            'cpu_check_interval': 0,
+            'scheduler': {'jitter': 1.0, 'max_concurrency': 100_000}
+        }
+    })
+
+
+async def bench_collector(count: int, duration: float, warmup: float,
+                          batch_size: int, flush_interval: float) -> Dict:
+    """Tek bir olay döngüsünde `count` loopback hedefini toplama hattıyla ölçer."""
+    influx = FakeInfluxServer()
+    influx.start()
+    config = _config(influx.url, batch_size, flush_interval)
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+
+    with mock.patch.object(data_store_module, 'PostgresEventSink', FakeEventSink):
+        store = build_data_store(config)
+
+    measuring = False
+    lags: List[float] = []
+    publish_ms: List[float] = []
+    failures = 0
+
+    def publish(target_id: int, result: ProbeResult) -> None:
+        nonlocal failures
+        if not measuring:
+            return
+        lags.append(result.schedule_lag)
+        publish_ms.append((time.monotonic_ns() - result.sent_mono) / 1e6)
+        if not result.ok:
+            failures += 1
+
+    pipeline = CollectorPipeline(
+        config, list(enumerate(loopback_targets(count))), store,
+        publish=publish, host_metrics=False
+    )
+    task = asyncio.create_task(pipeline.run())
+    await asyncio.sleep(warmup)
+
+    influx.e2e_ms.clear()
+    measuring = True
+    cpu_before = process.cpu_times()
+    started = time.perf_counter()
+    await asyncio.sleep(duration)
+    measuring = False
+    elapsed = time.perf_counter() - started
+    cpu_after = process.cpu_times()
+    rss_after = process.memory_info().rss
+
+    await pipeline.stop()
+    await task
+    influx.stop()
+
+    cpu_seconds = (cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system)
+    return {
+        'targets': count,
+        'duration': round(elapsed, 3),
+        'checks': len(lags),
+        'failures': failures,
+        'probes_per_sec': round(len(lags) / elapsed, 1),
+        'expected_per_sec': count,
+        'cpu_percent': round(100 * cpu_seconds / elapsed, 1),
+        'scheduler_lag_ms': _summary(lags),
+        'check_latency_ms': _summary(publish_ms),
+        'e2e_latency_ms': _summary(influx.e2e_ms),
+        'influx_lines': influx.lines,
+        'rss_per_target_bytes': round((rss_after - rss_before) / count)
+    }
+
+
+async def bench_writer(lines: int, batch_size: int) -> Dict:
+    """InfluxBatchWriter'ın sahte InfluxDB'ye yazma hızını ölçer."""
+    influx = FakeInfluxServer()
+    influx.start()
+    client = InfluxDBClient(url=influx.url, token='bench-token', org='bench-org', enable_gzip=True)
+    writer = InfluxBatchWriter(
+        client.write_api(write_options=SYNCHRONOUS),
+        bucket='bench-bucket',
+        org='bench-org',
+        batch_size=batch_size,
+        flush_interval=1.0,
+        max_queue_size=lines,
+        drop_policy='block'
+    )
+    payload = [
+        ProbeResult(f'10.0.{i // 256 % 256}.{i % 256}', Status.OK, latency=1.0 + i % 100,
+                    time_ns=1_700_000_000_000_000_000 + i).to_line()
+        for i in range(lines)
+    ]
+
+    started = time.perf_counter()
+    for line in payload:
+        await writer.write(line)
+    await writer.stop()
+    elapsed = time.perf_counter() - started
+    client.close()
+    influx.stop()
+
+    return {
+        'lines': lines,
+        'batch_size': batch_size,
+        'lines_per_sec': round(lines / elapsed),
+        'requests': influx.requests,
+        'received_lines': influx.lines,
+        'bytes_per_line': round(influx.bytes / max(influx.lines, 1), 1)
+    }
+
+
+async def bench_event_sink(events: int, batch_size: int) -> Dict:
+    """Olay yazıcısının kuyruklama ve toplu yazma hızını sahte PostgreSQL ile ölçer."""
+    sink = FakeEventSink('postgresql://bench@localhost/bench', batch_size=batch_size,
+                         flush_interval=1.0, max_queue_size=events)
+    # Durumu her örnekte değişen hedef: her sonuç bir geçiş satırı üretir
+    transitions = TransitionTracker()
+    rows = [
+        transitions.update(ProbeResult(
+            '10.0.0.1', Status.FAIL if i % 2 == 0 else Status.OK,
+            latency=None if i % 2 == 0 else 1.0, packet_loss=100.0 if i % 2 == 0 else 0.0,
+            time_ns=1_700_000_000_000_000_000 + i
+        ))
+        for i in range(events)
+    ]
+
+    started = time.perf_counter()
+    for row in rows:
+        await sink.write_event(*row)
+    await sink.stop()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'events': events,
+        'batch_size': batch_size,
+        'events_per_sec': round(events / elapsed),
+        'inserted_rows': sink.inserted_rows
+    }
+
+
+async def bench_local_store(samples: int, targets: int) -> Dict:
+    """Gömülü SQLite deposunun örnek yazma ve aralık okuma hızını ölçer."""
+    base_ns = time.time_ns() - samples // targets * 10**9
+    results = [
+        ProbeResult(f'10.0.{i % targets // 256}.{i % targets % 256}', Status.OK,
+                    latency=1.0 + i % 100, time_ns=base_ns + i // targets * 10**9)
+        for i in range(samples)
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        store = LocalDataStore(os.path.join(directory, 'bench.db'), compact_interval=0)
+        started = time.perf_counter()
+        for i, result in enumerate(results):
+            await store.store_metrics(result)
+            if i % targets == 0:
+                # Toplayıcıda olduğu gibi yazma görevi araya girebilsin
+                await asyncio.sleep(0)
+        await store.stop()
+        elapsed = time.perf_counter() - started
+
+        span = samples // targets
+        query_started = time.perf_counter()
+        store.history.source.fetch(results[0].target, base_ns // 10**9,
+                                   base_ns // 10**9 + span, max(span // 100, 1))
+        query_ms = (time.perf_counter() - query_started) * 1000
+        store.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size = os.path.getsize(os.path.join(directory, 'bench.db'))
+        store.close()
+
+    return {
+        'samples': samples,
+        'targets': targets,
+        'samples_per_sec': round(samples / elapsed),
+        'batches': store.written_batches,
+        'range_query_ms': round(query_ms, 3),
+        'bytes_per_sample': round(size / samples, 1)
+    }
+
+
+async def bench_tcp_connect(connections: int, concurrency: int) -> Dict:
+    """TCP probunun yerel yanıtlayıcıya bağlantı kurma hızını ve gecikmesini ölçer."""
+    responder = TcpResponder()
+    await responder.start()
+    probe = TcpProbe(responder.host, responder.port, timeout=5.0,
+                     limiter=asyncio.Semaphore(concurrency))
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(probe.perform_check() for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+    await responder.stop()
+
+    return {
+        'connections': connections,
+        'concurrency': concurrency,
+        'failures': sum(1 for result in results if not result.ok),
+        'connects_per_sec': round(connections / elapsed),
+        'connect_latency_ms': _summary(
+            [result.extra['connect_ms'] for result in results if result.ok]
+        )
+    }
+
+
+def bench_analytics(samples: int, targets: int) -> Dict:
+    """Kararlılık analizinin bir kayıt dosyasını tek çekirdekte özetleme hızını ölçer."""
+    base_ns = time.time_ns() - samples // targets * 10**9
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.nmcap')
+        writer = CaptureWriter(path)
+        for i in range(samples):
+            failed = i % 997 == 0
+            index = i % targets
+            result = ProbeResult(f'10.0.{index // 256}.{index % 256}',
+                                 Status.FAIL if failed else Status.OK,
+                                 latency=None if failed else 1.0 + i % 100,
+                                 packet_loss=100.0 if failed else 0.0,
+                                 time_ns=base_ns + i // targets * 10**9)
+            result.interval = 1.0
+            writer.append(result)
+        writer.close()
+        size = os.path.getsize(path)
+
+        started = time.perf_counter()
+        reports = analyze([path], processes=1).report()
+        elapsed = time.perf_counter() - started
+
+    return {
+        'samples': samples,
+        'targets': len(reports),
+        'samples_per_sec': round(samples / elapsed),
+        'capture_bytes_per_sample': round(size / samples, 2)
+    }
+
+
+def bench_startup(module: str, runs: int) -> Dict:
+    """Giriş noktasının (`main` paneli veya `collector`) yüklenme süresini ve belleğini ölçer."""
+    imports, processes, rss = [], [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', STARTUP_SCRIPT, module],
+            cwd=SRC_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        processes.append((time.perf_counter() - started) * 1000)
+        measured = json.loads(output.splitlines()[-1])
+        imports.append(measured['seconds'] * 1000)
+        rss.append(measured['rss'])
+    return {
+        'runs': runs,
+        'import_ms': round(percentile(sorted(imports), 50), 1),
+        'process_ms': round(percentile(sorted(processes), 50), 1),
+        'rss_mb': round(percentile(sorted(rss), 50) / 1024 / 1024, 1)
+    }
+
+
+def _metadata() -> Dict:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    results = {'meta': _metadata()}
+    results['writer'] = await bench_writer(args.writer_lines, args.batch_size)
+    print(f"writer: {results['writer']['lines_per_sec']} satır/sn")
+    results['event_sink'] = await bench_event_sink(args.writer_lines // 4, 500)
+    print(f"event_sink: {results['event_sink']['events_per_sec']} olay/sn")
+    results['local_store'] = await bench_local_store(args.writer_lines, 1000)
+    print(f"local_store: {results['local_store']['samples_per_sec']} örnek/sn")
+    results['tcp_connect'] = await bench_tcp_connect(args.tcp_connections, 500)
+    print(f"tcp_connect: {results['tcp_connect']['connects_per_sec']} bağlantı/sn")
+    results['analytics'] = bench_analytics(args.analytics_samples, 1000)
+    print(f"analytics: {results['analytics']['samples_per_sec']} örnek/sn")
+
+    results['startup'] = {module: bench_startup(module, 5) for module in ('main', 'collector')}
+    for module, result in results['startup'].items():
+        print(f"startup[{module}]: {result['import_ms']} ms, {result['rss_mb']} MB")
+
+    results['collector'] = []
+    for count in args.targets:
+        result = await bench_collector(count, args.duration, args.warmup,
+                                       args.batch_size, args.flush_interval)
+        results['collector'].append(result)
+        print(
+            f"collector[{count}]: {result['probes_per_sec']}/{count} kontrol/sn, "
+            f"gecikme p99 {result['scheduler_lag_ms'].get('p99')} ms, "
+            f"uçtan uca p99 {result['e2e_latency_ms'].get('p99')} ms, "
+            f"{result['rss_per_target_bytes']} bayt/hedef"
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Çevrim dışı performans kıyaslamaları")
+    parser.add_argument('--targets', type=int, nargs='+', default=[100, 1000, 10000],
+                        help="Ölçülecek hedef sayıları")
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help="Ölçek başına ölçüm süresi (saniye)")
+    parser.add_argument('--warmup', type=float, default=2.0,
+                        help="Ölçüm öncesi ısınma süresi (saniye)")
+    parser.add_argument('--batch-size', type=int, default=5000, help="InfluxDB grup boyu")
+    parser.add_argument('--flush-interval', type=float, default=1.0,
+                        help="InfluxDB yazma aralığı (saniye)")
+    parser.add_argument('--writer-lines', type=int, default=200_000,
+                        help="Yazıcı kıyaslamasındaki satır sayısı")
+    parser.add_argument('--tcp-connections', type=int, default=5000,
+                        help="TCP kıyaslamasındaki bağlantı sayısı")
+    parser.add_argument('--analytics-samples', type=int, default=1_000_000,
+                        help="Analiz kıyaslamasındaki örnek sayısı")
+    parser.add_argument('--output',
+                        help="Sonuç dosyası (varsayılan benchmarks/results/<zaman>.json)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    results = asyncio.run(run(args))
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        output = os.path.join(RESULTS_DIR, f'{stamp}.json')
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Sonuçlar: {output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Uzun dönem bağlantı kararlılığı raporu.
+
+Kayıt dosyalarını (`.nmcap`) ve InfluxDB'den dışa aktarılan `network_metrics`
+line protocol dosyalarını parçalar halinde, birden fazla çekirdekte
+NumPy ile özetler; hedef başına erişilebilirlik, kesintiler, MTBF/MTTR,
+gecikme yüzdelikleri, titreşim, MOS tahmini ve günlük desen üretir:
+
+    python src/analyze.py captures/*.nmcap
+    python src/analyze.py export.lp.gz --format json --utc-offset 3 > rapor.json
+"""
+import argparse
+import csv
+import json
+import logging
+import sys
+from typing import Dict, List, Optional
+
+from core.analytics import analyze
+
+logger = logging.getLogger(__name__)
+
+# Metin ve CSV çıktısındaki sütunlar (saatlik diziler ve kesinti listesi yalnızca JSON'da)
+COLUMNS = (
+    'target', 'samples', 'availability', 'outages', 'downtime', 'mtbf', 'mttr',
+    'latency_mean', 'latency_p50', 'latency_p95', 'latency_p99', 'jitter',
+    'packet_loss', 'mos', 'worst_hour'
+)
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Süreyi okunur biçime çevirir (ör. 3g 4s 5d 6sn, bir dakikanın altında 1.5sn)."""
+    if seconds is None:
+        return '-'
+    if seconds < 60:
+        return f'{seconds:.1f}sn'
+    seconds = int(round(seconds))
+    parts = []
+    for unit, size in (('g', 86400), ('s', 3600), ('d', 60)):
+        if seconds >= size:
+            parts.append(f'{seconds // size}{unit}')
+            seconds %= size
+    if seconds or not parts:
+        parts.append(f'{seconds}sn')
+    return ' '.join(parts)
+
+
+def format_text(reports: List[Dict]) -> str:
+    """Raporu hedef başına bir satırlık tablo olarak biçimlendirir."""
+    header = (f"{'hedef':<32}{'örnek':>10}{'erişim %':>10}{'kesinti':>9}{'toplam':>12}"
+              f"{'MTBF':>12}{'MTTR':>10}{'ort ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+              f"{'jitter':>8}{'kayıp %':>9}{'MOS':>6}{'saat':>6}")
+    lines = [header, '-' * len(header)]
+
+    def value(number, digits=2):
+        return '-' if number is None else f'{number:.{digits}f}'
+
+    for report in reports:
+        lines.append(
+            f"{report['target'][:31]:<32}{report['samples']:>10}"
+            f"{value(report['availability'], 3):>10}"
+            f"{report['outages']:>9}{format_duration(report['downtime']):>12}"
+            f"{format_duration(report['mtbf']):>12}{format_duration(report['mttr']):>10}"
+            f"{value(report['latency_mean']):>9}{value(report['latency_p95']):>9}"
+            f"{value(report['latency_p99']):>9}{value(report['jitter']):>8}"
+            f"{value(report['packet_loss'], 3):>9}{value(report['mos']):>6}"
+            f"{'-' if report['worst_hour'] is None else report['worst_hour']:>6}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Komut satırı giriş noktası."""
+    parser = argparse.ArgumentParser(description="Hedef başına bağlantı kararlılığı raporu")
+    parser.add_argument('paths', nargs='+', help="Kayıt dosyaları (.nmcap) veya "
+                        "network_metrics line protocol dışa aktarımları (.lp, .lp.gz)")
+    parser.add_argument('--format', choices=('text', 'json', 'csv'), default='text',
+                        help="Çıktı biçimi")
+    parser.add_argument('--processes', type=int, default=0, help="Süreç sayısı (0 = CPU sayısı)")
+    parser.add_argument('--chunk-records', type=int, default=2_000_000,
+                        help="Parça başına örnek; bellek kullanımını sınırlar")
+    parser.add_argument('--min-outage', type=float, default=0.0,
+                        help="Bundan kısa (saniye) kesintileri sayma")
+    parser.add_argument('--utc-offset', type=float, default=0.0,
+                        help="Günlük desen için saat dilimi farkı (saat, ör. 3)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    try:
+        analyzer = analyze(args.paths, processes=args.processes,
+                           chunk_records=args.chunk_records, utc_offset=args.utc_offset)
+    except (OSError, ValueError) as e:
+        logger.error(f"Analiz hatası: {str(e)}")
+        return 1
+    reports = analyzer.report(min_outage=args.min_outage)
+
+    if args.format == 'json':
+        json.dump(reports, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    elif args.format == 'csv':
+        writer = csv.DictWriter(sys.stdout, fieldnames=COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(reports)
+    else:
+        print(format_text(reports))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
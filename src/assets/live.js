@@ -0,0 +1,115 @@
+// Canlı görünüm: sunucunun /stream adresinden ittiği görünümleri uygular.
+// Görünümler sunucuda veri değişikliği başına bir kez üretilir; burada yalnızca
+// tam görünüm (figure) çizilir ya da fark (extend) grafiğe eklenir.
+(function () {
+    var source = null;
+    var queue = [];
+    var waiting = false;
+
+    function setText(id, text, className) {
+        var element = document.getElementById(id);
+        if (!element) {
+            return;
+        }
+        element.textContent = text;
+        if (className) {
+            element.className = className;
+        }
+    }
+
+    function renderTable(rows) {
+        var container = document.getElementById('metrics-table');
+        if (!container) {
+            return;
+        }
+        container.textContent = '';
+        if (!rows.length) {
+            return;
+        }
+        var table = document.createElement('table');
+        table.className = 'table table-bordered table-hover table-striped';
+        var head = table.createTHead().insertRow();
+        ['Zaman', 'Hedef', 'Durum', 'Gecikme (ms)', 'Paket Kaybı (%)'].forEach(function (title) {
+            var cell = document.createElement('th');
+            cell.textContent = title;
+            head.appendChild(cell);
+        });
+        var body = table.createTBody();
+        rows.forEach(function (row) {
+            var line = body.insertRow();
+            row.forEach(function (value) {
+                line.insertCell().textContent = value;
+            });
+        });
+        container.appendChild(table);
+    }
+
+    function flush() {
+        // plotly.js dcc.Graph ile tembel yüklenir; hazır olana kadar görünümler sırayla bekletilir
+        var graph = document.getElementById('live-graph');
+        if (!graph || !window.Plotly) {
+            waiting = true;
+            setTimeout(flush, 200);
+            return;
+        }
+        waiting = false;
+        var views = queue;
+        queue = [];
+        views.forEach(function (view) {
+            apply(graph, view);
+        });
+    }
+
+    function receive(view) {
+        if (view.figure) {
+            queue = [];  // tam görünüm öncekilerin yerini alır
+        }
+        queue.push(view);
+        if (!waiting) {
+            flush();
+        }
+    }
+
+    function apply(graph, view) {
+        if (view.figure) {
+            window.Plotly.react(graph, view.figure.data, view.figure.layout);
+        } else if (view.extend) {
+            window.Plotly.extendTraces(graph, view.extend[0], view.extend[1], view.extend[2]);
+        }
+        showValues(view);
+    }
+
+    function showValues(view) {
+        setText('current-latency', view.latency);
+        setText('current-packet-loss', view.packet_loss);
+        setText('current-status', view.status, view.status_class);
+        renderTable(view.rows);
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        live: {
+            subscribe: function (target, range, interval, values) {
+                if (source) {
+                    source.close();
+                    source = null;
+                }
+                queue = [];
+                var hidden = {display: 'none'};
+                if (target && range && range !== 'live') {
+                    // Geçmiş aralıklarda anlık değerler sunucu geri çağrısından gelir
+                    if (values) {
+                        showValues(values);
+                    }
+                    return [null, hidden, {}];
+                }
+                var url = 'stream?target=' + encodeURIComponent(target || '') +
+                    '&interval=' + (interval || 0);
+                source = new EventSource(url);
+                source.onmessage = function (event) {
+                    receive(JSON.parse(event.data));
+                };
+                return [url, {height: '400px'}, hidden];
+            }
+        }
+    });
+})();
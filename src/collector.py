@@ -0,0 +1,109 @@
+"""
+Panelsiz (başsız) toplayıcı.
+
+Yalnızca prob, zamanlayıcı ve depolama modüllerini yükler; panel yığını
+(dash, plotly, Flask) ve numpy yüklenmez, tarayıcı açılmaz. Sunucularda
+ve uç noktalardaki prob düğümlerinde `main.py` yerine kullanılır:
+
+    python src/collector.py --config config.yaml
+    cd src && python -m collector --workers 4
+"""
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+import threading
+from typing import Dict, List, Optional
+
+from config.config import Config
+from core.pipeline import CollectorPipeline, build_capture, build_data_store
+from core.supervisor import CollectorSupervisor, shard_targets
+
+logger = logging.getLogger(__name__)
+
+
+async def run_collector(config, targets: List[Dict]) -> None:
+    """
+    Tüm hedefleri bu süreçte, tek bir olay döngüsünde SIGINT/SIGTERM gelene kadar kontrol eder.
+
+    Args:
+        config: Uygulama yapılandırması
+        targets: Yapılandırmadaki hedefler
+    """
+    pipeline = CollectorPipeline(config, list(enumerate(targets)), build_data_store(config),
+                                 capture=build_capture(config))
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stopping.set)
+        except NotImplementedError:
+            # Windows: Ctrl+C ana görevi iptal eder, kapanış aşağıda yapılır
+            pass
+
+    logger.info(f"Toplayıcı başladı ({len(targets)} hedef)")
+    task = asyncio.create_task(pipeline.run())
+    try:
+        await stopping.wait()
+    finally:
+        await pipeline.stop()
+        await task
+        logger.info("Toplayıcı durdu")
+
+
+def run_supervised(config_path: str, targets: List[Dict], workers: int) -> None:
+    """Hedefleri çalışan süreçlere böler; sonuçlar yalnızca veri deposuna yazılır."""
+    supervisor = CollectorSupervisor(config_path, targets, workers=workers, results=False)
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+
+    supervisor.active.set()
+    supervisor.start()
+    logger.info(f"Toplayıcı başladı ({len(targets)} hedef, {len(supervisor.shards)} çalışan)")
+    try:
+        # Zaman aşımlı bekleme, Windows'ta Ctrl+C'nin ana iş parçacığına ulaşmasını sağlar
+        while not stopping.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        supervisor.stop()
+        logger.info("Toplayıcı durdu")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Komut satırı giriş noktası."""
+    parser = argparse.ArgumentParser(description="Panelsiz ağ izleme toplayıcısı")
+    parser.add_argument('--config', default='config.yaml', help="Yapılandırma dosyası")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Çalışan süreç sayısı "
+                             "(varsayılan app.collector.workers, 0 = CPU sayısı)")
+    args = parser.parse_args(argv)
+
+    try:
+        config = Config(args.config)
+    except Exception as e:
+        print(f"Yapılandırma yüklenemedi: {str(e)}", file=sys.stderr)
+        return 1
+
+    targets = config.get('targets', [])
+    if not targets:
+        logger.error("Yapılandırmada hedef yok")
+        return 1
+
+    workers = args.workers if args.workers is not None else config.get('app.collector.workers', 0)
+    # Tek çalışanlık iş için ayrı süreç ve denetçi açılmaz
+    if len(shard_targets(targets, workers)) == 1:
+        try:
+            asyncio.run(run_collector(config, targets))
+        except KeyboardInterrupt:
+            pass
+    else:
+        run_supervised(args.config, targets, workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,17 +7,20 @@ from dotenv import load_dotenv
 logger = logging.getLogger(__name__)
 
 class Config:
-    def __init__(self, config_path: str = "config.yaml"):
+    def __init__(self, config_path: str = "config.yaml", setup_logging: bool = True):
         """
         Yapılandırma yönetimi sınıfı.
         
         Args:
             config_path: Yapılandırma dosyası yolu
+            setup_logging: Loglama yapılandırması uygulansın mı; kayıtlarını ana
+                sürece ileten çalışan süreçlerde kapatılır
         """
         self.config_path = config_path
         self.config = {}
         self._load_config()
-        self._setup_logging()
+        if setup_logging:
+            self._setup_logging()
 
     def _load_config(self):
         """Yapılandırma dosyasını yükler ve çevre değişkenlerini uygular."""
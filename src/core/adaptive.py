@@ -0,0 +1,99 @@
+from typing import Optional
+
+from .probe_result import Status
+
+
+class AdaptiveInterval:
+    __slots__ = (
+        'base', 'fast', 'maximum', 'backoff', 'stable_checks', 'latency_change',
+        'min_latency_change', 'smoothing', 'interval', 'degraded', 'baseline',
+        'stable', 'last_status'
+    )
+
+    def __init__(
+        self,
+        base: float,
+        fast: Optional[float] = None,
+        maximum: Optional[float] = None,
+        backoff: float = 2.0,
+        stable_checks: int = 10,
+        latency_change: float = 0.5,
+        min_latency_change: float = 1.0,
+        smoothing: float = 0.1
+    ):
+        """
+        Hedef başına uyarlanır kontrol aralığı.
+
+        Kararlı kalan hedefin aralığı her `stable_checks` kararlı kontrolde
+        `backoff` katına çıkar (en fazla `maximum`). Durum değiştiğinde, kayıp
+        görüldüğünde ya da gecikme taban değerden saptığında aralık beklemeden
+        `fast` değerine iner ve hedef yeniden kararlı olana kadar bozulmuş sayılır.
+
+        Args:
+            base: Yapılandırılmış kontrol aralığı (saniye); başlangıç aralığı
+            fast: Bozulma sırasındaki aralık (saniye, en fazla `base`)
+            maximum: Kararlı hedefin ulaşabileceği en uzun aralık (saniye, en az `base`)
+            backoff: Her kararlı dönemdeki aralık çarpanı
+            stable_checks: Aralığı uzatmak için art arda kararlı kontrol sayısı
+            latency_change: Gecikmenin taban değerden bu oranda sapması değişim sayılır
+            min_latency_change: Değişim sayılacak en küçük gecikme farkı (ms); çok düşük
+                gecikmeli hedeflerde oransal eşiğin gürültüye takılmasını önler
+            smoothing: Taban gecikmenin üstel ortalama katsayısı (0-1)
+        """
+        self.base = base
+        self.fast = min(fast, base) if fast else base
+        self.maximum = max(maximum, base) if maximum else base
+        self.backoff = max(backoff, 1.0)
+        self.stable_checks = max(1, stable_checks)
+        self.latency_change = latency_change
+        self.min_latency_change = min_latency_change
+        self.smoothing = smoothing
+        self.interval = base
+        self.degraded = False
+        self.baseline: Optional[float] = None
+        self.stable = 0
+        self.last_status: Optional[Status] = None
+
+    def _changed(self, status: Status, latency: Optional[float], packet_loss: float) -> bool:
+        if status is not Status.OK or packet_loss > 0:
+            return True
+        if self.last_status is not None and status is not self.last_status:
+            return True
+        if latency is None or self.baseline is None:
+            return False
+        threshold = max(self.baseline * self.latency_change, self.min_latency_change)
+        return abs(latency - self.baseline) > threshold
+
+    def observe(self, status: Status, latency: Optional[float], packet_loss: float) -> float:
+        """
+        Kontrol sonucunu işler ve bir sonraki kontrol aralığını döndürür.
+
+        Args:
+            status: Kontrol durumu
+            latency: Gecikme (ms), ölçülemediyse None
+            packet_loss: Paket kaybı (%)
+
+        Returns:
+            Yeni kontrol aralığı (saniye)
+        """
+        changed = self._changed(status, latency, packet_loss)
+        self.last_status = status
+        if latency is not None:
+            # Kalıcı bir kayma (ör. yeni rota) zamanla yeni taban olur
+            if self.baseline is None:
+                self.baseline = latency
+            else:
+                self.baseline += (latency - self.baseline) * self.smoothing
+
+        if changed:
+            self.interval = self.fast
+            self.degraded = True
+            self.stable = 0
+            return self.interval
+
+        self.stable += 1
+        if self.stable >= self.stable_checks:
+            self.stable = 0
+            self.degraded = False
+            self.interval = min(self.interval * self.backoff, self.maximum)
+        return self.interval
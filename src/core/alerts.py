@@ -0,0 +1,346 @@
+import asyncio
+from email.message import EmailMessage
+import logging
+import smtplib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+FIRING = 'firing'
+RESOLVED = 'resolved'
+
+
+class Alert:
+    __slots__ = ('target', 'rule', 'state', 'value', 'timestamp')
+
+    def __init__(self, target: str, rule: str, state: str, value: float, timestamp: float):
+        """
+        Bir kuralın durum değişikliği.
+
+        Args:
+            target: Hedef adresi
+            rule: Kural adı
+            state: FIRING veya RESOLVED
+            value: Kararı veren değer
+            timestamp: Örnek zamanı (Unix zamanı, saniye)
+        """
+        self.target = target
+        self.rule = rule
+        self.state = state
+        self.value = value
+        self.timestamp = timestamp
+
+    def __repr__(self) -> str:
+        return f"Alert({self.target}, {self.rule}, {self.state}, {self.value:.2f})"
+
+
+class _Window:
+    __slots__ = ('values', 'index', 'count', 'total')
+
+    def __init__(self, size: int):
+        self.values = [0.0] * size
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+
+    def push(self, value: float) -> float:
+        """Değeri ekler, pencereden çıkan değeri döndürür."""
+        evicted = self.values[self.index]
+        self.values[self.index] = value
+        self.index = (self.index + 1) % len(self.values)
+        if self.count < len(self.values):
+            self.count += 1
+            evicted = 0.0
+        self.total += value - evicted
+        return evicted
+
+
+class ThresholdRule:
+    def __init__(self, name: str, field: str, threshold: float,
+                 window: int = 1, hysteresis: float = 0.8):
+        """
+        Kayan pencere ortalaması eşiği aştığında tetiklenen kural.
+
+        Args:
+            name: Kural adı
+            field: 'latency' veya 'packet_loss'
+            threshold: Tetiklenme eşiği
+            window: Ortalamanın alınacağı örnek sayısı
+            hysteresis: Uyarı, ortalama `threshold * hysteresis` altına inince kapanır
+        """
+        self.name = name
+        self.field = field
+        self.threshold = threshold
+        self.clear_threshold = threshold * hysteresis
+        self.window = window
+
+    def new_state(self) -> _Window:
+        return _Window(self.window)
+
+    def update(self, state: _Window, latency: Optional[float], packet_loss: float,
+               ok: bool, active: bool) -> Tuple[Optional[bool], float]:
+        """
+        Örneği duruma ekler.
+
+        Returns:
+            (karar, değer); karar True = tetikle, False = kapat, None = değişiklik yok
+        """
+        value = latency if self.field == 'latency' else packet_loss
+        if value is None:
+            return None, 0.0
+        state.push(value)
+        if state.count < self.window:
+            return None, 0.0
+        mean = state.total / state.count
+        if not active and mean > self.threshold:
+            return True, mean
+        if active and mean <= self.clear_threshold:
+            return False, mean
+        return None, mean
+
+
+class ConsecutiveFailureRule:
+    def __init__(self, name: str, failures: int, recoveries: int = 1):
+        """
+        Art arda başarısız kontroller için kural.
+
+        Args:
+            name: Kural adı
+            failures: Tetiklenmek için art arda başarısız kontrol sayısı
+            recoveries: Kapanmak için art arda başarılı kontrol sayısı
+        """
+        self.name = name
+        self.failures = failures
+        self.recoveries = recoveries
+
+    def new_state(self) -> List[int]:
+        return [0]  # art arda aynı sonucun sayısı (başarısızlık pozitif, başarı negatif)
+
+    def update(self, state: List[int], latency: Optional[float], packet_loss: float,
+               ok: bool, active: bool) -> Tuple[Optional[bool], float]:
+        if ok:
+            state[0] = min(state[0], 0) - 1
+        else:
+            state[0] = max(state[0], 0) + 1
+        if not active and state[0] >= self.failures:
+            return True, float(state[0])
+        if active and -state[0] >= self.recoveries:
+            return False, float(-state[0])
+        return None, float(state[0])
+
+
+class RateOfChangeRule:
+    def __init__(self, name: str, field: str, max_change: float,
+                 window: int = 5, hysteresis: float = 0.8):
+        """
+        Değerin son `window` örnekteki artışı sınırı aştığında tetiklenen kural.
+
+        Args:
+            name: Kural adı
+            field: 'latency' veya 'packet_loss'
+            max_change: İzin verilen en fazla artış (alanın biriminde)
+            window: Karşılaştırılacak örnek sayısı
+            hysteresis: Uyarı, artış `max_change * hysteresis` altına inince kapanır
+        """
+        self.name = name
+        self.field = field
+        self.max_change = max_change
+        self.clear_change = max_change * hysteresis
+        self.window = window
+
+    def new_state(self) -> _Window:
+        return _Window(self.window)
+
+    def update(self, state: _Window, latency: Optional[float], packet_loss: float,
+               ok: bool, active: bool) -> Tuple[Optional[bool], float]:
+        value = latency if self.field == 'latency' else packet_loss
+        if value is None:
+            return None, 0.0
+        full = state.count == len(state.values)
+        oldest = state.values[state.index] if full else None
+        state.push(value)
+        if oldest is None:
+            return None, 0.0
+        change = value - oldest
+        if not active and change > self.max_change:
+            return True, change
+        if active and change <= self.clear_change:
+            return False, change
+        return None, change
+
+
+class _RuleState:
+    __slots__ = ('data', 'active', 'notified', 'last_notified')
+
+    def __init__(self, data):
+        self.data = data
+        self.active = False
+        self.notified = False
+        self.last_notified = float('-inf')
+
+
+class AlertEngine:
+    def __init__(self, rules: Sequence, cooldown: float = 300.0):
+        """
+        Her yeni örnekte kuralları artımlı olarak değerlendirir.
+
+        Hedef ve kural başına durum sabit boyutludur; geçmiş yeniden
+        taranmaz, örnek başına maliyet kural sayısıyla doğrusaldır.
+
+        Args:
+            rules: Değerlendirilecek kurallar
+            cooldown: Aynı hedef ve kural için iki bildirim arasındaki en kısa süre (saniye)
+        """
+        self.rules = list(rules)
+        self.cooldown = cooldown
+        self._states: Dict[str, List[_RuleState]] = {}
+        self.evaluations = 0
+        self.suppressed = 0
+
+    def evaluate(
+        self,
+        target: str,
+        timestamp: float,
+        latency: Optional[float],
+        packet_loss: float,
+        ok: bool
+    ) -> List[Alert]:
+        """
+        Örneği tüm kurallara uygular.
+
+        Args:
+            target: Hedef adresi
+            timestamp: Örnek zamanı (Unix zamanı, saniye)
+            latency: Gecikme (ms), ölçülemediyse None
+            packet_loss: Paket kaybı (%)
+            ok: Kontrol başarılı mı
+
+        Returns:
+            Bildirilecek durum değişiklikleri
+        """
+        states = self._states.get(target)
+        if states is None:
+            states = self._states[target] = [_RuleState(rule.new_state()) for rule in self.rules]
+
+        alerts: List[Alert] = []
+        for rule, state in zip(self.rules, states):
+            decision, value = rule.update(state.data, latency, packet_loss, ok, state.active)
+            if decision is None:
+                continue
+            state.active = decision
+            if decision:
+                if timestamp - state.last_notified < self.cooldown:
+                    self.suppressed += 1
+                    continue
+                state.notified = True
+                state.last_notified = timestamp
+                alerts.append(Alert(target, rule.name, FIRING, value, timestamp))
+            elif state.notified:
+                # Yalnızca bildirilmiş uyarıların kapanışı bildirilir
+                state.notified = False
+                alerts.append(Alert(target, rule.name, RESOLVED, value, timestamp))
+        self.evaluations += len(self.rules)
+        return alerts
+
+
+class EmailNotifier:
+    def __init__(self, smtp_server: str, smtp_port: int, username: str,
+                 password: str, recipients: List[str]):
+        """
+        Uyarıları e-posta ile gönderir.
+
+        Args:
+            smtp_server: SMTP sunucusu
+            smtp_port: SMTP portu (STARTTLS)
+            username: SMTP kullanıcı adı (gönderen)
+            password: SMTP parolası
+            recipients: Alıcılar
+        """
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.username = username
+        self.password = password
+        self.recipients = recipients
+
+    async def send(self, alert: Alert) -> None:
+        await asyncio.to_thread(self._send, alert)
+
+    def _send(self, alert: Alert) -> None:
+        message = EmailMessage()
+        message['Subject'] = f"[{alert.state.upper()}] {alert.target}: {alert.rule}"
+        message['From'] = self.username
+        message['To'] = ', '.join(self.recipients)
+        message.set_content(
+            f"Hedef: {alert.target}\nKural: {alert.rule}\nDurum: {alert.state}\n"
+            f"Değer: {alert.value:.2f}\nZaman: {alert.timestamp}"
+        )
+        with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30) as smtp:
+            smtp.starttls()
+            smtp.login(self.username, self.password)
+            smtp.send_message(message)
+
+
+class AlertDispatcher:
+    def __init__(self, notifiers: Sequence, max_queue_size: int = 1000):
+        """
+        Uyarıları arka planda bildirim yöntemlerine iletir.
+
+        `submit` hiç beklemez; kuyruk doluysa uyarı atılır. Böylece yavaş
+        bir SMTP sunucusu prob yolunu bloklayamaz.
+
+        Args:
+            notifiers: `async send(alert)` sağlayan bildirim yöntemleri
+            max_queue_size: Bekleyen en fazla uyarı
+        """
+        self.notifiers = list(notifiers)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, alert: Alert) -> bool:
+        """Uyarıyı kuyruğa ekler; kuyruk doluysa False döner."""
+        logger.warning(f"Uyarı {alert.state}: {alert.target} {alert.rule} ({alert.value:.2f})")
+        try:
+            self._queue.put_nowait(alert)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    async def _run(self) -> None:
+        while True:
+            alert = await self._queue.get()
+            try:
+                await self._deliver(alert)
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, alert: Alert) -> None:
+        for notifier in self.notifiers:
+            try:
+                await notifier.send(alert)
+                self.sent += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Bildirim gönderme hatası: {str(e)}")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Kuyruktaki uyarıları gönderir ve arka plan görevini durdurur."""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self._queue.qsize()} uyarı gönderilemeden kapatıldı")
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,655 @@
+import collections
+import gzip
+import logging
+import math
+import multiprocessing
+import os
+import re
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .capture import (BLOCK_RECORDS, BLOCK_TARGETS, CODEC_ZLIB, capture_created, iter_blocks,
+                      record_dtype)
+from .probe_result import Status
+
+logger = logging.getLogger(__name__)
+
+# Gecikme yüzdelikleri için logaritmik kutular (DDSketch eşlemesi, yoğun dizi)
+RELATIVE_ACCURACY = 0.01
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+_MIN_INDEX = math.ceil(math.log(0.01) / _LOG_GAMMA)  # 0.01 ms
+_MAX_INDEX = math.ceil(math.log(100_000.0) / _LOG_GAMMA)  # 100 sn
+HISTOGRAM_BINS = _MAX_INDEX - _MIN_INDEX + 1
+
+HOURS = 24
+_NS = 10**9
+
+# Bir görev: ('capture', dosya, [(sıkıştırma, kayıt sayısı, konum, uzunluk)], hedef eşlemesi),
+# ('lines', line protocol parçası, hedef etiketi eşlemesi) ya da ('records', kayıt dizisi)
+Task = Tuple
+
+
+def weights(target_id: np.ndarray, time_ns: np.ndarray, interval: np.ndarray) -> np.ndarray:
+    """
+    Hedef ve zamana göre sıralı örneklerin temsil ettiği süreleri (saniye) hesaplar.
+
+    Örneğin `interval` alanı varsa o kullanılır; yoksa aynı hedefin önceki
+    örneğine, o da yoksa sonraki örneğine olan uzaklık, hiçbiri yoksa 1 sn.
+    """
+    same = target_id[1:] == target_id[:-1]
+    gaps = np.diff(time_ns).astype(np.float64) / _NS
+    backward = np.full(len(time_ns), np.nan)
+    forward = np.full(len(time_ns), np.nan)
+    backward[1:] = np.where(same, gaps, np.nan)
+    forward[:-1] = np.where(same, gaps, np.nan)
+    fallback = np.where(np.isnan(backward), np.where(np.isnan(forward), 1.0, forward), backward)
+    result = np.where(np.isfinite(interval) & (interval > 0), interval, fallback)
+    return np.maximum(result, 0.0)
+
+
+def mos(latency: np.ndarray, jitter: np.ndarray, packet_loss: np.ndarray) -> np.ndarray:
+    """
+    Basitleştirilmiş ITU-T G.107 E-modeliyle ses kalitesi (MOS, 1-4.5) tahmini.
+
+    Etkin gecikme = gecikme + 2 × titreşim + 10 ms; R = 93.2 - gecikme cezası - 2.5 × kayıp.
+
+    Args:
+        latency: Ortalama gidiş-dönüş gecikmesi (ms)
+        jitter: Ortalama titreşim (ms)
+        packet_loss: Paket kaybı (%)
+    """
+    effective = latency + 2 * jitter + 10
+    r = 93.2 - np.where(effective < 160, effective / 40, (effective - 120) / 10) - 2.5 * packet_loss
+    r = np.clip(r, 0, 100)
+    return np.clip(1 + 0.035 * r + 7e-6 * r * (r - 60) * (100 - r), 1.0, 4.5)
+
+
+class ChunkSummary:
+    __slots__ = (
+        'count', 'weight', 'ok_weight', 'loss_weight', 'latency_sum', 'latency_count',
+        'jitter_sum', 'jitter_count', 'histogram', 'hour_weight', 'hour_ok_weight',
+        'hour_latency_sum', 'hour_latency_count', 'first_time', 'last_time', 'last_end',
+        'first_latency', 'last_latency', 'runs'
+    )
+
+    def __init__(self, targets: int):
+        """
+        Bir veri parçasının hedef başına birleştirilebilir özeti.
+
+        Sayaçlar hedef kimliğiyle indekslenen dizilerdir; iki özet dizileri
+        toplanarak birleştirilir. Parça sınırındaki durum (ilk/son örnek ve
+        başarısız örnek dizileri) kesintilerin ve titreşimin parçalar
+        arasında sürmesi için ayrıca tutulur.
+
+        Args:
+            targets: Hedef sayısı
+        """
+        self.count = np.zeros(targets, dtype=np.int64)
+        self.weight = np.zeros(targets)
+        self.ok_weight = np.zeros(targets)
+        self.loss_weight = np.zeros(targets)
+        self.latency_sum = np.zeros(targets)
+        self.latency_count = np.zeros(targets, dtype=np.int64)
+        self.jitter_sum = np.zeros(targets)
+        self.jitter_count = np.zeros(targets, dtype=np.int64)
+        # Seyrek gecikme histogramı: (hedef × HISTOGRAM_BINS + kutu, sayı)
+        self.histogram = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        self.hour_weight = np.zeros((targets, HOURS))
+        self.hour_ok_weight = np.zeros((targets, HOURS))
+        self.hour_latency_sum = np.zeros((targets, HOURS))
+        self.hour_latency_count = np.zeros((targets, HOURS), dtype=np.int64)
+        self.first_time = np.full(targets, -1, dtype=np.int64)
+        self.last_time = np.full(targets, -1, dtype=np.int64)
+        self.last_end = np.full(targets, -1, dtype=np.int64)
+        self.first_latency = np.full(targets, np.nan)
+        self.last_latency = np.full(targets, np.nan)
+        # Başarısız örnek dizileri: hedef, başlangıç, bitiş (ilk OK örneğin zamanı,
+        # parça sonuna kadar sürüyorsa -1), parçanın ilk örneğiyle mi başlıyor
+        self.runs = (np.empty(0, dtype=np.int64),) * 3 + (np.empty(0, dtype=bool),)
+
+
+def summarize(records: np.ndarray, targets: Optional[int] = None,
+              utc_offset: float = 0.0) -> ChunkSummary:
+    """
+    Kayıt parçasını tüm dizi üzerinde NumPy işlemleriyle özetler.
+
+    Args:
+        records: `target_id`, `time_ns`, `status`, `latency`, `packet_loss` ve
+            `interval` alanlı kayıt dizisi (ör. `capture.record_dtype()`)
+        targets: Hedef sayısı (verilmezse en büyük `target_id` + 1)
+        utc_offset: Günlük desen için saat dilimi farkı (saat)
+    """
+    if targets is None:
+        targets = int(records['target_id'].max()) + 1 if len(records) else 0
+    summary = ChunkSummary(targets)
+    if not len(records):
+        return summary
+
+    order = np.lexsort((records['time_ns'], records['target_id']))
+    target = records['target_id'][order].astype(np.int64)
+    time_ns = records['time_ns'][order].astype(np.int64)
+    ok = records['status'][order] == Status.OK
+    latency = records['latency'][order].astype(np.float64)
+    loss = records['packet_loss'][order].astype(np.float64)
+    weight = weights(target, time_ns, records['interval'][order].astype(np.float64))
+    measured = np.isfinite(latency)
+
+    summary.count = np.bincount(target, minlength=targets)
+    summary.weight = np.bincount(target, weight, minlength=targets)
+    summary.ok_weight = np.bincount(target, weight * ok, minlength=targets)
+    summary.loss_weight = np.bincount(target, weight * loss, minlength=targets)
+    summary.latency_sum = np.bincount(target[measured], latency[measured], minlength=targets)
+    summary.latency_count = np.bincount(target[measured], minlength=targets)
+
+    # Titreşim: aynı hedefin ardışık ölçülen gecikmeleri arasındaki ortalama mutlak fark
+    # (RFC 3550 tahmincisinin beklenen değeri; özyinelemeli filtre vektörleşmez)
+    valid_target, valid_latency = target[measured], latency[measured]
+    pairs = valid_target[1:] == valid_target[:-1]
+    steps = np.abs(np.diff(valid_latency))[pairs]
+    summary.jitter_sum = np.bincount(valid_target[1:][pairs], steps, minlength=targets)
+    summary.jitter_count = np.bincount(valid_target[1:][pairs], minlength=targets)
+
+    positive = valid_latency > 0
+    bins = np.clip(np.ceil(np.log(valid_latency[positive]) / _LOG_GAMMA).astype(np.int64),
+                   _MIN_INDEX, _MAX_INDEX) - _MIN_INDEX
+    flat = np.zeros(len(valid_latency), dtype=np.int64)  # sıfır ve altı en küçük kutuya
+    flat[positive] = bins
+    summary.histogram = np.unique(valid_target * HISTOGRAM_BINS + flat, return_counts=True)
+
+    hour = ((time_ns // _NS + int(utc_offset * 3600)) // 3600 % HOURS).astype(np.int64)
+    cell = target * HOURS + hour
+    size = targets * HOURS
+    summary.hour_weight = np.bincount(cell, weight, minlength=size).reshape(targets, HOURS)
+    summary.hour_ok_weight = np.bincount(cell, weight * ok, minlength=size).reshape(targets, HOURS)
+    summary.hour_latency_sum = np.bincount(cell[measured], latency[measured],
+                                           minlength=size).reshape(targets, HOURS)
+    summary.hour_latency_count = np.bincount(cell[measured], minlength=size).reshape(targets, HOURS)
+
+    # Hedef grupları sıralı dizide ardışıktır
+    starts = np.flatnonzero(np.r_[True, target[1:] != target[:-1]])
+    ends = np.r_[starts[1:], len(target)] - 1
+    present = target[starts]
+    summary.first_time[present] = time_ns[starts]
+    summary.last_time[present] = time_ns[ends]
+    summary.last_end[present] = time_ns[ends] + (weight[ends] * _NS).astype(np.int64)
+    first_measured = np.flatnonzero(np.r_[True, valid_target[1:] != valid_target[:-1]])
+    last_measured = np.r_[first_measured[1:], len(valid_target)] - 1
+    if len(valid_target):
+        summary.first_latency[valid_target[first_measured]] = valid_latency[first_measured]
+        summary.last_latency[valid_target[last_measured]] = valid_latency[last_measured]
+
+    # Başarısız örnek dizileri: dizi, grubun başında ya da bir OK örnekten sonra başlar
+    failed = ~ok
+    group_start = np.zeros(len(target), dtype=bool)
+    group_start[starts] = True
+    group_end = np.zeros(len(target), dtype=bool)
+    group_end[ends] = True
+    run_start = failed & (group_start | np.r_[False, ok[:-1]])
+    run_last = failed & (group_end | np.r_[ok[1:], False])
+    first_index, last_index = np.flatnonzero(run_start), np.flatnonzero(run_last)
+    # Dizinin ardından aynı hedefin OK örneği geliyorsa kesinti onun zamanında biter
+    closed = ~group_end[last_index]
+    run_end = np.full(len(first_index), -1, dtype=np.int64)
+    run_end[closed] = time_ns[last_index[closed] + 1]
+    summary.runs = (target[first_index], time_ns[first_index], run_end, group_start[first_index])
+    return summary
+
+
+# Parçalar arasında toplanan ve sınır durumunu taşıyan alanlar
+_SUMMED = (
+    'count', 'weight', 'ok_weight', 'loss_weight', 'latency_sum', 'latency_count',
+    'jitter_sum', 'jitter_count', 'hour_weight', 'hour_ok_weight', 'hour_latency_sum',
+    'hour_latency_count'
+)
+_EDGES = ('first_time', 'last_time', 'last_end', 'first_latency', 'last_latency')
+
+
+class StabilityAnalyzer:
+    def __init__(self, targets: List[str], utc_offset: float = 0.0):
+        """
+        Parça özetlerini zaman sırasıyla birleştirir ve hedef başına rapor üretir.
+
+        Kesintiler parça sınırlarında birleştirilir: önceki parçanın sonunda
+        süren kesinti, sonraki parçanın başındaki başarısız örneklerle devam eder.
+
+        Args:
+            targets: Hedef adları (`target_id` sırası)
+            utc_offset: Günlük desen için saat dilimi farkı (saat)
+        """
+        # Liste kaynak okundukça büyüyebilir (line protocol); kopyalanmaz
+        self.targets = targets
+        self.utc_offset = utc_offset
+        self.total = ChunkSummary(0)
+        self.histogram = np.zeros((0, HISTOGRAM_BINS), dtype=np.int64)
+        self._open = np.full(0, -1, dtype=np.int64)
+        self._outages: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+
+    def _grow(self, size: int) -> None:
+        grown = ChunkSummary(size)
+        old = len(self._open)
+        for name in _SUMMED + _EDGES:
+            getattr(grown, name)[:old] = getattr(self.total, name)
+        self.total = grown
+        self.histogram = np.vstack([self.histogram,
+                                    np.zeros((size - old, HISTOGRAM_BINS), dtype=np.int64)])
+        self._open = np.r_[self._open, np.full(size - old, -1, dtype=np.int64)]
+
+    def add(self, chunk: ChunkSummary) -> None:
+        """Bir parça özetini (önceki parçalardan sonraki zamana ait) ekler."""
+        size = len(chunk.count)
+        if size > len(self._open):
+            self._grow(size)
+        elif size < len(self._open):
+            padded = ChunkSummary(len(self._open))
+            for name in _SUMMED + _EDGES:
+                getattr(padded, name)[:size] = getattr(chunk, name)
+            padded.histogram, padded.runs = chunk.histogram, chunk.runs
+            chunk = padded
+        total = self.total
+        # Parça sınırındaki titreşim
+        edge = np.isfinite(total.last_latency) & np.isfinite(chunk.first_latency)
+        total.jitter_sum[edge] += np.abs(chunk.first_latency[edge] - total.last_latency[edge])
+        total.jitter_count[edge] += 1
+
+        for name in _SUMMED:
+            getattr(total, name).__iadd__(getattr(chunk, name))
+        cells, counts = chunk.histogram
+        self.histogram.reshape(-1)[cells] += counts
+
+        present = chunk.count > 0
+        total.first_time = np.where(total.first_time < 0, chunk.first_time, total.first_time)
+        total.last_time = np.where(present, chunk.last_time, total.last_time)
+        total.last_end = np.where(present, chunk.last_end, total.last_end)
+        total.last_latency = np.where(np.isfinite(chunk.last_latency), chunk.last_latency,
+                                      total.last_latency)
+
+        run_target, run_start, run_end, leading = chunk.runs
+        open_start = self._open[run_target]
+        # Parçanın ilk örneği OK ise önceki parçadan süren kesinti o örnekte kapanır
+        has_leading = np.zeros(len(self._open), dtype=bool)
+        has_leading[run_target[leading]] = True
+        closing = np.flatnonzero(present & (self._open >= 0) & ~has_leading)
+        self._outages.append((closing, self._open[closing], chunk.first_time[closing]))
+        # Parçanın ilk örneği başarısızsa süren kesinti ilk diziyle devam eder
+        run_start = np.where(leading & (open_start >= 0), open_start, run_start)
+
+        still_open = run_end < 0
+        self._open[present] = -1
+        self._open[run_target[still_open]] = run_start[still_open]
+        self._outages.append((run_target[~still_open], run_start[~still_open],
+                              run_end[~still_open]))
+
+    def outages(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Tüm kesintileri döndürür; veri sonunda süren kesintiler son örneğin
+        temsil ettiği sürenin sonunda kapatılır.
+
+        Returns:
+            (hedef kimliği, başlangıç ns, bitiş ns) dizileri
+        """
+        ids = np.flatnonzero(self._open >= 0)
+        parts = self._outages + [(ids, self._open[ids], self.total.last_end[ids])]
+        return tuple(np.concatenate([part[i] for part in parts]).astype(np.int64) for i in range(3))
+
+    def report(self, min_outage: float = 0.0, longest: int = 5) -> List[Dict[str, Any]]:
+        """
+        Hedef başına kararlılık raporu.
+
+        Args:
+            min_outage: Bundan kısa (saniye) kesintiler sayılmaz
+            longest: Rapora eklenecek en uzun kesinti sayısı
+
+        Returns:
+            Örneği olan her hedef için bir sözlük
+        """
+        total = self.total
+        size = len(self._open)
+        outage_target, outage_start, outage_end = self.outages()
+        duration = (outage_end - outage_start) / _NS
+        keep = duration >= min_outage
+        outage_target, outage_start = outage_target[keep], outage_start[keep]
+        duration = duration[keep]
+        outage_count = np.bincount(outage_target, minlength=size)
+        downtime = np.bincount(outage_target, duration, minlength=size)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            availability = 100.0 * total.ok_weight / total.weight
+            packet_loss = total.loss_weight / total.weight
+            latency = total.latency_sum / total.latency_count
+            jitter = total.jitter_sum / total.jitter_count
+            mtbf = np.where(outage_count > 0, total.ok_weight / outage_count, np.nan)
+            mttr = np.where(outage_count > 0, downtime / outage_count, np.nan)
+            hourly_availability = 100.0 * total.hour_ok_weight / total.hour_weight
+            hourly_latency = total.hour_latency_sum / total.hour_latency_count
+        score = mos(latency, np.nan_to_num(jitter), packet_loss)
+        percentiles = quantiles(self.histogram, (0.5, 0.95, 0.99))
+        # Kesintiler hedefe, sonra süreye (uzundan kısaya) göre sıralanır
+        order = np.lexsort((-duration, outage_target))
+        first_outage = np.searchsorted(outage_target[order], np.arange(size))
+
+        reports = []
+        for index in np.flatnonzero(total.count):
+            first = first_outage[index]
+            ranked = order[first:first + min(longest, outage_count[index])]
+            reports.append({
+                'target': self.targets[index],
+                'samples': int(total.count[index]),
+                'start': _iso(total.first_time[index]),
+                'end': _iso(total.last_end[index]),
+                'availability': _round(availability[index], 4),
+                'outages': int(outage_count[index]),
+                'downtime': _round(downtime[index], 3),
+                'mtbf': _round(mtbf[index], 1),
+                'mttr': _round(mttr[index], 3),
+                'latency_mean': _round(latency[index], 3),
+                'latency_p50': _round(percentiles[index, 0], 3),
+                'latency_p95': _round(percentiles[index, 1], 3),
+                'latency_p99': _round(percentiles[index, 2], 3),
+                'jitter': _round(jitter[index], 3),
+                'packet_loss': _round(packet_loss[index], 4),
+                'mos': _round(score[index], 2),
+                'worst_hour': _worst_hour(hourly_availability[index], hourly_latency[index]),
+                'hourly_availability': [_round(value, 3) for value in hourly_availability[index]],
+                'hourly_latency': [_round(value, 3) for value in hourly_latency[index]],
+                'longest_outages': [
+                    {'start': _iso(outage_start[i]), 'duration': _round(duration[i], 3)}
+                    for i in ranked
+                ]
+            })
+        return reports
+
+
+def quantiles(histogram: np.ndarray, qs: Sequence[float]) -> np.ndarray:
+    """
+    Hedef başına gecikme histogramlarından yaklaşık yüzdelikleri hesaplar
+    (en fazla `RELATIVE_ACCURACY` göreli hata).
+
+    Returns:
+        (hedef sayısı, len(qs)) boyutlu dizi; örneği olmayan hedeflerde NaN
+    """
+    cumulative = histogram.cumsum(axis=1)
+    counts = cumulative[:, -1] if histogram.shape[1] else np.zeros(len(histogram))
+    result = np.full((len(histogram), len(qs)), np.nan)
+    present = counts > 0
+    for column, q in enumerate(qs):
+        rank = q * (counts[present] - 1)
+        index = (cumulative[present] > rank[:, None]).argmax(axis=1) + _MIN_INDEX
+        result[present, column] = 2 * _GAMMA ** index / (_GAMMA + 1)
+    return result
+
+
+def _round(value: float, digits: int) -> Optional[float]:
+    return None if not np.isfinite(value) else round(float(value), digits)
+
+
+def _iso(time_ns: int) -> str:
+    return str(np.datetime_as_string(np.datetime64(int(time_ns), 'ns'), unit='s', timezone='UTC'))
+
+
+def _worst_hour(availability: np.ndarray, latency: np.ndarray) -> Optional[int]:
+    """Erişilebilirliği en düşük, eşitlikte gecikmesi en yüksek saat."""
+    observed = np.isfinite(availability)
+    if not observed.any():
+        return None
+    candidates = np.where(observed, availability, np.inf)
+    worst = np.flatnonzero(candidates == candidates.min())
+    return int(worst[np.argmax(np.nan_to_num(latency[worst], nan=-np.inf))])
+
+
+def _read_blocks(path: str, blocks: List[Tuple[int, int, int, int]],
+                 mapping: np.ndarray) -> np.ndarray:
+    """Kayıt dosyasının verilen bloklarını okur ve hedef kimliklerini ortak sözlüğe çevirir."""
+    dtype = record_dtype()
+    parts = []
+    with open(path, 'rb') as f:
+        for codec, count, offset, length in blocks:
+            f.seek(offset)
+            payload = f.read(length)
+            if codec == CODEC_ZLIB:
+                payload = zlib.decompress(payload)
+            parts.append(np.frombuffer(payload, dtype=dtype, count=count))
+    records = np.concatenate(parts) if len(parts) > 1 else parts[0].copy()
+    records['target_id'] = mapping[records['target_id']]
+    return records
+
+
+def _capture_tasks(path: str, targets: List[str], index: Dict[str, int],
+                   chunk_records: int) -> Iterator[Task]:
+    mapping: List[int] = []
+    blocks: List[Tuple[int, int, int, int]] = []
+    pending = 0
+    with open(path, 'rb') as f:
+        for kind, codec, count, offset, length in iter_blocks(path):
+            if kind == BLOCK_TARGETS:
+                f.seek(offset)
+                for name in f.read(length).decode().split('\n'):
+                    if name not in index:
+                        index[name] = len(targets)
+                        targets.append(name)
+                    mapping.append(index[name])
+            elif kind == BLOCK_RECORDS:
+                blocks.append((codec, count, offset, length))
+                pending += count
+                if pending >= chunk_records:
+                    yield ('capture', path, blocks, np.array(mapping, dtype=np.uint32))
+                    blocks, pending = [], 0
+    if blocks:
+        yield ('capture', path, blocks, np.array(mapping, dtype=np.uint32))
+
+
+# Line protocol parçaları satır satır değil, tüm parça üzerinde NumPy ile
+# çözülür: satırlar sabit genişlikli bayt matrisine dönüştürülür, kaçışsız
+# boşluk ve virgül konumları maske olarak, alan konumları `np.char.find` ile
+# bulunur ve değerler tek bir dizinleme ile sütunlara kopyalanır.
+_LP_PREFIX = b'network_metrics,'
+_LP_UNESCAPE = re.compile(rb'\\([ ,=])')
+_STATUS_CODES = {status.name.encode(): int(status) for status in Status}
+# Parça boyu kayıt sayısından bu ortalama satır uzunluğuyla tahmin edilir (bayt)
+_LP_LINE_BYTES = 100
+# Bellek sınırı için parçalar bu kadar satırlık gruplar halinde çözülür
+_LP_BATCH = 65536
+
+
+class _LineBatch:
+    __slots__ = ('lines', 'matrix', 'boundary', 'tags_end', 'fields_end', 'timed')
+
+    def __init__(self, lines: np.ndarray):
+        """`network_metrics` satırlarının bayt matrisi ve bölüm sınırları."""
+        self.lines = lines
+        width = lines.dtype.itemsize
+        self.matrix = lines.view(np.uint8).reshape(len(lines), width)
+        escaped = np.zeros(self.matrix.shape, dtype=bool)
+        escaped[:, 1:] = self.matrix[:, :-1] == ord('\\')
+        space = (self.matrix == ord(' ')) & ~escaped
+        self.boundary = space | ((self.matrix == ord(',')) & ~escaped)
+        columns = np.arange(width)
+        # Etiketler ilk, alanlar ikinci kaçışsız boşluğa kadar sürer; ardından zaman gelir
+        self.tags_end = space.argmax(axis=1)
+        second = space & (columns > self.tags_end[:, None])
+        self.fields_end = second.argmax(axis=1)
+        self.timed = second.any(axis=1)
+
+    def _slice(self, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+        rows, width = self.matrix.shape
+        size = max(int((end - start).max()), 1) if rows else 1
+        index = start[:, None] + np.arange(size)
+        values = np.where(index < end[:, None],
+                          self.matrix[np.arange(rows)[:, None], np.minimum(index, width - 1)], 0)
+        return values.astype(np.uint8).view(f'S{size}').reshape(rows)
+
+    def tag(self, key: bytes) -> np.ndarray:
+        """Etiket değerleri (kaçışlı ham baytlar); etiket yoksa boş."""
+        start = np.char.find(self.lines, b',' + key + b'=', 0, self.tags_end)
+        found = start >= 0
+        start = np.where(found, start + len(key) + 2, 0)
+        after = self.boundary & (np.arange(self.matrix.shape[1]) >= start[:, None])
+        end = np.where(found, after.argmax(axis=1), 0)
+        return self._slice(start, end)
+
+    def field(self, key: bytes, default: bytes) -> np.ndarray:
+        """Sayısal alan değerleri; alan yoksa `default`."""
+        start, end = self.tags_end, self.fields_end
+        first = np.char.find(self.lines, b' ' + key + b'=', start, end)
+        other = np.char.find(self.lines, b',' + key + b'=', start, end)
+        first = np.where((other >= 0) & ((first < 0) | (other < first)), other, first)
+        found = first >= 0
+        first = np.where(found, first + len(key) + 2, 0)
+        last = np.char.find(self.lines, b',', first, end)
+        last = np.where(found, np.where(last < 0, end, last), 0)
+        values = self._slice(first, last)
+        return np.where(values == b'', default, values).astype(np.float64)
+
+    def time_ns(self) -> np.ndarray:
+        return self._slice(self.fields_end + 1, np.char.str_len(self.lines)).astype(np.int64)
+
+
+def _line_batches(data: bytes) -> Iterator[_LineBatch]:
+    if b'\r' in data:
+        data = data.replace(b'\r\n', b'\n')
+    lines = np.array(data.split(b'\n'), dtype=bytes)
+    lines = lines[np.char.startswith(lines, _LP_PREFIX)]
+    for start in range(0, len(lines), _LP_BATCH):
+        batch = _LineBatch(lines[start:start + _LP_BATCH])
+        if not batch.timed.all():
+            # Zaman damgası olmayan satırlar atlanır
+            batch = _LineBatch(batch.lines[batch.timed])
+        if len(batch.lines):
+            yield batch
+
+
+def _line_protocol_targets(data: bytes) -> List[bytes]:
+    """Parçadaki ham (kaçışlı) hedef etiketleri, ilk görülme sırasıyla."""
+    names: List[bytes] = []
+    for batch in _line_batches(data):
+        unique, first = np.unique(batch.tag(b'target'), return_index=True)
+        names.extend(unique[np.argsort(first)].tolist())
+    return list(dict.fromkeys(names))
+
+
+def _parse_line_protocol(data: bytes, names: Dict[bytes, int]) -> np.ndarray:
+    """
+    Tam satırlardan oluşan line protocol parçasını kayıt dizisine çevirir.
+
+    Args:
+        data: Parça (satır sonuyla biten)
+        names: Parçadaki ham (kaçışlı) hedef etiketi -> ortak hedef kimliği
+    """
+    parts = []
+    for batch in _line_batches(data):
+        records = np.zeros(len(batch.lines), dtype=record_dtype())
+        records['time_ns'] = batch.time_ns()
+        # Eşleme ve durum kodları yalnızca tekil değerler için çözülür
+        target, inverse = np.unique(batch.tag(b'target'), return_inverse=True)
+        records['target_id'] = np.array([names[name] for name in target.tolist()],
+                                        dtype=np.uint32)[inverse]
+        status, inverse = np.unique(batch.tag(b'status'), return_inverse=True)
+        codes = [_STATUS_CODES.get(name, int(Status.ERROR)) for name in status.tolist()]
+        records['status'] = np.array(codes, dtype=np.uint8)[inverse]
+        records['latency'] = batch.field(b'latency', b'nan')
+        records['packet_loss'] = batch.field(b'packet_loss', b'0')
+        records['schedule_lag'] = batch.field(b'schedule_lag', b'nan')
+        records['interval'] = batch.field(b'interval', b'nan')
+        parts.append(records)
+    if not parts:
+        return np.zeros(0, dtype=record_dtype())
+    return np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+
+def _line_protocol_tasks(path: str, targets: List[str], index: Dict[str, int],
+                         chunk_records: int) -> Iterator[Task]:
+    """
+    `network_metrics` line protocol dışa aktarımını (ör. `influxd inspect export-lp`,
+    `.gz` olabilir) satır sınırında bölünmüş ham parçalara ayırır; diğer ölçümler
+    atlanır. Sütunlar çalışan süreçlerde çözülür; burada yalnızca hedef etiketi
+    sütunu okunur ve parçadaki yeni hedef adlarına ortak kimlik verilir.
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    size = max(chunk_records * _LP_LINE_BYTES, 1)
+    rest = b''
+    with opener(path, 'rb') as f:
+        while True:
+            block = f.read(size)
+            data = rest + block
+            if block:
+                cut = data.rfind(b'\n') + 1
+                data, rest = data[:cut], data[cut:]
+            elif data and not data.endswith(b'\n'):
+                data += b'\n'
+            if data:
+                names = dict.fromkeys(_line_protocol_targets(data))
+                for name in names:
+                    decoded = _LP_UNESCAPE.sub(rb'\1', name).decode('utf-8')
+                    target_id = index.get(decoded)
+                    if target_id is None:
+                        target_id = index[decoded] = len(targets)
+                        targets.append(decoded)
+                    names[name] = target_id
+                if names:
+                    yield ('lines', data, names)
+            if not block:
+                return
+
+
+def iter_tasks(paths: Sequence[str], targets: List[str],
+               chunk_records: int = 2_000_000) -> Iterator[Task]:
+    """
+    Kaynak dosyalarını zaman sırasıyla parça görevlerine böler.
+
+    Kayıt dosyaları (`.nmcap`) oluşturulma zamanına göre, diğerleri line
+    protocol olarak okunur. Hedef adları okundukça `targets` listesine eklenir.
+    """
+    index = {name: i for i, name in enumerate(targets)}
+    captures = sorted((path for path in paths if path.endswith('.nmcap')), key=capture_created)
+    for path in captures:
+        yield from _capture_tasks(path, targets, index, chunk_records)
+    for path in paths:
+        if not path.endswith('.nmcap'):
+            yield from _line_protocol_tasks(path, targets, index, chunk_records)
+
+
+def _summarize_task(task: Task, utc_offset: float) -> ChunkSummary:
+    if task[0] == 'capture':
+        records = _read_blocks(*task[1:])
+    elif task[0] == 'lines':
+        records = _parse_line_protocol(*task[1:])
+    else:
+        records = task[1]
+    return summarize(records, utc_offset=utc_offset)
+
+
+def analyze(paths: Sequence[str], processes: int = 0, chunk_records: int = 2_000_000,
+            utc_offset: float = 0.0) -> StabilityAnalyzer:
+    """
+    Kayıt dosyalarını ve line protocol dışa aktarımlarını parçalar halinde
+    birden fazla süreçte özetler ve zaman sırasıyla birleştirir.
+
+    Bellekte aynı anda en fazla 2 × `processes` parça bulunur.
+
+    Args:
+        paths: `.nmcap` kayıtları ve/veya `network_metrics` line protocol dosyaları
+        processes: Süreç sayısı (0 = CPU sayısı, 1 = bu süreçte)
+        chunk_records: Parça başına en fazla örnek
+        utc_offset: Günlük desen için saat dilimi farkı (saat)
+    """
+    targets: List[str] = []
+    analyzer = StabilityAnalyzer(targets, utc_offset)
+    tasks = iter_tasks(paths, targets, chunk_records)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        for task in tasks:
+            analyzer.add(_summarize_task(task, utc_offset))
+        return analyzer
+
+    # Sonuçlar görev sırasıyla birleştirilir; sınırlı pencere belleği sınırlar
+    with multiprocessing.get_context('spawn').Pool(processes) as pool:
+        window: collections.deque = collections.deque()
+        for task in tasks:
+            window.append(pool.apply_async(_summarize_task, (task, utc_offset)))
+            if len(window) >= 2 * processes:
+                analyzer.add(window.popleft().get())
+        while window:
+            analyzer.add(window.popleft().get())
+    return analyzer
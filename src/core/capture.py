@@ -0,0 +1,514 @@
+import asyncio
+import logging
+import math
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .probe_result import ProbeResult, Status
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b'NMCAP\x00\r\n'
+CAPTURE_VERSION = 1
+CAPTURE_SUFFIX = '.nmcap'
+
+# Blok tipleri
+BLOCK_TARGETS = 1  # yeni hedef adları (UTF-8, satır sonuyla ayrılmış); kimlikler sırayla artar
+BLOCK_RECORDS = 2  # sabit genişlikli sonuç kayıtları
+
+# Blok sıkıştırması
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODECS = {'none': CODEC_NONE, 'zlib': CODEC_ZLIB}
+
+# Dosya başlığı: sihirli sayı, sürüm, kayıt boyutu, oluşturulma zamanı (ns)
+_FILE_HEADER = struct.Struct('<8sHHq')
+# Blok başlığı: tip, sıkıştırma, kayıt sayısı, yük uzunluğu, ham yükün CRC32'si
+_BLOCK_HEADER = struct.Struct('<BBxxIII')
+# Sonuç kaydı: zaman (ns), hedef kimliği, durum, gecikme, kayıp, zamanlama gecikmesi, aralık
+# Ölçülemeyen değerler NaN yazılır
+_RECORD = struct.Struct('<qIBffff')
+RECORD_FIELDS = (
+    ('time_ns', '<i8'),
+    ('target_id', '<u4'),
+    ('status', 'u1'),
+    ('latency', '<f4'),
+    ('packet_loss', '<f4'),
+    ('schedule_lag', '<f4'),
+    ('interval', '<f4')
+)
+
+_NAN = float('nan')
+
+
+def record_dtype() -> 'np.dtype':
+    """Kayıtların NumPy tipi (hizalamasız; dosyadaki düzenle birebir)."""
+    import numpy as np
+    return np.dtype(list(RECORD_FIELDS))
+
+
+def _optional(value: Optional[float]) -> float:
+    return _NAN if value is None else value
+
+
+class CaptureWriter:
+    def __init__(
+        self,
+        path: str,
+        codec: str = 'zlib',
+        block_records: int = 4096,
+        level: int = 1,
+        max_bytes: int = 0,
+        flush_interval: float = 5.0,
+        max_pending_blocks: int = 8
+    ):
+        """
+        Prob sonuçlarını sıkıştırılmış bloklar halinde kayıt dosyasına yazar.
+
+        Sonuçlar sabit genişlikli kayıtlar olarak bellekte biriktirilir ve
+        `block_records` kayıtta bir (ya da `flush` ile) tek blok olarak yazılır;
+        sonuç başına maliyet bir `struct.pack` çağrısıdır ve numpy gerekmez.
+        Dolan bloklar sıkıştırılıp yazılmak üzere yazıcı iş parçacığına
+        devredilir; `append` olay döngüsünde zlib ya da dosya işlemi yapmaz.
+        Hedef adları yalnızca ilk görüldüklerinde hedef bloğuna yazılır.
+        `max_bytes` aşılınca aynı dizinde yeni bir dosyaya geçilir.
+
+        Args:
+            path: Kayıt dosyası; döndürülen dosyalar `-1`, `-2` ... ekiyle adlandırılır
+            codec: Blok sıkıştırması, `zlib` veya `none` (memmap ile sıfır kopya okuma)
+            block_records: Blok başına kayıt sayısı
+            level: zlib sıkıştırma düzeyi (1 = en hızlı)
+            max_bytes: Dosya döndürme boyutu (bayt, 0 = döndürme yok)
+            flush_interval: Dolmayan bloğun en geç yazılma aralığı (saniye); hattın
+                düzenli `flush` çağrısı içindir
+            max_pending_blocks: Yazılmayı bekleyen en fazla blok; disk yetişemezse
+                `append` yer açılana kadar bekler
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Bilinmeyen kayıt sıkıştırması: {codec}")
+        self.path = path
+        self.codec = CODECS[codec]
+        self.block_records = block_records
+        self.level = level
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._count = 0
+        self._targets: Dict[str, int] = {}
+        self._new_targets: List[str] = []
+        self._closed = False
+        self._pending: 'queue.Queue[Optional[_Block]]' = queue.Queue(max_pending_blocks)
+        self._thread: Optional[threading.Thread] = None
+
+        # Yalnızca yazıcı iş parçacığında kullanılır
+        self._file: Optional[BinaryIO] = None
+        self._size = 0
+        self._rotations = 0
+        self._written_targets: List[str] = []
+
+        # Sayaçlar
+        self.records = 0
+        self.blocks = 0
+        self.bytes_written = 0
+        self.errors = 0
+
+    @property
+    def current_path(self) -> str:
+        if not self._rotations:
+            return self.path
+        base, suffix = os.path.splitext(self.path)
+        return f'{base}-{self._rotations}{suffix}'
+
+    def _open(self) -> None:
+        path = self.current_path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'wb')
+        self._file.write(_FILE_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, _RECORD.size,
+                                           time.time_ns()))
+        self._size = _FILE_HEADER.size
+
+    def append(self, result: ProbeResult) -> None:
+        """Sonucu bloğa ekler; blok dolduysa yazılmak üzere devreder."""
+        with self._lock:
+            if self._closed:
+                # Kapanış sırasında biten kontroller kapatılan dosyayı yeniden açmasın
+                return
+            target_id = self._targets.get(result.target)
+            if target_id is None:
+                target_id = self._targets[result.target] = len(self._targets)
+                self._new_targets.append(result.target)
+            self._buffer += _RECORD.pack(
+                result.time_ns, target_id, result.status, _optional(result.latency),
+                result.packet_loss, _optional(result.schedule_lag), _optional(result.interval)
+            )
+            self._count += 1
+            if self._count >= self.block_records:
+                self._hand_off()
+
+    def _hand_off(self) -> None:
+        """Bekleyen kayıtları ve yeni hedef adlarını yazıcı iş parçacığına devreder."""
+        block = _Block(self._new_targets, self._buffer, self._count)
+        self._new_targets = []
+        self._buffer = bytearray()
+        self._count = 0
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='capture-writer', daemon=True)
+            self._thread.start()
+        self._pending.put(block)
+
+    def _run(self) -> None:
+        while True:
+            block = self._pending.get()
+            try:
+                if block is None:
+                    return
+                self._write_block(block)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Kayıt dosyası yazma hatası: {str(e)}")
+            finally:
+                self._pending.task_done()
+
+    def _write_block(self, block: '_Block') -> None:
+        new_targets = block.targets
+        if self._file is None:
+            self._open()
+        elif self.max_bytes and self._size >= self.max_bytes:
+            self._file.close()
+            self._rotations += 1
+            self._open()
+            # Hedef kimlikleri dosya başınadır; yeni dosyada sözlük baştan yazılır
+            new_targets = self._written_targets + new_targets
+
+        chunks = []
+        if new_targets:
+            names = '\n'.join(new_targets).encode()
+            chunks.append(self._block(BLOCK_TARGETS, CODEC_NONE, len(new_targets), names))
+            self._written_targets += block.targets
+        if block.count:
+            payload = bytes(block.buffer)
+            if self.codec == CODEC_ZLIB:
+                payload = zlib.compress(payload, self.level)
+            chunks.append(self._block(BLOCK_RECORDS, self.codec, block.count, payload,
+                                      zlib.crc32(block.buffer)))
+            self.records += block.count
+        data = b''.join(chunks)
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+        self.bytes_written += len(data)
+
+    def _block(self, kind: int, codec: int, count: int, payload: bytes,
+               crc: Optional[int] = None) -> bytes:
+        self.blocks += 1
+        if crc is None:
+            crc = zlib.crc32(payload)
+        return _BLOCK_HEADER.pack(kind, codec, count, len(payload), crc) + payload
+
+    def flush(self) -> None:
+        """Bekleyen kayıtları (ve yeni hedef adlarını) yazar ve diske ulaşmalarını bekler."""
+        with self._lock:
+            if self._count or self._new_targets:
+                self._hand_off()
+        self._pending.join()
+
+    def close(self) -> None:
+        """Bekleyen kayıtları yazar, yazıcı iş parçacığını durdurur ve dosyayı kapatır."""
+        self.flush()
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._pending.put(None)
+            thread.join()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _Block:
+    __slots__ = ('targets', 'buffer', 'count')
+
+    def __init__(self, targets: List[str], buffer: bytearray, count: int):
+        self.targets = targets
+        self.buffer = buffer
+        self.count = count
+
+
+def capture_created(path: str) -> int:
+    """Kayıt dosyasının oluşturulma zamanı (Unix zamanı, ns); dosyaları sıralamak için."""
+    with open(path, 'rb') as f:
+        header = f.read(_FILE_HEADER.size)
+    if len(header) < _FILE_HEADER.size or header[:len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+        raise ValueError(f"Kayıt dosyası değil: {path}")
+    return _FILE_HEADER.unpack(header)[3]
+
+
+def iter_blocks(path: str) -> Iterator[Tuple[int, int, int, int, int]]:
+    """
+    Kayıt dosyasındaki blokları sırayla döndürür.
+
+    Yarım kalan son blok (ör. toplayıcı çökmesi) uyarıyla atlanır.
+
+    Yields:
+        (tip, sıkıştırma, kayıt sayısı, yükün dosyadaki konumu, yük uzunluğu)
+    """
+    with open(path, 'rb') as f:
+        header = f.read(_FILE_HEADER.size)
+        if len(header) < _FILE_HEADER.size:
+            raise ValueError(f"Kayıt dosyası değil: {path}")
+        magic, version, record_size, _ = _FILE_HEADER.unpack(header)
+        if magic != CAPTURE_MAGIC:
+            raise ValueError(f"Kayıt dosyası değil: {path}")
+        if version != CAPTURE_VERSION or record_size != _RECORD.size:
+            raise ValueError(f"Desteklenmeyen kayıt sürümü: {version}")
+
+        file_size = os.fstat(f.fileno()).st_size
+        offset = _FILE_HEADER.size
+        while offset + _BLOCK_HEADER.size <= file_size:
+            f.seek(offset)
+            kind, codec, count, length, _ = _BLOCK_HEADER.unpack(f.read(_BLOCK_HEADER.size))
+            offset += _BLOCK_HEADER.size
+            if offset + length > file_size:
+                logger.warning(f"{path}: yarım kalan son blok atlandı")
+                return
+            yield kind, codec, count, offset, length
+            offset += length
+
+
+class CaptureFile:
+    __slots__ = ('path', 'targets', 'records')
+
+    def __init__(self, path: str, targets: List[str], records: 'np.ndarray'):
+        """
+        Belleğe yüklenmiş kayıt dosyası.
+
+        Args:
+            path: Dosya yolu
+            targets: Hedef adları; kayıtlardaki `target_id` bu listedeki sıradır
+            records: `record_dtype()` tipinde kayıt dizisi
+        """
+        self.path = path
+        self.targets = targets
+        self.records = records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def results(self) -> Iterator[ProbeResult]:
+        """Kayıtları `ProbeResult` nesnelerine çevirir (yeniden oynatma ve içe aktarma için)."""
+        for record in self.records.tolist():
+            time_ns, target_id, status, latency, packet_loss, schedule_lag, interval = record
+            result = ProbeResult(
+                self.targets[target_id], Status(status),
+                latency=None if math.isnan(latency) else latency,
+                packet_loss=packet_loss, time_ns=time_ns
+            )
+            result.schedule_lag = None if math.isnan(schedule_lag) else schedule_lag
+            result.interval = None if math.isnan(interval) else interval
+            yield result
+
+
+def load_capture(path: str, verify: bool = True) -> CaptureFile:
+    """
+    Kayıt dosyasını NumPy dizisi olarak yükler.
+
+    Sıkıştırılmamış bloklar `numpy.memmap` ile eşlenir; dosya tek bloktan
+    oluşuyorsa kayıtlar kopyalanmadan diskten okunur. zlib blokları açılıp
+    `numpy.frombuffer` ile çözülür.
+
+    Args:
+        path: Kayıt dosyası
+        verify: Blok CRC32'leri doğrulansın mı (memmap bloklarında tüm yükü okur)
+    """
+    import numpy as np
+
+    dtype = record_dtype()
+    targets: List[str] = []
+    parts = []
+    with open(path, 'rb') as f:
+        for kind, codec, count, offset, length in iter_blocks(path):
+            f.seek(offset - _BLOCK_HEADER.size)
+            crc = _BLOCK_HEADER.unpack(f.read(_BLOCK_HEADER.size))[4]
+            if kind == BLOCK_TARGETS:
+                targets.extend(f.read(length).decode().split('\n'))
+            elif kind == BLOCK_RECORDS:
+                if codec == CODEC_NONE:
+                    records = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+                    raw = records
+                else:
+                    raw = zlib.decompress(f.read(length))
+                    records = np.frombuffer(raw, dtype=dtype, count=count)
+                if verify and zlib.crc32(raw) != crc:
+                    raise ValueError(f"{path}: bozuk blok (konum {offset})")
+                parts.append(records)
+
+    if not parts:
+        records = np.empty(0, dtype=dtype)
+    elif len(parts) == 1:
+        records = parts[0]
+    else:
+        records = np.concatenate(parts)
+    return CaptureFile(path, targets, records)
+
+
+def _is_sorted(values: 'np.ndarray') -> bool:
+    return bool((values[1:] >= values[:-1]).all())
+
+
+def merge_captures(captures: List[CaptureFile]) -> CaptureFile:
+    """
+    Birden fazla kayıt dosyasını (ör. çalışan başına ya da döndürülmüş dosyalar)
+    ortak hedef sözlüğüyle tek bir zaman sıralı kayıt dizisinde birleştirir.
+
+    Kayıtlar tamamlanma sırasıyla yazıldığı için tek bir dosya da gönderim
+    zamanına göre tam sıralı olmayabilir; oynatma öncesi her zaman bu işlevden
+    geçirilmelidir.
+    """
+    import numpy as np
+
+    if len(captures) == 1 and _is_sorted(captures[0].records['time_ns']):
+        return captures[0]
+    index: Dict[str, int] = {}
+    parts = []
+    for capture in captures:
+        mapping = np.array([index.setdefault(name, len(index)) for name in capture.targets],
+                           dtype=np.uint32)
+        records = np.array(capture.records)
+        records['target_id'] = mapping[records['target_id']]
+        parts.append(records)
+    records = np.concatenate(parts) if parts else np.empty(0, dtype=record_dtype())
+    records = records[np.argsort(records['time_ns'], kind='stable')]
+    return CaptureFile(', '.join(capture.path for capture in captures), list(index), records)
+
+
+async def replay_capture(capture: CaptureFile, data_store, speed: float = 0.0,
+                         retime: bool = False, rollups=None, batch_size: int = 5000) -> int:
+    """
+    Kayıtları veri deposuna yeniden yazar (geriye dönük doldurma ve yük testi).
+
+    Args:
+        capture: Yüklenmiş kayıt dosyası
+        data_store: `store_metrics`/`store_rollups`/`flush` sağlayan veri deposu
+        speed: Oynatma hızı; 1 gerçek zaman, 10 on kat hızlı, 0 beklemeden (en yüksek hız)
+        retime: Zaman damgaları oynatmanın başladığı ana kaydırılsın mı (yük testi);
+            kapalıyken kayıtlar özgün zamanlarıyla yazılır (geriye dönük doldurma)
+        rollups: Verilirse özet pencereleri de bu `RollupAggregator` ile üretilir
+        batch_size: En yüksek hızda bu kadar sonuçta bir deponun boşaltılması beklenir;
+            deponun kuyruğu dolup örnek düşürmesini önler
+
+    Returns:
+        Yazılan sonuç sayısı
+    """
+    if not len(capture):
+        return 0
+    first_ns = int(capture.records['time_ns'][0])
+    offset = time.time_ns() - first_ns if retime else 0
+    started = time.monotonic()
+    count = 0
+    for result in capture.results():
+        if speed > 0:
+            delay = (result.time_ns - first_ns) / 1e9 / speed - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        result.time_ns += offset
+        await data_store.store_metrics(result)
+        if rollups is not None:
+            await data_store.store_rollups(rollups.add(
+                result.target, result.timestamp, result.latency, result.packet_loss, result.ok,
+                result.interval or 1.0
+            ))
+        count += 1
+        if speed <= 0 and count % batch_size == 0:
+            await data_store.flush()
+    if rollups is not None:
+        await data_store.store_rollups(rollups.flush_expired(float('inf')))
+    await data_store.flush()
+    return count
+
+
+class CaptureReplayer:
+    def __init__(self, capture: CaptureFile, speed: float = 1.0, max_batch: int = 65536):
+        """
+        Kayıtları panele canlı sonuç gibi aktarır; `CollectorSupervisor` yerine kullanılır.
+
+        Zaman damgaları oynatmanın başladığı ana kaydırılır. Her `poll` çağrısı
+        son çağrıdan bu yana (hızla çarpılmış) geçen sürede düşen kayıtları
+        döndürür; `active` temizlenince oynatma duraklar.
+
+        Args:
+            capture: Yüklenmiş kayıt dosyası (`target_id` panelin hedef sırasıdır)
+            speed: Oynatma hızı; 1 gerçek zaman, 0 beklemeden (`poll` başına `max_batch` kayıt)
+            max_batch: Tek `poll` çağrısında döndürülecek en fazla kayıt
+        """
+        self.capture = capture
+        self.speed = speed
+        self.max_batch = max_batch
+        self.active = threading.Event()
+        self.missed = 0
+        self._position = 0
+        self._virtual_ns: Optional[int] = None
+        self._last_poll: Optional[float] = None
+        self._offset = 0
+
+    @property
+    def finished(self) -> bool:
+        return self._position >= len(self.capture)
+
+    def start(self) -> None:
+        """Oynatma saatini başlatır (kayıtlar `active` kurulunca akmaya başlar)."""
+        if len(self.capture):
+            first_ns = int(self.capture.records['time_ns'][0])
+            self._virtual_ns = first_ns
+            self._offset = time.time_ns() - first_ns
+        self._last_poll = time.monotonic()
+
+    def poll(self) -> 'np.ndarray':
+        """
+        Oynatma saatine göre zamanı gelen kayıtları döndürür.
+
+        Returns:
+            `shm_ring.RECORD_DTYPE` tipinde kayıt dizisi
+        """
+        import numpy as np
+        from .shm_ring import RECORD_DTYPE
+
+        now = time.monotonic()
+        elapsed, self._last_poll = now - (self._last_poll or now), now
+        if not self.active.is_set() or self.finished or self._virtual_ns is None:
+            return np.empty(0, dtype=RECORD_DTYPE)
+
+        times = self.capture.records['time_ns']
+        if self.speed > 0:
+            self._virtual_ns += int(elapsed * self.speed * 1e9)
+            end = int(np.searchsorted(times, self._virtual_ns, side='right'))
+            end = min(end, self._position + self.max_batch)
+        else:
+            end = min(len(times), self._position + self.max_batch)
+        records = self.capture.records[self._position:end]
+        self._position = end
+
+        out = np.empty(len(records), dtype=RECORD_DTYPE)
+        out['target_id'] = records['target_id']
+        out['status'] = records['status']
+        out['timestamp'] = (records['time_ns'] + self._offset) // 1000
+        out['latency'] = records['latency']
+        out['packet_loss'] = records['packet_loss']
+        return out
+
+    def telemetry_snapshots(self) -> Dict[int, List]:
+        return {}
+
+    def stop(self) -> None:
+        self.active.clear()
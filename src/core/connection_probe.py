@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import socket
+import ssl
+import time
+from typing import Dict, Optional, Tuple, Union
+
+from .probe_result import ProbeResult, Status
+
+logger = logging.getLogger(__name__)
+
+# Prob tipine göre varsayılan portlar
+DEFAULT_PORTS = {'tcp': 80, 'tls': 443}
+
+
+def connection_label(kind: str, host: str, port: Optional[int] = None) -> str:
+    """Bağlantı probunun sonuçlarda kullanılan hedef adı (ör. tls://example.com:443)."""
+    port = port or DEFAULT_PORTS[kind]
+    if ':' in host:
+        host = f'[{host}]'
+    return f'{kind}://{host}:{port}'
+
+
+def _lap(phases: Dict[str, float], name: str, started: float) -> float:
+    now = time.perf_counter()
+    phases[name] = round((now - started) * 1000, 3)  # ms cinsinden
+    return now
+
+
+def _numeric_address(host: str, port: int) -> Optional[Tuple]:
+    """Adres sayısal bir IP ise (aile, adres) döndürür; böylece DNS aşaması atlanır."""
+    try:
+        info = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM, flags=socket.AI_NUMERICHOST)
+    except socket.gaierror:
+        return None
+    return info[0][0], info[0][4]
+
+
+class TcpProbe:
+    def __init__(
+        self,
+        host: str,
+        port: Optional[int] = None,
+        timeout: float = 1.0,
+        tls: bool = False,
+        server_name: Optional[str] = None,
+        verify: bool = True,
+        payload: Optional[Union[str, bytes]] = None,
+        limiter: Optional[asyncio.Semaphore] = None
+    ):
+        """
+        TCP bağlantısı (isteğe bağlı TLS) kurarak bağlantının her aşamasını ölçen prob.
+
+        Aşamalar `dns_ms`, `connect_ms` (SYN→SYN/ACK), `tls_ms` ve
+        `first_byte_ms` alanlarına yazılır; gecikme tüm aşamaların toplam
+        süresidir. Zaman aşımı, reddedilen bağlantı, çözümlenemeyen ad ve
+        TLS hataları FAIL sayılır.
+
+        Args:
+            host: Hedef IP adresi veya alan adı
+            port: Hedef port (varsayılan TCP için 80, TLS için 443)
+            timeout: Tüm aşamalar için toplam süre sınırı (saniye)
+            tls: Bağlantı kurulduktan sonra TLS el sıkışması yapılsın mı
+            server_name: SNI ve sertifika doğrulamasında kullanılacak ad (varsayılan `host`)
+            verify: Sunucu sertifikası doğrulansın mı
+            payload: Bağlantıdan sonra gönderilecek veri; verilirse ilk yanıt
+                baytına kadar geçen süre ölçülür (boş ise yalnızca karşılama beklenir)
+            limiter: Aynı anda yapılabilecek bağlantı denemelerini sınırlayan semafor
+        """
+        kind = 'tls' if tls else 'tcp'
+        self.host = host
+        self.port = port or DEFAULT_PORTS[kind]
+        self.target = connection_label(kind, host, self.port)
+        self.timeout = timeout
+        self.tls = tls
+        self.server_name = server_name or host
+        self.payload = payload.encode() if isinstance(payload, str) else payload
+        self.limiter = limiter
+        self._address = _numeric_address(host, self.port)
+
+        self._ssl_context = None
+        if tls:
+            self._ssl_context = ssl.create_default_context()
+            if not verify:
+                self._ssl_context.check_hostname = False
+                self._ssl_context.verify_mode = ssl.CERT_NONE
+
+    async def perform_check(self) -> ProbeResult:
+        """Tek bir bağlantı kontrolü gerçekleştirir."""
+        if self.limiter is None:
+            return await self._check()
+        async with self.limiter:
+            return await self._check()
+
+    async def _check(self) -> ProbeResult:
+        time_ns, sent_mono = time.time_ns(), time.monotonic_ns()
+        phases: Dict[str, float] = {}
+        try:
+            await asyncio.wait_for(self._connect(phases), self.timeout)
+        except OSError as e:
+            # TimeoutError, socket.gaierror ve ssl.SSLError da OSError'dır
+            return ProbeResult(
+                self.target,
+                Status.FAIL,
+                packet_loss=100.0,
+                time_ns=time_ns,
+                sent_mono=sent_mono,
+                error=str(e) or 'zaman aşımı',
+                extra=phases or None
+            )
+        except Exception as e:
+            logger.error(f"Bağlantı kontrolü sırasında hata: {str(e)}")
+            return ProbeResult(self.target, Status.ERROR, time_ns=time_ns, sent_mono=sent_mono,
+                               error=str(e))
+
+        return ProbeResult(
+            self.target,
+            Status.OK,
+            latency=round((time.monotonic_ns() - sent_mono) / 1e6, 2),  # ms cinsinden
+            packet_loss=0.0,
+            time_ns=time_ns,
+            sent_mono=sent_mono,
+            extra=phases
+        )
+
+    async def _connect(self, phases: Dict[str, float]) -> None:
+        loop = asyncio.get_running_loop()
+        mark = time.perf_counter()
+        if self._address is not None:
+            family, address = self._address
+        else:
+            info = await loop.getaddrinfo(self.host, self.port, type=socket.SOCK_STREAM)
+            family, address = info[0][0], info[0][4]
+            mark = _lap(phases, 'dns_ms', mark)
+
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        writer = None
+        try:
+            sock.setblocking(False)
+            await loop.sock_connect(sock, address)
+            mark = _lap(phases, 'connect_ms', mark)
+            if not self.tls and self.payload is None:
+                return
+
+            reader, writer = await asyncio.open_connection(
+                sock=sock,
+                ssl=self._ssl_context,
+                server_hostname=self.server_name if self.tls else None
+            )
+            if self.tls:
+                mark = _lap(phases, 'tls_ms', mark)
+
+            if self.payload is not None:
+                if self.payload:
+                    writer.write(self.payload)
+                if not await reader.read(1):
+                    raise ConnectionResetError("Bağlantı yanıt gelmeden kapandı")
+                _lap(phases, 'first_byte_ms', mark)
+        finally:
+            # Akış soketi devraldıysa onu kapatmak soketi de kapatır
+            if writer is not None:
+                writer.close()
+            else:
+                sock.close()
@@ -1,10 +1,17 @@
-from datetime import datetime
 import logging
-from typing import Dict, List
-from influxdb_client import InfluxDBClient, Point
-from influxdb_client.client.write_api import ASYNCHRONOUS
-import psycopg2
-from psycopg2.extras import DictCursor
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+from influxdb_client import InfluxDBClient
+from influxdb_client.client.write_api import SYNCHRONOUS
+
+from .event_sink import PostgresEventSink
+from .influx_writer import InfluxBatchWriter, encode_line
+from .probe_result import ProbeResult
+from .rollup import ClosedWindow, resolution_name
+from .spool import KIND_EVENT, KIND_INFLUX, Spool, SpoolReplayer
+from .transitions import TransitionTracker
+
+if TYPE_CHECKING:
+    from .history import HistoryQuery, HistorySeries
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +22,23 @@ class DataStore:
         influx_token: str,
         influx_org: str,
         influx_bucket: str,
-        postgres_dsn: str
+        postgres_dsn: str,
+        batch_size: int = 100,
+        flush_interval: float = 10.0,
+        max_queue_size: int = 10000,
+        drop_policy: str = 'drop_oldest',
+        pg_min_connections: int = 1,
+        pg_max_connections: int = 4,
+        pg_batch_size: int = 500,
+        pg_flush_interval: float = 5.0,
+        pg_retention_days: float = 365,
+        pg_maintenance_interval: float = 3600.0,
+        spool: Optional[Spool] = None,
+        replay_rate: float = 20.0,
+        rollup_resolutions: Sequence[int] = (),
+        history_cache_size: int = 256,
+        history_cache_ttl: float = 300.0,
+        history_settle: float = 30.0
     ):
         """
         Veri depolama sınıfı.
@@ -26,84 +49,163 @@ class DataStore:
             influx_org: InfluxDB organizasyon adı
             influx_bucket: InfluxDB bucket adı
             postgres_dsn: PostgreSQL bağlantı bilgileri
+            batch_size: InfluxDB'ye tek istekte yazılacak en fazla satır
+            flush_interval: InfluxDB yazma aralığı (saniye)
+            max_queue_size: Yazma kuyruğundaki en fazla satır
+            drop_policy: Kuyruk dolduğunda uygulanacak politika
+            pg_min_connections: PostgreSQL havuzundaki en az bağlantı
+            pg_max_connections: PostgreSQL havuzundaki en fazla bağlantı
+            pg_batch_size: Tek seferde yazılacak en fazla olay
+            pg_flush_interval: Olay yazma aralığı (saniye)
+            pg_retention_days: Olayların saklanma süresi (gün, 0 = sınırsız)
+            pg_maintenance_interval: Olay tablosu bölüm bakımı aralığı (saniye, 0 = kapalı)
+            spool: Arka uçlara yazılamayan verilerin saklanacağı disk kuyruğu
+            replay_rate: Spool'dan saniyede geri yazılacak en fazla grup
+            rollup_resolutions: Yazılan özet pencere çözünürlükleri (saniye)
+            history_cache_size: Geçmiş sorgu önbelleğindeki en fazla girdi
+            history_cache_ttl: Önbellek girdisinin baştan sorgulanmadan kullanılabileceği
+                süre (saniye)
+            history_settle: Son bu kadar saniyedeki pencereler önbelleğe alınmaz
         """
-        # InfluxDB bağlantısı
+        # InfluxDB bağlantısı (istek gövdeleri gzip ile sıkıştırılır)
         self.influx_client = InfluxDBClient(
             url=influx_url,
             token=influx_token,
-            org=influx_org
+            org=influx_org,
+            enable_gzip=True
         )
-        self.write_api = self.influx_client.write_api(write_options=ASYNCHRONOUS)
+        self.write_api = self.influx_client.write_api(write_options=SYNCHRONOUS)
         self.influx_bucket = influx_bucket
         self.influx_org = influx_org
 
-        # PostgreSQL bağlantısı
+        # Geçmiş veriler için sorgu ve sonuç önbelleği (ilk sorguda oluşturulur)
+        self.rollup_resolutions = list(rollup_resolutions)
+        self._history_options = {
+            'max_entries': history_cache_size, 'ttl': history_cache_ttl, 'settle': history_settle
+        }
+        self._history: Optional['HistoryQuery'] = None
+        self.writer = InfluxBatchWriter(
+            self.write_api,
+            bucket=influx_bucket,
+            org=influx_org,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            max_queue_size=max_queue_size,
+            drop_policy=drop_policy,
+            spool=spool
+        )
+
+        # PostgreSQL bağlantı havuzu
         self.postgres_dsn = postgres_dsn
-        self.pg_conn = None
+        self.event_sink = PostgresEventSink(
+            postgres_dsn,
+            min_connections=pg_min_connections,
+            max_connections=pg_max_connections,
+            batch_size=pg_batch_size,
+            flush_interval=pg_flush_interval,
+            spool=spool,
+            retention_days=pg_retention_days,
+            maintenance_interval=pg_maintenance_interval
+        )
+        # Olay tablosuna her başarısız örnek yerine yalnızca durum değişimleri yazılır
+        self.transitions = TransitionTracker()
         self._init_postgres()
 
+        # Arka uçlar düzeldiğinde spool'daki veriler sırayla geri yazılır
+        self.spool = spool
+        self.replayer = None
+        if spool is not None:
+            self.replayer = SpoolReplayer(
+                spool,
+                {
+                    KIND_INFLUX: self.writer.send,
+                    KIND_EVENT: self.event_sink.insert_serialized
+                },
+                rate=replay_rate
+            )
+
     def _init_postgres(self):
-        """PostgreSQL tablosunu oluşturur."""
+        """PostgreSQL bağlantı havuzunu açar ve bölümlenmiş olay tablosunu oluşturur."""
         try:
-            with psycopg2.connect(self.postgres_dsn) as conn:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        CREATE TABLE IF NOT EXISTS network_events (
-                            id SERIAL PRIMARY KEY,
-                            timestamp TIMESTAMP WITH TIME ZONE,
-                            target VARCHAR(255),
-                            event_type VARCHAR(50),
-                            details JSONB,
-                            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-                        )
-                    """)
-                conn.commit()
+            self.event_sink.init_schema()
         except Exception as e:
             logger.error(f"PostgreSQL başlatma hatası: {str(e)}")
 
-    async def store_metrics(self, data: Dict):
+    async def store_metrics(self, result: ProbeResult):
         """
         Metrik verilerini InfluxDB'ye kaydeder.
-        Önemli olayları PostgreSQL'e kaydeder.
+        Hedefin durum değişimlerini (ör. OK→FAIL, FAIL→OK) PostgreSQL'e kaydeder.
         """
+        if self.replayer is not None:
+            self.replayer.start()
         try:
-            # InfluxDB'ye metrik kaydetme
-            point = Point("network_metrics")\
-                .tag("target", data['target'])\
-                .tag("status", data['status'])\
-                .field("latency", data.get('latency', 0))\
-                .field("packet_loss", data.get('packet_loss', 0))\
-                .time(datetime.fromisoformat(data['timestamp']))
-
-            if 'cpu_usage' in data:
-                point = point.field("cpu_usage", data['cpu_usage'])
-            if 'memory_usage' in data:
-                point = point.field("memory_usage", data['memory_usage'])
-
-            self.write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=point)
-
-            # Önemli olayları PostgreSQL'e kaydet
-            if data['status'] != 'OK':
-                with psycopg2.connect(self.postgres_dsn) as conn:
-                    with conn.cursor() as cur:
-                        cur.execute("""
-                            INSERT INTO network_events 
-                            (timestamp, target, event_type, details)
-                            VALUES (%s, %s, %s, %s)
-                        """, (
-                            datetime.fromisoformat(data['timestamp']),
-                            data['target'],
-                            data['status'],
-                            data
-                        ))
-                    conn.commit()
+            # InfluxDB'ye metrik kaydetme (toplu yazıcı kuyruğuna)
+            await self.writer.write(result.to_line())
+
+            # Durum değişimlerini PostgreSQL'e kaydet (toplu olay yazıcısına)
+            transition = self.transitions.update(result)
+            if transition is not None:
+                await self.event_sink.write_event(*transition)
 
         except Exception as e:
             logger.error(f"Veri kaydetme hatası: {str(e)}")
 
+    async def store_rollups(self, windows: List[ClosedWindow]):
+        """
+        Kapanan özet pencerelerini çözünürlüğe göre ayrı ölçümler olarak
+        kaydeder (ör. network_metrics_1m).
+        """
+        for target, resolution, window in windows:
+            try:
+                await self.writer.write(encode_line(
+                    f'network_metrics_{resolution_name(resolution)}',
+                    {'target': target},
+                    window.fields(),
+                    window.start * 10**9
+                ))
+            except Exception as e:
+                logger.error(f"Özet kaydetme hatası: {str(e)}")
+
+    async def write_line(self, line: str) -> bool:
+        """Hazır line protocol satırını (ör. sunucu metrikleri) yazma kuyruğuna ekler."""
+        return await self.writer.write(line)
+
+    @property
+    def history(self) -> 'HistoryQuery':
+        """Geçmiş sorgu nesnesi; numpy'ı yüklediği için ilk kullanımda oluşturulur."""
+        if self._history is None:
+            from .history import HistoryQuery, InfluxHistorySource
+            self._history = HistoryQuery(
+                InfluxHistorySource(self.influx_client.query_api(), self.influx_bucket,
+                                    self.influx_org, self.rollup_resolutions),
+                **self._history_options
+            )
+        return self._history
+
+    def query_history(self, target: str, start: float, end: float,
+                      points: int = 100) -> Tuple['HistorySeries', int]:
+        """
+        Geçmiş verileri grafik genişliğine indirgenmiş olarak okur (bkz. `HistoryQuery.query`).
+        Engelleyen bir çağrıdır; olay döngüsünden `asyncio.to_thread` ile çağrılmalıdır.
+        """
+        return self.history.query(target, start, end, points)
+
+    async def flush(self):
+        """Bekleyen InfluxDB satırlarını ve PostgreSQL olaylarını hemen yazar."""
+        await self.writer.flush()
+        await self.event_sink.flush()
+
+    async def stop(self):
+        """Arka plan yazıcılarını durdurur; bekleyen verileri yazar."""
+        if self.replayer is not None:
+            await self.replayer.stop()
+        await self.writer.stop()
+        await self.event_sink.stop()
+
     def close(self):
         """Veritabanı bağlantılarını kapatır."""
         if self.influx_client:
             self.influx_client.close()
-        if self.pg_conn:
-            self.pg_conn.close() 
\ No newline at end of file
+        self.event_sink.close()
+        if self.spool is not None:
+            self.spool.close() 
\ No newline at end of file
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import random
+import socket
+import struct
+import time
+from typing import Optional, Tuple
+
+from .probe_result import ProbeResult, Status
+
+logger = logging.getLogger(__name__)
+
+# Desteklenen sorgu tipleri (QTYPE)
+QUERY_TYPES = {'A': 1, 'AAAA': 28}
+
+# Yanıt kodu adları (RFC 1035 ve RFC 2136)
+RCODE_NAMES = {1: 'FORMERR', 2: 'SERVFAIL', 3: 'NXDOMAIN', 4: 'NOTIMP', 5: 'REFUSED'}
+
+
+def dns_label(name: str, resolver: Optional[str] = None) -> str:
+    """DNS probunun sonuçlarda kullanılan hedef adı (RFC 4501 biçiminde)."""
+    return f'dns://{resolver}/{name}' if resolver else f'dns:{name}'
+
+
+def build_query(query_id: int, name: str, query_type: int) -> bytes:
+    """Özyinelemeli (RD) tek sorulu DNS sorgu paketi oluşturur."""
+    header = struct.pack('!HHHHHH', query_id, 0x0100, 1, 0, 0, 0)
+    labels = name.rstrip('.').encode('idna').split(b'.')
+    question = b''.join(bytes([len(label)]) + label for label in labels) + b'\0'
+    return header + question + struct.pack('!HH', query_type, 1)
+
+
+def parse_response(data: bytes, query_id: int) -> Tuple[int, int]:
+    """
+    DNS yanıt başlığını çözer.
+
+    Returns:
+        (yanıt kodu, cevap kaydı sayısı)
+
+    Raises:
+        ValueError: Paket bu sorgunun yanıtı değilse
+    """
+    if len(data) < 12:
+        raise ValueError("DNS yanıtı çok kısa")
+    response_id, flags, _, answers, _, _ = struct.unpack_from('!HHHHHH', data)
+    if response_id != query_id or not flags & 0x8000:
+        raise ValueError("Beklenmeyen DNS yanıtı")
+    return flags & 0x000F, answers
+
+
+class _QueryProtocol(asyncio.DatagramProtocol):
+    def __init__(self, query_id: int):
+        self.query_id = query_id
+        self.response = asyncio.get_running_loop().create_future()
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        if self.response.done():
+            return
+        try:
+            self.response.set_result(parse_response(data, self.query_id))
+        except ValueError:
+            # Başka bir sorguya ait ya da bozuk paket; beklemeye devam
+            pass
+
+    def error_received(self, exc: Exception) -> None:
+        if not self.response.done():
+            self.response.set_exception(exc)
+
+
+class DnsProbe:
+    def __init__(
+        self,
+        name: str,
+        resolver: Optional[str] = None,
+        port: int = 53,
+        record_type: str = 'A',
+        timeout: float = 1.0,
+        limiter: Optional[asyncio.Semaphore] = None
+    ):
+        """
+        Ad çözümleme süresini ölçen prob.
+
+        `resolver` verilirse sorgu doğrudan bu sunucuya UDP ile gönderilir;
+        iş parçacığı kullanmadığı için binlerce eşzamanlı kontrolü kaldırır.
+        Verilmezse sistem çözümleyicisi (getaddrinfo) kullanılır; bu durumda
+        işletim sistemi önbelleği de ölçüme dahildir.
+
+        Args:
+            name: Çözümlenecek alan adı
+            resolver: DNS sunucusu IP adresi
+            port: DNS sunucusu portu
+            record_type: Sorgu tipi ('A' veya 'AAAA')
+            timeout: Yanıt bekleme süresi (saniye)
+            limiter: Aynı anda yapılabilecek sorguları sınırlayan semafor
+        """
+        if record_type not in QUERY_TYPES:
+            raise ValueError(f"Desteklenmeyen DNS sorgu tipi: {record_type}")
+        self.name = name
+        self.resolver = resolver
+        self.port = port
+        self.record_type = record_type
+        self.target = dns_label(name, resolver)
+        self.timeout = timeout
+        self.limiter = limiter
+
+    async def perform_check(self) -> ProbeResult:
+        """Tek bir çözümleme kontrolü gerçekleştirir."""
+        if self.limiter is None:
+            return await self._check()
+        async with self.limiter:
+            return await self._check()
+
+    async def _check(self) -> ProbeResult:
+        time_ns, sent_mono = time.time_ns(), time.monotonic_ns()
+        try:
+            if self.resolver:
+                rcode, answers = await asyncio.wait_for(self._query(), self.timeout)
+            else:
+                rcode, answers = await asyncio.wait_for(self._resolve(), self.timeout)
+        except OSError as e:
+            return ProbeResult(
+                self.target, Status.FAIL, packet_loss=100.0, time_ns=time_ns,
+                sent_mono=sent_mono, error=str(e) or 'zaman aşımı'
+            )
+        except Exception as e:
+            logger.error(f"DNS kontrolü sırasında hata: {str(e)}")
+            return ProbeResult(self.target, Status.ERROR, time_ns=time_ns, sent_mono=sent_mono,
+                               error=str(e))
+
+        latency = round((time.monotonic_ns() - sent_mono) / 1e6, 2)  # ms cinsinden
+        error = None
+        if rcode:
+            error = RCODE_NAMES.get(rcode, f'RCODE {rcode}')
+        elif not answers:
+            error = 'kayıt yok'
+
+        # Sunucu yanıt verdiği için gecikme, hata kodu dönse de yazılır
+        return ProbeResult(
+            self.target,
+            Status.FAIL if error else Status.OK,
+            latency=latency,
+            packet_loss=0.0,
+            time_ns=time_ns,
+            sent_mono=sent_mono,
+            error=error,
+            extra={'answers': float(answers), 'rcode': float(rcode)}
+        )
+
+    async def _query(self) -> Tuple[int, int]:
+        loop = asyncio.get_running_loop()
+        query_id = random.getrandbits(16)
+        transport, protocol = await loop.create_datagram_endpoint(
+            lambda: _QueryProtocol(query_id), remote_addr=(self.resolver, self.port)
+        )
+        try:
+            transport.sendto(build_query(query_id, self.name, QUERY_TYPES[self.record_type]))
+            return await protocol.response
+        finally:
+            transport.close()
+
+    async def _resolve(self) -> Tuple[int, int]:
+        family = socket.AF_INET6 if self.record_type == 'AAAA' else socket.AF_INET
+        info = await asyncio.get_running_loop().getaddrinfo(
+            self.name, None, family=family, type=socket.SOCK_STREAM
+        )
+        return 0, len(info)
@@ -0,0 +1,34 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def minmax_buckets(x: np.ndarray, y: np.ndarray, bucket: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Diziyi sabit boyutlu gruplara bölüp her gruptan en küçük ve en büyük
+    noktayı zaman sırasıyla seçer. Yarım kalan son grup atlanır.
+
+    Gruplar örnek sayısına göre hizalandığından, kapanmış bir grubun
+    çıktısı sonradan değişmez; yeni gruplar grafiğe artımlı eklenebilir.
+
+    Args:
+        x: Zaman değerleri
+        y: Ölçüm değerleri (NaN ölçülemeyen örnek)
+        bucket: Grup başına örnek sayısı
+    """
+    if bucket <= 1:
+        return x, y
+    count = len(y) // bucket
+    if count == 0:
+        return x[:0], y[:0]
+
+    groups = y[:count * bucket].reshape(count, bucket)
+    missing = np.isnan(groups)
+    low = np.where(missing, np.inf, groups).argmin(axis=1)
+    high = np.where(missing, -np.inf, groups).argmax(axis=1)
+
+    base = np.arange(count) * bucket
+    index = np.empty(count * 2, dtype=np.intp)
+    index[0::2] = base + np.minimum(low, high)
+    index[1::2] = base + np.maximum(low, high)
+    return x[index], y[index]
@@ -0,0 +1,422 @@
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+import json
+import logging
+import time
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from psycopg2.extras import Json, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+
+from .spool import KIND_EVENT, Spool
+from .telemetry import (WRITER_BATCH_SIZE, WRITER_DROPPED, WRITER_ERRORS,
+                        WRITER_FLUSH_SECONDS, WRITER_QUEUE_DEPTH)
+
+logger = logging.getLogger(__name__)
+
+# Olaylar yalnızca durum değişimleridir (bkz. TransitionTracker); tablo aylık
+# bölümlere ayrılır, saklama süresi dolan bölümler tek DROP ile silinir
+CREATE_EVENTS_SQL = """
+    CREATE TABLE IF NOT EXISTS network_events (
+        timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+        target VARCHAR(255) NOT NULL,
+        event_type VARCHAR(16) NOT NULL,
+        previous VARCHAR(16),
+        duration DOUBLE PRECISION,
+        samples INTEGER,
+        latency REAL,
+        packet_loss REAL,
+        error TEXT,
+        details JSONB,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    ) PARTITION BY RANGE (timestamp);
+    CREATE INDEX IF NOT EXISTS network_events_target_time ON network_events (target, timestamp);
+"""
+
+INSERT_EVENTS_SQL = """
+    INSERT INTO network_events (timestamp, target, event_type, previous, duration, samples,
+                                latency, packet_loss, error, details)
+    VALUES %s
+"""
+
+PARTITION_PREFIX = 'network_events_p'
+
+# Çalışan süreçler şema ve bölüm değişikliklerini (DDL) bu danışma kilidiyle sıraya
+# sokar; kilit işlem (transaction) sonunda kendiliğinden bırakılır
+SCHEMA_LOCK_SQL = "SELECT pg_advisory_xact_lock(hashtext('network_events'))"
+
+LIST_PARTITIONS_SQL = """
+    SELECT child.relname FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_inherits.inhparent = 'network_events'::regclass
+"""
+
+
+def _month(timestamp: datetime) -> Tuple[int, int]:
+    timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.year, timestamp.month
+
+
+def _next_month(year: int, month: int) -> Tuple[int, int]:
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def partition_name(year: int, month: int) -> str:
+    """Aylık bölüm tablosunun adı (ör. network_events_p202401)."""
+    return f'{PARTITION_PREFIX}{year:04d}{month:02d}'
+
+
+def partition_sql(year: int, month: int) -> str:
+    """Ayın bölüm tablosunu (UTC ay sınırlarıyla) oluşturan sorgu."""
+    end = _next_month(year, month)
+    return (f"CREATE TABLE IF NOT EXISTS {partition_name(year, month)} PARTITION OF network_events "
+            f"FOR VALUES FROM ('{year:04d}-{month:02d}-01 00:00:00+00') "
+            f"TO ('{end[0]:04d}-{end[1]:02d}-01 00:00:00+00')")
+
+
+class PostgresEventSink:
+    def __init__(
+        self,
+        dsn: str,
+        min_connections: int = 1,
+        max_connections: int = 4,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        max_queue_size: int = 10000,
+        spool: Optional[Spool] = None,
+        retention_days: float = 365,
+        maintenance_interval: float = 3600.0
+    ):
+        """
+        Bağlantı havuzu kullanan, toplu yazan PostgreSQL olay yazıcısı.
+
+        Olaylar bellekte biriktirilir ve `batch_size` dolduğunda ya da
+        `flush_interval` geçtiğinde tek bir çok satırlı INSERT ile,
+        olay döngüsünün dışında (iş parçacığında) yazılır. Eksik aylık
+        bölümler yazmadan önce oluşturulur; bakım görevi gelecek ayın
+        bölümünü hazırlar ve saklama süresi dolan bölümleri siler.
+
+        Args:
+            dsn: PostgreSQL bağlantı bilgileri
+            min_connections: Havuzdaki en az bağlantı sayısı
+            max_connections: Havuzdaki en fazla bağlantı sayısı
+            batch_size: Tek seferde yazılacak en fazla olay
+            flush_interval: En uzun bekleme süresi (saniye)
+            max_queue_size: Bellekte tutulacak en fazla olay
+            spool: Yazma başarısız olduğunda olayların saklanacağı disk kuyruğu
+            retention_days: Olayların saklanma süresi (gün, 0 = sınırsız); bölüm
+                bütünüyle süresi dolduğunda silinir
+            maintenance_interval: Bölüm bakımı aralığı (saniye, 0 = kapalı)
+        """
+        self.dsn = dsn
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        # Dolduğunda en eski olay, sona ekleme sırasında O(1) ile düşer
+        self._rows: Deque[Tuple] = deque(maxlen=max_queue_size)
+        self.spool = spool
+        self.retention_days = retention_days
+        self.maintenance_interval = maintenance_interval
+        self.pool: Optional[ThreadedConnectionPool] = None
+        self._partitions: Set[Tuple[int, int]] = set()
+
+        self._flush_event: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._closing = False
+
+        # Sayaçlar
+        self.enqueued = 0
+        self.dropped = 0
+        self.written_rows = 0
+        self.written_batches = 0
+        self.errors = 0
+        self.spooled_rows = 0
+        self.dropped_partitions = 0
+        self.last_flush_seconds = 0.0
+
+        # Telemetri (okuma yalnızca /metrics kazımasında yapılır)
+        WRITER_QUEUE_DEPTH.labels('postgres').set_function(lambda: len(self._rows))
+        self._flush_seconds = WRITER_FLUSH_SECONDS.labels('postgres')
+        self._batch_size = WRITER_BATCH_SIZE.labels('postgres')
+        self._dropped = WRITER_DROPPED.labels('postgres')
+        self._errors = WRITER_ERRORS.labels('postgres')
+
+    def stats(self) -> Dict[str, Any]:
+        """Yazıcı sayaçlarını döndürür."""
+        return {
+            'queue_depth': len(self._rows),
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'written_rows': self.written_rows,
+            'written_batches': self.written_batches,
+            'errors': self.errors,
+            'spooled_rows': self.spooled_rows,
+            'dropped_partitions': self.dropped_partitions,
+            'last_flush_seconds': self.last_flush_seconds
+        }
+
+    def open(self) -> None:
+        """Bağlantı havuzunu oluşturur."""
+        if self.pool is None:
+            self.pool = ThreadedConnectionPool(self.min_connections, self.max_connections, self.dsn)
+
+    def execute(self, sql: str, params: Optional[Tuple] = None) -> None:
+        """Havuzdan alınan bir bağlantıda tek bir sorgu çalıştırır ve onaylar."""
+        self.open()
+        conn = self.pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn)
+
+    def init_schema(self, now: Optional[datetime] = None) -> None:
+        """
+        Bölümlenmiş olay tablosunu, dizinini ve bu ile gelecek ayın bölümlerini
+        oluşturur. Eski (bölümlenmemiş) tablo `network_events_legacy` adıyla saklanır.
+        Aynı anda başlayan çalışanlar danışma kilidiyle sırayla çalışır; kilidi
+        alan ilk süreç tabloyu taşır, diğerleri hazır şemayı görür.
+        """
+        self.open()
+        now = now or datetime.now(timezone.utc)
+        conn = self.pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(SCHEMA_LOCK_SQL)
+                cur.execute(
+                    "SELECT relkind FROM pg_class WHERE oid = to_regclass('network_events')"
+                )
+                row = cur.fetchone()
+                if row is not None and row[0] == 'r':
+                    logger.warning("Bölümlenmemiş network_events tablosu "
+                                   "network_events_legacy olarak yeniden adlandırılıyor")
+                    cur.execute("ALTER TABLE network_events RENAME TO network_events_legacy")
+                cur.execute(CREATE_EVENTS_SQL)
+                self._create_partitions(cur, [_month(now), _next_month(*_month(now))])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            self._partitions.clear()
+            raise
+        finally:
+            self.pool.putconn(conn)
+
+    def _create_partitions(self, cur, months: Iterable[Tuple[int, int]]) -> None:
+        missing = sorted(set(months) - self._partitions)
+        if missing:
+            cur.execute(SCHEMA_LOCK_SQL)
+        for month in missing:
+            cur.execute(partition_sql(*month))
+            self._partitions.add(month)
+
+    def maintain(self, now: Optional[datetime] = None) -> int:
+        """
+        Gelecek ayın bölümünü oluşturur ve tamamı saklama süresinin dışında
+        kalan bölümleri siler.
+
+        Returns:
+            Silinen bölüm sayısı
+        """
+        self.open()
+        now = now or datetime.now(timezone.utc)
+        dropped = 0
+        conn = self.pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(SCHEMA_LOCK_SQL)
+                self._create_partitions(cur, [_month(now), _next_month(*_month(now))])
+                if self.retention_days:
+                    cutoff = _month(datetime.fromtimestamp(
+                        now.timestamp() - self.retention_days * 86400, timezone.utc))
+                    cur.execute(LIST_PARTITIONS_SQL)
+                    for (name,) in cur.fetchall():
+                        suffix = name[len(PARTITION_PREFIX):]
+                        if not name.startswith(PARTITION_PREFIX) or not suffix.isdigit():
+                            continue
+                        month = (int(suffix[:4]), int(suffix[4:]))
+                        # Bölümün üst sınırı kesme anından önceyse tüm satırları eskidir
+                        if _next_month(*month) <= cutoff:
+                            cur.execute(f"DROP TABLE IF EXISTS {name}")
+                            self._partitions.discard(month)
+                            dropped += 1
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            self._partitions.clear()
+            raise
+        finally:
+            self.pool.putconn(conn)
+        return dropped
+
+    def _insert_rows(self, rows: List[Tuple]) -> None:
+        self.open()
+        conn = self.pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                # Eksik bölümler (ör. spool'dan gelen eski olaylar) aynı işlemde oluşturulur
+                self._create_partitions(cur, {_month(row[0]) for row in rows})
+                execute_values(cur, INSERT_EVENTS_SQL, rows, page_size=len(rows))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            # Geri alınan işlemde oluşturulan bölümler geçersizdir
+            self._partitions.clear()
+            raise
+        finally:
+            self.pool.putconn(conn)
+
+    def insert_serialized(self, payload: bytes) -> None:
+        """Spool'dan okunan JSON kodlu olay grubunu senkron olarak yazar."""
+        rows = []
+        for row in json.loads(payload):
+            if len(row) == 4:
+                # Önceki sürümlerin (her başarısız örnek için bir satır) spool kayıtları
+                timestamp, target, event_type, details = row
+                row = [timestamp, target, event_type, None, None, None, details.get('latency'),
+                       details.get('packet_loss'), details.get('error'), None]
+            timestamp, *values, details = row
+            rows.append((datetime.fromisoformat(timestamp), *values,
+                         None if details is None else Json(details)))
+        self._insert_rows(rows)
+
+    @staticmethod
+    def _serialize_rows(rows: List[Tuple]) -> bytes:
+        return json.dumps([
+            [row[0].isoformat(), *row[1:-1], None if row[-1] is None else row[-1].adapted]
+            for row in rows
+        ], default=str).encode('utf-8')
+
+    def _ensure_started(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            loop = asyncio.get_running_loop()
+            self._flush_event = asyncio.Event()
+            self._flush_task = loop.create_task(self._flush_loop())
+            if self.maintenance_interval and self._maintenance_task is None:
+                self._maintenance_task = loop.create_task(self._maintenance_loop())
+
+    async def write_event(
+        self,
+        timestamp: datetime,
+        target: str,
+        event_type: str,
+        previous: Optional[str] = None,
+        duration: Optional[float] = None,
+        samples: Optional[int] = None,
+        latency: Optional[float] = None,
+        packet_loss: Optional[float] = None,
+        error: Optional[str] = None,
+        details: Optional[Dict] = None
+    ) -> None:
+        """
+        Durum değişimi olayını yazma kuyruğuna ekler.
+
+        Args:
+            timestamp: Olay zamanı (yeni durumun ilk örneği)
+            target: Hedef adresi
+            event_type: Yeni durum (ör. FAIL, OK)
+            previous: Önceki durum (bilinmiyorsa None)
+            duration: Önceki durumun süresi (saniye)
+            samples: Önceki durumda alınan örnek sayısı
+            latency: Gecikme (ms)
+            packet_loss: Paket kaybı (%)
+            error: Hata mesajı
+            details: JSONB olarak saklanacak ek alanlar
+        """
+        self._ensure_started()
+        if len(self._rows) >= self.max_queue_size:
+            self.dropped += 1
+            self._dropped.inc()
+        self._rows.append((timestamp, target, event_type, previous, duration, samples,
+                           latency, packet_loss, error, None if details is None else Json(details)))
+        self.enqueued += 1
+        if len(self._rows) >= self.batch_size:
+            self._flush_event.set()
+
+    async def _flush_loop(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            await self.flush()
+
+    async def _maintenance_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.maintenance_interval)
+            try:
+                dropped = await asyncio.to_thread(self.maintain)
+                self.dropped_partitions += dropped
+                if dropped:
+                    logger.info(f"Saklama süresi dolan {dropped} olay bölümü silindi")
+            except Exception as e:
+                logger.error(f"Olay tablosu bakım hatası: {str(e)}")
+
+    async def flush(self) -> None:
+        """Bekleyen olayları `batch_size`lık gruplar halinde yazar."""
+        async with self._flush_lock:
+            while self._rows:
+                count = min(self.batch_size, len(self._rows))
+                batch = [self._rows.popleft() for _ in range(count)]
+                await self._write_batch(batch)
+
+    async def _write_batch(self, batch: List[Tuple]) -> bool:
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._insert_rows, batch)
+        except Exception as e:
+            self.errors += 1
+            self._errors.inc()
+            logger.error(f"PostgreSQL toplu yazma hatası ({len(batch)} olay): {str(e)}")
+            await self._spool_batch(batch)
+            return False
+        finally:
+            self.last_flush_seconds = time.perf_counter() - started
+            self._flush_seconds.observe(self.last_flush_seconds)
+            self._batch_size.observe(len(batch))
+
+        self.written_rows += len(batch)
+        self.written_batches += 1
+        return True
+
+    async def _spool_batch(self, batch: List[Tuple]) -> None:
+        if self.spool is None:
+            return
+        try:
+            payload = self._serialize_rows(batch)
+            await asyncio.to_thread(self.spool.append, KIND_EVENT, [payload])
+            self.spooled_rows += len(batch)
+        except Exception as e:
+            logger.error(f"PostgreSQL olayları spool'a yazılamadı: {str(e)}")
+
+    async def stop(self) -> None:
+        """Kalan olayları yazar ve arka plan görevlerini durdurur."""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+        if self._flush_task is not None:
+            self._closing = True
+            self._flush_event.set()
+            await self._flush_task
+            self._flush_task = None
+            self._closing = False
+        await self.flush()
+
+    def close(self) -> None:
+        """Havuzdaki tüm bağlantıları kapatır."""
+        if self.pool is not None:
+            self.pool.closeall()
+            self.pool = None
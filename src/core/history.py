@@ -0,0 +1,269 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .rollup import resolution_name
+from .telemetry import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Grafik çözünürlüğü bu adımlardan seçilir; böylece birbirine yakın
+# aralıklar aynı önbellek anahtarını paylaşır
+RESOLUTION_STEPS = (1, 5, 10, 30, 60, 300, 900, 1800, 3600, 10800, 21600, 43200, 86400)
+
+CACHE_LOOKUPS = REGISTRY.counter(
+    'history_cache_lookups', 'Geçmiş sorgu önbelleği aramaları', ['result'])
+
+
+def choose_resolution(start: float, end: float, points: int) -> int:
+    """
+    Aralığı en fazla `points` pencereye bölen en küçük adımı seçer.
+
+    Args:
+        start: Aralık başlangıcı (Unix zamanı, saniye)
+        end: Aralık sonu (Unix zamanı, saniye)
+        points: Grafikte gösterilecek en fazla nokta
+
+    Returns:
+        Pencere genişliği (saniye)
+    """
+    step = (end - start) / max(points, 1)
+    for resolution in RESOLUTION_STEPS:
+        if resolution >= step:
+            return resolution
+    return math.ceil(step / RESOLUTION_STEPS[-1]) * RESOLUTION_STEPS[-1]
+
+
+def _flux_time(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _flux_string(value: str) -> str:
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def build_flux(bucket: str, measurement: str, fields: Sequence[str], target: str,
+               start: int, end: int, resolution: int) -> str:
+    """
+    Pencere başına ortalamayı sunucuda hesaplayan Flux sorgusu oluşturur.
+
+    Ham ölçümde `status` etiketi serileri böldüğü için alanlar pencerelemeden
+    önce birleştirilir; pencere zamanı başlangıcıdır.
+    """
+    field_filter = ' or '.join(f'r._field == {_flux_string(field)}' for field in fields)
+    return (
+        f'from(bucket: {_flux_string(bucket)})\n'
+        f'  |> range(start: {_flux_time(start)}, stop: {_flux_time(end)})\n'
+        f'  |> filter(fn: (r) => r._measurement == {_flux_string(measurement)}'
+        f' and r.target == {_flux_string(target)})\n'
+        f'  |> filter(fn: (r) => {field_filter})\n'
+        f'  |> group(columns: ["_field"])\n'
+        f'  |> aggregateWindow(every: {resolution}s, fn: mean, timeSrc: "_start",'
+        f' createEmpty: false)\n'
+        f'  |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")'
+    )
+
+
+class HistorySeries:
+    __slots__ = ('timestamps', 'latency', 'packet_loss')
+
+    def __init__(self, timestamps: np.ndarray, latency: np.ndarray, packet_loss: np.ndarray):
+        """
+        Pencere başına ortalama gecikme ve paket kaybı.
+
+        Args:
+            timestamps: Pencere başlangıçları (Unix zamanı, saniye, artan sırada)
+            latency: Ortalama gecikme (ms, ölçülemeyen pencerelerde NaN)
+            packet_loss: Ortalama paket kaybı (%)
+        """
+        self.timestamps = timestamps
+        self.latency = latency
+        self.packet_loss = packet_loss
+
+    @classmethod
+    def empty(cls) -> 'HistorySeries':
+        return cls(np.empty(0, np.int64), np.empty(0), np.empty(0))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def between(self, start: int, end: int) -> 'HistorySeries':
+        """[start, end) aralığındaki pencereleri döndürür."""
+        first, last = np.searchsorted(self.timestamps, (start, end))
+        return HistorySeries(
+            self.timestamps[first:last], self.latency[first:last], self.packet_loss[first:last]
+        )
+
+    def extend(self, other: 'HistorySeries') -> 'HistorySeries':
+        if not len(other):
+            return self
+        if not len(self):
+            return other
+        return HistorySeries(
+            np.concatenate((self.timestamps, other.timestamps)),
+            np.concatenate((self.latency, other.latency)),
+            np.concatenate((self.packet_loss, other.packet_loss))
+        )
+
+
+class _CacheEntry:
+    __slots__ = ('start', 'end', 'series', 'created')
+
+    def __init__(self, start: int, end: int, series: HistorySeries, created: float):
+        self.start = start
+        self.end = end
+        self.series = series
+        self.created = created
+
+
+def pick_rollup(rollup_resolutions: Sequence[int], resolution: int) -> Optional[int]:
+    """Pencere genişliğinin katı olduğu en büyük özet çözünürlüğü (1 sn hariç)."""
+    for rollup in sorted(rollup_resolutions, reverse=True):
+        if rollup > 1 and resolution % rollup == 0:
+            return rollup
+    return None
+
+
+class InfluxHistorySource:
+    def __init__(self, query_api, bucket: str, org: str, rollup_resolutions: Sequence[int] = ()):
+        """
+        Geçmiş verileri InfluxDB'den okur; pencere ortalamaları sunucuda hesaplanır.
+
+        Args:
+            query_api: InfluxDB sorgu API'si
+            bucket: InfluxDB bucket adı
+            org: InfluxDB organizasyon adı
+            rollup_resolutions: Yazılan özet pencere çözünürlükleri (saniye);
+                pencere genişliği bunlardan birinin katıysa özet ölçümü okunur
+        """
+        self.query_api = query_api
+        self.bucket = bucket
+        self.org = org
+        self.rollup_resolutions = list(rollup_resolutions)
+
+    def _source(self, resolution: int) -> Tuple[str, Dict[str, str]]:
+        """Çözünürlüğe uygun ölçüm ve (Flux alanı -> seri) eşlemesi."""
+        rollup = pick_rollup(self.rollup_resolutions, resolution)
+        if rollup is not None:
+            return (f'network_metrics_{resolution_name(rollup)}',
+                    {'latency_mean': 'latency', 'packet_loss': 'packet_loss'})
+        return 'network_metrics', {'latency': 'latency', 'packet_loss': 'packet_loss'}
+
+    def fetch(self, target: str, start: int, end: int, resolution: int) -> HistorySeries:
+        measurement, fields = self._source(resolution)
+        flux = build_flux(self.bucket, measurement, list(fields), target, start, end, resolution)
+        timestamps, columns = [], {name: [] for name in fields.values()}
+        for table in self.query_api.query(flux, org=self.org):
+            for record in table.records:
+                timestamps.append(int(record.get_time().timestamp()))
+                for field, name in fields.items():
+                    value = record.values.get(field)
+                    columns[name].append(math.nan if value is None else value)
+        order = np.argsort(np.array(timestamps, dtype=np.int64), kind='stable')
+        return HistorySeries(
+            np.array(timestamps, dtype=np.int64)[order],
+            np.array(columns['latency'], dtype=np.float64)[order],
+            np.array(columns['packet_loss'], dtype=np.float64)[order]
+        )
+
+
+class HistoryQuery:
+    def __init__(
+        self,
+        source,
+        max_entries: int = 256,
+        ttl: float = 300.0,
+        settle: float = 30.0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Geçmiş verileri grafik genişliğine indirgenmiş olarak okur.
+
+        Sonuçlar (hedef, çözünürlük) anahtarıyla LRU önbelleğinde tutulur.
+        Yalnızca kapanmış pencereler önbelleğe alınır; aralık ileri
+        kaydırıldığında (ör. "son 1 saat") sadece eksik kuyruk sorgulanır.
+        Girdiler `ttl` sonunda baştan sorgulanır, böylece spool'dan geç
+        gelen veriler de görünür.
+
+        Args:
+            source: `fetch(hedef, başlangıç, bitiş, çözünürlük)` sağlayan veri kaynağı
+            max_entries: Önbellekteki en fazla girdi
+            ttl: Girdinin baştan sorgulanmadan kullanılabileceği süre (saniye)
+            settle: Son bu kadar saniyedeki pencereler kapanmamış sayılır
+                (yazma aralığı boyunca geç gelen satırlar için)
+            clock: Zaman kaynağı
+        """
+        self.source = source
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.settle = settle
+        self.clock = clock
+        self._cache: 'OrderedDict[Tuple[str, int], _CacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = CACHE_LOOKUPS.labels('hit')
+        self._partial_hits = CACHE_LOOKUPS.labels('partial')
+        self._misses = CACHE_LOOKUPS.labels('miss')
+
+    def query(self, target: str, start: float, end: float,
+              points: int = 100) -> Tuple[HistorySeries, int]:
+        """
+        Hedefin [start, end) aralığındaki verilerini en fazla `points` pencereye indirger.
+
+        Args:
+            target: Hedef adı
+            start: Aralık başlangıcı (Unix zamanı, saniye)
+            end: Aralık sonu (Unix zamanı, saniye)
+            points: Grafikte gösterilecek en fazla nokta
+
+        Returns:
+            (seri, pencere genişliği)
+        """
+        resolution = choose_resolution(start, end, points)
+        start = int(start // resolution) * resolution
+        end = int(-(-end // resolution)) * resolution
+        now = self.clock()
+        settled = int((now - self.settle) // resolution) * resolution
+        key = (target, resolution)
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and (now - entry.created > self.ttl
+                                      or not entry.start <= start <= entry.end):
+                entry = None
+            if entry is not None:
+                self._cache.move_to_end(key)
+
+        if entry is None:
+            self._misses.inc()
+            series = self.source.fetch(target, start, end, resolution)
+            created = now
+        elif entry.end >= end:
+            self._hits.inc()
+            return entry.series.between(start, end), resolution
+        else:
+            self._partial_hits.inc()
+            series = entry.series.between(start, entry.end).extend(
+                self.source.fetch(target, entry.end, end, resolution)
+            )
+            created = entry.created
+
+        # Yalnızca kapanmış pencereler saklanır; açık pencere her seferinde yeniden okunur
+        complete = min(end, settled)
+        if complete > start:
+            with self._lock:
+                self._cache[key] = _CacheEntry(start, complete, series.between(start, complete),
+                                               created)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return series, resolution
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
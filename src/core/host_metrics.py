@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import socket
+import time
+from typing import Awaitable, Callable, List, Optional
+
+import psutil
+
+from .influx_writer import encode_line
+
+logger = logging.getLogger(__name__)
+
+# Arayüz başına yazılan psutil sayaçları
+NIC_COUNTERS = (
+    'bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv',
+    'errin', 'errout', 'dropin', 'dropout'
+)
+
+
+class HostMetricsSampler:
+    def __init__(
+        self,
+        write: Callable[[str], Awaitable[bool]],
+        interval: float = 60.0,
+        host: Optional[str] = None
+    ):
+        """
+        Sunucu metriklerini tek bir arka plan görevinde toplar.
+
+        CPU kullanımı `interval=None` ile iki örnek arasındaki farktan
+        okunur, bu yüzden ölçüm beklemez; psutil çağrıları olay döngüsünü
+        bloklamamak için ayrı iş parçacığında yapılır. Sonuçlar
+        `host_metrics` ve `host_network` ölçümlerine yazılır.
+
+        Args:
+            write: Line protocol satırını yazma kuyruğuna ekleyen fonksiyon
+            interval: Örnekleme aralığı (saniye)
+            host: `host` etiketi (verilmezse makine adı)
+        """
+        self.write = write
+        self.interval = interval
+        self.host = host or socket.gethostname()
+        self._process = psutil.Process()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        # İlk cpu_percent çağrısı yalnızca referans noktası oluşturur
+        await asyncio.to_thread(psutil.cpu_percent, None, True)
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                for line in await asyncio.to_thread(self.sample):
+                    await self.write(line)
+            except Exception as e:
+                logger.error(f"Sunucu metrikleri hatası: {str(e)}")
+
+    def sample(self, timestamp_ns: Optional[int] = None) -> List[str]:
+        """Anlık sunucu metriklerini line protocol satırları olarak döndürür."""
+        timestamp_ns = timestamp_ns or time.time_ns()
+        per_cpu = psutil.cpu_percent(interval=None, percpu=True)
+        memory = psutil.virtual_memory()
+
+        fields = {
+            'cpu_usage': sum(per_cpu) / len(per_cpu) if per_cpu else 0.0,
+            'memory_usage': float(memory.percent),
+            'memory_available': memory.available,
+            'process_memory_usage': self._process.memory_percent(),
+            'process_cpu_usage': self._process.cpu_percent(None)
+        }
+        for core, usage in enumerate(per_cpu):
+            fields[f'cpu{core}_usage'] = float(usage)
+        lines = [encode_line('host_metrics', {'host': self.host}, fields, timestamp_ns)]
+
+        for interface, counters in psutil.net_io_counters(pernic=True).items():
+            lines.append(encode_line(
+                'host_network',
+                {'host': self.host, 'interface': interface},
+                {name: getattr(counters, name) for name in NIC_COUNTERS},
+                timestamp_ns
+            ))
+        return lines
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,239 @@
+import asyncio
+import ipaddress
+import itertools
+import logging
+import os
+import socket
+import struct
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+
+_ICMP_HEADER = struct.Struct('!BBHHH')
+_DNS_CACHE_TTL = 300.0  # saniye
+_RECV_BUFFER_SIZE = 4 * 1024 * 1024  # bayt
+
+
+def checksum(data: bytes) -> int:
+    """RFC 1071 internet sağlama toplamını hesaplar."""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def build_echo_request(identifier: int, sequence: int, payload: bytes = b'') -> bytes:
+    """
+    ICMP echo request paketi oluşturur.
+
+    Args:
+        identifier: ICMP tanımlayıcısı
+        sequence: ICMP sıra numarası
+        payload: Paket yükü
+    """
+    header = _ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, identifier, sequence)
+    csum = checksum(header + payload)
+    return _ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, csum, identifier, sequence) + payload
+
+
+def parse_echo_reply(packet: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Gelen paketi çözer.
+
+    Returns:
+        Echo reply ise (identifier, sequence), değilse None
+    """
+    # Raw soketlerde paket IPv4 başlığı ile birlikte gelir
+    if packet and packet[0] >> 4 == 4:
+        packet = packet[(packet[0] & 0x0F) * 4:]
+    if len(packet) < _ICMP_HEADER.size:
+        return None
+    icmp_type, _, _, identifier, sequence = _ICMP_HEADER.unpack_from(packet)
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+    return identifier, sequence
+
+
+class IcmpEngine:
+    def __init__(self, payload_size: int = 56):
+        """
+        Tek soket üzerinden çalışan asenkron ICMP motoru.
+
+        Tüm problar aynı soketi paylaşır; yanıtlar tanımlayıcı ve sıra
+        numarası ile isteklere eşlenir, böylece binlerce echo aynı anda
+        beklemede olabilir.
+
+        Args:
+            payload_size: Echo paketinin yük boyutu (bayt)
+        """
+        self._payload = bytes(payload_size)
+        self._sock: Optional[socket.socket] = None
+        self._raw = False
+        self._identifier = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._sequence = itertools.count()
+        # sıra numarası -> (future, hedef adres, gönderim zamanı)
+        self._pending: Dict[int, Tuple[asyncio.Future, str, float]] = {}
+        self._dns_cache: Dict[str, Tuple[str, float]] = {}
+
+        self.sent = 0
+        self.received = 0
+        self.timeouts = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Yanıt bekleyen echo sayısı."""
+        return len(self._pending)
+
+    def _open_socket(self) -> None:
+        """Yetkisiz ICMP soketi açmayı dener, olmazsa raw sokete düşer."""
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            self._raw = False
+        except (PermissionError, OSError):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            self._raw = True
+        sock.setblocking(False)
+        # Aynı anda binlerce yanıt gelebileceği için alım tamponunu büyüt
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _RECV_BUFFER_SIZE)
+        except OSError:
+            pass
+        sock.bind(('0.0.0.0', 0))
+
+        if self._raw:
+            self._identifier = os.getpid() & 0xFFFF
+        else:
+            # Yetkisiz soketlerde çekirdek tanımlayıcıyı soket portu olarak atar
+            self._identifier = sock.getsockname()[1] & 0xFFFF
+        self._sock = sock
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._sock is not None and self._loop is loop:
+            return
+        if self._sock is not None:
+            # Motor başka bir olay döngüsünde açılmış; yeniden başlat
+            self._close_socket()
+        self._open_socket()
+        self._loop = loop
+        self._reader_task = loop.create_task(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        """Paylaşılan soketten gelen yanıtları bekleyen isteklere dağıtır."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                packet, addr = await loop.sock_recvfrom(self._sock, 65535)
+            except asyncio.CancelledError:
+                raise
+            except OSError as e:
+                logger.debug(f"ICMP okuma hatası: {str(e)}")
+                continue
+
+            received_at = time.perf_counter()
+            parsed = parse_echo_reply(packet)
+            if parsed is None:
+                continue
+            identifier, sequence = parsed
+            # Raw soket diğer süreçlerin yanıtlarını da alır
+            if self._raw and identifier != self._identifier:
+                continue
+
+            entry = self._pending.get(sequence)
+            if entry is None:
+                continue
+            future, address, sent_at = entry
+            if addr[0] != address or future.done():
+                continue
+            del self._pending[sequence]
+            self.received += 1
+            future.set_result(received_at - sent_at)
+
+    def _next_sequence(self) -> int:
+        for _ in range(0x10000):
+            sequence = next(self._sequence) & 0xFFFF
+            if sequence not in self._pending:
+                return sequence
+        raise RuntimeError("Bekleyen ICMP isteği sınırına ulaşıldı")
+
+    async def _resolve(self, target: str) -> str:
+        try:
+            return str(ipaddress.IPv4Address(target))
+        except ValueError:
+            pass
+
+        cached = self._dns_cache.get(target)
+        now = time.monotonic()
+        if cached and cached[1] > now:
+            return cached[0]
+
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            target, None, family=socket.AF_INET, type=socket.SOCK_RAW
+        )
+        address = infos[0][4][0]
+        self._dns_cache[target] = (address, now + _DNS_CACHE_TTL)
+        return address
+
+    async def ping(self, target: str, timeout: float = 1.0) -> Optional[float]:
+        """
+        Hedefe tek bir echo gönderir ve yanıtı bekler.
+
+        Args:
+            target: Hedef IP adresi veya alan adı
+            timeout: Yanıt bekleme süresi (saniye)
+
+        Returns:
+            Gidiş-dönüş süresi (saniye), zaman aşımında None
+        """
+        self._ensure_started()
+        address = await self._resolve(target)
+        sequence = self._next_sequence()
+        future = self._loop.create_future()
+        packet = build_echo_request(self._identifier, sequence, self._payload)
+
+        self._pending[sequence] = (future, address, time.perf_counter())
+        try:
+            await self._loop.sock_sendto(self._sock, packet, (address, 0))
+            self.sent += 1
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return None
+        finally:
+            self._pending.pop(sequence, None)
+
+    def _close_socket(self) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        for future, _, _ in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._loop = None
+
+    def close(self) -> None:
+        """Soketi kapatır ve bekleyen istekleri iptal eder."""
+        self._close_socket()
+
+
+_default_engine: Optional[IcmpEngine] = None
+
+
+def get_default_engine() -> IcmpEngine:
+    """Süreç genelinde paylaşılan ICMP motorunu döndürür."""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = IcmpEngine()
+    return _default_engine
@@ -0,0 +1,257 @@
+import asyncio
+from collections import deque
+import logging
+import math
+import time
+from typing import Any, Deque, Dict, List, Optional
+
+from .spool import KIND_INFLUX, Spool
+from .telemetry import (WRITER_BATCH_SIZE, WRITER_DROPPED, WRITER_ERRORS,
+                        WRITER_FLUSH_SECONDS, WRITER_QUEUE_DEPTH)
+
+logger = logging.getLogger(__name__)
+
+DROP_POLICIES = ('block', 'drop_oldest', 'drop_newest')
+
+
+def escape_key(value: str) -> str:
+    """Etiket anahtarını/değerini veya alan anahtarını line protocol için kaçışlar."""
+    return value.replace('\\', '\\\\').replace(',', '\\,').replace('=', '\\=').replace(' ', '\\ ')
+
+
+def _escape_measurement(value: str) -> str:
+    return value.replace('\\', '\\\\').replace(',', '\\,').replace(' ', '\\ ')
+
+
+def format_field_value(value: Any) -> str:
+    """Alan değerini line protocol söz dizimine çevirir."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return f'{value}i'
+    if isinstance(value, float):
+        return repr(value)
+    escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def encode_line(
+    measurement: str,
+    tags: Dict[str, str],
+    fields: Dict[str, Any],
+    timestamp_ns: int
+) -> str:
+    """
+    Point nesnesi oluşturmadan tek bir line protocol satırı üretir.
+
+    Args:
+        measurement: Ölçüm adı
+        tags: Etiketler
+        fields: Alanlar (None ve sonlu olmayan float değerler atlanır; line protocol
+            nan/inf kabul etmez)
+        timestamp_ns: Unix zamanı (nanosaniye)
+    """
+    tag_part = ''.join(
+        f',{escape_key(key)}={escape_key(str(value))}'
+        for key, value in sorted(tags.items()) if value != ''
+    )
+    field_part = ','.join(
+        f'{escape_key(key)}={format_field_value(value)}'
+        for key, value in fields.items()
+        if value is not None and not (isinstance(value, float) and not math.isfinite(value))
+    )
+    if not field_part:
+        raise ValueError("Line protocol satırında en az bir alan olmalı")
+    return f'{_escape_measurement(measurement)}{tag_part} {field_part} {timestamp_ns}'
+
+
+class InfluxBatchWriter:
+    def __init__(
+        self,
+        write_api: Any,
+        bucket: str,
+        org: str,
+        batch_size: int = 100,
+        flush_interval: float = 10.0,
+        max_queue_size: int = 10000,
+        drop_policy: str = 'drop_oldest',
+        spool: Optional[Spool] = None
+    ):
+        """
+        Line protocol satırlarını kuyruklayıp toplu yazan InfluxDB yazıcısı.
+
+        Kuyruk `batch_size` satıra ulaştığında ya da `flush_interval`
+        dolduğunda boşaltılır. Kuyruk dolduğunda `drop_policy` uygulanır.
+
+        Args:
+            write_api: Senkron InfluxDB write API nesnesi (gzip istemcide açılır)
+            bucket: InfluxDB bucket adı
+            org: InfluxDB organizasyon adı
+            batch_size: Tek istekte yazılacak en fazla satır
+            flush_interval: En uzun bekleme süresi (saniye)
+            max_queue_size: Kuyruktaki en fazla satır
+            drop_policy: 'block' (geri basınç), 'drop_oldest' veya 'drop_newest'
+            spool: Yazma başarısız olduğunda grupların saklanacağı disk kuyruğu
+        """
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Geçersiz drop_policy: {drop_policy}")
+        self.write_api = write_api
+        self.bucket = bucket
+        self.org = org
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.drop_policy = drop_policy
+        self.spool = spool
+
+        self._queue: Deque[str] = deque()
+        self._flush_event: Optional[asyncio.Event] = None
+        self._space_event: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._closing = False
+
+        # Sayaçlar
+        self.enqueued = 0
+        self.dropped = 0
+        self.written_lines = 0
+        self.written_batches = 0
+        self.written_bytes = 0
+        self.errors = 0
+        self.spooled_lines = 0
+        self.last_flush_seconds = 0.0
+        self.last_batch_size = 0
+
+        # Telemetri (okuma yalnızca /metrics kazımasında yapılır)
+        WRITER_QUEUE_DEPTH.labels('influx').set_function(lambda: len(self._queue))
+        self._flush_seconds = WRITER_FLUSH_SECONDS.labels('influx')
+        self._batch_size = WRITER_BATCH_SIZE.labels('influx')
+        self._dropped = WRITER_DROPPED.labels('influx')
+        self._errors = WRITER_ERRORS.labels('influx')
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        """Yazıcı sayaçlarını döndürür."""
+        return {
+            'queue_depth': self.queue_depth,
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'written_lines': self.written_lines,
+            'written_batches': self.written_batches,
+            'written_bytes': self.written_bytes,
+            'errors': self.errors,
+            'spooled_lines': self.spooled_lines,
+            'last_flush_seconds': self.last_flush_seconds,
+            'last_batch_size': self.last_batch_size
+        }
+
+    def _ensure_started(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_event = asyncio.Event()
+            self._space_event = asyncio.Event()
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def write(self, line: str) -> bool:
+        """
+        Satırı kuyruğa ekler.
+
+        Returns:
+            Satır kuyruğa alındıysa True, düşürüldüyse False
+        """
+        self._ensure_started()
+        while len(self._queue) >= self.max_queue_size:
+            if self.drop_policy == 'drop_newest':
+                self.dropped += 1
+                self._dropped.inc()
+                return False
+            if self.drop_policy == 'drop_oldest':
+                self._queue.popleft()
+                self.dropped += 1
+                self._dropped.inc()
+                break
+            # Geri basınç: yazıcı yer açana kadar bekle
+            self._space_event.clear()
+            self._flush_event.set()
+            await self._space_event.wait()
+
+        self._queue.append(line)
+        self.enqueued += 1
+        if len(self._queue) >= self.batch_size:
+            self._flush_event.set()
+        return True
+
+    async def _flush_loop(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Kuyruktaki tüm satırları `batch_size`lık gruplar halinde yazar."""
+        # Kilit, grupların kuyruk sırasıyla yazılmasını sağlar
+        async with self._flush_lock:
+            while self._queue:
+                count = min(self.batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(count)]
+                if self._space_event is not None:
+                    self._space_event.set()
+                await self._write_batch(batch)
+
+    def send(self, payload: bytes) -> None:
+        """Kodlanmış bir grubu senkron olarak InfluxDB'ye yazar."""
+        # probe_result bu modülü kullandığı için istemci kütüphanesi ilk yazmada yüklenir
+        from influxdb_client import WritePrecision
+        self.write_api.write(
+            bucket=self.bucket,
+            org=self.org,
+            record=payload,
+            write_precision=WritePrecision.NS
+        )
+
+    async def _write_batch(self, batch: List[str]) -> bool:
+        payload = '\n'.join(batch).encode('utf-8')
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self.send, payload)
+        except Exception as e:
+            self.errors += 1
+            self._errors.inc()
+            logger.error(f"InfluxDB toplu yazma hatası ({len(batch)} satır): {str(e)}")
+            await self._spool_batch(payload, len(batch))
+            return False
+        finally:
+            self.last_flush_seconds = time.perf_counter() - started
+            self._flush_seconds.observe(self.last_flush_seconds)
+            self._batch_size.observe(len(batch))
+
+        self.written_lines += len(batch)
+        self.written_batches += 1
+        self.written_bytes += len(payload)
+        self.last_batch_size = len(batch)
+        return True
+
+    async def _spool_batch(self, payload: bytes, lines: int) -> None:
+        if self.spool is None:
+            return
+        try:
+            await asyncio.to_thread(self.spool.append, KIND_INFLUX, [payload])
+            self.spooled_lines += lines
+        except Exception as e:
+            logger.error(f"InfluxDB grubu spool'a yazılamadı: {str(e)}")
+
+    async def stop(self) -> None:
+        """Kalan satırları yazar ve arka plan görevini durdurur."""
+        if self._flush_task is not None:
+            # Yazılmakta olan grup kaybolmasın diye görev iptal edilmez
+            self._closing = True
+            self._flush_event.set()
+            await self._flush_task
+            self._flush_task = None
+            self._closing = False
+        await self.flush()
@@ -0,0 +1,138 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# render(hedef, önceki durum) -> (durum, tam görünüm, fark); metinler JSON
+Renderer = Callable[[str, Any], Tuple[Any, str, Optional[str]]]
+
+
+class _View:
+    __slots__ = ('version', 'seq', 'base', 'state', 'snapshot', 'delta')
+
+    def __init__(self, version, seq, base, state, snapshot, delta):
+        self.version = version
+        self.seq = seq
+        self.base = base  # farkın uygulanabileceği önceki görünümün sırası
+        self.state = state
+        self.snapshot = snapshot
+        self.delta = delta
+
+
+class ViewBroadcaster:
+    def __init__(
+        self,
+        version: Callable[[str], Any],
+        render: Renderer,
+        interval: float = 1.0,
+        heartbeat: float = 15.0
+    ):
+        """
+        Hedef başına canlı görünümü veri değişikliği başına bir kez üretir ve
+        tüm izleyicilere Server-Sent Events olarak iter.
+
+        Görünümler yalnızca en az bir abonesi olan hedefler için, `version`
+        değiştiğinde `publish` çağıran iş parçacığında üretilir ve metin olarak
+        saklanır; izleyici başına maliyet hazır metni yazmaktan ibarettir.
+        Önceki görünümü almış abonelere yalnızca fark, yeni bağlanan veya
+        geride kalan abonelere tam görünüm gönderilir.
+
+        Args:
+            version: Hedefin veri sürümünü döndürür; değişmedikçe yeniden üretilmez
+            render: (hedef, önceki durum) -> (durum, tam görünüm, fark) döndürür;
+                önceki görünüme eklenemeyen durumlarda fark None olur
+            interval: Görünümlerin en sık yenilenme aralığı (saniye)
+            heartbeat: Boşta bağlantılara yorum satırı gönderme aralığı (saniye);
+                kapanan bağlantılar bu sayede fark edilir
+        """
+        self._version = version
+        self._render = render
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self._views: Dict[str, _View] = {}
+        self._subscribers: Dict[str, int] = {}
+        self._changed = threading.Condition()
+        self._seq = 0
+        self._published = 0.0
+        self.renders = 0
+
+    @property
+    def clients(self) -> int:
+        """Açık akış bağlantısı sayısı."""
+        return sum(self._subscribers.values())
+
+    def publish(self, force: bool = False) -> int:
+        """
+        Abonesi olan hedeflerden verisi değişenlerin görünümlerini yeniler.
+        Tek bir iş parçacığından (sonuçları tamponlara yazan) çağrılmalıdır.
+
+        Args:
+            force: `interval` dolmamış olsa da yenile
+
+        Returns:
+            int: Yeniden üretilen görünüm sayısı
+        """
+        now = time.monotonic()
+        if not force and now - self._published < self.interval:
+            return 0
+        self._published = now
+        with self._changed:
+            keys = list(self._subscribers)
+
+        updated = []
+        for key in keys:
+            version = self._version(key)
+            view = self._views.get(key)
+            if view is not None and view.version == version:
+                continue
+            state, snapshot, delta = self._render(key, None if view is None else view.state)
+            updated.append((key, version, view, state, snapshot, delta))
+
+        if updated:
+            with self._changed:
+                for key, version, view, state, snapshot, delta in updated:
+                    self._seq += 1
+                    base = None if view is None or delta is None else view.seq
+                    self._views[key] = _View(version, self._seq, base, state, snapshot, delta)
+                self.renders += len(updated)
+                self._changed.notify_all()
+        return len(updated)
+
+    def stream(self, key: str, last: Optional[int] = None, interval: float = 0.0) -> Iterator[str]:
+        """
+        Hedefin görünümlerini Server-Sent Events biçiminde üretir. Bağlantı
+        kapanıp üreteç kapatıldığında abonelik sona erer.
+
+        Args:
+            key: Hedef
+            last: İstemcinin aldığı son görünüm sırası (`Last-Event-ID`)
+            interval: İstemcinin istediği güncelleme aralığı (saniye); yayın
+                aralığından uzunsa aradaki görünümler atlanır ve yerine tam görünüm
+                gönderilir
+        """
+        pause = max(interval - self.interval, 0.0)
+        with self._changed:
+            self._subscribers[key] = self._subscribers.get(key, 0) + 1
+        try:
+            # Tarayıcının yeniden bağlanma gecikmesi (ms)
+            yield 'retry: 2000\n\n'
+            while True:
+                with self._changed:
+                    self._changed.wait_for(lambda: self._pending(key, last), self.heartbeat)
+                    view = self._views.get(key)
+                if view is None or view.seq == last:
+                    yield ':\n\n'
+                    continue
+                data = view.delta if last is not None and view.base == last else view.snapshot
+                last = view.seq
+                yield f'id: {view.seq}\ndata: {data}\n\n'
+                if pause:
+                    time.sleep(pause)
+        finally:
+            with self._changed:
+                self._subscribers[key] -= 1
+                if not self._subscribers[key]:
+                    del self._subscribers[key]
+
+    def _pending(self, key: str, last: Optional[int]) -> bool:
+        view = self._views.get(key)
+        return view is not None and view.seq != last
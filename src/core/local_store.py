@@ -0,0 +1,484 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from .probe_result import ProbeResult
+from .rollup import ClosedWindow
+from .transitions import TransitionTracker
+from .telemetry import (WRITER_BATCH_SIZE, WRITER_DROPPED, WRITER_ERRORS,
+                        WRITER_FLUSH_SECONDS, WRITER_QUEUE_DEPTH)
+
+if TYPE_CHECKING:
+    from .history import HistoryQuery, HistorySeries
+
+logger = logging.getLogger(__name__)
+
+# Örnekler ve özetler hedef + zaman birincil anahtarıyla kümelenir
+# (WITHOUT ROWID); hedef başına aralık taraması tek bir B-ağacı aralığıdır
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS targets (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS samples (
+    target INTEGER NOT NULL,
+    time_ns INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    latency REAL,
+    packet_loss REAL NOT NULL,
+    schedule_lag REAL,
+    interval REAL,
+    extra TEXT,
+    PRIMARY KEY (target, time_ns)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollups (
+    target INTEGER NOT NULL,
+    resolution INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    count REAL,
+    failures REAL,
+    packet_loss REAL,
+    latency_min REAL,
+    latency_max REAL,
+    latency_mean REAL,
+    latency_p50 REAL,
+    latency_p95 REAL,
+    latency_p99 REAL,
+    PRIMARY KEY (target, resolution, start)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    time_ns INTEGER NOT NULL,
+    target TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    previous TEXT,
+    duration REAL,
+    samples INTEGER,
+    latency REAL,
+    packet_loss REAL,
+    error TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS events_time ON events (time_ns);
+CREATE INDEX IF NOT EXISTS events_target_time ON events (target, time_ns);
+CREATE TABLE IF NOT EXISTS measurements (
+    time_ns INTEGER NOT NULL,
+    line TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS measurements_time ON measurements (time_ns);
+"""
+
+ROLLUP_FIELDS = (
+    'count', 'failures', 'packet_loss', 'latency_min', 'latency_max',
+    'latency_mean', 'latency_p50', 'latency_p95', 'latency_p99'
+)
+
+INSERT_SAMPLES_SQL = "INSERT OR REPLACE INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+INSERT_ROLLUPS_SQL = (
+    f"INSERT OR REPLACE INTO rollups VALUES (?, ?, ?, {', '.join('?' * len(ROLLUP_FIELDS))})"
+)
+INSERT_EVENTS_SQL = "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+INSERT_MEASUREMENTS_SQL = "INSERT INTO measurements VALUES (?, ?)"
+
+# Paket kaybı örneğin temsil ettiği süreyle ağırlıklandırılır (uyarlanır aralık)
+SAMPLE_WINDOWS_SQL = """
+    SELECT time_ns / :step_ns * :resolution AS window, AVG(latency),
+           SUM(packet_loss * COALESCE(interval, 1)) / SUM(COALESCE(interval, 1))
+    FROM samples
+    WHERE target = :target AND time_ns >= :start_ns AND time_ns < :end_ns
+    GROUP BY window ORDER BY window
+"""
+ROLLUP_WINDOWS_SQL = """
+    SELECT start / :resolution * :resolution AS window, AVG(latency_mean), AVG(packet_loss)
+    FROM rollups
+    WHERE target = :target AND resolution = :rollup AND start >= :start AND start < :end
+    GROUP BY window ORDER BY window
+"""
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Veritabanını WAL kipinde açar ve şemayı oluşturur.
+
+    WAL kipinde panel gibi okuyucular yazıcıyı bloklamaz; birden fazla
+    çalışan süreç aynı dosyaya sırayla (kısa işlemlerle) yazar.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30.0, isolation_level=None, check_same_thread=False)
+    # Silinen sayfalar compaction sırasında dosyaya geri verilir (yalnızca yeni dosyada etkili)
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    # Önceki sürümlerin olay tablosu (her başarısız örnek için bir satır) korunur
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(events)")]
+    if columns and 'previous' not in columns:
+        conn.execute("ALTER TABLE events RENAME TO events_legacy")
+        conn.execute("DROP INDEX IF EXISTS events_time")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class SqliteHistorySource:
+    def __init__(self, path: str, rollup_resolutions: Sequence[int] = ()):
+        """
+        Geçmiş verileri gömülü veritabanından okur; pencere ortalamaları SQL ile hesaplanır.
+
+        Args:
+            path: Veritabanı dosyası
+            rollup_resolutions: Yazılan özet pencere çözünürlükleri (saniye)
+        """
+        self.path = path
+        self.rollup_resolutions = list(rollup_resolutions)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def fetch(self, target: str, start: int, end: int, resolution: int) -> 'HistorySeries':
+        # numpy yalnızca sorgu yapan süreçte (panel) yüklenir; toplayıcı buraya gelmez
+        import numpy as np
+        from .history import HistorySeries, pick_rollup
+
+        with self._lock:
+            if self._conn is None:
+                self._conn = connect(self.path)
+            row = self._conn.execute("SELECT id FROM targets WHERE name = ?", (target,)).fetchone()
+            if row is None:
+                return HistorySeries.empty()
+
+            rollup = pick_rollup(self.rollup_resolutions, resolution)
+            if rollup is None:
+                rows = self._conn.execute(SAMPLE_WINDOWS_SQL, {
+                    'step_ns': resolution * 10**9, 'resolution': resolution, 'target': row[0],
+                    'start_ns': start * 10**9, 'end_ns': end * 10**9
+                }).fetchall()
+            else:
+                rows = self._conn.execute(ROLLUP_WINDOWS_SQL, {
+                    'resolution': resolution, 'rollup': rollup, 'target': row[0],
+                    'start': start, 'end': end
+                }).fetchall()
+
+        if not rows:
+            return HistorySeries.empty()
+        columns = np.array(rows, dtype=np.float64)  # None -> NaN
+        return HistorySeries(columns[:, 0].astype(np.int64), columns[:, 1], columns[:, 2])
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class LocalDataStore:
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 5000,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 100000,
+        retention_days: float = 30,
+        rollup_retention_days: float = 365,
+        compact_interval: float = 3600.0,
+        rollup_resolutions: Sequence[int] = (),
+        history_cache_size: int = 256,
+        history_cache_ttl: float = 300.0,
+        history_settle: float = 30.0
+    ):
+        """
+        InfluxDB ve PostgreSQL gerektirmeyen, SQLite (WAL) tabanlı gömülü veri deposu.
+
+        `DataStore` ile aynı arayüzü sağlar. Örnekler bellekte biriktirilir ve
+        tek bir işlemde (transaction) olay döngüsünün dışında yazılır. Süresi
+        dolan veriler `compact_interval` aralıklarla hedef başına silinir ve
+        boşalan sayfalar dosyaya geri verilir.
+
+        Args:
+            path: Veritabanı dosyası
+            batch_size: Bu kadar örnek biriktiğinde beklemeden yazılır
+            flush_interval: En uzun bekleme süresi (saniye)
+            max_queue_size: Bellekte tutulacak en fazla örnek; doluysa yeni örnek atılır
+            retention_days: Ham örneklerin, olayların ve sunucu metriklerinin saklanma süresi
+                (gün, 0 = sınırsız)
+            rollup_retention_days: Özet pencerelerinin saklanma süresi (gün, 0 = sınırsız)
+            compact_interval: Saklama süresi temizliği aralığı (saniye, 0 = kapalı)
+            rollup_resolutions: Yazılan özet pencere çözünürlükleri (saniye)
+            history_cache_size: Geçmiş sorgu önbelleğindeki en fazla girdi
+            history_cache_ttl: Önbellek girdisinin baştan sorgulanmadan kullanılabileceği süre
+                (saniye)
+            history_settle: Son bu kadar saniyedeki pencereler önbelleğe alınmaz
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.retention_days = retention_days
+        self.rollup_retention_days = rollup_retention_days
+        self.compact_interval = compact_interval
+        self.rollup_resolutions = list(rollup_resolutions)
+        self.conn = connect(path)
+
+        self._target_ids: Dict[str, int] = {}
+        # Olay tablosuna her başarısız örnek yerine yalnızca durum değişimleri yazılır
+        self.transitions = TransitionTracker()
+        self._samples: List[Tuple] = []
+        self._rollups: List[Tuple] = []
+        self._events: List[Tuple] = []
+        self._lines: List[Tuple] = []
+        self._flush_event: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._compact_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._closing = False
+
+        # Sayaçlar
+        self.enqueued = 0
+        self.dropped = 0
+        self.written_rows = 0
+        self.written_batches = 0
+        self.errors = 0
+        self.deleted_rows = 0
+        self.last_flush_seconds = 0.0
+
+        # Telemetri (okuma yalnızca /metrics kazımasında yapılır)
+        WRITER_QUEUE_DEPTH.labels('sqlite').set_function(lambda: len(self._samples))
+        self._flush_seconds = WRITER_FLUSH_SECONDS.labels('sqlite')
+        self._batch_size = WRITER_BATCH_SIZE.labels('sqlite')
+        self._dropped = WRITER_DROPPED.labels('sqlite')
+        self._errors = WRITER_ERRORS.labels('sqlite')
+
+        # Geçmiş veriler için sorgu ve sonuç önbelleği (ilk sorguda oluşturulur)
+        self._history_options = {
+            'max_entries': history_cache_size, 'ttl': history_cache_ttl, 'settle': history_settle
+        }
+        self._history: Optional['HistoryQuery'] = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Yazıcı sayaçlarını döndürür."""
+        return {
+            'queue_depth': len(self._samples),
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'written_rows': self.written_rows,
+            'written_batches': self.written_batches,
+            'errors': self.errors,
+            'deleted_rows': self.deleted_rows,
+            'last_flush_seconds': self.last_flush_seconds
+        }
+
+    def _ensure_started(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            loop = asyncio.get_running_loop()
+            self._flush_event = asyncio.Event()
+            self._flush_task = loop.create_task(self._flush_loop())
+            if self.compact_interval and self._compact_task is None:
+                self._compact_task = loop.create_task(self._compact_loop())
+
+    async def store_metrics(self, result: ProbeResult):
+        """Örneği yazma kuyruğuna ekler; hedefin durum değişimleri olay olarak da saklanır."""
+        self._ensure_started()
+        if len(self._samples) >= self.max_queue_size:
+            self.dropped += 1
+            self._dropped.inc()
+            return
+        self._samples.append((
+            result.target, result.time_ns, int(result.status), result.latency, result.packet_loss,
+            result.schedule_lag, result.interval,
+            json.dumps(result.extra) if result.extra else None
+        ))
+        transition = self.transitions.update(result)
+        if transition is not None:
+            details = transition[-1]
+            self._events.append((result.time_ns,) + transition[1:-1]
+                                + (json.dumps(details) if details else None,))
+        self.enqueued += 1
+        if len(self._samples) >= self.batch_size:
+            self._flush_event.set()
+
+    async def store_rollups(self, windows: List[ClosedWindow]):
+        """Kapanan özet pencerelerini kaydeder."""
+        if not windows:
+            return
+        self._ensure_started()
+        for target, resolution, window in windows:
+            fields = window.fields()
+            self._rollups.append(
+                (target, resolution, window.start)
+                + tuple(fields.get(name) for name in ROLLUP_FIELDS)
+            )
+
+    async def write_line(self, line: str) -> bool:
+        """
+        Diğer ölçümleri (ör. sunucu metrikleri) line protocol olarak saklar;
+        gerekirse `influx write` ile InfluxDB'ye aktarılabilir.
+        """
+        self._ensure_started()
+        self._lines.append((int(line.rsplit(' ', 1)[1]), line))
+        return True
+
+    def _resolve_targets(self, names) -> Dict[str, int]:
+        ids = self._target_ids
+        missing = [name for name in set(names) if name not in ids]
+        if missing:
+            self.conn.executemany("INSERT OR IGNORE INTO targets (name) VALUES (?)",
+                                  [(name,) for name in missing])
+            for name in missing:
+                ids[name] = self.conn.execute(
+                    "SELECT id FROM targets WHERE name = ?", (name,)
+                ).fetchone()[0]
+        return ids
+
+    def _write(self, samples: List[Tuple], rollups: List[Tuple],
+               events: List[Tuple], lines: List[Tuple]) -> None:
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            ids = self._resolve_targets(
+                [row[0] for row in samples] + [row[0] for row in rollups]
+            )
+            if samples:
+                conn.executemany(INSERT_SAMPLES_SQL, [(ids[row[0]],) + row[1:] for row in samples])
+            if rollups:
+                conn.executemany(INSERT_ROLLUPS_SQL, [(ids[row[0]],) + row[1:] for row in rollups])
+            if events:
+                conn.executemany(INSERT_EVENTS_SQL, events)
+            if lines:
+                conn.executemany(INSERT_MEASUREMENTS_SQL, lines)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            # Geri alınan işlemde eklenen hedef kimlikleri geçersizdir
+            self._target_ids.clear()
+            raise
+
+    async def _flush_loop(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Bekleyen tüm kayıtları tek bir işlemde yazar."""
+        async with self._flush_lock:
+            if not (self._samples or self._rollups or self._events or self._lines):
+                return
+            samples, self._samples = self._samples, []
+            rollups, self._rollups = self._rollups, []
+            events, self._events = self._events, []
+            lines, self._lines = self._lines, []
+
+            rows = len(samples) + len(rollups) + len(events) + len(lines)
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._write, samples, rollups, events, lines)
+            except Exception as e:
+                self.errors += 1
+                self._errors.inc()
+                logger.error(f"Yerel veritabanı yazma hatası ({rows} kayıt): {str(e)}")
+                return
+            finally:
+                self.last_flush_seconds = time.perf_counter() - started
+                self._flush_seconds.observe(self.last_flush_seconds)
+                self._batch_size.observe(rows)
+
+            self.written_rows += rows
+            self.written_batches += 1
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """
+        Saklama süresi dolan kayıtları siler ve boşalan sayfaları dosyaya geri verir.
+
+        Returns:
+            Silinen kayıt sayısı
+        """
+        now = time.time() if now is None else now
+        conn = self.conn
+        deleted = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            targets = [row[0] for row in conn.execute("SELECT id FROM targets").fetchall()]
+            if self.retention_days:
+                cutoff_ns = int((now - self.retention_days * 86400) * 10**9)
+                # Birincil anahtar (hedef, zaman) olduğu için hedef başına aralık silinir
+                for target in targets:
+                    deleted += conn.execute(
+                        "DELETE FROM samples WHERE target = ? AND time_ns < ?", (target, cutoff_ns)
+                    ).rowcount
+                deleted += conn.execute(
+                    "DELETE FROM events WHERE time_ns < ?", (cutoff_ns,)
+                ).rowcount
+                deleted += conn.execute(
+                    "DELETE FROM measurements WHERE time_ns < ?", (cutoff_ns,)
+                ).rowcount
+            if self.rollup_retention_days:
+                cutoff = int(now - self.rollup_retention_days * 86400)
+                for target in targets:
+                    deleted += conn.execute(
+                        "DELETE FROM rollups WHERE target = ? AND start < ?", (target, cutoff)
+                    ).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if deleted:
+            conn.execute("PRAGMA incremental_vacuum")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return deleted
+
+    async def _compact_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.compact_interval)
+            try:
+                async with self._flush_lock:
+                    deleted = await asyncio.to_thread(self.compact)
+                self.deleted_rows += deleted
+                if deleted:
+                    logger.info(f"Yerel veritabanından {deleted} eski kayıt silindi")
+            except Exception as e:
+                logger.error(f"Yerel veritabanı temizleme hatası: {str(e)}")
+
+    @property
+    def history(self) -> 'HistoryQuery':
+        """Geçmiş sorgu nesnesi; numpy'ı yüklediği için ilk kullanımda oluşturulur."""
+        if self._history is None:
+            from .history import HistoryQuery
+            self._history = HistoryQuery(
+                SqliteHistorySource(self.path, self.rollup_resolutions), **self._history_options
+            )
+        return self._history
+
+    def query_history(self, target: str, start: float, end: float,
+                      points: int = 100) -> Tuple['HistorySeries', int]:
+        """Geçmiş verileri grafik genişliğine indirgenmiş okur (bkz. `HistoryQuery.query`)."""
+        return self.history.query(target, start, end, points)
+
+    async def stop(self):
+        """Arka plan görevlerini durdurur; bekleyen kayıtları yazar."""
+        if self._compact_task is not None:
+            self._compact_task.cancel()
+            try:
+                await self._compact_task
+            except asyncio.CancelledError:
+                pass
+            self._compact_task = None
+        if self._flush_task is not None:
+            self._closing = True
+            self._flush_event.set()
+            await self._flush_task
+            self._flush_task = None
+            self._closing = False
+        await self.flush()
+
+    def close(self):
+        """Veritabanı bağlantılarını kapatır."""
+        if self._history is not None:
+            self._history.source.close()
+        self.conn.close()
@@ -1,59 +1,107 @@
 import asyncio
-from datetime import datetime
 import logging
-from typing import Dict, Optional
-from ping3 import ping
-import psutil
+import time
+from typing import Optional
+
+from .icmp import IcmpEngine, get_default_engine
+from .probe_result import ProbeResult, Status
+from .stats import summarize_rtts
 
 logger = logging.getLogger(__name__)
 
 class NetworkProbe:
-    def __init__(self, target: str = "8.8.8.8", timeout: float = 1.0):
+    def __init__(
+        self,
+        target: str = "8.8.8.8",
+        timeout: float = 1.0,
+        engine: Optional[IcmpEngine] = None,
+        burst_count: int = 1,
+        burst_spacing: float = 0.02,
+        degraded_burst_count: Optional[int] = None
+    ):
         """
         Ağ izleme sınıfı.
         
         Args:
             target: Hedef IP adresi veya alan adı
             timeout: Ping timeout süresi (saniye)
+            engine: Paylaşılan ICMP motoru (verilmezse süreç geneli motor kullanılır)
+            burst_count: Her kontrolde gönderilecek echo sayısı
+            burst_spacing: Burst içindeki echo'lar arası süre (saniye)
+            degraded_burst_count: `degraded` işaretliyken gönderilecek echo sayısı
+                (uyarlanır aralıkta hedef bozulduğunda kayıp ve titreşim ayrıntılı ölçülür)
         """
         self.target = target
         self.timeout = timeout
+        self.engine = engine or get_default_engine()
+        self.burst_count = max(1, burst_count)
+        self.burst_spacing = burst_spacing
+        self.degraded_burst_count = degraded_burst_count
+        self.degraded = False
         self._running = False
-        self._last_cpu_check = 0
-        self._cpu_check_interval = 60  # CPU kullanımını her 60 saniyede bir kontrol et
 
-    async def perform_check(self) -> Dict:
+    async def perform_check(self) -> ProbeResult:
         """Tek bir ağ kontrolü gerçekleştirir."""
+        time_ns, sent_mono = time.time_ns(), time.monotonic_ns()
+        burst_count = self.burst_count
+        if self.degraded and self.degraded_burst_count:
+            burst_count = max(burst_count, self.degraded_burst_count)
         try:
-            # Ping işlemi
-            latency = ping(self.target, timeout=self.timeout)
-            
-            # Sonuçları hazırla
-            result = {
-                'timestamp': datetime.utcnow().isoformat(),
-                'target': self.target,
-                'status': 'OK' if latency else 'FAIL',
-                'latency': round(latency * 1000, 2) if latency else None,  # ms cinsinden
-                'packet_loss': 0 if latency else 100
-            }
+            if burst_count > 1:
+                result = await self._burst_check(time_ns, sent_mono, burst_count)
+            else:
+                # Ping işlemi
+                latency = await self.engine.ping(self.target, timeout=self.timeout)
 
-            # Her 60 saniyede bir CPU kullanımını kontrol et
-            current_time = datetime.utcnow().timestamp()
-            if current_time - self._last_cpu_check >= self._cpu_check_interval:
-                result['cpu_usage'] = psutil.cpu_percent(interval=0.1)
-                result['memory_usage'] = psutil.Process().memory_percent()
-                self._last_cpu_check = current_time
+                # Sonuçları hazırla
+                # 0.0 geçerli bir (yuvarlanmış) gecikmedir; yalnızca None zaman aşımıdır
+                replied = latency is not None
+                result = ProbeResult(
+                    self.target,
+                    Status.OK if replied else Status.FAIL,
+                    latency=round(latency * 1000, 2) if replied else None,  # ms cinsinden
+                    packet_loss=0.0 if replied else 100.0,
+                    time_ns=time_ns,
+                    sent_mono=sent_mono
+                )
 
             return result
 
         except Exception as e:
             logger.error(f"Ağ kontrolü sırasında hata: {str(e)}")
-            return {
-                'timestamp': datetime.utcnow().isoformat(),
-                'target': self.target,
-                'status': 'ERROR',
-                'error': str(e)
-            }
+            return ProbeResult(
+                self.target,
+                Status.ERROR,
+                time_ns=time_ns,
+                sent_mono=sent_mono,
+                error=str(e)
+            )
+
+    async def _send_after(self, delay: float) -> Optional[float]:
+        if delay:
+            await asyncio.sleep(delay)
+        return await self.engine.ping(self.target, timeout=self.timeout)
+
+    async def _burst_check(self, time_ns: int, sent_mono: int, burst_count: int) -> ProbeResult:
+        """
+        Aralıklı N echo gönderir, yanıtları eşzamanlı toplar ve
+        kayıp, RTT, titreşim ve yüzdelik istatistiklerini hesaplar.
+        """
+        rtts = await asyncio.gather(*(
+            self._send_after(i * self.burst_spacing) for i in range(burst_count)
+        ))
+        summary = summarize_rtts([rtt * 1000 if rtt is not None else None for rtt in rtts])
+        packet_loss = summary.pop('packet_loss')
+
+        return ProbeResult(
+            self.target,
+            Status.OK if summary['packets_received'] else Status.FAIL,
+            latency=summary.get('rtt_avg'),
+            packet_loss=packet_loss,
+            time_ns=time_ns,
+            sent_mono=sent_mono,
+            extra=summary
+        )
 
     async def continuous_monitor(self, interval: float = 1.0):
         """
@@ -0,0 +1,483 @@
+import asyncio
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .adaptive import AdaptiveInterval
+from .alerts import (AlertDispatcher, AlertEngine, ConsecutiveFailureRule,
+                     EmailNotifier, RateOfChangeRule, ThresholdRule)
+from .capture import CAPTURE_SUFFIX, CaptureWriter
+from .connection_probe import TcpProbe, connection_label
+from .dns_probe import DnsProbe, dns_label
+from .network_probe import NetworkProbe
+from .probe_result import ProbeResult, Status
+from .rollup import RollupAggregator
+from .scheduler import ProbeScheduler, ScheduledProbe
+from .spool import Spool
+from .telemetry import REGISTRY, monitor_event_loop
+from .traceroute import TracerouteProbe, traceroute_label
+
+if TYPE_CHECKING:
+    from .history import HistoryQuery
+
+logger = logging.getLogger(__name__)
+
+CHECK_DURATION = REGISTRY.histogram(
+    'probe_check_duration_seconds', 'Gönderimden sonucun işlenmesine kadar geçen süre', ['target'])
+CHECKS = REGISTRY.counter('probe_checks', 'Tamamlanan kontroller', ['status'])
+SCHEDULE_LAG = REGISTRY.histogram(
+    'scheduler_lag_seconds', 'Kontrolün planlanan zamandan ne kadar geç başladığı')
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    'event_loop_lag_seconds', 'Olay döngüsü uyandırma gecikmesi')
+IN_FLIGHT = REGISTRY.gauge('probes_in_flight', 'Şu anda çalışmakta olan kontroller')
+ROLLUP_LATE = REGISTRY.gauge(
+    'rollup_late_samples', 'Penceresi kapandıktan sonra geldiği için özete eklenmeyen örnekler')
+
+# (hedef sırası, hedef yapılandırması)
+TargetSpec = Tuple[int, Dict]
+
+
+def build_data_store(config, spool_directory: Optional[str] = None):
+    """
+    Yapılandırmadan veri deposunu (ve varsa spool'u) oluşturur.
+
+    Args:
+        config: Uygulama yapılandırması
+        spool_directory: Spool dizini (verilmezse `spool.directory`)
+
+    Returns:
+        `storage.backend` değerine göre `DataStore` (influx) veya `LocalDataStore` (sqlite)
+    """
+    # Arka uç kütüphaneleri yalnızca seçildiklerinde yüklenir (başsız toplayıcının
+    # başlangıç süresi ve belleği kullanılmayan istemcilere harcanmasın)
+    if config.get('storage.backend', 'influx') == 'sqlite':
+        from .local_store import LocalDataStore
+        return LocalDataStore(
+            config.get('storage.path', 'data/network_monitor.db'),
+            batch_size=config.get('storage.batch_size', 5000),
+            flush_interval=config.get('storage.flush_interval', 1),
+            max_queue_size=config.get('storage.max_queue_size', 100000),
+            retention_days=config.get('storage.retention_days', 30),
+            rollup_retention_days=config.get('storage.rollup_retention_days', 365),
+            compact_interval=config.get('storage.compact_interval', 3600),
+            rollup_resolutions=_rollup_resolutions(config),
+            history_cache_size=config.get('history.cache_size', 256),
+            history_cache_ttl=config.get('history.cache_ttl', 300),
+            history_settle=config.get('history.settle', 30)
+        )
+
+    # Arka uç kesintilerinde verilerin saklanacağı disk kuyruğu
+    spool = None
+    if config.get('spool.enabled', True):
+        spool = Spool(
+            spool_directory or config.get('spool.directory', 'spool'),
+            segment_size=config.get('spool.segment_size_mb', 16) * 1024 * 1024,
+            max_bytes=config.get('spool.max_size_mb', 512) * 1024 * 1024,
+            fsync=config.get('spool.fsync', True)
+        )
+
+    from .data_store import DataStore
+    return DataStore(
+        influx_url=config.get('influxdb.url'),
+        influx_token=config.get('influxdb.token'),
+        influx_org=config.get('influxdb.org'),
+        influx_bucket=config.get('influxdb.bucket'),
+        postgres_dsn=config.get('postgresql.dsn'),
+        batch_size=config.get('influxdb.batch_size', 100),
+        flush_interval=config.get('influxdb.flush_interval', 10),
+        max_queue_size=config.get('influxdb.max_queue_size', 10000),
+        drop_policy=config.get('influxdb.drop_policy', 'drop_oldest'),
+        pg_min_connections=config.get('postgresql.min_connections', 1),
+        pg_max_connections=config.get('postgresql.max_connections', 4),
+        pg_batch_size=config.get('postgresql.batch_size', 500),
+        pg_flush_interval=config.get('postgresql.flush_interval', 5),
+        pg_retention_days=config.get('postgresql.retention_days', 365),
+        pg_maintenance_interval=config.get('postgresql.maintenance_interval', 3600),
+        spool=spool,
+        replay_rate=config.get('spool.replay_rate', 20),
+        rollup_resolutions=_rollup_resolutions(config),
+        history_cache_size=config.get('history.cache_size', 256),
+        history_cache_ttl=config.get('history.cache_ttl', 300),
+        history_settle=config.get('history.settle', 30)
+    )
+
+
+def build_capture(config, name: str = 'collector') -> Optional[CaptureWriter]:
+    """
+    `capture` bölümünden sonuç kaydedicisini oluşturur; kapalıysa None döner.
+
+    Args:
+        config: Uygulama yapılandırması
+        name: Dosya adı öneki (çalışan süreçlerde `worker-<sıra>`)
+    """
+    if not config.get('capture.enabled', False):
+        return None
+    started = time.strftime('%Y%m%dT%H%M%S')
+    directory = config.get('capture.directory', 'captures')
+    return CaptureWriter(
+        os.path.join(directory, f'{name}-{started}{CAPTURE_SUFFIX}'),
+        codec=config.get('capture.compression', 'zlib'),
+        block_records=config.get('capture.block_records', 4096),
+        max_bytes=config.get('capture.max_file_mb', 256) * 1024 * 1024,
+        flush_interval=config.get('capture.flush_interval', 5)
+    )
+
+
+def _rollup_resolutions(config) -> List[int]:
+    if not config.get('rollups.enabled', True):
+        return []
+    return config.get('rollups.resolutions', [1, 60, 3600])
+
+
+def build_history(config) -> 'HistoryQuery':
+    """
+    Panel süreci için yalnızca okuma yapan geçmiş sorgu nesnesi oluşturur
+    (veri deposunun yazıcılarını ve PostgreSQL havuzunu açmaz).
+    """
+    from .history import HistoryQuery, InfluxHistorySource
+
+    if config.get('storage.backend', 'influx') == 'sqlite':
+        from .local_store import SqliteHistorySource
+        source = SqliteHistorySource(
+            config.get('storage.path', 'data/network_monitor.db'), _rollup_resolutions(config)
+        )
+    else:
+        from influxdb_client import InfluxDBClient
+        client = InfluxDBClient(
+            url=config.get('influxdb.url'),
+            token=config.get('influxdb.token'),
+            org=config.get('influxdb.org')
+        )
+        source = InfluxHistorySource(
+            client.query_api(),
+            config.get('influxdb.bucket'),
+            config.get('influxdb.org'),
+            _rollup_resolutions(config)
+        )
+    return HistoryQuery(
+        source,
+        max_entries=config.get('history.cache_size', 256),
+        ttl=config.get('history.cache_ttl', 300),
+        settle=config.get('history.settle', 30)
+    )
+
+
+def build_alerting(config) -> Optional[Tuple[AlertEngine, AlertDispatcher]]:
+    """
+    `alerts` bölümünden uyarı motorunu ve bildirim dağıtıcısını oluşturur.
+    Eşiği 0 ya da boş olan kurallar eklenmez.
+    """
+    if not config.get('alerts.enabled', True):
+        return None
+
+    window = config.get('alerts.window', 5)
+    hysteresis = config.get('alerts.hysteresis', 0.8)
+    rules = []
+    if config.get('alerts.latency_threshold'):
+        rules.append(ThresholdRule(
+            'latency', 'latency', config.get('alerts.latency_threshold'), window, hysteresis
+        ))
+    if config.get('alerts.packet_loss_threshold'):
+        rules.append(ThresholdRule(
+            'packet_loss', 'packet_loss', config.get('alerts.packet_loss_threshold'),
+            window, hysteresis
+        ))
+    if config.get('alerts.consecutive_failures'):
+        rules.append(ConsecutiveFailureRule(
+            'consecutive_failures',
+            config.get('alerts.consecutive_failures'),
+            config.get('alerts.recoveries', 1)
+        ))
+    if config.get('alerts.latency_change_threshold'):
+        rules.append(RateOfChangeRule(
+            'latency_change', 'latency', config.get('alerts.latency_change_threshold'),
+            window, hysteresis
+        ))
+    if not rules:
+        return None
+
+    notifiers = []
+    for method in config.get('alerts.methods') or []:
+        if not method.get('enabled', False):
+            continue
+        if method.get('type') == 'email':
+            notifiers.append(EmailNotifier(
+                method['smtp_server'],
+                method.get('smtp_port', 587),
+                method['username'],
+                method['password'],
+                method.get('recipients', [])
+            ))
+        else:
+            logger.warning(f"Bilinmeyen bildirim yöntemi: {method.get('type')}")
+
+    engine = AlertEngine(rules, cooldown=config.get('alerts.notification_cooldown', 300))
+    dispatcher = AlertDispatcher(notifiers, max_queue_size=config.get('alerts.queue_size', 1000))
+    return engine, dispatcher
+
+
+def target_label(target: Dict) -> str:
+    """Hedefin sonuçlarda kullanılan adı; aynı adresteki farklı prob tiplerini ayırır."""
+    kind = target.get('type', 'icmp')
+    if kind in ('tcp', 'tls'):
+        return connection_label(kind, target['address'], target.get('port'))
+    if kind == 'dns':
+        return dns_label(target['address'], target.get('resolver'))
+    if kind == 'traceroute':
+        return traceroute_label(target['address'])
+    return target['address']
+
+
+def build_adaptive_interval(config, target: Dict) -> Optional[AdaptiveInterval]:
+    """
+    `app.scheduler.adaptive` bölümünden hedefin uyarlanır aralığını oluşturur.
+    Kapalıysa ya da hedefte `adaptive: false` verilmişse None döner.
+    """
+    if not config.get('app.scheduler.adaptive.enabled', False) or not target.get('adaptive', True):
+        return None
+    return AdaptiveInterval(
+        target['interval'],
+        fast=config.get('app.scheduler.adaptive.fast_interval', 0.5),
+        maximum=config.get('app.scheduler.adaptive.max_interval', 60),
+        backoff=config.get('app.scheduler.adaptive.backoff', 2.0),
+        stable_checks=config.get('app.scheduler.adaptive.stable_checks', 10),
+        latency_change=config.get('app.scheduler.adaptive.latency_change', 0.5),
+        min_latency_change=config.get('app.scheduler.adaptive.min_latency_change', 1.0)
+    )
+
+
+def build_probe(target: Dict, limiter: Optional[asyncio.Semaphore] = None,
+                degraded_burst_count: Optional[int] = None):
+    """
+    Hedef yapılandırmasından prob oluşturur.
+
+    Args:
+        target: Hedef yapılandırması; `type` icmp (varsayılan), tcp, tls, dns veya traceroute
+        limiter: Bağlantı, DNS ve yol keşfi problarının eşzamanlı deneme sınırı
+        degraded_burst_count: Uyarlanır aralıkta hedef bozulduğunda ICMP echo sayısı
+    """
+    kind = target.get('type', 'icmp')
+    timeout = target.get('timeout', 1.0)
+    if kind == 'icmp':
+        return NetworkProbe(
+            target=target['address'],
+            timeout=timeout,
+            burst_count=target.get('burst_count', 1),
+            burst_spacing=target.get('burst_spacing', 0.02),
+            degraded_burst_count=degraded_burst_count
+        )
+    if kind in ('tcp', 'tls'):
+        return TcpProbe(
+            target['address'],
+            port=target.get('port'),
+            timeout=timeout,
+            tls=kind == 'tls',
+            server_name=target.get('server_name'),
+            verify=target.get('verify', True),
+            payload=target.get('payload'),
+            limiter=limiter
+        )
+    if kind == 'dns':
+        return DnsProbe(
+            target['address'],
+            resolver=target.get('resolver'),
+            port=target.get('resolver_port', 53),
+            record_type=target.get('record_type', 'A'),
+            timeout=timeout,
+            limiter=limiter
+        )
+    if kind == 'traceroute':
+        return TracerouteProbe(
+            target['address'],
+            max_hops=target.get('max_hops', 30),
+            timeout=target.get('timeout', 2.0),
+            retrace_interval=target.get('retrace_interval', 3600),
+            latency_change=target.get('latency_change', 0.5),
+            min_latency_change=target.get('min_latency_change', 1.0),
+            limiter=limiter
+        )
+    raise ValueError(f"Bilinmeyen prob tipi: {kind}")
+
+
+class CollectorPipeline:
+    def __init__(
+        self,
+        config,
+        targets: List[TargetSpec],
+        data_store,
+        publish: Optional[Callable[[int, ProbeResult], None]] = None,
+        active=None,
+        host_metrics: bool = True,
+        capture: Optional[CaptureWriter] = None
+    ):
+        """
+        Tek bir olay döngüsünde çalışan toplama hattı: zamanlayıcı, problar,
+        veri deposu, özet pencereleri ve uyarılar.
+
+        Args:
+            config: Uygulama yapılandırması
+            targets: Bu hattın kontrol edeceği hedefler
+            data_store: Sonuçların yazılacağı veri deposu (`DataStore` veya `LocalDataStore`)
+            publish: Her sonuç için çağrılır (hedef sırası, sonuç)
+            active: `is_set()` sağlayan izleme bayrağı; verilmezse her zaman aktif
+            host_metrics: Sunucu metrikleri bu hatta toplansın mı (süreç başına değil,
+                tek bir hatta açılmalı)
+            capture: Sonuçların ayrıca yazılacağı kayıt dosyası
+        """
+        self.data_store = data_store
+        self.publish = publish
+        self.active = active
+        self.capture = capture
+
+        # Çok çözünürlüklü özet pencereleri
+        self.rollups = None
+        if config.get('rollups.enabled', True):
+            self.rollups = RollupAggregator(
+                resolutions=config.get('rollups.resolutions', [1, 60, 3600]),
+                relative_accuracy=config.get('rollups.relative_accuracy', 0.01)
+            )
+
+        # Sunucu metrikleri problardan bağımsız, tek bir görevde toplanır
+        self.host_metrics = None
+        interval = config.get('app.cpu_check_interval', 60)
+        if host_metrics and interval:
+            from .host_metrics import HostMetricsSampler
+            self.host_metrics = HostMetricsSampler(self.data_store.write_line, interval)
+
+        # Örnek başına artımlı uyarı değerlendirmesi
+        self.alerts, self.dispatcher = build_alerting(config) or (None, None)
+
+        self.scheduler = ProbeScheduler(
+            self.handle,
+            jitter=config.get('app.scheduler.jitter', 1.0),
+            max_concurrency=config.get('app.scheduler.max_concurrency', 1000)
+        )
+        # Bağlantı ve DNS problarının aynı anda açabileceği soket sayısı sınırı
+        limiter = asyncio.Semaphore(config.get('app.scheduler.max_connections', 1000))
+        self._target_ids: Dict[object, int] = {}
+        self._adaptive: Dict[object, AdaptiveInterval] = {}
+        degraded_burst_count = config.get('app.scheduler.adaptive.burst_count', 5)
+        # Telemetri metrikleri sıcak yolda etiket araması yapılmasın diye önceden alınır
+        self._check_durations = {}
+        self._checks = {status: CHECKS.labels(status.name) for status in Status}
+        self._schedule_lag = SCHEDULE_LAG.labels()
+        for target_id, target in targets:
+            adaptive = build_adaptive_interval(config, target)
+            probe = build_probe(target, limiter, degraded_burst_count if adaptive else None)
+            if adaptive is not None:
+                self._adaptive[probe] = adaptive
+            self._target_ids[probe] = target_id
+            self._check_durations[probe] = CHECK_DURATION.labels(probe.target)
+            self.scheduler.add(probe, target['interval'])
+        if self.rollups is not None:
+            # Sonuçlar gönderim zamanıyla gelir; pencere en yavaş prob yanıtlanmadan
+            # kapanmasın (yol keşfi ping ardından iz sürdüğünden iki zaman aşımı)
+            longest = max((probe.timeout for probe in self._target_ids), default=0.0)
+            self.rollups.grace = max(self.rollups.grace, 2 * longest)
+            ROLLUP_LATE.set_function(lambda: self.rollups.late_samples)
+        self._flush_task = None
+        self._capture_task = None
+        self._monitor_task = None
+
+    async def handle(self, entry: ScheduledProbe) -> None:
+        """Zamanlayıcı tarafından tetiklenen tek bir kontrolü işler."""
+        if self.active is not None and not self.active.is_set():
+            return
+
+        probe = entry.probe
+        try:
+            result = await probe.perform_check()
+            result.schedule_lag = round(entry.last_lag * 1000, 3)  # ms cinsinden
+            result.interval = entry.interval
+            self._schedule_lag.observe(entry.last_lag)
+            self._checks[result.status].inc()
+            await self.data_store.store_metrics(result)
+            if self.capture is not None:
+                self.capture.append(result)
+            if result.extra and result.extra.get('traced'):
+                for line in probe.hop_lines(result.time_ns):
+                    await self.data_store.write_line(line)
+
+            timestamp = result.timestamp
+            if self.rollups is not None:
+                await self.data_store.store_rollups(self.rollups.add(
+                    probe.target, timestamp, result.latency, result.packet_loss, result.ok,
+                    entry.interval
+                ))
+
+            if self.alerts is not None:
+                for alert in self.alerts.evaluate(
+                    probe.target, timestamp, result.latency, result.packet_loss, result.ok
+                ):
+                    self.dispatcher.submit(alert)
+
+            if self.publish is not None:
+                self.publish(self._target_ids[probe], result)
+            self._check_durations[probe].observe((time.monotonic_ns() - result.sent_mono) / 1e9)
+
+            # Aralık en son güncellenir; kontrol bitmeden yeni tetiklenme atlanmasın
+            adaptive = self._adaptive.get(probe)
+            if adaptive is not None:
+                interval = adaptive.observe(result.status, result.latency, result.packet_loss)
+                if interval != entry.interval:
+                    self.scheduler.set_interval(entry, interval)
+                if hasattr(probe, 'degraded'):
+                    probe.degraded = adaptive.degraded
+        except Exception as e:
+            logger.error(f"Veri güncelleme hatası: {str(e)}")
+
+    async def _flush_rollups(self) -> None:
+        """Yeni örnek gelmeyen hedeflerin süresi dolan özet pencerelerini kapatır."""
+        while True:
+            await asyncio.sleep(1)
+            try:
+                await self.data_store.store_rollups(self.rollups.flush_expired(time.time()))
+            except Exception as e:
+                logger.error(f"Özet pencere hatası: {str(e)}")
+
+    async def _flush_capture(self) -> None:
+        """Dolmayan kayıt bloğunu düzenli olarak diske yazar."""
+        while True:
+            await asyncio.sleep(self.capture.flush_interval)
+            try:
+                await asyncio.to_thread(self.capture.flush)
+            except Exception as e:
+                logger.error(f"Kayıt dosyası hatası: {str(e)}")
+
+    async def run(self) -> None:
+        """Hedefleri durdurulana kadar kendi aralıklarında kontrol eder."""
+        in_flight = IN_FLIGHT.labels()
+        self._monitor_task = asyncio.create_task(monitor_event_loop(
+            EVENT_LOOP_LAG.labels(), on_tick=lambda: in_flight.set(self.scheduler.in_flight)
+        ))
+        if self.rollups is not None:
+            self._flush_task = asyncio.create_task(self._flush_rollups())
+        if self.capture is not None:
+            self._capture_task = asyncio.create_task(self._flush_capture())
+        if self.dispatcher is not None:
+            self.dispatcher.start()
+        if self.host_metrics is not None:
+            self.host_metrics.start()
+        try:
+            await self.scheduler.run()
+        finally:
+            self._monitor_task.cancel()
+            if self._flush_task is not None:
+                self._flush_task.cancel()
+            if self._capture_task is not None:
+                self._capture_task.cancel()
+
+    async def stop(self) -> None:
+        """Zamanlayıcıyı durdurur, açık özet pencerelerini ve bekleyen verileri yazar."""
+        self.scheduler.stop()
+        if self.host_metrics is not None:
+            await self.host_metrics.stop()
+        if self.rollups is not None:
+            await self.data_store.store_rollups(self.rollups.flush_expired(float('inf')))
+        if self.dispatcher is not None:
+            await self.dispatcher.stop()
+        if self.capture is not None:
+            await asyncio.to_thread(self.capture.close)
+        await self.data_store.stop()
+        self.data_store.close()
@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+from enum import IntEnum
+import math
+import time
+from typing import Dict, Optional
+
+from .influx_writer import escape_key
+
+
+class Status(IntEnum):
+    OK = 0
+    FAIL = 1
+    ERROR = 2
+
+
+def _finite(value: Optional[float]) -> bool:
+    return value is not None and math.isfinite(value)
+
+
+class ProbeResult:
+    __slots__ = (
+        'target', 'status', 'latency', 'packet_loss', 'time_ns', 'sent_mono',
+        'schedule_lag', 'interval', 'error', 'extra'
+    )
+
+    def __init__(
+        self,
+        target: str,
+        status: Status,
+        latency: Optional[float] = None,
+        packet_loss: float = 0.0,
+        time_ns: Optional[int] = None,
+        sent_mono: Optional[int] = None,
+        error: Optional[str] = None,
+        extra: Optional[Dict[str, float]] = None
+    ):
+        """
+        Tek bir kontrolün sonucu.
+
+        Args:
+            target: Hedef adresi
+            status: Kontrol durumu
+            latency: Gecikme (ms), ölçülemediyse None
+            packet_loss: Paket kaybı (%)
+            time_ns: Gönderim anının duvar saati zamanı (Unix zamanı, nanosaniye)
+            sent_mono: Gönderim anının monoton saat değeri (nanosaniye)
+            error: Hata mesajı (ERROR durumunda)
+            extra: Ek sayısal alanlar (ör. burst istatistikleri)
+        """
+        self.target = target
+        self.status = status
+        self.latency = latency
+        self.packet_loss = packet_loss
+        self.time_ns = time.time_ns() if time_ns is None else time_ns
+        self.sent_mono = time.monotonic_ns() if sent_mono is None else sent_mono
+        self.schedule_lag: Optional[float] = None
+        # Örneğin temsil ettiği süre (saniye); uyarlanır aralıkta örnekler değişken
+        # sıklıkta alındığı için oranlar bu süreyle ağırlıklandırılır
+        self.interval: Optional[float] = None
+        self.error = error
+        self.extra = extra
+
+    def __repr__(self) -> str:
+        return (f"ProbeResult({self.target}, {self.status.name}, "
+                f"latency={self.latency}, packet_loss={self.packet_loss})")
+
+    @property
+    def ok(self) -> bool:
+        return self.status is Status.OK
+
+    @property
+    def timestamp(self) -> float:
+        """Sonuç zamanı (Unix zamanı, saniye)."""
+        return self.time_ns / 1e9
+
+    @property
+    def timestamp_us(self) -> int:
+        """Sonuç zamanı (Unix zamanı, mikrosaniye); panel sütunları bu birimi kullanır."""
+        return self.time_ns // 1000
+
+    @property
+    def utc_time(self) -> datetime:
+        """Sonuç zamanı (UTC, mikrosaniye hassasiyetinde)."""
+        return datetime.fromtimestamp(self.time_ns // 10**9, timezone.utc).replace(
+            microsecond=self.time_ns // 1000 % 10**6
+        )
+
+    def to_line(self) -> str:
+        """
+        Sonucu `network_metrics` line protocol satırına çevirir.
+
+        Alan tiplerinin ölçümler arasında çakışmaması için sayılar float yazılır;
+        line protocol nan/inf kabul etmediğinden sonlu olmayan değerler atlanır.
+        """
+        fields = f'packet_loss={float(self.packet_loss)!r}'
+        if _finite(self.latency):
+            fields = f'latency={float(self.latency)!r},{fields}'
+        if _finite(self.schedule_lag):
+            fields += f',schedule_lag={float(self.schedule_lag)!r}'
+        if _finite(self.interval):
+            fields += f',interval={float(self.interval)!r}'
+        if self.extra:
+            for key, value in self.extra.items():
+                if _finite(value):
+                    fields += f',{key}={float(value)!r}'
+        return (f'network_metrics,status={self.status.name},target={escape_key(self.target)} '
+                f'{fields} {self.time_ns}')
@@ -0,0 +1,101 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from .probe_result import ProbeResult, Status
+
+STATUS_NAMES = tuple(status.name for status in Status)
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+
+class RingBuffer:
+    def __init__(self, capacity: int):
+        """
+        Hedef başına sabit boyutlu, sütun tabanlı örnek tamponu.
+
+        Sütunlar önceden ayrılır; her örnek hem `i` hem `i + capacity`
+        konumuna yazılır, böylece son N örnek her zaman kopyasız, bitişik
+        bir NumPy görünümü olarak okunabilir.
+
+        Args:
+            capacity: Tutulacak en fazla örnek sayısı
+        """
+        if capacity <= 0:
+            raise ValueError("Tampon kapasitesi pozitif olmalı")
+        self.capacity = capacity
+        self.timestamp = np.zeros(2 * capacity, dtype='datetime64[us]')
+        self.latency = np.full(2 * capacity, np.nan, dtype=np.float32)
+        self.packet_loss = np.zeros(2 * capacity, dtype=np.float32)
+        self.status = np.zeros(2 * capacity, dtype=np.uint8)
+        self._head = 0
+        self._size = 0
+        self.total = 0  # eklenen toplam örnek; veri sürümü olarak da kullanılır
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Tamponun sütunlar için ayırdığı bellek (bayt)."""
+        return (self.timestamp.nbytes + self.latency.nbytes
+                + self.packet_loss.nbytes + self.status.nbytes)
+
+    def append(
+        self,
+        timestamp: np.datetime64,
+        latency: Optional[float],
+        packet_loss: float,
+        status: int
+    ) -> None:
+        """
+        Tampona O(1) sürede bir örnek ekler; doluysa en eskinin üzerine yazar.
+
+        Args:
+            timestamp: Örnek zamanı
+            latency: Gecikme (ms), ölçülemediyse None
+            packet_loss: Paket kaybı (%)
+            status: Durum kodu (STATUS_CODES)
+        """
+        for i in (self._head, self._head + self.capacity):
+            self.timestamp[i] = timestamp
+            self.latency[i] = np.nan if latency is None else latency
+            self.packet_loss[i] = packet_loss
+            self.status[i] = status
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self.total += 1
+
+    def append_result(self, result: ProbeResult) -> None:
+        """Prob sonucunu tampona ekler."""
+        self.append(
+            np.datetime64(result.timestamp_us, 'us'),
+            result.latency,
+            result.packet_loss,
+            result.status
+        )
+
+    def window_since(self, index: int) -> Dict[str, np.ndarray]:
+        """
+        Mutlak sırası `index` ve sonrası olan örnekleri döndürür.
+
+        Args:
+            index: Mutlak örnek sırası (0 ilk eklenen örnek; `total` bir sonraki)
+        """
+        return self.window(max(self.total - index, 0))
+
+    def window(self, count: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Son `count` örneği eskiden yeniye kopyasız görünümler olarak döndürür.
+
+        Args:
+            count: Örnek sayısı (verilmezse tampondaki tüm örnekler)
+        """
+        count = self._size if count is None else min(count, self._size)
+        end = self._head + self.capacity
+        window = slice(end - count, end)
+        return {
+            'timestamp': self.timestamp[window],
+            'latency': self.latency[window],
+            'packet_loss': self.packet_loss[window],
+            'status': self.status[window]
+        }
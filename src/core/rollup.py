@@ -0,0 +1,212 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .sketch import LatencySketch
+
+
+def resolution_name(seconds: int) -> str:
+    """Çözünürlüğü ölçüm adı son ekine çevirir (1 -> '1s', 60 -> '1m')."""
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds % size == 0:
+            return f'{seconds // size}{unit}'
+    return f'{seconds}s'
+
+
+class RollupWindow:
+    __slots__ = (
+        'start', 'count', 'failures', 'weight', 'loss_sum',
+        'latency_count', 'latency_sum', 'latency_min', 'latency_max', 'sketch'
+    )
+
+    def __init__(self, start: int, relative_accuracy: float = 0.01):
+        """
+        Tek bir zaman penceresinin özet istatistikleri.
+
+        Args:
+            start: Pencere başlangıcı (Unix zamanı, saniye)
+            relative_accuracy: Yüzdelik taslağının göreli hatası
+        """
+        self.start = start
+        self.count = 0
+        self.failures = 0
+        self.weight = 0.0
+        self.loss_sum = 0.0
+        self.latency_count = 0
+        self.latency_sum = 0.0
+        self.latency_min = math.inf
+        self.latency_max = -math.inf
+        self.sketch = LatencySketch(relative_accuracy)
+
+    def add(self, latency: Optional[float], packet_loss: float, ok: bool,
+            weight: float = 1.0) -> None:
+        # Paket kaybı örneğin temsil ettiği süreyle ağırlıklandırılır; uyarlanır
+        # aralıkta bozulma sırasındaki sık örnekler ortalamayı şişirmez
+        self.count += 1
+        self.weight += weight
+        self.loss_sum += packet_loss * weight
+        if not ok:
+            self.failures += 1
+        if latency is not None:
+            self.latency_count += 1
+            self.latency_sum += latency
+            self.latency_min = min(self.latency_min, latency)
+            self.latency_max = max(self.latency_max, latency)
+            self.sketch.add(latency)
+
+    def merge(self, other: 'RollupWindow') -> None:
+        self.count += other.count
+        self.failures += other.failures
+        self.weight += other.weight
+        self.loss_sum += other.loss_sum
+        self.latency_count += other.latency_count
+        self.latency_sum += other.latency_sum
+        self.latency_min = min(self.latency_min, other.latency_min)
+        self.latency_max = max(self.latency_max, other.latency_max)
+        self.sketch.merge(other.sketch)
+
+    def fields(self) -> Dict[str, float]:
+        """Pencereyi yazılacak alanlara çevirir."""
+        fields = {
+            'count': float(self.count),
+            'failures': float(self.failures),
+            'packet_loss': self.loss_sum / self.weight if self.weight else 0.0
+        }
+        if self.latency_count:
+            fields.update({
+                'latency_min': self.latency_min,
+                'latency_max': self.latency_max,
+                'latency_mean': self.latency_sum / self.latency_count,
+                'latency_p50': self.sketch.quantile(0.50),
+                'latency_p95': self.sketch.quantile(0.95),
+                'latency_p99': self.sketch.quantile(0.99)
+            })
+        return fields
+
+
+ClosedWindow = Tuple[str, int, RollupWindow]  # (hedef, çözünürlük, pencere)
+
+
+class RollupAggregator:
+    def __init__(
+        self,
+        resolutions: Sequence[int] = (1, 60, 3600),
+        relative_accuracy: float = 0.01,
+        grace: float = 2.0
+    ):
+        """
+        Hedef başına çok çözünürlüklü, akan (tumbling) pencere toplayıcısı.
+
+        Örnekler yalnızca en ince pencereye eklenir; kapanan pencere bir
+        üst çözünürlüğe birleştirilir. Bu yüzden örnek başına maliyet
+        çözünürlük sayısından bağımsızdır.
+
+        Args:
+            resolutions: Artan sırada pencere boyları (saniye); her biri bir öncekinin katı olmalı
+            relative_accuracy: Yüzdelik taslaklarının göreli hatası
+            grace: Geç gelen örnekler için pencere kapanmadan önce beklenecek süre (saniye);
+                en uzun prob zaman aşımından kısa olmamalıdır
+
+        Kapanmış (yazılmış) bir pencereye düşen geç örnekler pencereyi yeniden
+        açıp tamamlanmış özetin üzerine yazmasın diye atılır ve `late_samples`
+        ile sayılır.
+        """
+        resolutions = sorted(resolutions)
+        for finer, coarser in zip(resolutions, resolutions[1:]):
+            if coarser % finer:
+                raise ValueError("Her çözünürlük bir öncekinin katı olmalı")
+        self.resolutions = resolutions
+        self.relative_accuracy = relative_accuracy
+        self.grace = grace
+        self._windows: Dict[str, List[Optional[RollupWindow]]] = {}
+        # Hedef ve çözünürlük başına kapanan son pencerenin bitişi (Unix zamanı, saniye)
+        self._closed_until: Dict[str, List[float]] = {}
+
+        # Sayaçlar
+        self.late_samples = 0
+
+    def add(
+        self,
+        target: str,
+        timestamp: float,
+        latency: Optional[float],
+        packet_loss: float,
+        ok: bool,
+        weight: float = 1.0
+    ) -> List[ClosedWindow]:
+        """
+        Örneği en ince pencereye ekler.
+
+        Args:
+            target: Hedef adresi
+            timestamp: Örnek zamanı (Unix zamanı, saniye)
+            latency: Gecikme (ms), ölçülemediyse None
+            packet_loss: Paket kaybı (%)
+            ok: Kontrol başarılı mı
+            weight: Örneğin temsil ettiği süre (saniye); paket kaybı bununla ağırlıklandırılır
+
+        Returns:
+            Bu örnek nedeniyle kapanan pencereler
+        """
+        closed: List[ClosedWindow] = []
+        windows = self._windows.get(target)
+        if windows is None:
+            windows = self._windows[target] = [None] * len(self.resolutions)
+            self._closed_until[target] = [-math.inf] * len(self.resolutions)
+
+        resolution = self.resolutions[0]
+        start = int(timestamp) - int(timestamp) % resolution
+        current = windows[0]
+        # Kapanmış ya da açık pencereden eski bir pencereye ait geç örnekler atılır;
+        # açık pencereye sayılırlarsa yanlış zaman aralığının özetine karışırlar
+        if start < self._closed_until[target][0] or (
+                current is not None and start < current.start):
+            self.late_samples += 1
+            return closed
+        if current is not None and start > current.start:
+            windows[0] = None
+            self._close(target, 0, current, closed)
+            current = None
+        if current is None:
+            current = windows[0] = RollupWindow(start, self.relative_accuracy)
+        current.add(latency, packet_loss, ok, weight)
+        return closed
+
+    def flush_expired(self, now: float) -> List[ClosedWindow]:
+        """
+        Süresi (ve bekleme payı) dolmuş pencereleri kapatır.
+
+        Args:
+            now: Şimdiki zaman (Unix zamanı, saniye)
+        """
+        closed: List[ClosedWindow] = []
+        for target, windows in self._windows.items():
+            for level, resolution in enumerate(self.resolutions):
+                window = windows[level]
+                if window is not None and window.start + resolution + self.grace <= now:
+                    windows[level] = None
+                    self._close(target, level, window, closed)
+        return closed
+
+    def _close(self, target: str, level: int, window: RollupWindow,
+               closed: List[ClosedWindow]) -> None:
+        closed.append((target, self.resolutions[level], window))
+        closed_until = self._closed_until[target]
+        closed_until[level] = max(closed_until[level], window.start + self.resolutions[level])
+        if level + 1 >= len(self.resolutions):
+            return
+
+        windows = self._windows[target]
+        resolution = self.resolutions[level + 1]
+        start = window.start - window.start % resolution
+        if start < closed_until[level + 1]:
+            # Üst pencere zaten yazıldı; yeniden açılırsa eksik özet tamamının yerine geçer
+            self.late_samples += window.count
+            return
+        parent = windows[level + 1]
+        if parent is not None and start > parent.start:
+            windows[level + 1] = None
+            self._close(target, level + 1, parent, closed)
+            parent = None
+        if parent is None:
+            parent = windows[level + 1] = RollupWindow(start, self.relative_accuracy)
+        parent.merge(window)
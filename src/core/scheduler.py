@@ -0,0 +1,207 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledProbe:
+    __slots__ = (
+        'probe', 'interval', 'next_due', 'active', 'running',
+        'fired', 'skipped', 'missed', 'last_lag', 'max_lag', 'seq'
+    )
+
+    def __init__(self, probe: Any, interval: float, next_due: float):
+        """
+        Zamanlayıcıdaki tek bir hedefin durumu.
+
+        Args:
+            probe: Çalıştırılacak prob nesnesi
+            interval: Kontrol aralığı (saniye)
+            next_due: Bir sonraki tetiklenme zamanı (olay döngüsü saati)
+        """
+        self.probe = probe
+        self.interval = interval
+        self.next_due = next_due
+        self.active = True
+        self.running = False
+        self.fired = 0
+        self.skipped = 0  # önceki kontrol bitmediği için atlanan tetiklenmeler
+        self.missed = 0  # zamanlayıcı geride kaldığı için kaçırılan periyotlar
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.seq = 0  # yığındaki geçerli kaydın sıra numarası
+
+
+class ProbeScheduler:
+    def __init__(
+        self,
+        handler: Callable[[ScheduledProbe], Awaitable[None]],
+        jitter: float = 0.0,
+        max_concurrency: int = 1000
+    ):
+        """
+        Zamanlayıcı yığını (heap) tabanlı, kaymasız prob zamanlayıcısı.
+
+        Her hedef kendi aralığında tetiklenir; bir sonraki zaman önceki
+        planlanan zamana göre hesaplandığı için kontrol süresi aralığı kaydırmaz.
+
+        Args:
+            handler: Her tetiklenmede çağrılacak eşzamansız fonksiyon
+            jitter: Başlangıç fazı dağılımı (aralığın oranı, 0-1)
+            max_concurrency: Aynı anda çalışabilecek en fazla kontrol sayısı
+        """
+        self.handler = handler
+        self.jitter = jitter
+        self._heap: List[Tuple[float, int, ScheduledProbe]] = []
+        self._counter = itertools.count()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks = set()
+        self._running = False
+
+        self.fired = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+
+    def __len__(self) -> int:
+        return sum(1 for _, seq, entry in self._heap if entry.active and seq == entry.seq)
+
+    @property
+    def in_flight(self) -> int:
+        """Şu anda çalışmakta olan kontrol sayısı."""
+        return len(self._tasks)
+
+    def _now(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def _push(self, entry: ScheduledProbe) -> None:
+        entry.seq = next(self._counter)
+        heapq.heappush(self._heap, (entry.next_due, entry.seq, entry))
+
+    def add(self, probe: Any, interval: float, now: Optional[float] = None) -> ScheduledProbe:
+        """
+        Zamanlayıcıya yeni bir prob ekler.
+
+        Args:
+            probe: Prob nesnesi
+            interval: Kontrol aralığı (saniye)
+            now: Başlangıç zamanı (verilmezse olay döngüsü saati)
+        """
+        if interval <= 0:
+            raise ValueError("Kontrol aralığı pozitif olmalı")
+        if now is None:
+            now = self._now()
+        phase = random.uniform(0, interval * self.jitter) if self.jitter else 0.0
+        entry = ScheduledProbe(probe, interval, now + phase)
+        self._push(entry)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return entry
+
+    def remove(self, entry: ScheduledProbe) -> None:
+        """Probu zamanlayıcıdan çıkarır (yığından tembel olarak silinir)."""
+        entry.active = False
+
+    def set_interval(self, entry: ScheduledProbe, interval: float,
+                     now: Optional[float] = None) -> None:
+        """
+        Probun kontrol aralığını değiştirir.
+
+        Bir sonraki zaman son planlanan tetiklenmeye göre yeniden hesaplanır;
+        aralık kısaldığında bu zaman geçmişte kalıyorsa kontrol beklemeden yapılır.
+        Yığındaki eski kayıt tembel olarak atlanır.
+
+        Args:
+            entry: `add` ile dönen zamanlayıcı kaydı
+            interval: Yeni kontrol aralığı (saniye)
+            now: Şimdiki zaman (verilmezse olay döngüsü saati)
+        """
+        if interval <= 0:
+            raise ValueError("Kontrol aralığı pozitif olmalı")
+        if now is None:
+            now = self._now()
+        due = max(entry.next_due - entry.interval + interval, now)
+        entry.interval = interval
+        if due != entry.next_due:
+            entry.next_due = due
+            self._push(entry)
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    def _reschedule(self, entry: ScheduledProbe, now: float) -> None:
+        entry.next_due += entry.interval
+        if entry.next_due <= now:
+            # Zamanlayıcı bir periyottan fazla geride; kaçırılanları atla
+            behind = int((now - entry.next_due) // entry.interval) + 1
+            entry.missed += behind
+            entry.next_due += behind * entry.interval
+        self._push(entry)
+
+    def _fire(self, entry: ScheduledProbe, now: float) -> None:
+        lag = now - entry.next_due
+        entry.last_lag = lag
+        entry.max_lag = max(entry.max_lag, lag)
+        entry.fired += 1
+        self.fired += 1
+        self.lag_total += lag
+        self.lag_max = max(self.lag_max, lag)
+
+        if entry.running:
+            entry.skipped += 1
+            return
+        entry.running = True
+        task = asyncio.create_task(self._run_entry(entry))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_entry(self, entry: ScheduledProbe) -> None:
+        try:
+            async with self._semaphore:
+                await self.handler(entry)
+        except Exception as e:
+            logger.error(f"Zamanlanmış kontrol hatası: {str(e)}")
+        finally:
+            entry.running = False
+
+    async def run(self) -> None:
+        """Zamanlayıcıyı durdurulana kadar çalıştırır."""
+        self._running = True
+        self._wakeup = asyncio.Event()
+        try:
+            while self._running:
+                if not self._heap:
+                    await self._wakeup.wait()
+                    self._wakeup.clear()
+                    continue
+
+                now = self._now()
+                delay = self._heap[0][0] - now
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+                    continue
+
+                while self._heap and self._heap[0][0] <= now:
+                    _, seq, entry = heapq.heappop(self._heap)
+                    # Çıkarılmış ya da aralığı değişip yeniden planlanmış kayıt
+                    if not entry.active or seq != entry.seq:
+                        continue
+                    self._fire(entry, now)
+                    self._reschedule(entry, now)
+        finally:
+            self._running = False
+            for task in list(self._tasks):
+                task.cancel()
+
+    def stop(self) -> None:
+        """Zamanlayıcıyı durdurur."""
+        self._running = False
+        if self._wakeup is not None:
+            self._wakeup.set()
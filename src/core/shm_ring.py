@@ -0,0 +1,134 @@
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .probe_result import ProbeResult
+
+# Paylaşılan bellekteki tek bir sonuç kaydı
+RECORD_DTYPE = np.dtype([
+    ('target_id', np.uint32),
+    ('status', np.uint8),
+    ('timestamp', np.int64),  # Unix zamanı (mikrosaniye)
+    ('latency', np.float32),  # ms, ölçülemediyse NaN
+    ('packet_loss', np.float32)
+], align=True)
+
+# Başlık: yazılan toplam kayıt sayısı (head) ve kapasite
+_HEADER_DTYPE = np.dtype([('head', np.uint64), ('capacity', np.uint64)])
+_HEADER_SIZE = 64
+
+
+class SharedResultRing:
+    def __init__(self, name: Optional[str] = None, capacity: int = 65536):
+        """
+        Tek yazıcılı, çok okuyuculu paylaşılan bellek halkası.
+
+        Çalışan süreç sonuçları sabit genişlikli kayıtlar olarak yazar ve
+        ardından `head` sayacını artırır; panel süreci kayıtları pickle
+        kullanmadan doğrudan NumPy dizisi olarak okur.
+
+        Args:
+            name: Bağlanılacak paylaşılan bellek adı (verilmezse yenisi oluşturulur)
+            capacity: Halkadaki kayıt sayısı (yalnızca oluştururken kullanılır)
+        """
+        self.owner = name is None
+        if self.owner:
+            size = _HEADER_SIZE + capacity * RECORD_DTYPE.itemsize
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+
+        self._header = np.ndarray((1,), dtype=_HEADER_DTYPE, buffer=self._shm.buf)
+        if self.owner:
+            self._header['head'] = 0
+            self._header['capacity'] = capacity
+        self.capacity = int(self._header['capacity'][0])
+        self._records = np.ndarray(
+            (self.capacity,), dtype=RECORD_DTYPE, buffer=self._shm.buf, offset=_HEADER_SIZE
+        )
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def head(self) -> int:
+        """Şimdiye kadar yazılan toplam kayıt sayısı."""
+        return int(self._header['head'][0])
+
+    def publish(
+        self,
+        target_id: int,
+        timestamp_us: int,
+        latency: Optional[float],
+        packet_loss: float,
+        status: int
+    ) -> None:
+        """
+        Halkaya bir sonuç yazar; doluysa en eski kaydın üzerine yazılır.
+
+        Args:
+            target_id: Hedefin yapılandırmadaki sırası
+            timestamp_us: Unix zamanı (mikrosaniye)
+            latency: Gecikme (ms), ölçülemediyse None
+            packet_loss: Paket kaybı (%)
+            status: Durum kodu
+        """
+        head = self.head
+        record = self._records[head % self.capacity]
+        record['target_id'] = target_id
+        record['status'] = status
+        record['timestamp'] = timestamp_us
+        record['latency'] = np.nan if latency is None else latency
+        record['packet_loss'] = packet_loss
+        # Kayıt tamamlandıktan sonra yayınla
+        self._header['head'] = head + 1
+
+    def publish_result(self, target_id: int, result: ProbeResult) -> None:
+        """Prob sonucunu halkaya yazar."""
+        self.publish(
+            target_id,
+            result.timestamp_us,
+            result.latency,
+            result.packet_loss,
+            result.status
+        )
+
+    def read(self, cursor: int) -> Tuple[np.ndarray, int, int]:
+        """
+        `cursor` konumundan sonra yazılan kayıtları kopyalar.
+
+        Returns:
+            (kayıtlar, yeni imleç, kaçırılan kayıt sayısı)
+        """
+        head = self.head
+        missed = 0
+        if head - cursor > self.capacity:
+            missed = head - self.capacity - cursor
+            cursor = head - self.capacity
+        if head == cursor:
+            return self._records[:0].copy(), cursor, 0
+
+        start, end = cursor % self.capacity, head % self.capacity
+        if start < end:
+            records = self._records[start:end].copy()
+        else:
+            records = np.concatenate([self._records[start:], self._records[:end]])
+
+        # Kopyalamadan sonra yazma sırasını yeniden oku: yazıcı `head` kaydını
+        # yayınlamadan önce yazdığından, (start + 1) ile kopyalanan yuvaya yazmaya
+        # başlamış olabileceği kayıtlar da yırtık sayılır ve atılır
+        overwritten = min(self.head + 1 - self.capacity - cursor, len(records))
+        if overwritten > 0:
+            records = records[overwritten:]
+            missed += overwritten
+        return records, head, missed
+
+    def close(self) -> None:
+        """Belleği ayırır; sahibi ise paylaşılan belleği de siler."""
+        self._header = None
+        self._records = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
@@ -0,0 +1,61 @@
+import math
+from typing import Dict
+
+
+class LatencySketch:
+    __slots__ = ('relative_accuracy', '_gamma', '_log_gamma', '_bins', 'zero_count', 'count')
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Göreli hata sınırlı, birleştirilebilir yüzdelik taslağı (DDSketch).
+
+        Değerler logaritmik aralıklı kutulara sayılır; iki taslak kutu
+        sayıları toplanarak kayıpsız birleştirilir. Her yüzdelik en fazla
+        `relative_accuracy` göreli hatayla döner.
+
+        Args:
+            relative_accuracy: İzin verilen göreli hata (ör. 0.01 = %1)
+        """
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Taslağa bir değer ekler."""
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self._bins[index] = self._bins.get(index, 0) + 1
+
+    def merge(self, other: 'LatencySketch') -> None:
+        """Aynı doğruluktaki başka bir taslağı bu taslağa ekler."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Farklı doğruluktaki taslaklar birleştirilemez")
+        for index, count in other._bins.items():
+            self._bins[index] = self._bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """
+        Yaklaşık yüzdeliği döndürür.
+
+        Args:
+            q: Oran (0-1)
+        """
+        if not self.count:
+            raise ValueError("Boş taslaktan yüzdelik hesaplanamaz")
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for index in sorted(self._bins):
+            seen += self._bins[index]
+            if seen > rank:
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._bins) / (self._gamma + 1)
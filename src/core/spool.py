@@ -0,0 +1,313 @@
+import asyncio
+import logging
+import os
+import struct
+import threading
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Kayıt tipleri
+KIND_INFLUX = 1  # line protocol grubu
+KIND_EVENT = 2  # JSON kodlu olay satırları
+
+# Kayıt başlığı: yük uzunluğu, CRC32, tip
+_RECORD_HEADER = struct.Struct('<IIB')
+_SEGMENT_SUFFIX = '.seg'
+_CURSOR_FILE = 'cursor'
+
+Position = Tuple[int, int]  # (segment numarası, bayt konumu)
+
+
+class Spool:
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int = 16 * 1024 * 1024,
+        max_bytes: int = 512 * 1024 * 1024,
+        fsync: bool = True
+    ):
+        """
+        Segmentlere bölünmüş, yalnızca ekleme yapılan disk kuyruğu.
+
+        Her kayıt uzunluk + CRC32 + tip başlığıyla yazılır; çökme sonrası
+        yarım kalan son kayıt açılışta kesilir. Okuma konumu ayrı bir imleç
+        dosyasında tutulur ve tamamen tüketilen segmentler silinir.
+
+        Args:
+            directory: Segment dosyalarının dizini
+            segment_size: Segment döndürme boyutu (bayt)
+            max_bytes: Toplam disk kullanım sınırı (bayt); aşılınca en eski segment silinir
+            fsync: Her eklemeden sonra diske zorla yazılsın mı
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.max_bytes = max_bytes
+        self.fsync = fsync
+        self._lock = threading.Lock()
+
+        # Sayaçlar
+        self.appended_records = 0
+        self.dropped_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._segments: List[int] = sorted(
+            int(name[:-len(_SEGMENT_SUFFIX)])
+            for name in os.listdir(directory) if name.endswith(_SEGMENT_SUFFIX)
+        )
+        if not self._segments:
+            self._segments.append(1)
+        self._cursor = self._load_cursor()
+
+        active = self._segments[-1]
+        self._recover_segment(active)
+        self._file = open(self._segment_path(active), 'ab')
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f'{segment:08d}{_SEGMENT_SUFFIX}')
+
+    def _load_cursor(self) -> Position:
+        try:
+            with open(os.path.join(self.directory, _CURSOR_FILE), 'rb') as f:
+                segment, offset = struct.unpack('<QQ', f.read(16))
+        except (OSError, struct.error):
+            return (self._segments[0], 0)
+        if segment < self._segments[0]:
+            return (self._segments[0], 0)
+        return (segment, offset)
+
+    def _save_cursor(self) -> None:
+        path = os.path.join(self.directory, _CURSOR_FILE)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(struct.pack('<QQ', *self._cursor))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(path + '.tmp', path)
+
+    def _recover_segment(self, segment: int) -> None:
+        """Çökme sonrası segment sonundaki yarım ya da bozuk kaydı keser."""
+        path = self._segment_path(segment)
+        if not os.path.exists(path):
+            return
+        valid_end = 0
+        with open(path, 'rb') as f:
+            for _, _, end in self._iter_records(f, 0):
+                valid_end = end
+        if valid_end < os.path.getsize(path):
+            logger.warning(f"Spool segmenti {segment} {valid_end} bayta kısaltıldı")
+            with open(path, 'r+b') as f:
+                f.truncate(valid_end)
+
+    @staticmethod
+    def _iter_records(f, offset: int):
+        f.seek(offset)
+        while True:
+            header = f.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                return
+            length, crc, kind = _RECORD_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return
+            offset += _RECORD_HEADER.size + length
+            yield kind, payload, offset
+
+    @property
+    def total_bytes(self) -> int:
+        """Diskteki segmentlerin toplam boyutu."""
+        total = 0
+        for segment in self._segments:
+            try:
+                total += os.path.getsize(self._segment_path(segment))
+            except OSError:
+                pass
+        return total
+
+    @property
+    def position(self) -> Position:
+        """Onaylanmış okuma konumu."""
+        return self._cursor
+
+    @property
+    def pending_bytes(self) -> int:
+        """Henüz tekrar oynatılmamış kayıtların boyutu."""
+        segment, offset = self._cursor
+        pending = 0
+        for current in self._segments:
+            if current < segment:
+                continue
+            try:
+                size = os.path.getsize(self._segment_path(current))
+            except OSError:
+                continue
+            pending += size - offset if current == segment else size
+        return max(pending, 0)
+
+    def empty(self) -> bool:
+        """
+        Bekleyen kayıt yoksa True döndürür. Kilidi ve dosya tamponunu
+        kullandığından olay döngüsünden `asyncio.to_thread` ile çağrılır.
+        """
+        with self._lock:
+            self._file.flush()
+            segment, offset = self._cursor
+            return segment == self._segments[-1] and offset >= self._file.tell()
+
+    def append(self, kind: int, payloads: List[bytes]) -> None:
+        """
+        Kayıtları aktif segmentin sonuna ekler.
+
+        Args:
+            kind: Kayıt tipi (KIND_INFLUX, KIND_EVENT)
+            payloads: Yazılacak kayıt yükleri
+        """
+        with self._lock:
+            for payload in payloads:
+                self._file.write(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload), kind))
+                self._file.write(payload)
+                self.appended_records += 1
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+            if self._file.tell() >= self.segment_size:
+                self._rotate()
+            self._enforce_limit()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._segments.append(self._segments[-1] + 1)
+        self._file = open(self._segment_path(self._segments[-1]), 'ab')
+
+    def _enforce_limit(self) -> None:
+        while len(self._segments) > 1 and self.total_bytes > self.max_bytes:
+            oldest = self._segments.pop(0)
+            path = self._segment_path(oldest)
+            self.dropped_bytes += os.path.getsize(path)
+            os.remove(path)
+            logger.warning(f"Spool disk sınırı aşıldı, segment {oldest} silindi")
+            if self._cursor[0] <= oldest:
+                self._cursor = (self._segments[0], 0)
+                self._save_cursor()
+
+    def read(self, max_records: int) -> Tuple[List[Tuple[int, bytes]], Position]:
+        """
+        İmleçten itibaren en fazla `max_records` kayıt okur.
+
+        Returns:
+            (kayıtlar, okuma sonrası konum); konum `commit` ile onaylanır
+        """
+        with self._lock:
+            self._file.flush()
+            records: List[Tuple[int, bytes]] = []
+            segment, offset = self._cursor
+            while len(records) < max_records:
+                path = self._segment_path(segment)
+                end = offset
+                if os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        for kind, payload, end in self._iter_records(f, offset):
+                            records.append((kind, payload))
+                            if len(records) >= max_records:
+                                break
+                offset = end
+                if len(records) >= max_records or segment == self._segments[-1]:
+                    break
+                # Bu segment bitti; bir sonrakine geç
+                later = [s for s in self._segments if s > segment]
+                if not later:
+                    break
+                segment, offset = later[0], 0
+            return records, (segment, offset)
+
+    def commit(self, position: Position) -> None:
+        """Okuma konumunu kaydeder ve tamamen tüketilen segmentleri siler."""
+        with self._lock:
+            self._cursor = position
+            while len(self._segments) > 1 and self._segments[0] < position[0]:
+                os.remove(self._segment_path(self._segments.pop(0)))
+            self._save_cursor()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class SpoolReplayer:
+    def __init__(
+        self,
+        spool: Spool,
+        handlers: Dict[int, Callable[[bytes], None]],
+        rate: float = 20.0,
+        retry_interval: float = 5.0
+    ):
+        """
+        Arka uç yeniden erişilebilir olduğunda spool kayıtlarını sırayla,
+        sınırlı hızda geri yazar.
+
+        Args:
+            spool: Okunacak spool
+            handlers: Kayıt tipi -> kaydı arka uca yazan senkron fonksiyon
+            rate: Saniyede en fazla tekrar oynatılacak kayıt
+            retry_interval: Arka uç hatasından sonra bekleme süresi (saniye)
+        """
+        self.spool = spool
+        self.handlers = handlers
+        self.rate = rate
+        self.retry_interval = retry_interval
+        self._task: Optional[asyncio.Task] = None
+
+        self.replayed_records = 0
+        self.failures = 0
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def replay_once(self) -> int:
+        """
+        Bekleyen kayıtları hız sınırına uyarak yazar.
+
+        Returns:
+            Yazılan kayıt sayısı; arka uç hatasında o ana kadar yazılanlar onaylanır
+        """
+        replayed = 0
+        while True:
+            records, end = await asyncio.to_thread(self.spool.read, 1)
+            if not records:
+                if end != self.spool.position:
+                    await asyncio.to_thread(self.spool.commit, end)
+                return replayed
+            kind, payload = records[0]
+            handler = self.handlers.get(kind)
+            if handler is not None:
+                try:
+                    await asyncio.to_thread(handler, payload)
+                except Exception as e:
+                    self.failures += 1
+                    logger.warning(f"Spool tekrar oynatma hatası: {str(e)}")
+                    return replayed
+            await asyncio.to_thread(self.spool.commit, end)
+            replayed += 1
+            self.replayed_records += 1
+            await asyncio.sleep(1.0 / self.rate)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if not await asyncio.to_thread(self.spool.empty):
+                    await self.replay_once()
+            except Exception as e:
+                logger.error(f"Spool tekrar oynatma döngüsü hatası: {str(e)}")
+            await asyncio.sleep(self.retry_interval)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
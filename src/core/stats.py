@@ -0,0 +1,72 @@
+import math
+from typing import Dict, List, Optional, Sequence
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Sıralı değerlerden doğrusal interpolasyonla yüzdelik hesaplar.
+
+    Args:
+        sorted_values: Küçükten büyüğe sıralı değerler
+        q: Yüzdelik (0-100)
+    """
+    if not sorted_values:
+        raise ValueError("Boş dizi için yüzdelik hesaplanamaz")
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def interarrival_jitter(rtts: Sequence[float]) -> float:
+    """
+    RFC 3550 (bölüm 6.4.1) geliş arası titreşimini hesaplar.
+
+    Gidiş-dönüş ölçümünde ardışık paketlerin geçiş süresi farkı
+    RTT farkına eşittir: J = J + (|D| - J) / 16.
+    """
+    jitter = 0.0
+    for previous, current in zip(rtts, rtts[1:]):
+        jitter += (abs(current - previous) - jitter) / 16.0
+    return jitter
+
+
+def summarize_rtts(rtts: List[Optional[float]]) -> Dict:
+    """
+    Bir paket dizisinin kayıp ve gecikme istatistiklerini hesaplar.
+
+    Args:
+        rtts: Gönderim sırasına göre RTT değerleri (ms), kayıp paketler için None
+
+    Returns:
+        Kayıp yüzdesi, min/ort/maks/mdev RTT, titreşim ve p50/p95/p99 alanları
+    """
+    received = [rtt for rtt in rtts if rtt is not None]
+    sent = len(rtts)
+    summary = {
+        'packets_sent': sent,
+        'packets_received': len(received),
+        'packet_loss': round(100.0 * (sent - len(received)) / sent, 2) if sent else 100.0
+    }
+    if not received:
+        return summary
+
+    ordered = sorted(received)
+    mean = sum(received) / len(received)
+    # ping(8) ile aynı tanım: sqrt(E[x²] - E[x]²)
+    mdev = math.sqrt(max(sum(rtt * rtt for rtt in received) / len(received) - mean * mean, 0.0))
+
+    summary.update({
+        'rtt_min': round(ordered[0], 3),
+        'rtt_avg': round(mean, 3),
+        'rtt_max': round(ordered[-1], 3),
+        'rtt_mdev': round(mdev, 3),
+        'jitter': round(interarrival_jitter(received), 3),
+        'rtt_p50': round(percentile(ordered, 50), 3),
+        'rtt_p95': round(percentile(ordered, 95), 3),
+        'rtt_p99': round(percentile(ordered, 99), 3)
+    })
+    return summary
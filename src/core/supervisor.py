@@ -0,0 +1,280 @@
+import asyncio
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .pipeline import CollectorPipeline, TargetSpec, build_capture, build_data_store
+from .telemetry import REGISTRY
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .shm_ring import SharedResultRing
+
+logger = logging.getLogger(__name__)
+
+RESULTS_OVERWRITTEN = REGISTRY.counter(
+    'collector_results_overwritten', 'Panel okuyamadan halkada ezilen sonuçlar')
+WORKER_RESTARTS = REGISTRY.counter(
+    'collector_worker_restarts', 'Beklenmedik şekilde sonlanıp yeniden başlatılan çalışanlar')
+
+# Çalışanlar ana süreçten iş parçacığı veya soket miras almasın diye
+# her platformda 'spawn' kullanılır
+_context = multiprocessing.get_context('spawn')
+
+
+def shard_targets(targets: List[Dict], workers: int) -> List[List[TargetSpec]]:
+    """
+    Hedefleri çalışanlara sırayla (round-robin) dağıtır.
+
+    Args:
+        targets: Yapılandırmadaki hedefler
+        workers: Çalışan sayısı (0 ise CPU sayısı); hedef sayısını aşamaz
+
+    Returns:
+        Çalışan başına (hedef sırası, hedef) listeleri
+    """
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(targets)))
+    shards: List[List[TargetSpec]] = [[] for _ in range(workers)]
+    for target_id, target in enumerate(targets):
+        shards[target_id % workers].append((target_id, target))
+    return shards
+
+
+def _forward_logging(logs, level: str) -> None:
+    """Çalışanın log kayıtlarını denetçinin işleyicilerine iletir."""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(logs))
+    root.setLevel(level)
+
+
+def run_worker(config_path: str, index: int, targets: List[TargetSpec],
+               ring_name: Optional[str], active, telemetry=None, logs=None) -> None:
+    """
+    Çalışan sürecin giriş noktası; kendi olay döngüsünü çalıştırır.
+    `ring_name` verilmezse sonuçlar yalnızca veri deposuna yazılır (başsız mod).
+    `logs` verilirse log kayıtları dosyaya yazılmaz, denetçiye iletilir; böylece
+    ortak log dosyasını yalnızca ana süreç döndürür.
+    """
+    # Ctrl+C tüm süreç grubuna gider; kapatmayı denetçi yönetir
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from config.config import Config
+    config = Config(config_path, setup_logging=logs is None)
+    if logs is not None:
+        _forward_logging(logs, config.get('logging.root.level', 'INFO'))
+    ring = None
+    if ring_name is not None:
+        # numpy yalnızca sonuçları panele aktaran çalışanlarda yüklenir
+        from .shm_ring import SharedResultRing
+        ring = SharedResultRing(ring_name)
+    try:
+        asyncio.run(_worker_main(config, index, targets, ring, active, telemetry))
+    finally:
+        if ring is not None:
+            ring.close()
+
+
+async def _publish_telemetry(index: int, telemetry, interval: float) -> None:
+    """Çalışanın metrik anlık görüntüsünü düzenli olarak denetçiye gönderir."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            telemetry.put_nowait((index, REGISTRY.collect()))
+        except queue.Full:
+            # Panel okumuyorsa eski görüntü yeterli; çalışan beklemez
+            pass
+
+
+async def _worker_main(config, index: int, targets: List[TargetSpec],
+                       ring: Optional['SharedResultRing'], active, telemetry=None) -> None:
+    spool_directory = os.path.join(config.get('spool.directory', 'spool'), f'worker-{index}')
+    pipeline = CollectorPipeline(
+        config,
+        targets,
+        build_data_store(config, spool_directory),
+        publish=ring.publish_result if ring is not None else None,
+        active=active,
+        host_metrics=index == 0,
+        capture=build_capture(config, f'worker-{index}')
+    )
+
+    stopping = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopping.set)
+    except NotImplementedError:
+        # Windows: terminate() süreci doğrudan sonlandırır
+        pass
+
+    telemetry_task = None
+    interval = config.get('app.telemetry.interval', 5)
+    if telemetry is not None and interval:
+        telemetry_task = asyncio.create_task(_publish_telemetry(index, telemetry, interval))
+
+    logger.info(f"Toplayıcı çalışanı {index} başladı ({len(targets)} hedef)")
+    task = asyncio.create_task(pipeline.run())
+    await stopping.wait()
+    if telemetry_task is not None:
+        telemetry_task.cancel()
+    await pipeline.stop()
+    await task
+    logger.info(f"Toplayıcı çalışanı {index} durdu")
+
+
+class CollectorSupervisor:
+    def __init__(
+        self,
+        config_path: str,
+        targets: List[Dict],
+        workers: int = 0,
+        ring_capacity: int = 65536,
+        restart_delay: float = 1.0,
+        results: bool = True
+    ):
+        """
+        Hedefleri çalışan süreçlere bölen ve bu süreçleri izleyen denetçi.
+
+        Her çalışan kendi olay döngüsünde zamanlayıcı, problar ve veri deposu
+        çalıştırır; sonuçlarını kendi paylaşılan bellek halkasına yazar.
+        Panel süreci halkaları `poll()` ile pickle kullanmadan okur.
+
+        Args:
+            config_path: Çalışanların yükleyeceği yapılandırma dosyası
+            targets: Yapılandırmadaki hedefler
+            workers: Çalışan süreç sayısı (0 ise CPU sayısı)
+            ring_capacity: Çalışan başına halkadaki kayıt sayısı
+            restart_delay: Sonlanan çalışanın yeniden başlatılmadan önceki bekleme (saniye)
+            results: Sonuçlar halkalara yazılsın mı; panelsiz çalışan toplayıcıda
+                kapatılır ve halkalar hiç oluşturulmaz
+        """
+        self.config_path = config_path
+        self.targets = targets
+        self.shards = shard_targets(targets, workers) if targets else []
+        self.ring_capacity = ring_capacity
+        self.restart_delay = restart_delay
+        self.results = results
+
+        # Panelden açılıp kapatılan, tüm çalışanlarca paylaşılan izleme bayrağı
+        self.active = _context.Event()
+        # Çalışanların metrik anlık görüntüleri; dolarsa yenileri atılır
+        self.telemetry = _context.Queue(maxsize=max(4 * len(self.shards), 1))
+        # Çalışanların log kayıtları ana sürecin işleyicilerine buradan aktarılır
+        self.logs = _context.Queue()
+        self._log_listener: Optional[logging.handlers.QueueListener] = None
+        self._snapshots: Dict[int, List[Dict[str, Any]]] = {}
+        self.rings: List['SharedResultRing'] = []
+        self.processes: List[Optional[multiprocessing.Process]] = [None] * len(self.shards)
+        self._cursors = [0] * len(self.shards)
+        self.missed = 0
+        self.restarts = 0
+        self._stopping = threading.Event()
+        self._watcher = None
+
+    def start(self) -> None:
+        """Çalışanları başlatır ve izlemeye başlar."""
+        if self.results:
+            from .shm_ring import SharedResultRing
+            self.rings = [SharedResultRing(capacity=self.ring_capacity) for _ in self.shards]
+        self._log_listener = logging.handlers.QueueListener(
+            self.logs, *logging.getLogger().handlers, respect_handler_level=True)
+        self._log_listener.start()
+        for index in range(len(self.shards)):
+            self._spawn(index)
+        self._watcher = threading.Thread(target=self._watch, name='collector-supervisor',
+                                         daemon=True)
+        self._watcher.start()
+
+    def _spawn(self, index: int) -> None:
+        process = _context.Process(
+            target=run_worker,
+            args=(self.config_path, index, self.shards[index],
+                  self.rings[index].name if self.rings else None, self.active, self.telemetry,
+                  self.logs),
+            name=f'collector-{index}',
+            daemon=True
+        )
+        process.start()
+        self.processes[index] = process
+
+    def _watch(self) -> None:
+        """Beklenmedik şekilde sonlanan çalışanları yeniden başlatır."""
+        while not self._stopping.wait(self.restart_delay):
+            for index, process in enumerate(self.processes):
+                if process is not None and not process.is_alive():
+                    logger.warning(
+                        f"Toplayıcı çalışanı {index} sonlandı (çıkış kodu {process.exitcode}), "
+                        "yeniden başlatılıyor"
+                    )
+                    self.restarts += 1
+                    WORKER_RESTARTS.inc()
+                    self._spawn(index)
+
+    def poll(self) -> 'np.ndarray':
+        """
+        Son çağrıdan bu yana tüm çalışanların yazdığı sonuçları döndürür.
+
+        Returns:
+            `RECORD_DTYPE` tipinde kayıt dizisi
+        """
+        import numpy as np
+        from .shm_ring import RECORD_DTYPE
+
+        batches = []
+        for index, ring in enumerate(self.rings):
+            records, self._cursors[index], missed = ring.read(self._cursors[index])
+            if missed:
+                self.missed += missed
+                RESULTS_OVERWRITTEN.inc(missed)
+                logger.warning(f"Çalışan {index} halkasında {missed} sonuç okunamadan ezildi")
+            if len(records):
+                batches.append(records)
+        if not batches:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return batches[0] if len(batches) == 1 else np.concatenate(batches)
+
+    def telemetry_snapshots(self) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Çalışanların gönderdiği en son metrik anlık görüntülerini döndürür.
+
+        Returns:
+            Çalışan sırası -> `Registry.collect()` çıktısı
+        """
+        while True:
+            try:
+                index, snapshot = self.telemetry.get_nowait()
+            except queue.Empty:
+                break
+            self._snapshots[index] = snapshot
+        return dict(self._snapshots)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Çalışanlara bekleyen verilerini yazıp çıkmalarını söyler ve halkaları siler."""
+        self._stopping.set()
+        if self._watcher is not None:
+            self._watcher.join()
+        for process in self.processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            if process is not None:
+                process.join(timeout)
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+        for ring in self.rings:
+            ring.close()
+        self.rings = []
+        if self._log_listener is not None:
+            # Sonlanan çalışanların kuyruktaki son kayıtları da yazılır
+            self._log_listener.stop()
+            self._log_listener = None
+        self.telemetry.close()
+        self.logs.close()
@@ -0,0 +1,236 @@
+import asyncio
+from bisect import bisect_left
+import functools
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Saniye cinsinden süreler için varsayılan histogram sınırları
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                    0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+# (ad, etiketler, değer)
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class Counter:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def samples(self, name: str, labels: Dict[str, str]) -> List[Sample]:
+        return [(f'{name}_total', labels, self.value)]
+
+
+class Gauge:
+    __slots__ = ('value', 'function')
+
+    def __init__(self):
+        self.value = 0
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Değeri okuma anında `function` çağrısıyla hesaplar."""
+        self.function = function
+
+    def samples(self, name: str, labels: Dict[str, str]) -> List[Sample]:
+        return [(name, labels, self.function() if self.function else self.value)]
+
+
+class Histogram:
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # son kova +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: Dict[str, str]) -> List[Sample]:
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(float(bound))
+            samples.append((f'{name}_bucket', {**labels, 'le': le}, cumulative))
+        samples.append((f'{name}_count', labels, self.count))
+        samples.append((f'{name}_sum', labels, self.sum))
+        return samples
+
+
+class MetricFamily:
+    def __init__(self, name: str, kind: str, help_text: str,
+                 labelnames: Sequence[str] = (), factory: Callable[[], Any] = Counter):
+        """
+        Aynı ada sahip, etiketlere göre ayrılmış metrikler.
+
+        Args:
+            name: Metrik adı
+            kind: 'counter', 'gauge' veya 'histogram'
+            help_text: Açıklama
+            labelnames: Etiket adları
+            factory: Etiket değeri başına metrik üretir
+        """
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        if not self.labelnames:
+            self._children[()] = factory()
+
+    def labels(self, *values: str):
+        """
+        Etiket değerlerine ait metriği döndürür (ilk çağrıda oluşturulur).
+        Sıcak yolda her seferinde çağırmak yerine sonucu saklayın.
+        """
+        child = self._children.get(values)
+        if child is None:
+            child = self._children.setdefault(values, self._factory())
+        return child
+
+    def __getattr__(self, attribute: str):
+        # Etiketsiz ailelerde inc/set/observe doğrudan çağrılabilir
+        if attribute.startswith('_') or self.labelnames:
+            raise AttributeError(attribute)
+        return getattr(self._children[()], attribute)
+
+    def collect(self) -> Dict[str, Any]:
+        samples: List[Sample] = []
+        for values, child in list(self._children.items()):
+            samples.extend(child.samples(self.name, dict(zip(self.labelnames, values))))
+        return {'name': self.name, 'type': self.kind, 'help': self.help, 'samples': samples}
+
+
+class Registry:
+    def __init__(self):
+        """Süreç içindeki metrik aileleri; okuma yalnızca kazıma (scrape) anında yapılır."""
+        self._families: Dict[str, MetricFamily] = {}
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        existing = self._families.get(family.name)
+        if existing is not None:
+            return existing
+        self._families[family.name] = family
+        return family
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(MetricFamily(name, 'counter', help_text, labelnames, Counter))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(MetricFamily(name, 'gauge', help_text, labelnames, Gauge))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DURATION_BUCKETS) -> MetricFamily:
+        return self._register(MetricFamily(
+            name, 'histogram', help_text, labelnames, lambda: Histogram(buckets)
+        ))
+
+    def collect(self) -> List[Dict[str, Any]]:
+        """Tüm metriklerin pickle edilebilir anlık görüntüsü."""
+        return [family.collect() for family in list(self._families.values())]
+
+
+REGISTRY = Registry()
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float):
+        return repr(value) if value == value else 'NaN'
+    return str(value)
+
+
+def render(sources: List[Tuple[Dict[str, str], List[Dict[str, Any]]]]) -> str:
+    """
+    Anlık görüntüleri OpenMetrics metnine çevirir.
+
+    Args:
+        sources: (ek etiketler, `Registry.collect()` çıktısı) listesi;
+            aynı adlı aileler tek blokta birleştirilir
+    """
+    families: Dict[str, Dict[str, Any]] = {}
+    for extra_labels, snapshot in sources:
+        for family in snapshot:
+            merged = families.setdefault(family['name'], {
+                'type': family['type'], 'help': family['help'], 'samples': []
+            })
+            for name, labels, value in family['samples']:
+                merged['samples'].append((name, {**extra_labels, **labels}, value))
+
+    lines = []
+    for name, family in families.items():
+        lines.append(f"# TYPE {name} {family['type']}")
+        lines.append(f"# HELP {name} {_escape(family['help'])}")
+        for sample_name, labels, value in family['samples']:
+            if labels:
+                label_text = ','.join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+                sample_name = f'{sample_name}{{{label_text}}}'
+            lines.append(f'{sample_name} {_format_value(value)}')
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+def timed(histogram: Histogram):
+    """Fonksiyonun çalışma süresini histograma kaydeden dekoratör."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+async def monitor_event_loop(histogram: Histogram, interval: float = 0.5,
+                             on_tick: Optional[Callable[[], None]] = None) -> None:
+    """
+    Olay döngüsü gecikmesini ölçer: uyandırmanın planlanandan ne kadar
+    geç geldiği histograma yazılır.
+
+    Args:
+        histogram: Gecikmelerin (saniye) yazılacağı histogram
+        interval: Ölçüm aralığı (saniye)
+        on_tick: Her ölçümde çağrılır (ör. anlık göstergeleri güncellemek için)
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        histogram.observe(max(loop.time() - expected, 0.0))
+        if on_tick is not None:
+            on_tick()
+
+
+# Yazıcılar (InfluxDB ve PostgreSQL) için ortak metrikler
+WRITER_QUEUE_DEPTH = REGISTRY.gauge(
+    'writer_queue_depth', 'Yazma kuyruğunda bekleyen kayıt sayısı', ['backend'])
+WRITER_FLUSH_SECONDS = REGISTRY.histogram(
+    'writer_flush_duration_seconds', 'Tek bir grubun arka uca yazılma süresi', ['backend'])
+WRITER_BATCH_SIZE = REGISTRY.histogram(
+    'writer_batch_size', 'Arka uca yazılan grup boyu (kayıt)', ['backend'], SIZE_BUCKETS)
+WRITER_DROPPED = REGISTRY.counter(
+    'writer_dropped', 'Kuyruk dolduğu için atılan kayıtlar', ['backend'])
+WRITER_ERRORS = REGISTRY.counter(
+    'writer_errors', 'Başarısız arka uç yazmaları', ['backend'])
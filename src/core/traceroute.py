@@ -0,0 +1,410 @@
+import asyncio
+import functools
+import ipaddress
+import itertools
+import logging
+import socket
+import struct
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from .icmp import ICMP_ECHO_REQUEST, ICMP_ECHO_REPLY
+from .influx_writer import encode_line
+from .probe_result import ProbeResult, Status
+
+logger = logging.getLogger(__name__)
+
+ICMP_DEST_UNREACHABLE = 3
+ICMP_TIME_EXCEEDED = 11
+
+_ICMP_HEADER = struct.Struct('!BBHHH')
+# Akış paketinin sıra numarası ve tümleyen yükü
+_FLOW_TAIL = struct.Struct('!HH')
+_DEFAULT_TTL = 64
+
+
+def traceroute_label(address: str) -> str:
+    """Yol keşfi probunun sonuçlarda kullanılan hedef adı."""
+    return f'traceroute://{address}'
+
+
+@functools.lru_cache(maxsize=1024)
+def _flow_template(identifier: int) -> bytes:
+    # scapy yalnızca yol keşfi kullanıldığında yüklenir (toplayıcının açılışı etkilenmez)
+    from scapy.layers.inet import ICMP
+    from scapy.packet import Raw
+
+    return bytes(ICMP(type=ICMP_ECHO_REQUEST, id=identifier, seq=0) / Raw(b'\xff\xff'))
+
+
+def build_flow_packet(identifier: int, sequence: int) -> bytes:
+    """
+    Paris traceroute tarzı echo request oluşturur.
+
+    Yük sıra numarasının bir tümleyenini taşır; böylece sağlama toplamı
+    sıra numarasından bağımsız olarak akış boyunca sabit kalır. Yük
+    dengeleyiciler akışı ICMP başlığının ilk dört baytından (tip, kod,
+    sağlama toplamı) ayırt ettiği için tüm TTL'ler aynı yoldan gider.
+    Paket akış başına bir kez scapy ile oluşturulur; sağlama toplamı sabit
+    olduğundan diğer sıra numaralarında yalnızca son dört bayt değişir.
+
+    Args:
+        identifier: Akış tanımlayıcısı (ICMP tanımlayıcısı)
+        sequence: Paketi ayırt eden sıra numarası
+    """
+    return _flow_template(identifier)[:6] + _FLOW_TAIL.pack(sequence, ~sequence & 0xFFFF)
+
+
+def parse_icmp_response(packet: bytes) -> Optional[Tuple[int, int, int]]:
+    """
+    Raw soketten gelen paketi çözer.
+
+    Echo reply'da tanımlayıcı ve sıra numarası doğrudan, TTL aşımı ve
+    ulaşılamaz mesajlarında alıntılanan orijinal echo başlığından okunur.
+    Raw soket makinedeki tüm ICMP yanıtlarını aldığından olay döngüsünde
+    paket başına yalnızca `struct` ile sabit konumlu alanlar okunur.
+
+    Returns:
+        (ICMP tipi, tanımlayıcı, sıra numarası), ilgisiz paketlerde None
+    """
+    if len(packet) < 20 or packet[0] >> 4 != 4:
+        return None
+    icmp = packet[(packet[0] & 0x0F) * 4:]
+    if len(icmp) < _ICMP_HEADER.size:
+        return None
+    icmp_type = icmp[0]
+    if icmp_type == ICMP_ECHO_REPLY:
+        _, _, _, identifier, sequence = _ICMP_HEADER.unpack_from(icmp)
+        return icmp_type, identifier, sequence
+    if icmp_type not in (ICMP_TIME_EXCEEDED, ICMP_DEST_UNREACHABLE):
+        return None
+    # 8 baytlık ICMP başlığından sonra orijinal IP başlığı ve ilk 8 baytı gelir
+    inner = icmp[8:]
+    if len(inner) < 20 or inner[9] != socket.IPPROTO_ICMP:
+        return None
+    quoted = inner[(inner[0] & 0x0F) * 4:]
+    if len(quoted) < _ICMP_HEADER.size:
+        return None
+    quoted_type, _, _, identifier, sequence = _ICMP_HEADER.unpack_from(quoted)
+    if quoted_type != ICMP_ECHO_REQUEST:
+        return None
+    return icmp_type, identifier, sequence
+
+
+class Hop:
+    __slots__ = ('ttl', 'address', 'rtt')
+
+    def __init__(self, ttl: int, address: Optional[str], rtt: Optional[float]):
+        """
+        Yoldaki tek bir sıçrama.
+
+        Args:
+            ttl: Sıçrama sırası (1'den başlar)
+            address: Yanıt veren yönlendirici, yanıt yoksa None
+            rtt: Gidiş-dönüş süresi (ms), yanıt yoksa None
+        """
+        self.ttl = ttl
+        self.address = address
+        self.rtt = rtt
+
+    def __repr__(self) -> str:
+        return f"Hop({self.ttl}, {self.address or '*'}, {self.rtt})"
+
+
+class TracerouteEngine:
+    def __init__(self):
+        """
+        Tüm TTL'leri aynı anda gönderen, yanıtları tek bir raw soketten
+        eşzamansız toplayan yol keşif motoru.
+
+        TTL aşımı mesajlarını almak için raw ICMP soketi (yönetici/root ya
+        da CAP_NET_RAW) gerekir. Yanıtlar (tanımlayıcı, sıra numarası) ile
+        isteklere eşlenir; birçok hedef aynı soketi paylaşır.
+        """
+        self._sock: Optional[socket.socket] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._sequence = itertools.count()
+        # (tanımlayıcı, sıra numarası) -> (future, gönderim zamanı)
+        self._pending: Dict[Tuple[int, int], Tuple[asyncio.Future, float]] = {}
+
+        self.sent = 0
+        self.received = 0
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._sock is not None and self._loop is loop:
+            return
+        if self._sock is not None:
+            self.close()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+        sock.setblocking(False)
+        sock.bind(('0.0.0.0', 0))
+        self._sock = sock
+        self._loop = loop
+        self._reader_task = loop.create_task(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                packet, addr = await loop.sock_recvfrom(self._sock, 65535)
+            except asyncio.CancelledError:
+                raise
+            except OSError as e:
+                logger.debug(f"Traceroute okuma hatası: {str(e)}")
+                continue
+
+            received_at = time.perf_counter()
+            parsed = parse_icmp_response(packet)
+            if parsed is None:
+                continue
+            icmp_type, identifier, sequence = parsed
+            entry = self._pending.pop((identifier, sequence), None)
+            if entry is None or entry[0].done():
+                continue
+            self.received += 1
+            entry[0].set_result((addr[0], (received_at - entry[1]) * 1000, icmp_type))
+
+    def _send(self, address: str, identifier: int,
+              ttl: int) -> Tuple[asyncio.Future, Tuple[int, int]]:
+        key = (identifier, next(self._sequence) & 0xFFFF)
+        future = self._loop.create_future()
+        packet = build_flow_packet(*key)
+        # TTL ayarı ile gönderim arasında bekleme olmamalı; soket paylaşılıyor
+        self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+        self._pending[key] = (future, time.perf_counter())
+        try:
+            self._sock.sendto(packet, (address, 0))
+            self.sent += 1
+        except OSError as e:
+            # Dolu gönderim tamponu ya da ağa ulaşılamıyor; bu TTL yanıtsız sayılır
+            logger.debug(f"Traceroute gönderim hatası (TTL {ttl}): {str(e)}")
+        return future, key
+
+    async def ping(self, address: str, identifier: int, timeout: float = 1.0) -> Optional[float]:
+        """
+        Aynı akışla hedefe tek bir echo gönderir.
+
+        Returns:
+            Gidiş-dönüş süresi (ms), yanıt yoksa None
+        """
+        self._ensure_started()
+        future, key = self._send(address, identifier, _DEFAULT_TTL)
+        try:
+            responder, rtt, icmp_type = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._pending.pop(key, None)
+        return rtt if icmp_type == ICMP_ECHO_REPLY else None
+
+    async def trace(self, address: str, identifier: int, max_hops: int = 30,
+                    timeout: float = 2.0) -> Tuple[List[Hop], bool]:
+        """
+        1..max_hops TTL'lerini aynı anda gönderir ve yanıtları toplar.
+
+        Hedefe ulaşan en küçük TTL yolun uzunluğudur; sonrasındaki TTL'ler
+        atılır. Yanıt vermeyen yönlendiriciler için tüm yol en fazla
+        `timeout` kadar beklenir.
+
+        Args:
+            address: Hedef IPv4 adresi
+            identifier: Akış tanımlayıcısı
+            max_hops: En büyük TTL
+            timeout: Yanıt bekleme süresi (saniye)
+
+        Returns:
+            (sıçramalar, hedefe ulaşıldı mı)
+        """
+        self._ensure_started()
+        sent = [self._send(address, identifier, ttl) for ttl in range(1, max_hops + 1)]
+        futures = [future for future, _ in sent]
+        deadline = self._loop.time() + timeout
+        try:
+            pending = set(futures)
+            while pending:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                _, pending = await asyncio.wait(pending, timeout=remaining,
+                                                return_when=asyncio.FIRST_COMPLETED)
+                # Hedefe ulaşıldıysa ve önceki sıçramaların hepsi yanıt verdiyse beklemeye gerek yok
+                reached = self._reached(futures)
+                if reached is not None and all(future.done() for future in futures[:reached]):
+                    break
+        finally:
+            for future, key in sent:
+                self._pending.pop(key, None)
+                if not future.done():
+                    future.cancel()
+
+        reached = self._reached(futures)
+        hops = []
+        for ttl, future in enumerate(futures[:reached + 1 if reached is not None else None], 1):
+            if future.cancelled():
+                hops.append(Hop(ttl, None, None))
+            else:
+                responder, rtt, _ = future.result()
+                hops.append(Hop(ttl, responder, round(rtt, 3)))
+        return hops, reached is not None
+
+    @staticmethod
+    def _reached(futures: List[asyncio.Future]) -> Optional[int]:
+        """Hedefin yanıt verdiği ilk TTL'nin sırası (0 tabanlı)."""
+        for index, future in enumerate(futures):
+            if future.done() and not future.cancelled():
+                if future.result()[2] != ICMP_TIME_EXCEEDED:
+                    return index
+        return None
+
+    def close(self) -> None:
+        """Soketi kapatır ve bekleyen istekleri iptal eder."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        for future, _ in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._loop = None
+
+
+_default_engine: Optional[TracerouteEngine] = None
+
+
+def get_default_engine() -> TracerouteEngine:
+    """Süreç genelinde paylaşılan yol keşif motorunu döndürür."""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = TracerouteEngine()
+    return _default_engine
+
+
+class TracerouteProbe:
+    def __init__(
+        self,
+        target: str,
+        max_hops: int = 30,
+        timeout: float = 2.0,
+        retrace_interval: float = 3600.0,
+        latency_change: float = 0.5,
+        min_latency_change: float = 1.0,
+        engine: Optional[TracerouteEngine] = None,
+        limiter: Optional[asyncio.Semaphore] = None
+    ):
+        """
+        Yol keşfi probu.
+
+        Her kontrolde hedefe yolla aynı akıştan tek bir echo gönderilir.
+        Yol yalnızca ilk kontrolde, gecikme son keşiftekinden saptığında,
+        erişilebilirlik değiştiğinde ya da `retrace_interval` dolduğunda
+        yeniden çıkarılır; sıçrama gecikmeleri `hop_lines` ile yazılır.
+
+        Args:
+            target: Hedef IPv4 adresi veya alan adı
+            max_hops: En büyük TTL
+            timeout: Echo ve yol keşfi için yanıt bekleme süresi (saniye)
+            retrace_interval: Değişim olmasa da yolun yeniden çıkarılma aralığı (saniye)
+            latency_change: Gecikmenin son keşiftekinden bu oranda sapması değişim sayılır
+            min_latency_change: Değişim sayılacak en küçük gecikme farkı (ms)
+            engine: Paylaşılan yol keşif motoru (verilmezse süreç geneli motor)
+            limiter: Aynı anda yapılabilecek yol keşiflerini sınırlayan semafor
+        """
+        self.address = target
+        self.target = traceroute_label(target)
+        self.max_hops = max_hops
+        self.timeout = timeout
+        self.retrace_interval = retrace_interval
+        self.latency_change = latency_change
+        self.min_latency_change = min_latency_change
+        self.engine = engine or get_default_engine()
+        self.limiter = limiter
+        # Akış tanımlayıcısı hedefe göre sabittir; yeniden başlatmada da aynı yol seçilir
+        self.identifier = zlib.crc32(target.encode()) & 0xFFFF
+
+        self.path: List[Hop] = []
+        self.reached = False
+        self.traced_at: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._resolved: Optional[str] = None
+
+    async def _resolve(self) -> str:
+        if self._resolved is None:
+            try:
+                self._resolved = str(ipaddress.IPv4Address(self.address))
+            except ValueError:
+                infos = await asyncio.get_running_loop().getaddrinfo(
+                    self.address, None, family=socket.AF_INET, type=socket.SOCK_RAW
+                )
+                self._resolved = infos[0][4][0]
+        return self._resolved
+
+    def _needs_trace(self, rtt: Optional[float], now: float) -> bool:
+        if self.traced_at is None or now - self.traced_at >= self.retrace_interval:
+            return True
+        if (rtt is not None) != self.reached:
+            return True
+        if rtt is None or self._baseline is None:
+            return False
+        threshold = max(self._baseline * self.latency_change, self.min_latency_change)
+        return abs(rtt - self._baseline) > threshold
+
+    async def _trace(self, address: str) -> Tuple[List[Hop], bool]:
+        if self.limiter is None:
+            return await self.engine.trace(address, self.identifier, self.max_hops, self.timeout)
+        async with self.limiter:
+            return await self.engine.trace(address, self.identifier, self.max_hops, self.timeout)
+
+    async def perform_check(self) -> ProbeResult:
+        """Hedefe echo gönderir; gerekiyorsa yolu yeniden çıkarır."""
+        time_ns, sent_mono = time.time_ns(), time.monotonic_ns()
+        try:
+            address = await self._resolve()
+            rtt = await self.engine.ping(address, self.identifier, self.timeout)
+            now = time.monotonic()
+            traced = path_changed = False
+            if self._needs_trace(rtt, now):
+                previous = [hop.address for hop in self.path]
+                self.path, self.reached = await self._trace(address)
+                self.traced_at = now
+                # Keşif sırasındaki hedef sıçraması taban gecikme olur
+                self._baseline = self.path[-1].rtt if self.reached else rtt
+                traced = True
+                path_changed = bool(previous) and previous != [hop.address for hop in self.path]
+        except Exception as e:
+            logger.error(f"Yol keşfi hatası ({self.address}): {str(e)}")
+            return ProbeResult(self.target, Status.ERROR, time_ns=time_ns, sent_mono=sent_mono,
+                               error=str(e))
+
+        return ProbeResult(
+            self.target,
+            Status.OK if rtt is not None else Status.FAIL,
+            latency=round(rtt, 3) if rtt is not None else None,
+            packet_loss=0.0 if rtt is not None else 100.0,
+            time_ns=time_ns,
+            sent_mono=sent_mono,
+            extra={'hops': float(len(self.path)), 'traced': float(traced),
+                   'path_changed': float(path_changed)}
+        )
+
+    def hop_lines(self, time_ns: int) -> List[str]:
+        """
+        Son keşfedilen yolu `network_hops` satırlarına çevirir.
+
+        Sıçrama adresi etiket olduğu için birçok hedefin paylaştığı kötü bir
+        sıçrama, sıçrama adresine göre gruplanarak tek sorguda görülür.
+        """
+        return [
+            encode_line(
+                'network_hops',
+                {'target': self.target, 'hop': hop.address or '*', 'ttl': str(hop.ttl)},
+                {'rtt': hop.rtt, 'lost': 0.0 if hop.address else 100.0},
+                time_ns
+            )
+            for hop in self.path
+        ]
@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from .probe_result import ProbeResult, Status
+
+# (zaman, hedef, yeni durum, önceki durum, önceki durumun süresi (sn),
+#  önceki durumdaki örnek sayısı, gecikme, paket kaybı, hata, ek alanlar)
+TransitionRow = Tuple[datetime, str, str, Optional[str], Optional[float], Optional[int],
+                      Optional[float], float, Optional[str], Optional[Dict[str, Any]]]
+
+
+class _Run:
+    __slots__ = ('status', 'started_ns', 'samples')
+
+    def __init__(self, status: Status, started_ns: int):
+        self.status = status
+        self.started_ns = started_ns
+        self.samples = 1
+
+
+class TransitionTracker:
+    def __init__(self):
+        """
+        Hedef başına durum dizisini (run-length) izler ve yalnızca durum
+        değişimlerini olay olarak üretir.
+
+        Bir saatlik kesinti, her örnek için bir satır yerine başlangıç (OK→FAIL)
+        ve bitiş (FAIL→OK) olmak üzere iki olay üretir; bitiş olayı kesintinin
+        süresini ve kesinti boyunca alınan örnek sayısını taşır.
+        """
+        self._runs: Dict[str, _Run] = {}
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def update(self, result: ProbeResult) -> Optional[TransitionRow]:
+        """
+        Sonucu hedefin durum dizisine ekler.
+
+        Args:
+            result: Prob sonucu
+
+        Returns:
+            Durum değiştiyse olay satırı, aksi halde None. Hedefin ilk sonucu
+            başarısızsa önceki durumu bilinmeyen bir olay üretilir.
+        """
+        run = self._runs.get(result.target)
+        if run is None:
+            self._runs[result.target] = _Run(result.status, result.time_ns)
+            if result.ok:
+                return None
+            return self._row(result, None, None, None)
+
+        if run.status is result.status:
+            run.samples += 1
+            return None
+
+        row = self._row(result, run.status.name,
+                        max(result.time_ns - run.started_ns, 0) / 1e9, run.samples)
+        run.status = result.status
+        run.started_ns = result.time_ns
+        run.samples = 1
+        return row
+
+    @staticmethod
+    def _row(result: ProbeResult, previous: Optional[str], duration: Optional[float],
+             samples: Optional[int]) -> TransitionRow:
+        return (result.utc_time, result.target, result.status.name, previous, duration, samples,
+                result.latency, result.packet_loss, result.error, result.extra or None)
@@ -1,30 +1,58 @@
-import asyncio
+import argparse
+from datetime import datetime, timedelta
+import json
+import math
 import sys
-from datetime import datetime
+import threading
+import time
 import webbrowser
 from pathlib import Path
 
+import numpy as np
+
 import dash
 from dash import html, dcc
 import dash_bootstrap_components as dbc
-from dash.dependencies import Input, Output, State
+from dash.dependencies import ClientsideFunction, Input, Output, State
+from dash.exceptions import PreventUpdate
+from dash import no_update
 import plotly.graph_objects as go
-from flask import Flask
+from plotly.utils import PlotlyJSONEncoder
+from flask import Flask, Response, request
 
 from config.config import Config
-from core.network_probe import NetworkProbe
-from core.data_store import DataStore
+from core.capture import CaptureReplayer, load_capture, merge_captures
+from core.ring_buffer import RingBuffer, STATUS_NAMES
+from core.downsample import minmax_buckets
+from core.live_view import ViewBroadcaster
+from core.pipeline import build_history, target_label
+from core.supervisor import CollectorSupervisor
+from core.telemetry import CONTENT_TYPE, REGISTRY, render, timed
+
+CONFIG_PATH = "config.yaml"
 
 # Global değişkenler
-probes = []
 probe_data = {}
-data_store = None
+addresses = []  # hedef sırası -> hedef adı
+buffer_size = 100
+chart_points = 100
+supervisor = None
+history = None
+views = None
 monitoring_active = False
 
+# Zaman aralığı seçenekleri (saniye); 'live' bellekteki son örnekleri gösterir
+HISTORY_RANGES = {'1h': 3600, '6h': 6 * 3600, '24h': 86400, '7d': 7 * 86400, '30d': 30 * 86400}
+
 # Flask ve Dash uygulamasını oluştur
 server = Flask(__name__)
 app = dash.Dash(__name__, server=server, external_stylesheets=[dbc.themes.BOOTSTRAP])
 
+CALLBACK_DURATION = REGISTRY.histogram(
+    'dashboard_callback_duration_seconds', 'Panel geri çağrılarının çalışma süresi', ['callback'])
+STREAM_CLIENTS = REGISTRY.gauge('dashboard_stream_clients', 'Açık canlı görünüm akışları')
+VIEW_RENDERS = REGISTRY.counter('dashboard_view_renders', 'Üretilen canlı görünümler')
+
 # Layout
 app.layout = dbc.Container([
     dbc.Row([
@@ -57,7 +85,24 @@ app.layout = dbc.Container([
                                 id='target-dropdown',
                                 placeholder="İzlenecek hedefi seçin"
                             ),
-                        ], width=6),
+                        ], width=4),
+                        dbc.Col([
+                            html.Label("Zaman Aralığı:", className="fw-bold"),
+                            dcc.Dropdown(
+                                id='range-dropdown',
+                                options=[
+                                    {'label': 'Canlı', 'value': 'live'},
+                                    {'label': 'Son 1 saat', 'value': '1h'},
+                                    {'label': 'Son 6 saat', 'value': '6h'},
+                                    {'label': 'Son 24 saat', 'value': '24h'},
+                                    {'label': 'Dün', 'value': 'yesterday'},
+                                    {'label': 'Son 7 gün', 'value': '7d'},
+                                    {'label': 'Son 30 gün', 'value': '30d'}
+                                ],
+                                value='live',
+                                clearable=False
+                            ),
+                        ], width=4),
                         dbc.Col([
                             html.Label("Güncelleme Aralığı:", className="fw-bold"),
                             dcc.Dropdown(
@@ -72,7 +117,7 @@ app.layout = dbc.Container([
                                 value=1,
                                 placeholder="Güncelleme sıklığını seçin"
                             ),
-                        ], width=6),
+                        ], width=4),
                     ]),
                 ])
             ], className="mb-4"),
@@ -117,11 +162,18 @@ app.layout = dbc.Container([
             dbc.Card([
                 dbc.CardBody([
                     html.H4("Performans Grafikleri", className="card-title"),
-                    dcc.Graph(id='metrics-graph'),
+                    # Canlı görünüm /stream akışıyla live.js tarafından çizilir;
+                    # dcc.Graph yalnızca geçmiş aralıkları gösterir
+                    html.Div(id='live-graph', style={'height': '400px'}),
+                    dcc.Graph(id='metrics-graph', style={'display': 'none'}),
+                    dcc.Store(id='graph-state'),
+                    dcc.Store(id='live-stream'),
+                    dcc.Store(id='history-values'),
                     dcc.Interval(
                         id='interval-component',
                         interval=1000,  # milisaniye cinsinden
-                        n_intervals=0
+                        n_intervals=0,
+                        disabled=True
                     )
                 ])
             ], className="mb-4"),
@@ -137,58 +189,70 @@ app.layout = dbc.Container([
     ])
 ], fluid=True)
 
-@app.callback(
-    [Output('metrics-graph', 'figure'),
-     Output('metrics-table', 'children'),
-     Output('current-latency', 'children'),
-     Output('current-packet-loss', 'children'),
-     Output('current-status', 'children'),
-     Output('current-status', 'className')],
-    [Input('interval-component', 'n_intervals'),
-     Input('target-dropdown', 'value')]
-)
-def update_metrics(n_intervals, target):
-    # Boş grafik şablonunu oluştur
-    empty_fig = go.Figure()
-    empty_fig.update_layout(
-        title='Veri Bekleniyor...',
-        xaxis=dict(title='Zaman'),
-        yaxis=dict(title='Değer'),
-        height=400,
-        annotations=[dict(
-            text='İzleme başlatıldığında veriler burada görüntülenecek',
-            showarrow=False,
-            xref='paper',
-            yref='paper',
-            x=0.5,
-            y=0.5
-        )]
-    )
+def _format_value(value):
+    """Tampon değerini gösterim için biçimlendirir; ölçülemeyen değerler '-' olur."""
+    value = float(value)
+    return '-' if value != value else str(round(value, 2))
 
-    if not target or target not in probe_data or not monitoring_active:
-        return empty_fig, [], "-", "-", "Beklemede", "text-center text-warning h3"
-    
-    data = probe_data[target]
-    if not data:
-        return empty_fig, [], "-", "-", "Beklemede", "text-center text-warning h3"
+def _bucket_size(buffer):
+    """Tamponu `chart_points` noktaya indirmek için grup başına örnek sayısı."""
+    if buffer.capacity <= chart_points:
+        return 1
+    # Her grup en küçük ve en büyük olmak üzere iki nokta üretir
+    return math.ceil(2 * buffer.capacity / chart_points)
+
+def _chart_series(buffer, first, last, bucket):
+    """[first, last) aralığındaki örnekleri grafik serilerine indirger."""
+    data = buffer.window_since(first)
+    count = last - first
+    times = data['timestamp'][:count]
+    latency_x, latency_y = minmax_buckets(times, data['latency'][:count], bucket)
+    loss_x, loss_y = minmax_buckets(times, data['packet_loss'][:count], bucket)
+    return (latency_x, latency_y), (loss_x, loss_y)
+
+def _history_range(value, now):
+    """Seçilen zaman aralığını (başlangıç, bitiş) Unix zamanına çevirir."""
+    if value == 'yesterday':
+        today = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (today - timedelta(days=1)).timestamp(), today.timestamp()
+    return now - HISTORY_RANGES[value], now
+
+def _history_view(target, range_value, graph_state):
+    """Geçmiş verileri InfluxDB'den grafik genişliğine indirgenmiş olarak çizer."""
+    now = time.time()
+    start, end = _history_range(range_value, now)
+    state = {'target': target, 'range': range_value}
+    # Aynı aralık, yeni bir pencere kapanmadan yeniden sorgulanmaz
+    if graph_state.get('target') == target and graph_state.get('range') == range_value \
+            and now - graph_state.get('queried', 0) < graph_state.get('resolution', 0):
+        return no_update, no_update
+
+    try:
+        series, resolution = history.query(target, start, end, chart_points)
+    except Exception as e:
+        print(f"Geçmiş sorgu hatası: {str(e)}")
+        figure = go.Figure()
+        figure.update_layout(title='Geçmiş veriler alınamadı', height=400)
+        return figure, state
+
+    times = series.timestamps.astype('datetime64[s]')
+    figure = _build_figure((times, series.latency), (times, series.packet_loss))
+    state.update(queried=now, resolution=resolution)
+    return figure, state
 
-    # Grafik oluştur
+def _build_figure(latency, loss):
     fig = go.Figure()
     
-    times = [d['timestamp'] for d in data]
-    latencies = [d.get('latency', 0) for d in data]
-    
     fig.add_trace(go.Scatter(
-        x=times,
-        y=latencies,
+        x=latency[0],
+        y=latency[1],
         name='Gecikme (ms)',
         line=dict(color='blue')
     ))
     
-    packet_losses = [d.get('packet_loss', 0) for d in data]
     fig.add_trace(go.Scatter(
-        x=times,
-        y=packet_losses,
+        x=loss[0],
+        y=loss[1],
         name='Paket Kaybı (%)',
         line=dict(color='red'),
         yaxis='y2'
@@ -202,41 +266,146 @@ def update_metrics(n_intervals, target):
         height=400,
         margin=dict(t=30, b=30, l=50, r=50)
     )
+    return fig
 
-    # Tablo oluştur
-    table = dbc.Table([
-        html.Thead([
-            html.Tr([
-                html.Th("Zaman"),
-                html.Th("Hedef"),
-                html.Th("Durum"),
-                html.Th("Gecikme (ms)"),
-                html.Th("Paket Kaybı (%)")
-            ])
-        ]),
-        html.Tbody([
-            html.Tr([
-                html.Td(d['timestamp']),
-                html.Td(d['target']),
-                html.Td(d['status']),
-                html.Td(str(d.get('latency', '-'))),
-                html.Td(str(d.get('packet_loss', '-')))
-            ]) for d in reversed(data[-10:])  # Son 10 veriyi göster
-        ])
-    ], bordered=True, hover=True, striped=True)
-
-    # Anlık değerler
-    last_data = data[-1]
-    latency = f"{last_data.get('latency', '-')} ms"
-    packet_loss = f"{last_data.get('packet_loss', '-')}%"
-    status = last_data['status']
-    status_class = {
-        'OK': 'text-center text-success h3',
-        'FAIL': 'text-center text-danger h3',
-        'ERROR': 'text-center text-warning h3'
-    }.get(status, 'text-center text-secondary h3')
-
-    return fig, table, latency, packet_loss, status, status_class
+@app.callback(
+    [Output('interval-component', 'interval'),
+     Output('interval-component', 'disabled')],
+    [Input('interval-dropdown', 'value'),
+     Input('range-dropdown', 'value')]
+)
+def update_refresh_interval(seconds, range_value):
+    # Canlı görünüm sunucudan itilir; zamanlayıcı yalnızca geçmiş aralıkları yeniler
+    return int((seconds or 1) * 1000), range_value == 'live'
+
+
+# Canlı görünüm akışını seçili hedefe bağlar ve grafik alanlarını değiştirir
+app.clientside_callback(
+    ClientsideFunction(namespace='live', function_name='subscribe'),
+    [Output('live-stream', 'data'),
+     Output('live-graph', 'style'),
+     Output('metrics-graph', 'style')],
+    [Input('target-dropdown', 'value'),
+     Input('range-dropdown', 'value'),
+     Input('interval-dropdown', 'value'),
+     Input('history-values', 'data')]
+)
+
+@app.callback(
+    [Output('metrics-graph', 'figure'),
+     Output('graph-state', 'data'),
+     Output('history-values', 'data')],
+    [Input('interval-component', 'n_intervals'),
+     Input('target-dropdown', 'value'),
+     Input('range-dropdown', 'value')],
+    [State('graph-state', 'data')]
+)
+@timed(CALLBACK_DURATION.labels('update_metrics'))
+def update_metrics(n_intervals, target, range_value, graph_state):
+    if not target or not range_value or range_value == 'live' or history is None:
+        raise PreventUpdate
+    # Geçmiş aralıklarda anlık metrikler ve tablo bellekteki tampondan
+    # sunucuda üretilir; live.js bunları canlı görünümle aynı biçimde çizer
+    figure, state = _history_view(target, range_value, graph_state or {})
+    return figure, state, _current_values(target)
+
+def _to_json(view):
+    # NumPy dizileri ve zamanlar listeye, NaN null'a çevrilir
+    return json.dumps(view, cls=PlotlyJSONEncoder, separators=(',', ':'))
+
+
+# İzleme kapalıyken veya hedefin verisi yokken gösterilen anlık değerler
+WAITING_VALUES = {'rows': [], 'latency': "-", 'packet_loss': "-",
+                  'status': "Beklemede", 'status_class': "text-center text-warning h3"}
+
+def _waiting_view():
+    """İzleme kapalıyken veya hedefin verisi yokken gösterilen boş görünüm."""
+    empty_fig = go.Figure()
+    empty_fig.update_layout(
+        title='Veri Bekleniyor...',
+        xaxis=dict(title='Zaman'),
+        yaxis=dict(title='Değer'),
+        height=400,
+        annotations=[dict(
+            text='İzleme başlatıldığında veriler burada görüntülenecek',
+            showarrow=False,
+            xref='paper',
+            yref='paper',
+            x=0.5,
+            y=0.5
+        )]
+    )
+    return dict(WAITING_VALUES, figure=empty_fig)
+
+def _current_values(target):
+    """Hedefin son ölçümlerini tablo satırları ve anlık değerler olarak döndürür."""
+    buffer = probe_data.get(target)
+    if buffer is None or not monitoring_active or not len(buffer):
+        return WAITING_VALUES
+
+    recent = buffer.window(10)  # Son 10 veriyi göster
+    status = STATUS_NAMES[recent['status'][-1]]
+    return {
+        'rows': [
+            [str(recent['timestamp'][i]), target, STATUS_NAMES[recent['status'][i]],
+             _format_value(recent['latency'][i]), _format_value(recent['packet_loss'][i])]
+            for i in reversed(range(len(recent['timestamp'])))
+        ],
+        'latency': f"{_format_value(recent['latency'][-1])} ms",
+        'packet_loss': f"{_format_value(recent['packet_loss'][-1])}%",
+        'status': status,
+        'status_class': {
+            'OK': 'text-center text-success h3',
+            'FAIL': 'text-center text-danger h3',
+            'ERROR': 'text-center text-warning h3'
+        }.get(status, 'text-center text-secondary h3')
+    }
+
+def live_version(target):
+    """Canlı görünümün veri sürümü; değişmedikçe görünüm yeniden üretilmez."""
+    buffer = probe_data.get(target)
+    return monitoring_active, None if buffer is None else buffer.total
+
+@timed(CALLBACK_DURATION.labels('render_live'))
+def render_live(target, rendered):
+    """
+    Hedefin canlı görünümünü üretir; sonuçları tamponlara yazan iş parçacığında,
+    veri değişikliği başına izleyici sayısından bağımsız olarak bir kez çalışır.
+
+    Args:
+        target: Hedef
+        rendered: Önceki görünümde çizilmiş son grup sınırı (yoksa None)
+
+    Returns:
+        tuple: (çizilen grup sınırı, tam görünüm, önceki görünüme eklenecek fark)
+    """
+    VIEW_RENDERS.inc()
+    buffer = probe_data.get(target)
+    if buffer is None or not monitoring_active or not len(buffer):
+        return None, _to_json(_waiting_view()), None
+
+    # Örnekler mutlak sıraya göre hizalı gruplara bölünür; yalnızca
+    # kapanmış gruplar çizilir, böylece yeni gruplar artımlı eklenebilir
+    version = buffer.total
+    bucket = _bucket_size(buffer)
+    oldest = version - len(buffer)
+    last = (version // bucket) * bucket
+
+    view = _current_values(target)
+    first = -(-oldest // bucket) * bucket
+    snapshot = dict(view, figure=_build_figure(*_chart_series(buffer, first, last, bucket)))
+    delta = None
+    if rendered is not None and rendered >= oldest:
+        delta = view
+        if last > rendered:
+            latency, loss = _chart_series(buffer, rendered, last, bucket)
+            max_points = buffer.capacity if bucket == 1 else 2 * (buffer.capacity // bucket)
+            delta = dict(view, extend=(
+                dict(x=[latency[0], loss[0]], y=[latency[1], loss[1]]),
+                [0, 1],
+                max_points
+            ))
+    return last, _to_json(snapshot), None if delta is None else _to_json(delta)
 
 @app.callback(
     [Output('start-stop-button', 'children'),
@@ -252,75 +421,123 @@ def toggle_monitoring(n_clicks, current_text):
     global monitoring_active
     if current_text == "İzlemeyi Başlat":
         monitoring_active = True
+        supervisor.active.set()
         return "İzlemeyi Durdur", "danger", "İzleme Durumu: Aktif"
     else:
         monitoring_active = False
+        supervisor.active.clear()
         return "İzlemeyi Başlat", "success", "İzleme Durumu: Durduruldu"
 
-async def update_data():
-    """Arka planda sürekli veri toplama."""
+@server.route('/metrics')
+def metrics():
+    """Panel ve çalışan süreçlerin öz telemetrisi (OpenMetrics)."""
+    sources = [({}, REGISTRY.collect())]
+    if supervisor is not None:
+        sources.extend(
+            ({'worker': str(index)}, snapshot)
+            for index, snapshot in sorted(supervisor.telemetry_snapshots().items())
+        )
+    return Response(render(sources), content_type=CONTENT_TYPE)
+
+@server.route('/stream')
+def stream():
+    """Seçili hedefin canlı görünümünü Server-Sent Events olarak iter."""
+    target = request.args.get('target', '')
+    interval = request.args.get('interval', 0.0, type=float)
+    last = request.headers.get('Last-Event-ID', type=int)
+    return Response(
+        views.stream(target, last, interval),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def drain_results(interval=0.1):
+    """Çalışanların paylaşılan bellek halkalarındaki sonuçları tamponlara aktarır."""
     while True:
-        if monitoring_active:
-            for probe, interval in probes:
-                try:
-                    data = await probe.perform_check()
-                    await data_store.store_metrics(data)
-                    
-                    if probe.target not in probe_data:
-                        probe_data[probe.target] = []
-                    
-                    probe_data[probe.target].append(data)
-                    if len(probe_data[probe.target]) > 100:  # Son 100 veriyi tut
-                        probe_data[probe.target].pop(0)
-                except Exception as e:
-                    print(f"Veri güncelleme hatası: {str(e)}")
-        
-        await asyncio.sleep(1)
-
-async def main():
+        time.sleep(interval)
+        try:
+            for record in supervisor.poll():
+                probe_data[addresses[record['target_id']]].append(
+                    np.datetime64(int(record['timestamp']), 'us'),
+                    record['latency'],
+                    record['packet_loss'],
+                    record['status']
+                )
+            views.publish()
+        except Exception as e:
+            print(f"Veri güncelleme hatası: {str(e)}")
+
+def main():
     """Ana uygulama fonksiyonu."""
+    global probe_data, addresses, buffer_size, chart_points, supervisor, history, views
+    parser = argparse.ArgumentParser(description="Ağ izleme paneli")
+    parser.add_argument('--replay', nargs='+', metavar='KAYIT',
+                        help="Problar yerine kayıt dosyalarını (.nmcap) panele oynat")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Oynatma hızı: 1 gerçek zaman, 0 beklemeden (varsayılan 1)")
+    args = parser.parse_args()
     try:
-        global probes, data_store, probe_data
-        
         # Yapılandırmayı yükle
-        config = Config("config.yaml")
-        
-        # Veritabanı bağlantılarını oluştur
-        data_store = DataStore(
-            influx_url=config.get('influxdb.url'),
-            influx_token=config.get('influxdb.token'),
-            influx_org=config.get('influxdb.org'),
-            influx_bucket=config.get('influxdb.bucket'),
-            postgres_dsn=config.get('postgresql.dsn')
-        )
+        config = Config(CONFIG_PATH)
 
-        # Ağ izleyicilerini oluştur
-        for target in config.get('targets', []):
-            probe = NetworkProbe(
-                target=target['address'],
-                timeout=1.0
-            )
-            probes.append((probe, target['interval']))
-            probe_data[target['address']] = []
+        # Hedef başına bellekte tutulacak örnek ve grafikte gösterilecek nokta sayısı
+        chart_points = config.get('app.ui.chart_points', 100)
+        buffer_size = config.get('app.ui.buffer_size', chart_points)
+
+        targets = config.get('targets', [])
+        names = {target_label(target): target['name'] for target in targets}
+        capture = None
+        if args.replay:
+            # Kayıttaki hedef kimlikleri panelin hedef sırası olarak kullanılır
+            capture = merge_captures([load_capture(path) for path in args.replay])
+            addresses.extend(capture.targets)
+        else:
+            addresses.extend(target_label(target) for target in targets)
+        for label in addresses:
+            probe_data[label] = RingBuffer(buffer_size)
+
+        # Varsayılan güncelleme aralığı; canlı görünümler en fazla bu sıklıkta üretilir
+        update_interval = config.get('app.ui.update_interval', 1)
+        app.layout['interval-dropdown'].value = update_interval
+        views = ViewBroadcaster(live_version, render_live, interval=update_interval)
+        STREAM_CLIENTS.set_function(lambda: views.clients)
 
         # Dropdown seçeneklerini güncelle
         app.layout['target-dropdown'].options = [
-            {'label': target['name'], 'value': target['address']}
-            for target in config.get('targets', [])
+            {'label': names.get(label, label), 'value': label}
+            for label in addresses
         ]
-        
-        # Veri toplama görevini başlat
-        asyncio.create_task(update_data())
-        
-        # Tarayıcıyı aç
-        webbrowser.open('http://localhost:8050')
-        
+
+        # Geçmiş aralıklar InfluxDB'den önbellekli olarak okunur
+        history = build_history(config)
+
+        if capture is not None:
+            supervisor = CaptureReplayer(capture, speed=args.speed)
+        else:
+            # Problar ayrı süreçlerde çalışır; panel yalnızca sonuçları okur
+            supervisor = CollectorSupervisor(
+                CONFIG_PATH,
+                targets,
+                workers=config.get('app.collector.workers', 0),
+                ring_capacity=config.get('app.collector.ring_capacity', 65536)
+            )
+        supervisor.start()
+        threading.Thread(target=drain_results, name='result-drain', daemon=True).start()
+
+        # Tarayıcıyı aç (sunucularda kapatılabilir)
+        if config.get('app.ui.open_browser', True):
+            webbrowser.open('http://localhost:8050')
+
         # Sunucuyu başlat
         app.run_server(debug=False, use_reloader=False)
 
     except Exception as e:
         print(f"Uygulama başlatma hatası: {str(e)}")
         sys.exit(1)
+    finally:
+        if supervisor is not None:
+            supervisor.stop()
+
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    main()
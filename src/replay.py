@@ -0,0 +1,87 @@
+"""
+Kayıt dosyalarını veri deposuna yeniden oynatır.
+
+Toplayıcının `capture` bölümüyle yazdığı `.nmcap` dosyalarını yapılandırılan
+depoya (InfluxDB + PostgreSQL veya SQLite) aktarır; geriye dönük doldurma
+için en yüksek hızda, yük testi için gerçek zamanlı ya da hızlandırılmış:
+
+    python src/replay.py captures/*.nmcap --config config.yaml
+    python src/replay.py captures/worker-0-*.nmcap --speed 10 --retime
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from typing import List, Optional
+
+from config.config import Config
+from core.capture import load_capture, merge_captures, replay_capture
+from core.pipeline import build_data_store
+from core.rollup import RollupAggregator
+
+logger = logging.getLogger(__name__)
+
+
+async def run_replay(config, paths: List[str], speed: float, retime: bool,
+                     rollups: bool = True) -> int:
+    """
+    Kayıt dosyalarını birleştirip yapılandırılan veri deposuna yazar.
+
+    Returns:
+        Yazılan sonuç sayısı
+    """
+    capture = merge_captures([load_capture(path) for path in paths])
+    logger.info(f"{len(capture)} sonuç, {len(capture.targets)} hedef yeniden oynatılıyor")
+
+    aggregator = None
+    if rollups and config.get('rollups.enabled', True):
+        aggregator = RollupAggregator(
+            resolutions=config.get('rollups.resolutions', [1, 60, 3600]),
+            relative_accuracy=config.get('rollups.relative_accuracy', 0.01)
+        )
+    data_store = build_data_store(config)
+    try:
+        return await replay_capture(capture, data_store, speed=speed, retime=retime,
+                                    rollups=aggregator,
+                                    batch_size=config.get('storage.batch_size', 5000))
+    finally:
+        await data_store.stop()
+        data_store.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Komut satırı giriş noktası."""
+    parser = argparse.ArgumentParser(description="Kayıt dosyalarını veri deposuna yeniden oynatır")
+    parser.add_argument('paths', nargs='+', help="Kayıt dosyaları (.nmcap)")
+    parser.add_argument('--config', default='config.yaml', help="Yapılandırma dosyası")
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help="Oynatma hızı: 1 gerçek zaman, 10 on kat hızlı, "
+                             "0 beklemeden (varsayılan)")
+    parser.add_argument('--retime', action='store_true',
+                        help="Zaman damgalarını oynatmanın başladığı ana kaydır (yük testi)")
+    parser.add_argument('--no-rollups', action='store_true', help="Özet pencerelerini üretme")
+    args = parser.parse_args(argv)
+
+    try:
+        config = Config(args.config)
+    except Exception as e:
+        print(f"Yapılandırma yüklenemedi: {str(e)}", file=sys.stderr)
+        return 1
+
+    started = time.monotonic()
+    try:
+        count = asyncio.run(run_replay(config, args.paths, args.speed, args.retime,
+                                       rollups=not args.no_rollups))
+    except KeyboardInterrupt:
+        return 130
+    except (OSError, ValueError) as e:
+        logger.error(f"Yeniden oynatma hatası: {str(e)}")
+        return 1
+    elapsed = time.monotonic() - started
+    logger.info(f"{count} sonuç {elapsed:.1f} sn'de yazıldı ({count / max(elapsed, 1e-9):.0f}/sn)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,8 @@
 import pytest
-from datetime import datetime
 import os
 
 from src.core.data_store import DataStore
+from src.core.probe_result import ProbeResult, Status
 
 @pytest.fixture
 def data_store():
@@ -17,15 +17,7 @@ def data_store():
 
 @pytest.mark.asyncio
 async def test_store_metrics_success(data_store):
-    test_data = {
-        'timestamp': datetime.utcnow().isoformat(),
-        'target': '8.8.8.8',
-        'status': 'OK',
-        'latency': 100.0,
-        'packet_loss': 0,
-        'cpu_usage': 5.0,
-        'memory_usage': 2.0
-    }
+    test_data = ProbeResult('8.8.8.8', Status.OK, latency=100.0, packet_loss=0.0)
     
     try:
         await data_store.store_metrics(test_data)
@@ -34,33 +26,36 @@ async def test_store_metrics_success(data_store):
 
 @pytest.mark.asyncio
 async def test_store_metrics_error_event(data_store):
-    test_data = {
-        'timestamp': datetime.utcnow().isoformat(),
-        'target': '8.8.8.8',
-        'status': 'ERROR',
-        'error': 'Test error message'
-    }
+    test_data = ProbeResult('8.8.8.8', Status.ERROR, error='Test error message')
     
     try:
         await data_store.store_metrics(test_data)
+        await data_store.flush()
     except Exception as e:
         pytest.fail(f"Hata olayı kaydetme başarısız: {str(e)}")
 
 def test_database_connection(data_store):
+    # Sunucuya ulaşılamazsa şema kurulumu hata kaydeder ve havuz açılmaz
+    if data_store.event_sink.pool is None:
+        pytest.skip("PostgreSQL sunucusuna ulaşılamıyor")
     try:
         # InfluxDB bağlantısı kontrolü
         assert data_store.influx_client is not None
         assert data_store.write_api is not None
         
-        # PostgreSQL bağlantısı kontrolü
-        with data_store.pg_conn.cursor() as cur:
-            cur.execute("SELECT 1")
-            result = cur.fetchone()
-            assert result[0] == 1
+        # PostgreSQL bağlantı havuzu kontrolü
+        conn = data_store.event_sink.pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+                result = cur.fetchone()
+                assert result[0] == 1
+        finally:
+            data_store.event_sink.pool.putconn(conn)
     except Exception as e:
         pytest.fail(f"Veritabanı bağlantı testi başarısız: {str(e)}")
 
 def test_cleanup(data_store):
     data_store.close()
     assert data_store.influx_client is not None  # InfluxDB client hala var ama kapalı
-    assert data_store.pg_conn is None  # PostgreSQL bağlantısı kapatıldı 
\ No newline at end of file
+    assert data_store.event_sink.pool is None  # PostgreSQL havuzu kapatıldı 
\ No newline at end of file
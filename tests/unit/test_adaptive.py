@@ -0,0 +1,68 @@
+import pytest
+
+from src.core.adaptive import AdaptiveInterval
+from src.core.probe_result import Status
+
+
+def _policy(**kwargs):
+    options = dict(fast=0.5, maximum=8.0, backoff=2.0, stable_checks=3)
+    options.update(kwargs)
+    return AdaptiveInterval(1.0, **options)
+
+
+def test_stable_target_backs_off_up_to_maximum():
+    policy = _policy()
+    intervals = [policy.observe(Status.OK, 10.0, 0.0) for _ in range(15)]
+
+    assert intervals[:3] == [1.0, 1.0, 2.0]
+    assert intervals[-1] == 8.0
+    assert not policy.degraded
+
+
+@pytest.mark.parametrize('status, latency, packet_loss', [
+    (Status.FAIL, None, 100.0),
+    (Status.ERROR, None, 0.0),
+    (Status.OK, 10.0, 20.0),
+    (Status.OK, 30.0, 0.0),
+])
+def test_degradation_drops_straight_to_fast_interval(status, latency, packet_loss):
+    policy = _policy()
+    for _ in range(9):
+        policy.observe(Status.OK, 10.0, 0.0)
+    assert policy.interval == 8.0
+
+    assert policy.observe(status, latency, packet_loss) == 0.5
+    assert policy.degraded
+
+
+def test_recovery_needs_stable_checks_and_backs_off_gradually():
+    policy = _policy()
+    policy.observe(Status.FAIL, None, 100.0)
+
+    intervals = [policy.observe(Status.OK, 10.0, 0.0) for _ in range(6)]
+
+    # Durum değişimi (FAIL -> OK) de bir değişimdir
+    assert intervals == [0.5, 0.5, 0.5, 1.0, 1.0, 1.0]
+    assert not policy.degraded
+
+
+def test_small_latency_noise_and_persistent_shift():
+    policy = _policy(smoothing=0.5)
+    policy.observe(Status.OK, 0.2, 0.0)
+    # Oransal olarak büyük ama 1 ms'den küçük sapma gürültü sayılır
+    assert policy.observe(Status.OK, 0.6, 0.0) == 1.0
+
+    policy = _policy(smoothing=0.5)
+    policy.observe(Status.OK, 10.0, 0.0)
+    assert policy.observe(Status.OK, 20.0, 0.0) == 0.5
+    # Taban yeni gecikmeye yaklaşınca hedef yeniden kararlı sayılır
+    for _ in range(3):
+        policy.observe(Status.OK, 20.0, 0.0)
+    assert not policy.observe(Status.OK, 20.0, 0.0) == 0.5
+
+
+def test_bounds_never_cross_configured_interval():
+    policy = AdaptiveInterval(1.0, fast=5.0, maximum=0.1)
+
+    assert policy.fast == 1.0
+    assert policy.maximum == 1.0
@@ -0,0 +1,103 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.core.alerts import (FIRING, RESOLVED, Alert, AlertDispatcher, AlertEngine,
+                             ConsecutiveFailureRule, RateOfChangeRule, ThresholdRule)
+
+
+def _feed(engine, latencies, ok=True, start=0.0):
+    alerts = []
+    for i, latency in enumerate(latencies):
+        alerts += engine.evaluate('8.8.8.8', start + i, latency, 0.0, ok)
+    return alerts
+
+
+def test_threshold_uses_sliding_mean_with_hysteresis():
+    rule = ThresholdRule('latency', 'latency', 100, window=2, hysteresis=0.8)
+    engine = AlertEngine([rule], cooldown=0)
+
+    # Tek bir sıçrama ortalamayı eşiğin üstüne çıkarmaz
+    assert _feed(engine, [50, 140, 50]) == []
+    alerts = _feed(engine, [150, 150], start=3)
+    assert [(a.rule, a.state, a.value) for a in alerts] == [('latency', FIRING, 150.0)]
+
+    # Eşiğin hemen altı uyarıyı kapatmaz, histerezis sınırının altı kapatır
+    assert _feed(engine, [90, 90], start=5) == []
+    alerts = _feed(engine, [70, 70], start=7)
+    assert [a.state for a in alerts] == [RESOLVED]
+
+
+def test_consecutive_failures_and_recoveries():
+    engine = AlertEngine([ConsecutiveFailureRule('down', failures=3, recoveries=2)], cooldown=0)
+
+    assert _feed(engine, [None, None], ok=False) == []
+    assert [a.state for a in _feed(engine, [None], ok=False, start=2)] == [FIRING]
+    assert _feed(engine, [10], start=3) == []
+    assert [a.state for a in _feed(engine, [10], start=4)] == [RESOLVED]
+
+
+def test_rate_of_change_compares_with_window_ago():
+    engine = AlertEngine([RateOfChangeRule('jump', 'latency', 50, window=2)], cooldown=0)
+
+    assert _feed(engine, [10, 30, 55]) == []
+    alerts = _feed(engine, [90], start=3)
+    assert alerts[0].state == FIRING and alerts[0].value == 60
+    # Eksik ölçümler durumu değiştirmez
+    assert _feed(engine, [None], start=4) == []
+
+
+def test_cooldown_suppresses_repeat_notifications():
+    engine = AlertEngine([ConsecutiveFailureRule('down', failures=1)], cooldown=300)
+
+    assert len(engine.evaluate('t', 0, None, 100, False)) == 1
+    assert len(engine.evaluate('t', 1, 1.0, 0, True)) == 1
+    # Bekleme süresi içindeki yeni tetiklenme ve kapanışı bildirilmez
+    assert engine.evaluate('t', 10, None, 100, False) == []
+    assert engine.evaluate('t', 11, 1.0, 0, True) == []
+    assert engine.suppressed == 1
+    assert len(engine.evaluate('t', 400, None, 100, False)) == 1
+
+
+def test_state_is_per_target():
+    engine = AlertEngine([ConsecutiveFailureRule('down', failures=2)], cooldown=0)
+
+    assert engine.evaluate('a', 0, None, 100, False) == []
+    assert engine.evaluate('b', 0, None, 100, False) == []
+    assert [a.target for a in engine.evaluate('a', 1, None, 100, False)] == ['a']
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_delivers_in_background():
+    notifier = AsyncMock()
+    dispatcher = AlertDispatcher([notifier])
+    dispatcher.start()
+    assert dispatcher.submit(Alert('t', 'down', FIRING, 1.0, 0.0))
+    await dispatcher.stop()
+
+    notifier.send.assert_awaited_once()
+    assert dispatcher.sent == 1
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_drops_when_full_and_survives_failures():
+    gate = asyncio.Event()
+
+    class SlowNotifier:
+        async def send(self, alert):
+            await gate.wait()
+            raise RuntimeError("smtp")
+
+    dispatcher = AlertDispatcher([SlowNotifier()], max_queue_size=1)
+    dispatcher.start()
+    assert dispatcher.submit(Alert('t', 'a', FIRING, 1.0, 0.0))
+    await asyncio.sleep(0)
+    assert dispatcher.submit(Alert('t', 'b', FIRING, 1.0, 0.0))
+    # Kuyruk dolu: submit beklemez, uyarıyı atar
+    assert not dispatcher.submit(Alert('t', 'c', FIRING, 1.0, 0.0))
+    assert dispatcher.dropped == 1
+
+    gate.set()
+    await dispatcher.stop()
+    assert dispatcher.failed == 2
@@ -0,0 +1,147 @@
+import gzip
+
+import numpy as np
+import pytest
+
+from src.core.analytics import RELATIVE_ACCURACY, analyze, mos, quantiles, summarize
+from src.core.capture import CaptureWriter, load_capture, record_dtype
+from src.core.probe_result import ProbeResult, Status
+
+BASE_NS = 1_700_000_000 * 10**9
+
+
+def _failed(target, second):
+    # a: 10-14. sn ve 95. sn'den sona kadar, b: 0-1. ve 50. sn kesinti
+    if target == 'a':
+        return 10 <= second < 15 or second >= 95
+    return second in (0, 1, 50)
+
+
+@pytest.fixture
+def capture_path(tmp_path):
+    path = str(tmp_path / 'a.nmcap')
+    writer = CaptureWriter(path, block_records=7)
+    for second in range(100):
+        for target in ('a', 'b'):
+            failed = _failed(target, second)
+            result = ProbeResult(target, Status.FAIL if failed else Status.OK,
+                                 latency=None if failed else 10.0 + second % 2,
+                                 packet_loss=100.0 if failed else 0.0,
+                                 time_ns=BASE_NS + second * 10**9)
+            result.interval = 1.0
+            writer.append(result)
+    writer.close()
+    return path
+
+
+def test_report_availability_outages_and_jitter(capture_path):
+    reports = {report['target']: report for report in analyze([capture_path], processes=1).report()}
+
+    a, b = reports['a'], reports['b']
+    assert a['samples'] == 100
+    assert a['availability'] == 90.0 and a['packet_loss'] == 10.0
+    assert a['outages'] == 2 and a['downtime'] == 10.0
+    assert a['mtbf'] == 45.0 and a['mttr'] == 5.0
+    assert [outage['duration'] for outage in a['longest_outages']] == [5.0, 5.0]
+    assert a['longest_outages'][0]['start'] == '2023-11-14T22:13:30Z'
+    assert a['latency_mean'] == 10.5
+    assert a['latency_p99'] == pytest.approx(11.0, rel=RELATIVE_ACCURACY)
+    # Kesinti öncesi ve sonrası gecikmeler aynı (11 ms) olduğu için tek fark sıfırdır
+    assert a['jitter'] == pytest.approx(83 / 84, abs=1e-3)
+    assert a['worst_hour'] == 22 and len(a['hourly_availability']) == 24
+
+    assert b['outages'] == 2 and b['downtime'] == 3.0
+    assert b['longest_outages'][0] == {'start': '2023-11-14T22:13:20Z', 'duration': 2.0}
+    assert analyze([capture_path], processes=1).report(min_outage=1.5)[1]['outages'] == 1
+
+
+def test_chunking_and_processes_do_not_change_report(capture_path):
+    expected = analyze([capture_path], processes=1).report()
+
+    # 7 kayıtlık parçalar kesintileri ve titreşimi parça sınırlarından böler
+    assert analyze([capture_path], processes=1, chunk_records=7).report() == expected
+    assert analyze([capture_path], processes=2, chunk_records=14).report() == expected
+
+
+def test_targets_first_seen_in_later_chunks(tmp_path):
+    path = str(tmp_path / 'late.nmcap')
+    writer = CaptureWriter(path, block_records=16)
+    for second in range(60):
+        # n. hedef ilk kez 2n. saniyede görünür; her hedefin kesintileri parça sınırlarını aşar
+        for index in range(min(second // 2 + 1, 20)):
+            failed = (second + index) % 7 < 2
+            result = ProbeResult(f'10.0.0.{index}', Status.FAIL if failed else Status.OK,
+                                 latency=None if failed else 5.0 + index,
+                                 packet_loss=100.0 if failed else 0.0,
+                                 time_ns=BASE_NS + second * 10**9)
+            result.interval = 1.0
+            writer.append(result)
+    writer.close()
+
+    expected = analyze([path], processes=1).report()
+    assert len(expected) == 20
+    assert analyze([path], processes=2, chunk_records=100).report() == expected
+
+
+def test_line_protocol_export_matches_capture(capture_path, tmp_path):
+    export = tmp_path / 'export.lp'
+    lines = [result.to_line() for result in load_capture(capture_path).results()]
+    lines.insert(3, 'host_metrics,host=x cpu_usage=1.0 1700000000000000000')
+    export.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    expected = analyze([capture_path], processes=1).report()
+    assert analyze([str(export)], processes=1, chunk_records=50).report() == expected
+    assert analyze([str(export)], processes=2, chunk_records=10).report() == expected
+
+
+def test_line_protocol_columns_escaping_and_field_order(tmp_path):
+    export = tmp_path / 'export.lp.gz'
+    lines = [
+        'network_metrics,status=OK,target=a\\ b\\,c interval=1,latency=10.0,packet_loss=0 '
+        f'{BASE_NS}',
+        'network_metrics,status=FAIL,target=a\\ b\\,c packet_loss=100 '
+        f'{BASE_NS + 10**9}',
+        'network_metrics,target=x status=1',  # zaman damgası yok: atlanır
+        'network_metrics,region=eu,status=OK,target=x packet_loss=50,latency=2.5,interval=2 '
+        f'{BASE_NS}',
+    ]
+    with gzip.open(export, 'wt', encoding='utf-8') as f:
+        f.write('\n'.join(lines))  # son satırda satır sonu yok
+
+    summary = analyze([str(export)], processes=1, chunk_records=1)
+    reports = {report['target']: report for report in summary.report()}
+    assert set(reports) == {'a b,c', 'x'}
+    assert reports['a b,c']['samples'] == 2 and reports['a b,c']['availability'] == 50.0
+    assert reports['x']['packet_loss'] == 50.0 and reports['x']['latency_mean'] == 2.5
+
+
+def test_summarize_without_intervals_uses_sample_spacing():
+    records = np.zeros(4, dtype=record_dtype())
+    records['time_ns'] = BASE_NS + np.array([0, 10, 20, 30]) * 10**9
+    records['status'] = [Status.OK, Status.FAIL, Status.OK, Status.OK]
+    records['latency'] = [1.0, np.nan, 2.0, 4.0]
+    records['interval'] = np.nan
+
+    summary = summarize(records)
+    assert summary.weight.tolist() == [40.0]
+    assert summary.ok_weight.tolist() == [30.0]
+    assert summary.jitter_sum.tolist() == [3.0]
+
+
+def test_quantiles_and_mos():
+    histogram_values = np.random.default_rng(1).gamma(2.0, 10.0, 10_000)
+    records = np.zeros(len(histogram_values), dtype=record_dtype())
+    records['time_ns'] = BASE_NS + np.arange(len(records)) * 10**9
+    records['latency'] = histogram_values
+    records['interval'] = 1.0
+    cells, counts = summarize(records).histogram
+    histogram = np.zeros(int(cells.max()) + 1, dtype=np.int64)
+    histogram[cells] = counts
+
+    estimate = quantiles(histogram[None, :], (0.5, 0.99))[0]
+    exact = np.quantile(histogram_values, (0.5, 0.99))
+    assert np.allclose(estimate, exact, rtol=2 * RELATIVE_ACCURACY)
+
+    scores = mos(np.array([20.0, 20.0, 400.0]), np.array([1.0, 1.0, 50.0]),
+                 np.array([0.0, 5.0, 20.0]))
+    assert scores[0] > 4.3 and scores[0] > scores[1] > scores[2] >= 1.0
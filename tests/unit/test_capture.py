@@ -0,0 +1,158 @@
+import math
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from src.core.capture import (CaptureReplayer, CaptureWriter, load_capture, merge_captures,
+                              replay_capture)
+from src.core.probe_result import ProbeResult, Status
+from src.core.rollup import RollupAggregator
+
+BASE_NS = 1_700_000_000 * 10**9
+
+
+def _result(target, second, latency=10.0, status=Status.OK):
+    result = ProbeResult(target, status, latency=latency if status is Status.OK else None,
+                         packet_loss=0.0 if status is Status.OK else 100.0,
+                         time_ns=BASE_NS + int(second * 10**9))
+    result.interval = 1.0
+    return result
+
+
+@pytest.mark.parametrize('codec', ['zlib', 'none'])
+def test_round_trip_across_blocks(tmp_path, codec):
+    path = str(tmp_path / 'a.nmcap')
+    writer = CaptureWriter(path, codec=codec, block_records=4)
+    for second in range(10):
+        writer.append(_result('10.0.0.1', second, latency=float(second)))
+        if second == 5:
+            writer.append(_result('tcp://10.0.0.2:80', second, status=Status.FAIL))
+    writer.close()
+
+    capture = load_capture(path)
+    assert capture.targets == ['10.0.0.1', 'tcp://10.0.0.2:80']
+    assert len(capture) == 11
+    assert capture.records['latency'][:3].tolist() == [0.0, 1.0, 2.0]
+    assert writer.blocks == 5  # iki hedef bloğu, üç kayıt bloğu
+
+    failed = [result for result in capture.results() if result.status is Status.FAIL]
+    assert len(failed) == 1
+    assert failed[0].target == 'tcp://10.0.0.2:80'
+    assert failed[0].latency is None and failed[0].packet_loss == 100.0
+    assert failed[0].time_ns == BASE_NS + 5 * 10**9
+    assert failed[0].interval == 1.0 and failed[0].schedule_lag is None
+
+
+def test_uncompressed_single_block_is_memory_mapped(tmp_path):
+    path = str(tmp_path / 'a.nmcap')
+    writer = CaptureWriter(path, codec='none')
+    for second in range(100):
+        writer.append(_result('10.0.0.1', second))
+    writer.close()
+
+    assert isinstance(load_capture(path).records, np.memmap)
+
+
+def test_rotation_repeats_target_dictionary(tmp_path):
+    writer = CaptureWriter(str(tmp_path / 'a.nmcap'), block_records=10, max_bytes=1)
+    for second in range(20):
+        writer.append(_result('10.0.0.1', second))
+    writer.close()
+
+    first = load_capture(str(tmp_path / 'a.nmcap'))
+    second = load_capture(str(tmp_path / 'a-1.nmcap'))
+    assert first.targets == second.targets == ['10.0.0.1']
+    assert len(first) == len(second) == 10
+
+
+def test_blocks_are_written_off_the_calling_thread(tmp_path):
+    path = str(tmp_path / 'a.nmcap')
+    writer = CaptureWriter(path, block_records=2, max_bytes=1)
+    threads = []
+    write_block = writer._write_block
+
+    def tracked(block):
+        threads.append(threading.current_thread())
+        write_block(block)
+
+    writer._write_block = tracked
+    writer.append(_result('10.0.0.1', 0))
+    writer.append(_result('10.0.0.1', 1))
+    writer.append(_result('10.0.0.2', 2))
+    writer.close()
+
+    assert threads and threading.current_thread() not in threads
+    # Döndürülen dosya önceki hedef adlarını da taşır
+    assert load_capture(str(tmp_path / 'a-1.nmcap')).targets == ['10.0.0.1', '10.0.0.2']
+    assert writer.records == 3 and writer._thread is None
+
+
+def test_truncated_tail_is_skipped(tmp_path):
+    path = tmp_path / 'a.nmcap'
+    writer = CaptureWriter(str(path), block_records=5)
+    for second in range(10):
+        writer.append(_result('10.0.0.1', second))
+    writer.close()
+    path.write_bytes(path.read_bytes()[:-3])
+
+    assert len(load_capture(str(path))) == 5
+
+
+def test_merge_remaps_targets_and_sorts_by_time(tmp_path):
+    paths = [str(tmp_path / 'a.nmcap'), str(tmp_path / 'b.nmcap')]
+    for path, target, offset in ((paths[0], 'a', 0.0), (paths[1], 'b', 0.5)):
+        writer = CaptureWriter(path)
+        for second in range(3):
+            writer.append(_result(target, second + offset))
+        writer.close()
+
+    merged = merge_captures([load_capture(path) for path in paths])
+    assert merged.targets == ['a', 'b']
+    assert [merged.targets[i] for i in merged.records['target_id']] == ['a', 'b'] * 3
+    assert (np.diff(merged.records['time_ns']) > 0).all()
+
+
+@pytest.mark.asyncio
+async def test_replay_into_store_with_rollups(tmp_path):
+    path = str(tmp_path / 'a.nmcap')
+    writer = CaptureWriter(path)
+    for second in range(120):
+        writer.append(_result('10.0.0.1', second, latency=float(second)))
+    writer.close()
+
+    data_store = MagicMock()
+    data_store.store_metrics = AsyncMock()
+    data_store.store_rollups = AsyncMock()
+    data_store.flush = AsyncMock()
+    count = await replay_capture(load_capture(path), data_store,
+                                 rollups=RollupAggregator(resolutions=[60]), batch_size=50)
+
+    assert count == 120
+    assert data_store.store_metrics.await_count == 120
+    assert data_store.flush.await_count == 3  # her 50 sonuçta bir ve sonda
+    assert data_store.store_metrics.call_args_list[0][0][0].time_ns == BASE_NS
+    windows = [window for call in data_store.store_rollups.call_args_list for window in call[0][0]]
+    assert len(windows) == 3  # 1700000000 bir dakika sınırı değil
+
+
+def test_replayer_pauses_until_active_and_retimes(tmp_path):
+    path = str(tmp_path / 'a.nmcap')
+    writer = CaptureWriter(path)
+    for second in range(5):
+        writer.append(_result('10.0.0.1', second, latency=float(second)))
+    writer.close()
+
+    replayer = CaptureReplayer(merge_captures([load_capture(path)]), speed=0, max_batch=3)
+    replayer.start()
+    assert len(replayer.poll()) == 0
+
+    replayer.active.set()
+    first, second = replayer.poll(), replayer.poll()
+    assert first['latency'].tolist() == [0.0, 1.0, 2.0] and len(second) == 2
+    assert replayer.finished
+    # Zaman damgaları oynatmanın başladığı ana kaydırılır (mikrosaniye)
+    assert abs(first['timestamp'][0] / 1e6 - time.time()) < 5
+    assert not math.isnan(second['latency'][-1])
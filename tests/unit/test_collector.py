@@ -0,0 +1,62 @@
+import json
+import os
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+
+import pytest
+import yaml
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'src')
+HEAVY_MODULES = ('dash', 'plotly', 'flask', 'numpy', 'influxdb_client', 'psycopg2')
+
+
+def test_import_skips_dashboard_and_backend_libraries():
+    output = subprocess.run(
+        [sys.executable, '-c',
+         'import json, sys, collector; '
+         f'print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))'],
+        cwd=SRC_DIR, capture_output=True, text=True, check=True
+    ).stdout
+
+    assert json.loads(output) == []
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="SIGTERM gerektirir")
+def test_collector_writes_until_terminated(tmp_path):
+    # Çekirdek bağlantıları accept() çağrılmadan da tamamlar
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(64)
+    port = listener.getsockname()[1]
+
+    database = tmp_path / 'metrics.db'
+    config = {
+        'targets': [{'name': 'yerel', 'type': 'tcp', 'address': '127.0.0.1',
+                     'port': port, 'interval': 0.1}],
+        'storage': {'backend': 'sqlite', 'path': str(database), 'flush_interval': 0.1},
+        'influxdb': {'url': None, 'token': None, 'org': None, 'bucket': None},
+        'postgresql': {'dsn': None},
+        'app': {'cpu_check_interval': 0, 'collector': {'workers': 1}},
+        'alerts': {'enabled': False},
+        'logging': {'version': 1}
+    }
+    config_path = tmp_path / 'config.yaml'
+    config_path.write_text(yaml.safe_dump(config), encoding='utf-8')
+
+    process = subprocess.Popen([sys.executable, 'collector.py', '--config', str(config_path)],
+                               cwd=SRC_DIR)
+    try:
+        time.sleep(2.0)
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=10) == 0
+    finally:
+        if process.poll() is None:
+            process.kill()
+        listener.close()
+
+    with sqlite3.connect(database) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM samples WHERE status = 0").fetchone()[0] > 0
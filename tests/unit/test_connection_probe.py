@@ -0,0 +1,148 @@
+import asyncio
+import shutil
+import socket
+import ssl
+import subprocess
+
+import pytest
+
+from src.core.connection_probe import TcpProbe, connection_label
+from src.core.probe_result import Status
+
+
+async def _start_server(handler, ssl_context=None):
+    server = await asyncio.start_server(handler, '127.0.0.1', 0, ssl=ssl_context)
+    return server, server.sockets[0].getsockname()[1]
+
+
+async def _echo_banner(reader, writer):
+    writer.write(b'220 hazir\r\n')
+    await writer.drain()
+    writer.close()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_connection_label():
+    assert connection_label('tcp', 'example.com') == 'tcp://example.com:80'
+    assert connection_label('tls', '::1', 8443) == 'tls://[::1]:8443'
+
+
+@pytest.mark.asyncio
+async def test_tcp_connect_success():
+    server, port = await _start_server(_echo_banner)
+    try:
+        result = await TcpProbe('127.0.0.1', port).perform_check()
+    finally:
+        server.close()
+
+    assert result.status is Status.OK
+    assert result.target == f'tcp://127.0.0.1:{port}'
+    assert result.packet_loss == 0.0
+    assert result.latency >= 0
+    # Sayısal adreste DNS aşaması yoktur
+    assert set(result.extra) == {'connect_ms'}
+
+
+@pytest.mark.asyncio
+async def test_tcp_first_byte_and_dns_phase():
+    server, port = await _start_server(_echo_banner)
+    try:
+        result = await TcpProbe('localhost', port, payload='').perform_check()
+    finally:
+        server.close()
+
+    assert result.status is Status.OK
+    assert set(result.extra) == {'dns_ms', 'connect_ms', 'first_byte_ms'}
+
+
+@pytest.mark.asyncio
+async def test_tcp_connection_refused_is_failure():
+    result = await TcpProbe('127.0.0.1', _free_port()).perform_check()
+
+    assert result.status is Status.FAIL
+    assert result.packet_loss == 100.0
+    assert result.latency is None
+    assert result.error
+
+
+@pytest.mark.asyncio
+async def test_tcp_timeout_is_failure():
+    async def silent(reader, writer):
+        # Yanıt vermeden istemcinin bağlantıyı kapatmasını bekler
+        await reader.read()
+        writer.close()
+
+    server, port = await _start_server(silent)
+    try:
+        result = await TcpProbe('127.0.0.1', port, timeout=0.05, payload=b'ping').perform_check()
+    finally:
+        server.close()
+
+    assert result.status is Status.FAIL
+    assert result.error == 'zaman aşımı'
+    assert 'connect_ms' in result.extra
+
+
+@pytest.mark.asyncio
+async def test_limiter_bounds_concurrent_attempts():
+    active = peak = 0
+
+    async def slow(reader, writer):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        writer.write(b'x')
+        writer.close()
+
+    server, port = await _start_server(slow)
+    limiter = asyncio.Semaphore(2)
+    try:
+        results = await asyncio.gather(*(
+            TcpProbe('127.0.0.1', port, payload='', limiter=limiter).perform_check()
+            for _ in range(6)
+        ))
+    finally:
+        server.close()
+
+    assert all(result.ok for result in results)
+    assert peak <= 2
+
+
+@pytest.fixture
+def certificate(tmp_path):
+    if shutil.which('openssl') is None:
+        pytest.skip("openssl bulunamadı")
+    cert, key = tmp_path / 'cert.pem', tmp_path / 'key.pem'
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+         '-subj', '/CN=localhost', '-keyout', str(key), '-out', str(cert)],
+        check=True, capture_output=True
+    )
+    return cert, key
+
+
+@pytest.mark.asyncio
+async def test_tls_handshake_phases(certificate):
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(*certificate)
+    server, port = await _start_server(_echo_banner, context)
+    try:
+        unverified = await TcpProbe('127.0.0.1', port, tls=True, verify=False).perform_check()
+        verified = await TcpProbe('127.0.0.1', port, tls=True,
+                                  server_name='localhost').perform_check()
+    finally:
+        server.close()
+
+    assert unverified.status is Status.OK
+    assert unverified.target == f'tls://127.0.0.1:{port}'
+    assert set(unverified.extra) == {'connect_ms', 'tls_ms'}
+    # Kendinden imzalı sertifika doğrulanamaz
+    assert verified.status is Status.FAIL
+    assert 'certificate' in verified.error.lower()
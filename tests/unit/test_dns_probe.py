@@ -0,0 +1,108 @@
+import asyncio
+import struct
+
+import pytest
+
+from src.core.dns_probe import DnsProbe, build_query, dns_label, parse_response
+from src.core.probe_result import Status
+
+
+class _Resolver(asyncio.DatagramProtocol):
+    """Sorguyu verilen yanıt kodu ve cevap sayısıyla yanıtlayan yerel DNS sunucusu."""
+
+    def __init__(self, rcode=0, answers=1, reply=True):
+        self.rcode = rcode
+        self.answers = answers
+        self.reply = reply
+        self.queries = []
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.queries.append(data)
+        if self.reply:
+            query_id = struct.unpack_from('!H', data)[0]
+            header = struct.pack('!HHHHHH', query_id, 0x8180 | self.rcode, 1, self.answers, 0, 0)
+            self.transport.sendto(header + data[12:], addr)
+
+
+async def _start_resolver(**kwargs):
+    transport, protocol = await asyncio.get_running_loop().create_datagram_endpoint(
+        lambda: _Resolver(**kwargs), local_addr=('127.0.0.1', 0)
+    )
+    return transport, protocol, transport.get_extra_info('sockname')[1]
+
+
+def test_build_query_and_parse_response():
+    query = build_query(0x1234, 'example.com.', 1)
+    assert query[:12] == struct.pack('!HHHHHH', 0x1234, 0x0100, 1, 0, 0, 0)
+    assert query[12:] == b'\x07example\x03com\x00\x00\x01\x00\x01'
+
+    response = struct.pack('!HHHHHH', 0x1234, 0x8183, 1, 0, 0, 0)
+    assert parse_response(response, 0x1234) == (3, 0)
+    with pytest.raises(ValueError):
+        parse_response(response, 0x4321)
+    with pytest.raises(ValueError):
+        parse_response(query, 0x1234)  # yanıt bayrağı yok
+
+
+def test_dns_label():
+    assert dns_label('example.com', '8.8.8.8') == 'dns://8.8.8.8/example.com'
+    assert dns_label('example.com') == 'dns:example.com'
+
+
+@pytest.mark.asyncio
+async def test_query_success():
+    transport, resolver, port = await _start_resolver(answers=2)
+    try:
+        result = await DnsProbe('example.com', resolver='127.0.0.1', port=port).perform_check()
+    finally:
+        transport.close()
+
+    assert result.status is Status.OK
+    assert result.target == 'dns://127.0.0.1/example.com'
+    assert result.latency >= 0
+    assert result.extra == {'answers': 2.0, 'rcode': 0.0}
+    assert len(resolver.queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_nxdomain_is_failure_with_latency():
+    transport, _, port = await _start_resolver(rcode=3, answers=0)
+    try:
+        result = await DnsProbe('missing.example', resolver='127.0.0.1', port=port).perform_check()
+    finally:
+        transport.close()
+
+    assert result.status is Status.FAIL
+    assert result.error == 'NXDOMAIN'
+    assert result.latency is not None
+
+
+@pytest.mark.asyncio
+async def test_unanswered_query_times_out():
+    transport, _, port = await _start_resolver(reply=False)
+    try:
+        result = await DnsProbe('example.com', resolver='127.0.0.1', port=port,
+                                timeout=0.05).perform_check()
+    finally:
+        transport.close()
+
+    assert result.status is Status.FAIL
+    assert result.packet_loss == 100.0
+    assert result.error == 'zaman aşımı'
+
+
+@pytest.mark.asyncio
+async def test_system_resolver():
+    result = await DnsProbe('localhost').perform_check()
+
+    assert result.status is Status.OK
+    assert result.target == 'dns:localhost'
+    assert result.extra['answers'] >= 1
+
+
+def test_unsupported_record_type():
+    with pytest.raises(ValueError):
+        DnsProbe('example.com', record_type='MX')
@@ -0,0 +1,39 @@
+import numpy as np
+
+from src.core.downsample import minmax_buckets
+
+
+def test_bucket_of_one_returns_input():
+    x = np.arange(5)
+    y = np.arange(5, dtype=float)
+    out_x, out_y = minmax_buckets(x, y, 1)
+    assert out_x is x and out_y is y
+
+
+def test_keeps_min_and_max_in_time_order():
+    x = np.arange(8)
+    y = np.array([5.0, 1.0, 9.0, 3.0, 2.0, 8.0, 4.0, 0.0])
+    out_x, out_y = minmax_buckets(x, y, 4)
+
+    assert out_x.tolist() == [1, 2, 5, 7]
+    assert out_y.tolist() == [1.0, 9.0, 8.0, 0.0]
+
+
+def test_drops_partial_tail_and_handles_gaps():
+    x = np.arange(7)
+    y = np.array([np.nan, 2.0, np.nan, np.nan, np.nan, np.nan, 1.0])
+    out_x, out_y = minmax_buckets(x, y, 3)
+
+    assert len(out_x) == 4  # son yarım grup atlanır
+    assert out_y[:2].tolist() == [2.0, 2.0]
+    assert np.isnan(out_y[2:]).all()
+
+
+def test_aligned_buckets_are_stable_when_extended():
+    x = np.arange(100)
+    y = np.sin(x / 5.0)
+    full_x, _ = minmax_buckets(x, y, 10)
+    head_x, _ = minmax_buckets(x[:60], y[:60], 10)
+    tail_x, _ = minmax_buckets(x[60:], y[60:], 10)
+
+    assert np.concatenate([head_x, tail_x]).tolist() == full_x.tolist()
@@ -0,0 +1,148 @@
+import asyncio
+from datetime import datetime, timezone
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.event_sink import SCHEMA_LOCK_SQL, PostgresEventSink, partition_sql
+
+
+@pytest.fixture
+def sink():
+    sink = PostgresEventSink('postgresql://test', batch_size=3, flush_interval=60,
+                             max_queue_size=5, maintenance_interval=0)
+    sink.pool = MagicMock()
+    return sink
+
+
+async def _write(sink, count):
+    for i in range(count):
+        await sink.write_event(datetime(2024, 1, 1, 0, 0, i, tzinfo=timezone.utc), '8.8.8.8',
+                               'FAIL', 'OK', 60.0, 60, details={'seq': i})
+
+
+@pytest.mark.asyncio
+async def test_batches_events_into_multi_row_insert():
+    sink = PostgresEventSink('postgresql://test', batch_size=3, flush_interval=60,
+                             max_queue_size=100, maintenance_interval=0)
+    sink.pool = MagicMock()
+    with patch('src.core.event_sink.execute_values') as mock_execute_values:
+        await _write(sink, 7)
+        await sink.stop()
+
+    batches = [call.args[2] for call in mock_execute_values.call_args_list]
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert batches[0][0][1:3] == ('8.8.8.8', 'FAIL')
+    assert sink.written_rows == 7
+    assert sink.written_batches == 3
+    conn = sink.pool.getconn.return_value
+    assert conn.commit.call_count == 3
+    assert sink.pool.putconn.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_flush_runs_off_event_loop(sink):
+    loop_thread = []
+
+    def record_thread(*args, **kwargs):
+        loop_thread.append(threading.current_thread() is threading.main_thread())
+
+    with patch('src.core.event_sink.execute_values', side_effect=record_thread):
+        await _write(sink, 3)
+        await asyncio.sleep(0.1)
+        await sink.stop()
+
+    assert loop_thread == [False]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_rolls_back_and_counts_error(sink):
+    with patch('src.core.event_sink.execute_values', side_effect=Exception("db down")):
+        await _write(sink, 1)
+        await sink.stop()
+
+    conn = sink.pool.getconn.return_value
+    conn.rollback.assert_called_once()
+    sink.pool.putconn.assert_called_once_with(conn)
+    assert sink.errors == 1
+    assert sink.written_rows == 0
+
+
+@pytest.mark.asyncio
+async def test_drops_oldest_when_queue_full(sink):
+    sink.batch_size = 100
+    await _write(sink, 7)
+    assert sink.dropped == 2
+    assert sink.stats()['queue_depth'] == 5
+
+    with patch('src.core.event_sink.execute_values') as mock_execute_values:
+        await sink.stop()
+    seqs = [row[9].adapted['seq'] for row in mock_execute_values.call_args.args[2]]
+    assert seqs == [2, 3, 4, 5, 6]
+
+
+def test_close_releases_pool(sink):
+    pool = sink.pool
+    sink.close()
+    pool.closeall.assert_called_once()
+    assert sink.pool is None
+
+
+@pytest.mark.asyncio
+async def test_creates_missing_monthly_partitions_once(sink):
+    cursor = sink.pool.getconn.return_value.cursor.return_value.__enter__.return_value
+    with patch('src.core.event_sink.execute_values'):
+        await _write(sink, 3)
+        await sink.write_event(datetime(2023, 12, 31, 23, 59, tzinfo=timezone.utc), 'a', 'FAIL')
+        await sink.stop()
+
+    statements = [call.args[0] for call in cursor.execute.call_args_list]
+    assert statements == [SCHEMA_LOCK_SQL, partition_sql(2024, 1),
+                          SCHEMA_LOCK_SQL, partition_sql(2023, 12)]
+    assert "FROM ('2023-12-01 00:00:00+00') TO ('2024-01-01 00:00:00+00')" in statements[3]
+
+
+def test_maintenance_drops_expired_partitions(sink):
+    sink.retention_days = 90
+    cursor = sink.pool.getconn.return_value.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = [('network_events_p202401',), ('network_events_p202402',),
+                                    ('network_events_p202403',), ('network_events_legacy',)]
+
+    dropped = sink.maintain(datetime(2024, 5, 15, tzinfo=timezone.utc))
+
+    statements = [call.args[0] for call in cursor.execute.call_args_list]
+    # Kesme anı 16 Şubat: Ocak bölümü tamamen eski, Şubat'ta hâlâ saklanacak olaylar var
+    assert dropped == 1
+    assert 'DROP TABLE IF EXISTS network_events_p202401' in statements
+    assert not any('p202402' in statement and 'DROP' in statement for statement in statements)
+    assert partition_sql(2024, 6) in statements
+
+
+def test_spooled_rows_round_trip_including_legacy_format(sink):
+    row = (datetime(2024, 1, 1, tzinfo=timezone.utc), 'a', 'OK', 'FAIL', 30.0, 30,
+           12.5, 0.0, None, None)
+    legacy = [['2024-01-01T00:00:01+00:00', 'a', 'ERROR',
+               {'latency': None, 'packet_loss': 100.0, 'error': 'timeout'}]]
+    payload = json.dumps(json.loads(sink._serialize_rows([row])) + legacy).encode()
+
+    with patch('src.core.event_sink.execute_values') as mock_execute_values:
+        sink.insert_serialized(payload)
+
+    rows = mock_execute_values.call_args.args[2]
+    assert rows[0] == row
+    assert rows[1][1:] == ('a', 'ERROR', None, None, None, None, 100.0, 'timeout', None)
+
+
+def test_schema_setup_holds_advisory_lock_before_legacy_rename(sink):
+    cursor = sink.pool.getconn.return_value.cursor.return_value.__enter__.return_value
+    cursor.fetchone.return_value = ('r',)
+
+    sink.init_schema(datetime(2024, 1, 15, tzinfo=timezone.utc))
+
+    statements = [call.args[0].strip() for call in cursor.execute.call_args_list]
+    assert statements[0] == SCHEMA_LOCK_SQL
+    assert statements.index("ALTER TABLE network_events RENAME TO network_events_legacy") > 0
+    assert partition_sql(2024, 2) in statements
+    sink.pool.getconn.return_value.commit.assert_called_once()
@@ -0,0 +1,105 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import re
+
+import numpy as np
+
+from src.core.history import HistoryQuery, InfluxHistorySource, build_flux, choose_resolution
+
+
+class FakeQueryApi:
+    """Her pencere için latency = pencere başlangıcı / 60 döndüren sahte sorgu API'si."""
+
+    def __init__(self):
+        self.queries = []
+
+    def query(self, flux, org=None):
+        self.queries.append(flux)
+        start, stop = (
+            int(datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
+                .replace(tzinfo=timezone.utc).timestamp())
+            for value in re.search(r'range\(start: (\S+), stop: (\S+)\)', flux).groups()
+        )
+        every = int(re.search(r'every: (\d+)s', flux).group(1))
+        field = 'latency_mean' if 'latency_mean' in flux else 'latency'
+        records = [
+            SimpleNamespace(
+                get_time=lambda t=t: datetime.fromtimestamp(t, timezone.utc),
+                values={field: t / 60, 'packet_loss': 0.0}
+            )
+            for t in range(start, stop, every)
+        ]
+        return [SimpleNamespace(records=records)]
+
+
+def _history(now, rollup_resolutions=(), **kwargs):
+    clock = SimpleNamespace(now=now)
+    api = FakeQueryApi()
+    source = InfluxHistorySource(api, 'bucket', 'org', rollup_resolutions)
+    history = HistoryQuery(source, clock=lambda: clock.now, **kwargs)
+    return history, api, clock
+
+
+def test_choose_resolution_picks_nice_steps():
+    assert choose_resolution(0, 100, 100) == 1
+    assert choose_resolution(0, 3600, 100) == 60
+    assert choose_resolution(0, 86400, 100) == 900
+    assert choose_resolution(0, 400 * 86400, 100) == 4 * 86400
+
+
+def test_build_flux_pushes_down_aggregation():
+    flux = build_flux('b', 'network_metrics', ['latency', 'packet_loss'], 'a"b', 0, 3600, 60)
+
+    assert 'range(start: 1970-01-01T00:00:00Z, stop: 1970-01-01T01:00:00Z)' in flux
+    assert 'r.target == "a\\"b"' in flux
+    assert 'r._field == "latency" or r._field == "packet_loss"' in flux
+    assert 'aggregateWindow(every: 60s, fn: mean' in flux
+
+
+def test_rolling_range_fetches_only_missing_tail():
+    history, api, clock = _history(now=7200, settle=0)
+
+    series, resolution = history.query('t', 3600, 7200, points=60)
+    assert resolution == 60
+    assert len(series) == 60 and series.timestamps[0] == 3600
+    assert np.allclose(series.latency, series.timestamps / 60)
+
+    clock.now = 7320
+    series, _ = history.query('t', 3720, 7320, points=60)
+    assert len(series) == 60 and series.timestamps[0] == 3720 and series.timestamps[-1] == 7260
+    assert 'range(start: 1970-01-01T02:00:00Z, stop: 1970-01-01T02:02:00Z)' in api.queries[-1]
+
+    # Aralık tamamen önbellekte
+    series, _ = history.query('t', 3720, 7320, points=60)
+    assert len(api.queries) == 2 and len(series) == 60
+
+
+def test_open_windows_are_not_cached():
+    history, api, _ = _history(now=7200, settle=300)
+    history.query('t', 3600, 7200, points=60)
+    history.query('t', 3600, 7200, points=60)
+
+    # Son 5 dakika her seferinde yeniden okunur
+    assert 'range(start: 1970-01-01T01:55:00Z, stop: 1970-01-01T02:00:00Z)' in api.queries[-1]
+
+
+def test_ttl_and_lru_eviction():
+    history, api, clock = _history(now=7200, settle=0, ttl=60, max_entries=1)
+    history.query('a', 3600, 7200, points=60)
+    history.query('b', 3600, 7200, points=60)
+    history.query('a', 3600, 7200, points=60)
+    assert len(api.queries) == 3  # 'a' çıkarılmıştı
+
+    clock.now = 7261
+    history.query('a', 3600, 7200, points=60)
+    assert len(api.queries) == 4  # süresi doldu, baştan sorgulandı
+    assert 'start: 1970-01-01T01:00:00Z' in api.queries[-1]
+
+
+def test_coarse_resolution_reads_rollups():
+    history, api, _ = _history(now=10 * 86400, settle=0, rollup_resolutions=[1, 60, 3600])
+    series, resolution = history.query('t', 0, 7 * 86400, points=100)
+
+    assert resolution == 10800
+    assert '"network_metrics_1h"' in api.queries[-1]
+    assert len(series) == 56 and not np.isnan(series.latency).any()
@@ -0,0 +1,56 @@
+import asyncio
+from collections import namedtuple
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.core.host_metrics import HostMetricsSampler
+
+Memory = namedtuple('Memory', 'percent available')
+Nic = namedtuple(
+    'Nic', 'bytes_sent bytes_recv packets_sent packets_recv errin errout dropin dropout')
+
+
+def _patched_psutil():
+    patcher = patch('src.core.host_metrics.psutil')
+    psutil = patcher.start()
+    psutil.cpu_percent.return_value = [10.0, 30.0]
+    psutil.virtual_memory.return_value = Memory(42.0, 1024)
+    psutil.net_io_counters.return_value = {'eth0': Nic(1, 2, 3, 4, 5, 6, 7, 8)}
+    psutil.Process.return_value.memory_percent.return_value = 1.5
+    psutil.Process.return_value.cpu_percent.return_value = 3.0
+    return patcher, psutil
+
+
+def test_sample_writes_host_and_network_measurements():
+    patcher, psutil = _patched_psutil()
+    try:
+        sampler = HostMetricsSampler(AsyncMock(), host='probe-1')
+        host_line, nic_line = sampler.sample(timestamp_ns=10)
+    finally:
+        patcher.stop()
+
+    # CPU kullanımı beklemeden, son çağrıdan bu yana olan farktan okunur
+    psutil.cpu_percent.assert_called_with(interval=None, percpu=True)
+    assert host_line.startswith('host_metrics,host=probe-1 cpu_usage=20.0,memory_usage=42.0,')
+    assert 'cpu0_usage=10.0,cpu1_usage=30.0' in host_line
+    assert nic_line == (
+        'host_network,host=probe-1,interface=eth0 bytes_sent=1i,bytes_recv=2i,'
+        'packets_sent=3i,packets_recv=4i,errin=5i,errout=6i,dropin=7i,dropout=8i 10'
+    )
+
+
+@pytest.mark.asyncio
+async def test_background_task_writes_each_interval():
+    patcher, _ = _patched_psutil()
+    write = AsyncMock(return_value=True)
+    try:
+        sampler = HostMetricsSampler(write, interval=0.01, host='probe-1')
+        sampler.start()
+        await asyncio.sleep(0.1)
+        await sampler.stop()
+    finally:
+        patcher.stop()
+
+    assert write.await_count >= 2
+    assert write.await_args_list[0].args[0].startswith('host_metrics,')
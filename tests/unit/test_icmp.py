@@ -0,0 +1,61 @@
+import asyncio
+import socket
+import struct
+
+import pytest
+
+from src.core.icmp import (
+    IcmpEngine,
+    build_echo_request,
+    checksum,
+    parse_echo_reply,
+)
+
+
+def _can_open_icmp_socket():
+    for sock_type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+        try:
+            socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP).close()
+            return True
+        except OSError:
+            continue
+    return False
+
+
+def test_checksum_of_valid_packet_is_zero():
+    packet = build_echo_request(0x1234, 7, b'abc')
+    assert checksum(packet) == 0
+
+
+def test_parse_echo_reply_without_ip_header():
+    reply = bytearray(build_echo_request(0x1234, 42, b'x' * 8))
+    reply[0] = 0  # echo reply
+    assert parse_echo_reply(bytes(reply)) == (0x1234, 42)
+
+
+def test_parse_echo_reply_with_ip_header():
+    ip_header = struct.pack('!BBHHHBBH4s4s', 0x45, 0, 36, 0, 0, 64, 1, 0,
+                            b'\x7f\x00\x00\x01', b'\x7f\x00\x00\x01')
+    reply = bytearray(build_echo_request(1, 2))
+    reply[0] = 0
+    assert parse_echo_reply(ip_header + bytes(reply)) == (1, 2)
+
+
+def test_parse_ignores_echo_request():
+    assert parse_echo_reply(build_echo_request(1, 2)) is None
+    assert parse_echo_reply(b'\x00\x00') is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not _can_open_icmp_socket(), reason="ICMP soketi açılamıyor")
+async def test_concurrent_loopback_pings():
+    engine = IcmpEngine()
+    try:
+        results = await asyncio.gather(*(
+            engine.ping('127.0.0.1', timeout=1.0) for _ in range(200)
+        ))
+        assert all(rtt is not None and rtt >= 0 for rtt in results)
+        assert engine.received == 200
+        assert engine.in_flight == 0
+    finally:
+        engine.close()
@@ -0,0 +1,146 @@
+import asyncio
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+import pytest
+from influxdb_client import InfluxDBClient
+from influxdb_client.client.write_api import SYNCHRONOUS
+
+from src.core.influx_writer import InfluxBatchWriter, encode_line, format_field_value
+
+
+class _FakeInfluxHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        self.server.requests.append((self.path, dict(self.headers), body.decode()))
+        self.send_response(self.server.status)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_influx():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _FakeInfluxHandler)
+    server.requests = []
+    server.status = 204
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _writer(server, **kwargs):
+    client = InfluxDBClient(
+        url=f'http://127.0.0.1:{server.server_address[1]}',
+        token='test-token',
+        org='test-org',
+        enable_gzip=True
+    )
+    return InfluxBatchWriter(
+        client.write_api(write_options=SYNCHRONOUS),
+        bucket='test-bucket',
+        org='test-org',
+        **kwargs
+    )
+
+
+def _line(i):
+    return encode_line('network_metrics', {'target': '8.8.8.8'}, {'latency': float(i)}, i)
+
+
+def test_encode_line_escapes_and_types():
+    line = encode_line(
+        'network metrics',
+        {'target': 'a,b=c d', 'status': 'OK'},
+        {'latency': 1.5, 'count': 3, 'up': True, 'note': 'x"y', 'skip': None},
+        123
+    )
+    assert line == (
+        'network\\ metrics,status=OK,target=a\\,b\\=c\\ d '
+        'latency=1.5,count=3i,up=true,note="x\\"y" 123'
+    )
+    assert format_field_value(0.0) == '0.0'
+    line = encode_line('m', {}, {'a': float('nan'), 'b': float('inf'), 'c': 1.0}, 1)
+    assert line == 'm c=1.0 1'
+    with pytest.raises(ValueError):
+        encode_line('m', {}, {'a': None}, 1)
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_batch_size_with_gzip(fake_influx):
+    writer = _writer(fake_influx, batch_size=5, flush_interval=60)
+    for i in range(10):
+        await writer.write(_line(i))
+    await asyncio.sleep(0.3)
+
+    assert writer.written_batches == 2
+    assert writer.written_lines == 10
+    path, headers, body = fake_influx.requests[0]
+    assert path.startswith('/api/v2/write')
+    assert 'bucket=test-bucket' in path
+    assert 'precision=ns' in path
+    assert headers['Content-Encoding'] == 'gzip'
+    assert body.split('\n') == [_line(i) for i in range(5)]
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_interval(fake_influx):
+    writer = _writer(fake_influx, batch_size=100, flush_interval=0.1)
+    await writer.write(_line(1))
+    await asyncio.sleep(0.4)
+
+    assert writer.written_lines == 1
+    assert writer.queue_depth == 0
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_when_queue_full(fake_influx):
+    writer = _writer(fake_influx, batch_size=100, flush_interval=60,
+                     max_queue_size=3, drop_policy='drop_oldest')
+    for i in range(5):
+        assert await writer.write(_line(i))
+    assert writer.dropped == 2
+    await writer.stop()
+
+    assert fake_influx.requests[0][2].split('\n') == [_line(i) for i in (2, 3, 4)]
+
+
+@pytest.mark.asyncio
+async def test_drop_newest_when_queue_full(fake_influx):
+    writer = _writer(fake_influx, batch_size=100, flush_interval=60,
+                     max_queue_size=2, drop_policy='drop_newest')
+    results = [await writer.write(_line(i)) for i in range(3)]
+    assert results == [True, True, False]
+    assert writer.dropped == 1
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_block_policy_applies_backpressure(fake_influx):
+    writer = _writer(fake_influx, batch_size=2, flush_interval=60,
+                     max_queue_size=2, drop_policy='block')
+    for i in range(6):
+        await writer.write(_line(i))
+    await writer.stop()
+
+    assert writer.dropped == 0
+    assert writer.written_lines == 6
+
+
+@pytest.mark.asyncio
+async def test_counts_errors(fake_influx):
+    fake_influx.status = 500
+    writer = _writer(fake_influx, batch_size=1, flush_interval=60)
+    await writer.write(_line(1))
+    await writer.stop()
+
+    assert writer.errors == 1
+    assert writer.written_lines == 0
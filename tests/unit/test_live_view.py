@@ -0,0 +1,69 @@
+from src.core.live_view import ViewBroadcaster
+
+
+class _Source:
+    def __init__(self):
+        self.versions = {'a': 1, 'b': 1}
+        self.calls = []
+
+    def version(self, key):
+        return self.versions[key]
+
+    def render(self, key, state):
+        self.calls.append(key)
+        version = self.versions[key]
+        delta = None if state is None else f'"{key}+{version}"'
+        return version, f'"{key}{version}"', delta
+
+
+def _broadcaster(source):
+    return ViewBroadcaster(source.version, source.render, interval=0, heartbeat=0.01)
+
+
+def test_renders_once_per_change_for_subscribed_targets_only():
+    source = _Source()
+    views = _broadcaster(source)
+    first, second = views.stream('a'), views.stream('a')
+    next(first), next(second)  # abonelik ilk yield'de başlar
+
+    assert views.clients == 2
+    assert views.publish() == 1
+    assert views.publish() == 0  # sürüm değişmedi
+    assert next(first) == next(second) == 'id: 1\ndata: "a1"\n\n'
+    assert source.calls == ['a']
+
+    first.close()
+    second.close()
+    assert views.clients == 0
+
+
+def test_delta_for_current_clients_snapshot_otherwise():
+    source = _Source()
+    views = _broadcaster(source)
+    stream = views.stream('a')
+    next(stream)
+    views.publish()
+    assert next(stream) == 'id: 1\ndata: "a1"\n\n'
+
+    source.versions['a'] = 2
+    views.publish()
+    assert next(stream) == 'id: 2\ndata: "a+2"\n\n'
+
+    # Yeni bağlanan ve bir görünümü kaçırmış (Last-Event-ID) istemciler tam görünüm alır
+    late, missed = views.stream('a'), views.stream('a', last=0)
+    next(late), next(missed)
+    assert next(late) == next(missed) == 'id: 2\ndata: "a2"\n\n'
+    assert next(stream) == ':\n\n'  # değişiklik yok: yalnızca canlılık yorumu
+
+
+def test_publish_is_rate_limited():
+    source = _Source()
+    views = ViewBroadcaster(source.version, source.render, interval=60)
+    stream = views.stream('b')
+    next(stream)
+
+    assert views.publish() == 1
+    source.versions['b'] = 2
+    assert views.publish() == 0
+    assert views.publish(force=True) == 1
+    assert views.renders == 2
@@ -0,0 +1,132 @@
+import sqlite3
+
+import pytest
+
+from src.core.local_store import LocalDataStore, connect
+from src.core.probe_result import ProbeResult, Status
+from src.core.rollup import RollupWindow
+
+BASE_NS = 1_700_000_000 * 10**9
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LocalDataStore(str(tmp_path / 'db' / 'metrics.db'), compact_interval=0,
+                           rollup_resolutions=[1, 60, 3600], history_settle=0)
+    yield store
+    store.close()
+
+
+def _result(target, second, latency=10.0, status=Status.OK):
+    return ProbeResult(target, status, latency=latency if status is Status.OK else None,
+                       packet_loss=0.0 if status is Status.OK else 100.0,
+                       time_ns=BASE_NS + second * 10**9)
+
+
+@pytest.mark.asyncio
+async def test_batched_writes_and_range_scan(store):
+    for second in range(120):
+        await store.store_metrics(_result('10.0.0.1', second, latency=float(second)))
+        await store.store_metrics(_result('10.0.0.2', second, status=Status.FAIL))
+    await store.stop()
+
+    assert store.written_batches == 1
+    assert store.conn.execute("SELECT COUNT(*) FROM samples").fetchone()[0] == 240
+    # Hedef baştan sona başarısız: yalnızca ilk durum olayı yazılır
+    assert store.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 1
+
+    start = BASE_NS // 10**9
+    # 5 sn bir özet çözünürlüğünün katı olmadığı için ham örneklerden hesaplanır
+    series, resolution = store.query_history('10.0.0.1', start, start + 120, points=24)
+    assert resolution == 5
+    assert series.timestamps.tolist() == [start + 5 * i for i in range(24)]
+    assert series.latency[:2].tolist() == [2.0, 7.0]
+
+    failed, _ = store.query_history('10.0.0.2', start, start + 120, points=120)
+    assert len(failed) == 120
+    assert failed.packet_loss.tolist() == [100.0] * 120
+    assert all(value != value for value in failed.latency)  # NaN
+
+
+@pytest.mark.asyncio
+async def test_rollups_serve_coarse_resolutions(store):
+    windows = []
+    for hour in range(48):
+        window = RollupWindow(1_700_006_400 + hour * 3600)
+        window.add(float(hour), 0.0, True)
+        windows.append(('10.0.0.1', 3600, window))
+    await store.store_rollups(windows)
+    await store.stop()
+
+    start = 1_700_006_400
+    series, resolution = store.query_history('10.0.0.1', start, start + 48 * 3600, points=10)
+    assert resolution == 21600
+    assert len(series) == 8
+    assert series.latency[1] == pytest.approx(8.5, rel=0.02)
+
+
+@pytest.mark.asyncio
+async def test_write_line_keeps_other_measurements(store):
+    await store.write_line('host_metrics,host=a cpu_usage=1.0 1700000000000000000')
+    await store.flush()
+
+    assert store.conn.execute("SELECT time_ns, line FROM measurements").fetchall() == [
+        (BASE_NS, 'host_metrics,host=a cpu_usage=1.0 1700000000000000000')
+    ]
+
+
+@pytest.mark.asyncio
+async def test_compact_applies_retention_per_target(store):
+    store.retention_days = 1
+    for second in (0, 2 * 86400):
+        await store.store_metrics(_result('10.0.0.1', second, status=Status.FAIL))
+    await store.flush()
+
+    deleted = store.compact(now=BASE_NS / 1e9 + 2 * 86400 + 10)
+
+    assert deleted == 2  # bir örnek ve olayı
+    remaining = store.conn.execute("SELECT time_ns FROM samples").fetchall()
+    assert remaining == [(BASE_NS + 2 * 86400 * 10**9,)]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_new_samples(store):
+    store.max_queue_size = 2
+    store.batch_size = 10
+    for second in range(3):
+        await store.store_metrics(_result('10.0.0.1', second))
+
+    assert store.dropped == 1
+    await store.stop()
+    assert store.conn.execute("SELECT COUNT(*) FROM samples").fetchone()[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_events_are_state_transitions(store):
+    statuses = [Status.OK] * 10 + [Status.FAIL] * 30 + [Status.OK] * 5
+    for second, status in enumerate(statuses):
+        await store.store_metrics(_result('10.0.0.1', second, status=status))
+    await store.stop()
+
+    rows = store.conn.execute(
+        "SELECT time_ns, event_type, previous, duration, samples FROM events ORDER BY time_ns"
+    ).fetchall()
+    assert rows == [(BASE_NS + 10 * 10**9, 'FAIL', 'OK', 10.0, 10),
+                    (BASE_NS + 40 * 10**9, 'OK', 'FAIL', 30.0, 30)]
+
+
+def test_legacy_events_table_is_kept(tmp_path):
+    path = str(tmp_path / 'old.db')
+    old = sqlite3.connect(path)
+    old.executescript("""
+        CREATE TABLE events (time_ns INTEGER NOT NULL, target TEXT NOT NULL,
+                             event_type TEXT NOT NULL, details TEXT);
+        CREATE INDEX events_time ON events (time_ns);
+        INSERT INTO events VALUES (1, 'a', 'FAIL', '{}');
+    """)
+    old.close()
+
+    conn = connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM events_legacy").fetchone()[0] == 1
+    assert 'previous' in [row[1] for row in conn.execute("PRAGMA table_info(events)")]
+    conn.close()
@@ -1,59 +1,66 @@
 import pytest
 from datetime import datetime
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 from src.core.network_probe import NetworkProbe
+from src.core.probe_result import ProbeResult, Status
 
 @pytest.fixture
 def network_probe():
-    return NetworkProbe(target="8.8.8.8", timeout=1.0)
+    return NetworkProbe(target="8.8.8.8", timeout=1.0, engine=MagicMock())
 
 @pytest.mark.asyncio
 async def test_perform_check_success(network_probe):
-    with patch('src.core.network_probe.ping', return_value=0.1):
-        with patch('src.core.network_probe.psutil.cpu_percent', return_value=5.0):
-            with patch('src.core.network_probe.psutil.Process') as mock_process:
-                mock_process.return_value.memory_percent.return_value = 2.0
-                
-                result = await network_probe.perform_check()
-                
-                assert result['status'] == 'OK'
-                assert result['latency'] == 100.0  # 0.1 saniye = 100 ms
-                assert result['packet_loss'] == 0
-                assert isinstance(result['timestamp'], str)
-                assert result['target'] == '8.8.8.8'
+    with patch.object(network_probe.engine, 'ping', AsyncMock(return_value=0.1)):
+        result = await network_probe.perform_check()
+
+        assert isinstance(result, ProbeResult)
+        assert result.status is Status.OK
+        assert result.latency == 100.0  # 0.1 saniye = 100 ms
+        assert result.packet_loss == 0
+        assert isinstance(result.time_ns, int)
+        assert result.target == '8.8.8.8'
+        assert result.extra is None
+
+@pytest.mark.asyncio
+async def test_perform_check_zero_latency_is_success(network_probe):
+    with patch.object(network_probe.engine, 'ping', AsyncMock(return_value=0.0)):
+        result = await network_probe.perform_check()
+
+        assert result.status is Status.OK
+        assert result.latency == 0.0
+        assert result.packet_loss == 0
 
 @pytest.mark.asyncio
 async def test_perform_check_failure(network_probe):
-    with patch('src.core.network_probe.ping', return_value=None):
+    with patch.object(network_probe.engine, 'ping', AsyncMock(return_value=None)):
         result = await network_probe.perform_check()
         
-        assert result['status'] == 'FAIL'
-        assert result['latency'] is None
-        assert result['packet_loss'] == 100
-        assert isinstance(result['timestamp'], str)
-        assert result['target'] == '8.8.8.8'
+        assert result.status is Status.FAIL
+        assert result.latency is None
+        assert result.packet_loss == 100
+        assert isinstance(result.time_ns, int)
+        assert result.target == '8.8.8.8'
 
 @pytest.mark.asyncio
 async def test_perform_check_error(network_probe):
-    with patch('src.core.network_probe.ping', side_effect=Exception("Test error")):
+    with patch.object(network_probe.engine, 'ping', AsyncMock(side_effect=Exception("Test error"))):
         result = await network_probe.perform_check()
         
-        assert result['status'] == 'ERROR'
-        assert 'error' in result
-        assert result['error'] == "Test error"
-        assert isinstance(result['timestamp'], str)
-        assert result['target'] == '8.8.8.8'
+        assert result.status is Status.ERROR
+        assert result.error == "Test error"
+        assert isinstance(result.time_ns, int)
+        assert result.target == '8.8.8.8'
 
 @pytest.mark.asyncio
 async def test_continuous_monitor(network_probe):
-    with patch('src.core.network_probe.ping', return_value=0.1):
+    with patch.object(network_probe.engine, 'ping', AsyncMock(return_value=0.1)):
         network_probe._running = True
         counter = 0
         
         async for result in network_probe.continuous_monitor(interval=0.1):
-            assert result['status'] == 'OK'
-            assert result['latency'] == 100.0
+            assert result.ok
+            assert result.latency == 100.0
             counter += 1
             if counter >= 2:  # İki veri noktası al
                 network_probe.stop()
@@ -64,4 +71,58 @@ async def test_continuous_monitor(network_probe):
 def test_stop(network_probe):
     network_probe._running = True
     network_probe.stop()
-    assert not network_probe._running 
\ No newline at end of file
+    assert not network_probe._running 
+@pytest.mark.asyncio
+async def test_perform_check_burst():
+    probe = NetworkProbe(target="8.8.8.8", timeout=1.0, engine=MagicMock(),
+                         burst_count=4, burst_spacing=0.0)
+    rtts = AsyncMock(side_effect=[0.010, None, 0.030, 0.020])
+    with patch.object(probe.engine, 'ping', rtts):
+        result = await probe.perform_check()
+
+    assert rtts.await_count == 4
+    assert result.status is Status.OK
+    assert result.extra['packets_sent'] == 4
+    assert result.extra['packets_received'] == 3
+    assert result.packet_loss == 25.0
+    assert result.extra['rtt_min'] == 10.0
+    assert result.extra['rtt_max'] == 30.0
+    assert result.latency == result.extra['rtt_avg'] == 20.0
+    assert result.extra['rtt_p50'] == 20.0
+
+@pytest.mark.asyncio
+async def test_perform_check_burst_all_lost():
+    probe = NetworkProbe(target="8.8.8.8", timeout=1.0, engine=MagicMock(),
+                         burst_count=3, burst_spacing=0.0)
+    with patch.object(probe.engine, 'ping', AsyncMock(return_value=None)):
+        result = await probe.perform_check()
+
+    assert result.status is Status.FAIL
+    assert result.packet_loss == 100.0
+    assert result.latency is None
+
+
+@pytest.mark.asyncio
+async def test_perform_check_burst_zero_rtt_is_received():
+    probe = NetworkProbe(target="127.0.0.1", timeout=1.0, engine=MagicMock(),
+                         burst_count=2, burst_spacing=0.0)
+    with patch.object(probe.engine, 'ping', AsyncMock(side_effect=[0.0, 0.002])):
+        result = await probe.perform_check()
+
+    assert result.extra['packets_received'] == 2
+    assert result.packet_loss == 0.0
+    assert result.extra['rtt_min'] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_degraded_probe_sends_bursts():
+    probe = NetworkProbe(target="8.8.8.8", timeout=1.0, engine=MagicMock(),
+                         burst_spacing=0.0, degraded_burst_count=5)
+    ping = AsyncMock(return_value=0.01)
+    with patch.object(probe.engine, 'ping', ping):
+        await probe.perform_check()
+        probe.degraded = True
+        result = await probe.perform_check()
+
+    assert ping.await_count == 6
+    assert result.extra['packets_sent'] == 5
@@ -0,0 +1,94 @@
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.connection_probe import TcpProbe
+from src.core.dns_probe import DnsProbe
+from src.core.pipeline import CollectorPipeline, build_probe, target_label
+from src.core.probe_result import ProbeResult, Status
+
+
+def _config(values):
+    config = MagicMock()
+    config.get.side_effect = lambda key, default=None: values.get(key, default)
+    return config
+
+
+def _pipeline(settings=None, **kwargs):
+    data_store = MagicMock()
+    data_store.store_metrics = AsyncMock()
+    data_store.store_rollups = AsyncMock()
+    pipeline = CollectorPipeline(
+        _config({'rollups.enabled': False, **(settings or {})}),
+        [(7, {'address': '8.8.8.8', 'interval': 1.0})],
+        data_store,
+        **kwargs
+    )
+    entry = next(iter(pipeline.scheduler._heap))[2]
+    entry.probe.perform_check = AsyncMock(
+        return_value=ProbeResult('8.8.8.8', Status.OK, latency=10.0)
+    )
+    return pipeline, entry, data_store
+
+
+@pytest.mark.asyncio
+async def test_handle_stores_and_publishes_with_target_id():
+    publish = MagicMock()
+    pipeline, entry, data_store = _pipeline(publish=publish)
+    await pipeline.handle(entry)
+
+    data_store.store_metrics.assert_awaited_once()
+    target_id, result = publish.call_args[0]
+    assert target_id == 7
+    assert result.schedule_lag == 0.0
+
+
+@pytest.mark.asyncio
+async def test_handle_records_capture():
+    capture = MagicMock()
+    pipeline, entry, data_store = _pipeline(capture=capture)
+    await pipeline.handle(entry)
+
+    assert capture.append.call_args[0][0] is data_store.store_metrics.call_args[0][0]
+
+
+@pytest.mark.asyncio
+async def test_handle_skips_when_inactive():
+    active = threading.Event()
+    pipeline, entry, data_store = _pipeline(active=active)
+    await pipeline.handle(entry)
+
+    entry.probe.perform_check.assert_not_awaited()
+    data_store.store_metrics.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_adaptive_interval_densifies_on_failure():
+    pipeline, entry, data_store = _pipeline({'app.scheduler.adaptive.enabled': True,
+                                             'app.scheduler.adaptive.fast_interval': 0.25})
+    entry.probe.perform_check.return_value = ProbeResult('8.8.8.8', Status.FAIL, packet_loss=100.0)
+    await pipeline.handle(entry)
+
+    # Örnek, alındığı andaki aralığı taşır; sonraki kontrol hızlı aralıkla ve burst ile yapılır
+    assert data_store.store_metrics.call_args[0][0].interval == 1.0
+    assert entry.interval == 0.25
+    assert entry.probe.degraded and entry.probe.degraded_burst_count == 5
+
+
+def test_build_probe_selects_kind_and_matches_label():
+    targets = [
+        {'type': 'tls', 'address': 'example.com'},
+        {'type': 'tcp', 'address': '10.0.0.1', 'port': 22, 'payload': ''},
+        {'type': 'dns', 'address': 'example.com', 'resolver': '8.8.8.8', 'timeout': 2.0}
+    ]
+    probes = [build_probe(target) for target in targets]
+
+    assert isinstance(probes[0], TcpProbe) and probes[0].tls and probes[0].port == 443
+    assert isinstance(probes[1], TcpProbe) and probes[1].payload == b''
+    assert isinstance(probes[2], DnsProbe) and probes[2].timeout == 2.0
+    assert [probe.target for probe in probes] == [target_label(target) for target in targets]
+    assert target_label({'address': '8.8.8.8'}) == '8.8.8.8'
+
+    with pytest.raises(ValueError):
+        build_probe({'type': 'udp', 'address': '10.0.0.1'})
@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+
+from src.core.probe_result import ProbeResult, Status
+
+TIME_NS = 1704067200_250000_123
+
+
+def test_to_line_writes_floats_and_skips_missing_latency():
+    result = ProbeResult('my host', Status.FAIL, latency=None, packet_loss=100, time_ns=TIME_NS)
+    result.schedule_lag = 1.5
+
+    assert result.to_line() == (
+        'network_metrics,status=FAIL,target=my\\ host '
+        f'packet_loss=100.0,schedule_lag=1.5 {TIME_NS}'
+    )
+
+
+def test_to_line_includes_extra_fields():
+    result = ProbeResult('8.8.8.8', Status.OK, latency=12.5, time_ns=TIME_NS,
+                         extra={'packets_sent': 4, 'rtt_p99': None, 'jitter': float('nan')})
+
+    assert result.to_line() == (
+        f'network_metrics,status=OK,target=8.8.8.8 '
+        f'latency=12.5,packet_loss=0.0,packets_sent=4.0 {TIME_NS}'
+    )
+
+
+def test_utc_time_and_error_status():
+    result = ProbeResult('8.8.8.8', Status.ERROR, time_ns=TIME_NS, error='boom')
+
+    assert result.utc_time == datetime(2024, 1, 1, 0, 0, 0, 250000, tzinfo=timezone.utc)
+    assert not result.ok
+
+
+def test_time_conversions_and_slots():
+    result = ProbeResult('8.8.8.8', Status.OK, time_ns=TIME_NS)
+
+    assert result.timestamp_us == 1704067200_250000
+    assert result.timestamp == TIME_NS / 1e9
+    assert isinstance(result.sent_mono, int)
+    assert not hasattr(result, '__dict__')
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from src.core.probe_result import ProbeResult, Status
+from src.core.ring_buffer import STATUS_CODES, RingBuffer
+
+
+def _fill(buffer, count):
+    for i in range(count):
+        buffer.append(np.datetime64(i, 's'), float(i), 0.0, STATUS_CODES['OK'])
+
+
+def test_window_returns_samples_oldest_first():
+    buffer = RingBuffer(4)
+    _fill(buffer, 3)
+    window = buffer.window()
+
+    assert len(buffer) == 3
+    assert window['latency'].tolist() == [0.0, 1.0, 2.0]
+
+
+def test_overwrites_oldest_when_full():
+    buffer = RingBuffer(4)
+    _fill(buffer, 10)
+
+    assert len(buffer) == 4
+    assert buffer.total == 10
+    assert buffer.window()['latency'].tolist() == [6.0, 7.0, 8.0, 9.0]
+    assert buffer.window(2)['latency'].tolist() == [8.0, 9.0]
+
+
+def test_window_is_zero_copy_view():
+    buffer = RingBuffer(4)
+    _fill(buffer, 7)
+    window = buffer.window()
+
+    assert window['latency'].base is buffer.latency
+    assert window['timestamp'].base is buffer.timestamp
+
+
+def test_append_result_maps_columns():
+    buffer = RingBuffer(2)
+    buffer.append_result(ProbeResult(
+        '8.8.8.8', Status.FAIL, latency=None, packet_loss=100.0,
+        time_ns=1704067200_250000_000
+    ))
+    window = buffer.window()
+
+    assert window['timestamp'][0] == np.datetime64('2024-01-01T00:00:00.250')
+    assert np.isnan(window['latency'][0])
+    assert window['packet_loss'][0] == 100.0
+    assert window['status'][0] == STATUS_CODES['FAIL']
+
+
+def test_memory_is_preallocated():
+    buffer = RingBuffer(1000)
+    before = buffer.nbytes
+    _fill(buffer, 5000)
+
+    assert buffer.nbytes == before == 2 * 1000 * (8 + 4 + 4 + 1)
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+def test_window_since_absolute_index():
+    buffer = RingBuffer(4)
+    _fill(buffer, 6)
+
+    assert buffer.window_since(4)['latency'].tolist() == [4.0, 5.0]
+    assert buffer.window_since(0)['latency'].tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert len(buffer.window_since(6)['latency']) == 0
@@ -0,0 +1,117 @@
+import pytest
+
+from src.core.rollup import RollupAggregator, resolution_name
+
+
+def _by_resolution(closed):
+    result = {}
+    for target, resolution, window in closed:
+        result.setdefault(resolution, []).append(window)
+    return result
+
+
+def test_resolution_name():
+    assert resolution_name(1) == '1s'
+    assert resolution_name(60) == '1m'
+    assert resolution_name(3600) == '1h'
+    assert resolution_name(90) == '90s'
+
+
+def test_windows_close_and_cascade():
+    aggregator = RollupAggregator(resolutions=(1, 10))
+    closed = []
+    for second in range(25):
+        for fraction in (0.1, 0.6):
+            closed += aggregator.add('a', 1000 + second + fraction, 10.0 + second, 0.0, True)
+
+    windows = _by_resolution(closed)
+    assert len(windows[1]) == 24
+    assert windows[1][0].count == 2
+    # 1000-1009 ve 1010-1019 pencereleri kapanmış olmalı
+    assert [w.start for w in windows[10]] == [1000, 1010]
+    assert windows[10][0].count == 20
+    fields = windows[10][0].fields()
+    assert fields['latency_min'] == 10.0
+    assert fields['latency_max'] == 19.0
+    assert fields['latency_mean'] == pytest.approx(14.5)
+    assert fields['latency_p50'] == pytest.approx(14.0, rel=0.02)
+
+
+def test_loss_and_failures_are_aggregated():
+    aggregator = RollupAggregator(resolutions=(1,))
+    aggregator.add('a', 5.1, 10.0, 0.0, True)
+    aggregator.add('a', 5.5, None, 100.0, False)
+    (_, _, window), = aggregator.flush_expired(100)
+    fields = window.fields()
+
+    assert fields['count'] == 2.0
+    assert fields['failures'] == 1.0
+    assert fields['packet_loss'] == 50.0
+    assert fields['latency_p99'] == pytest.approx(10.0, rel=0.02)
+
+
+def test_packet_loss_is_weighted_by_interval():
+    aggregator = RollupAggregator(resolutions=(60,))
+    # 50 sn kararlı, ardından bozulma sırasında 0,5 sn aralıkla 20 kayıplı örnek
+    aggregator.add('a', 0.0, 10.0, 0.0, True, weight=50.0)
+    for i in range(20):
+        aggregator.add('a', 50.0 + i * 0.5, None, 100.0, False, weight=0.5)
+    (_, _, window), = aggregator.flush_expired(1000)
+    fields = window.fields()
+
+    assert fields['count'] == 21.0
+    assert fields['packet_loss'] == pytest.approx(100.0 * 10 / 60)
+
+
+def test_flush_expired_respects_grace_and_targets():
+    aggregator = RollupAggregator(resolutions=(1, 60), grace=2.0)
+    aggregator.add('a', 100.2, 1.0, 0.0, True)
+    aggregator.add('b', 100.4, 2.0, 0.0, True)
+
+    assert aggregator.flush_expired(102.5) == []
+    closed = aggregator.flush_expired(103.0)
+    assert sorted(target for target, _, _ in closed) == ['a', 'b']
+
+    closed = aggregator.flush_expired(200.0)
+    assert sorted((t, r) for t, r, _ in closed) == [('a', 60), ('b', 60)]
+
+
+def test_late_samples_do_not_reopen_closed_windows():
+    aggregator = RollupAggregator(resolutions=(1, 60), grace=2.0)
+    aggregator.add('a', 100.2, 1.0, 0.0, True)
+    aggregator.add('a', 100.7, 2.0, 0.0, True)
+    (_, _, window), = aggregator.flush_expired(103.0)
+    assert window.count == 2
+
+    # Pencere kapandıktan sonra gelen örnek yeni (eksik) bir 100 penceresi açmaz
+    assert aggregator.add('a', 100.9, 3.0, 0.0, True) == []
+    assert aggregator.late_samples == 1
+    assert aggregator.flush_expired(104.0) == []
+
+    closed = aggregator.flush_expired(200.0)
+    assert [(r, w.start, w.count) for _, r, w in closed] == [(60, 60, 2)]
+
+    # İnce penceresi hiç açılmamış, ancak üst penceresi yazılmış örnek üste birleştirilmez
+    aggregator.add('a', 110.0, 4.0, 0.0, True)
+    closed = aggregator.flush_expired(300.0)
+    assert [(r, w.start) for _, r, w in closed] == [(1, 110)]
+    assert aggregator.late_samples == 2
+
+
+def test_late_samples_are_not_added_to_newer_open_window():
+    aggregator = RollupAggregator(resolutions=(10, 60), grace=30.0)
+    aggregator.add('a', 101.0, 1.0, 0.0, True)
+    closed = aggregator.add('a', 125.0, 2.0, 0.0, True)
+
+    # 100 penceresi kapandı, 110 hiç açılmadı; 115 açık olan 120 penceresine girmez
+    assert aggregator.add('a', 115.0, 9.0, 0.0, True) == []
+    assert aggregator.late_samples == 1
+
+    closed = _by_resolution(closed + aggregator.flush_expired(200.0))
+    assert [(w.start, w.count) for w in closed[10]] == [(100, 1), (120, 1)]
+    assert closed[10][1].fields()['latency_max'] == 2.0
+
+
+def test_rejects_non_multiple_resolutions():
+    with pytest.raises(ValueError):
+        RollupAggregator(resolutions=(7, 60))
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from src.core.scheduler import ProbeScheduler
+
+
+async def _run_for(scheduler, seconds):
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(seconds)
+    scheduler.stop()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_each_probe_fires_at_its_own_interval():
+    fired = {'fast': 0, 'slow': 0}
+
+    async def handler(entry):
+        fired[entry.probe] += 1
+
+    scheduler = ProbeScheduler(handler)
+    scheduler.add('fast', 0.05)
+    scheduler.add('slow', 0.2)
+    await _run_for(scheduler, 0.51)
+
+    assert 10 <= fired['fast'] <= 11
+    assert 2 <= fired['slow'] <= 3
+
+
+@pytest.mark.asyncio
+async def test_slow_check_does_not_delay_other_targets():
+    fired = {'slow': 0, 'fast': 0}
+
+    async def handler(entry):
+        fired[entry.probe] += 1
+        if entry.probe == 'slow':
+            await asyncio.sleep(0.3)
+
+    scheduler = ProbeScheduler(handler)
+    slow = scheduler.add('slow', 0.05)
+    scheduler.add('fast', 0.05)
+    await _run_for(scheduler, 0.52)
+
+    assert fired['fast'] >= 10
+    assert fired['slow'] == 2
+    assert slow.skipped > 0
+
+
+@pytest.mark.asyncio
+async def test_schedule_has_no_drift_and_records_lag():
+    async def handler(entry):
+        await asyncio.sleep(0.02)  # kontrol süresi aralığa eklenmemeli
+
+    scheduler = ProbeScheduler(handler)
+    entry = scheduler.add('a', 0.05)
+    start = entry.next_due
+    await _run_for(scheduler, 0.5)
+
+    assert entry.next_due == pytest.approx(start + entry.interval * (entry.fired + entry.missed))
+    assert entry.fired >= 9
+    assert 0 <= entry.max_lag < 0.05
+    assert scheduler.fired == entry.fired
+
+
+@pytest.mark.asyncio
+async def test_jitter_spreads_initial_phase():
+    async def handler(entry):
+        pass
+
+    scheduler = ProbeScheduler(handler, jitter=1.0)
+    entries = [scheduler.add(i, 1.0, now=0.0) for i in range(200)]
+    dues = [e.next_due for e in entries]
+
+    assert all(0.0 <= due <= 1.0 for due in dues)
+    assert len(set(dues)) > 100
+
+
+@pytest.mark.asyncio
+async def test_removed_probe_stops_firing():
+    fired = []
+
+    async def handler(entry):
+        fired.append(entry.probe)
+
+    scheduler = ProbeScheduler(handler)
+    entry = scheduler.add('a', 0.05)
+    scheduler.remove(entry)
+    await _run_for(scheduler, 0.2)
+
+    assert fired == []
+    assert len(scheduler) == 0
+
+
+@pytest.mark.asyncio
+async def test_set_interval_reschedules_without_duplicates():
+    fired = []
+
+    async def handler(entry):
+        fired.append(scheduler._now())
+        # İlk kontrolden sonra aralık kısalır, ikinciden sonra eski değerine döner
+        if len(fired) == 1:
+            scheduler.set_interval(entry, 0.05)
+        elif len(fired) == 2:
+            scheduler.set_interval(entry, 0.5)
+
+    scheduler = ProbeScheduler(handler)
+    entry = scheduler.add('a', 0.5)
+    await _run_for(scheduler, 0.3)
+
+    assert len(fired) == 2
+    assert fired[1] - fired[0] == pytest.approx(0.05, abs=0.02)
+    assert entry.interval == 0.5
+    assert len(scheduler) == 1
+    assert entry.skipped == 0
+
+
+@pytest.mark.asyncio
+async def test_shorter_interval_fires_immediately_when_overdue():
+    async def handler(entry):
+        pass
+
+    scheduler = ProbeScheduler(handler)
+    entry = scheduler.add('a', 10.0, now=0.0)
+    scheduler.set_interval(entry, 1.0, now=5.0)
+    assert entry.next_due == 5.0
+
+    scheduler.set_interval(entry, 30.0, now=5.0)
+    assert entry.next_due == pytest.approx(34.0)
@@ -0,0 +1,91 @@
+import numpy as np
+
+from src.core.probe_result import ProbeResult, Status
+from src.core.ring_buffer import STATUS_CODES
+from src.core.shm_ring import SharedResultRing
+
+
+def test_reader_attaches_by_name_and_reads_new_records():
+    writer = SharedResultRing(capacity=8)
+    reader = SharedResultRing(writer.name)
+    try:
+        writer.publish(3, 1_000_000, 12.5, 0.0, STATUS_CODES['OK'])
+        writer.publish(4, 2_000_000, None, 100.0, STATUS_CODES['FAIL'])
+
+        records, cursor, missed = reader.read(0)
+        assert reader.capacity == 8
+        assert cursor == 2 and missed == 0
+        assert records['target_id'].tolist() == [3, 4]
+        assert records['timestamp'].tolist() == [1_000_000, 2_000_000]
+        assert records['latency'][0] == 12.5
+        assert np.isnan(records['latency'][1])
+        assert records['status'][1] == STATUS_CODES['FAIL']
+
+        records, cursor, _ = reader.read(cursor)
+        assert len(records) == 0 and cursor == 2
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_wraparound_reports_overwritten_records():
+    ring = SharedResultRing(capacity=4)
+    try:
+        for i in range(10):
+            ring.publish(i, i, float(i), 0.0, STATUS_CODES['OK'])
+
+        records, cursor, missed = ring.read(0)
+        assert cursor == 10
+        # Halka doluyken en eski yuva yazıcının sıradaki yuvasıdır; yırtık olabilir
+        assert missed == 7
+        assert records['target_id'].tolist() == [7, 8, 9]
+
+        ring.publish(10, 10, 10.0, 0.0, STATUS_CODES['OK'])
+        records, cursor, missed = ring.read(cursor)
+        assert records['target_id'].tolist() == [10]
+        assert missed == 0
+    finally:
+        ring.close()
+
+
+def test_drops_slot_rewritten_during_copy():
+    ring = SharedResultRing(capacity=4)
+    try:
+        for i in range(3):
+            ring.publish(i, i, float(i), 0.0, STATUS_CODES['OK'])
+        records = ring._records
+        copy = np.ndarray.copy
+
+        class _Records(np.ndarray):
+            def copy(self):
+                # Kopyalama sırasında yazıcı iki kayıt daha yayınlar ve
+                # sıradaki (okunan ilk) yuvaya yazmaya başlar
+                ring._records = records
+                ring.publish(3, 3, 3.0, 0.0, STATUS_CODES['OK'])
+                ring.publish(4, 4, 4.0, 0.0, STATUS_CODES['OK'])
+                return copy(self)
+
+        ring._records = records.view(_Records)
+        records_read, cursor, missed = ring.read(0)
+
+        assert cursor == 3
+        assert missed == 2
+        assert records_read['target_id'].tolist() == [2]
+    finally:
+        ring.close()
+
+
+def test_publish_result_maps_record():
+    ring = SharedResultRing(capacity=4)
+    try:
+        ring.publish_result(1, ProbeResult(
+            '8.8.8.8', Status.ERROR, time_ns=1704067200_250000_000, error='boom'
+        ))
+        records, _, _ = ring.read(0)
+
+        assert np.datetime64(int(records['timestamp'][0]), 'us') == \
+            np.datetime64('2024-01-01T00:00:00.250')
+        assert records['packet_loss'][0] == 0.0
+        assert records['status'][0] == STATUS_CODES['ERROR']
+    finally:
+        ring.close()
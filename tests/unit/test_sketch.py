@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from src.core.sketch import LatencySketch
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_within_relative_accuracy():
+    rng = random.Random(1)
+    values = [rng.lognormvariate(3, 0.5) for _ in range(10000)]
+    sketch = LatencySketch(0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.95, 0.99):
+        assert sketch.quantile(q) == pytest.approx(_exact(values, q), rel=0.02)
+
+
+def test_merge_equals_single_sketch():
+    left, right, combined = LatencySketch(), LatencySketch(), LatencySketch()
+    for i in range(1, 1001):
+        (left if i % 2 else right).add(float(i))
+        combined.add(float(i))
+    left.merge(right)
+
+    assert left.count == combined.count == 1000
+    for q in (0.1, 0.5, 0.99):
+        assert left.quantile(q) == combined.quantile(q)
+
+
+def test_zero_values_and_errors():
+    sketch = LatencySketch()
+    sketch.add(0.0)
+    sketch.add(10.0)
+    assert sketch.quantile(0.0) == 0.0
+
+    with pytest.raises(ValueError):
+        LatencySketch().quantile(0.5)
+    with pytest.raises(ValueError):
+        sketch.merge(LatencySketch(0.05))
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.influx_writer import InfluxBatchWriter
+from src.core.spool import KIND_EVENT, KIND_INFLUX, Spool, SpoolReplayer
+
+
+@pytest.fixture
+def spool(tmp_path):
+    spool = Spool(str(tmp_path), segment_size=64, max_bytes=10_000, fsync=False)
+    yield spool
+    spool.close()
+
+
+def _payloads(spool, count=100):
+    records, position = spool.read(count)
+    return [payload for _, payload in records], position
+
+
+def test_append_read_commit_in_order(spool):
+    spool.append(KIND_INFLUX, [b'a', b'b'])
+    spool.append(KIND_EVENT, [b'c'])
+
+    records, position = spool.read(10)
+    assert records == [(KIND_INFLUX, b'a'), (KIND_INFLUX, b'b'), (KIND_EVENT, b'c')]
+    assert not spool.empty()
+
+    spool.commit(position)
+    assert spool.empty()
+    assert spool.read(10)[0] == []
+
+
+def test_rotates_segments_and_removes_consumed(spool, tmp_path):
+    for i in range(10):
+        spool.append(KIND_INFLUX, [b'x' * 30 + bytes([i])])
+    segments = [name for name in os.listdir(tmp_path) if name.endswith('.seg')]
+    assert len(segments) > 1
+
+    payloads, position = _payloads(spool)
+    assert [p[-1] for p in payloads] == list(range(10))
+    spool.commit(position)
+    segments = [name for name in os.listdir(tmp_path) if name.endswith('.seg')]
+    assert len(segments) == 1
+
+
+def test_disk_cap_drops_oldest_segments(tmp_path):
+    spool = Spool(str(tmp_path), segment_size=100, max_bytes=300, fsync=False)
+    for i in range(20):
+        spool.append(KIND_INFLUX, [b'y' * 40 + bytes([i])])
+
+    assert spool.total_bytes <= 300 + 100
+    assert spool.dropped_bytes > 0
+    payloads, _ = _payloads(spool)
+    assert payloads[-1][-1] == 19
+    assert payloads[0][-1] > 0
+    spool.close()
+
+
+def test_survives_crash_with_torn_record_and_keeps_cursor(tmp_path):
+    spool = Spool(str(tmp_path), fsync=False)
+    spool.append(KIND_INFLUX, [b'first', b'second', b'third'])
+    records, position = spool.read(1)
+    spool.commit(position)
+    spool.close()
+
+    # Yarım kalmış bir kayıt ekle (başlık var, yük eksik)
+    segment = [n for n in os.listdir(tmp_path) if n.endswith('.seg')][0]
+    with open(tmp_path / segment, 'ab') as f:
+        f.write(b'\x10\x00\x00\x00\x00\x00\x00\x00\x01abc')
+
+    reopened = Spool(str(tmp_path), fsync=False)
+    reopened.append(KIND_INFLUX, [b'fourth'])
+    payloads, _ = _payloads(reopened)
+    assert records == [(KIND_INFLUX, b'first')]
+    assert payloads == [b'second', b'third', b'fourth']
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_replayer_stops_on_failure_and_resumes_in_order(spool):
+    spool.append(KIND_INFLUX, [b'1', b'2', b'3'])
+    written = []
+    fail = {'on': b'2'}
+
+    def handler(payload):
+        if payload == fail['on']:
+            raise ConnectionError("backend down")
+        written.append(payload)
+
+    replayer = SpoolReplayer(spool, {KIND_INFLUX: handler}, rate=1000)
+    assert await replayer.replay_once() == 1
+    assert replayer.failures == 1
+
+    fail['on'] = None
+    assert await replayer.replay_once() == 2
+    assert written == [b'1', b'2', b'3']
+    assert spool.empty()
+
+
+@pytest.mark.asyncio
+async def test_replayer_checks_spool_off_event_loop(spool):
+    threads = []
+    empty = spool.empty
+
+    def tracked_empty():
+        threads.append(threading.current_thread())
+        return empty()
+
+    spool.empty = tracked_empty
+    replayer = SpoolReplayer(spool, {}, retry_interval=0.01)
+    replayer.start()
+    await asyncio.sleep(0.05)
+    await replayer.stop()
+
+    assert threads
+    assert threading.main_thread() not in threads
+
+
+@pytest.mark.asyncio
+async def test_influx_writer_falls_back_to_spool(spool):
+    write_api = MagicMock()
+    write_api.write.side_effect = ConnectionError("influx down")
+    writer = InfluxBatchWriter(write_api, 'bucket', 'org', batch_size=2,
+                               flush_interval=60, spool=spool)
+    for line in ('m v=1 1', 'm v=2 2', 'm v=3 3'):
+        await writer.write(line)
+    await writer.stop()
+
+    assert writer.errors == 2
+    assert writer.spooled_lines == 3
+    payloads, _ = _payloads(spool)
+    assert payloads == [b'm v=1 1\nm v=2 2', b'm v=3 3']
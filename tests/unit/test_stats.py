@@ -0,0 +1,36 @@
+import pytest
+
+from src.core.stats import interarrival_jitter, percentile, summarize_rtts
+
+
+def test_percentile_interpolates():
+    values = [10.0, 20.0, 30.0, 40.0]
+    assert percentile(values, 0) == 10.0
+    assert percentile(values, 50) == 25.0
+    assert percentile(values, 100) == 40.0
+    with pytest.raises(ValueError):
+        percentile([], 50)
+
+
+def test_interarrival_jitter_follows_rfc3550():
+    assert interarrival_jitter([10.0, 10.0, 10.0]) == 0.0
+    # J1 = 16/16 = 1, J2 = 1 + (16 - 1)/16
+    assert interarrival_jitter([10.0, 26.0, 10.0]) == pytest.approx(1 + 15 / 16)
+
+
+def test_summarize_rtts():
+    summary = summarize_rtts([10.0, None, 20.0, 30.0])
+
+    assert summary['packets_sent'] == 4
+    assert summary['packets_received'] == 3
+    assert summary['packet_loss'] == 25.0
+    assert summary['rtt_min'] == 10.0
+    assert summary['rtt_avg'] == 20.0
+    assert summary['rtt_max'] == 30.0
+    assert summary['rtt_mdev'] == pytest.approx(8.165, abs=1e-3)
+    assert summary['rtt_p95'] == pytest.approx(29.0)
+
+
+def test_summarize_all_lost():
+    summary = summarize_rtts([None, None])
+    assert summary == {'packets_sent': 2, 'packets_received': 0, 'packet_loss': 100.0}
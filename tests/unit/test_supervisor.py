@@ -0,0 +1,58 @@
+import logging
+import logging.handlers
+import queue
+
+from src.core.ring_buffer import STATUS_CODES
+from src.core.shm_ring import SharedResultRing
+from src.core.supervisor import CollectorSupervisor, _forward_logging, shard_targets
+
+
+def _targets(count):
+    return [{'name': f't{i}', 'address': f'10.0.0.{i}', 'interval': 1.0} for i in range(count)]
+
+
+def test_shard_targets_round_robin():
+    shards = shard_targets(_targets(5), 2)
+
+    assert [[target_id for target_id, _ in shard] for shard in shards] == [[0, 2, 4], [1, 3]]
+    assert shards[1][0][1]['address'] == '10.0.0.1'
+
+
+def test_shard_targets_never_exceeds_target_count():
+    assert len(shard_targets(_targets(2), 8)) == 2
+    assert len(shard_targets(_targets(3), 0)) >= 1
+
+
+def test_poll_merges_rings_and_tracks_cursors():
+    supervisor = CollectorSupervisor('config.yaml', _targets(4), workers=2, ring_capacity=16)
+    supervisor.rings = [SharedResultRing(capacity=16) for _ in supervisor.shards]
+    try:
+        supervisor.rings[0].publish(0, 1, 1.0, 0.0, STATUS_CODES['OK'])
+        supervisor.rings[1].publish(1, 2, 2.0, 0.0, STATUS_CODES['OK'])
+        supervisor.rings[1].publish(3, 3, 3.0, 0.0, STATUS_CODES['OK'])
+
+        assert sorted(supervisor.poll()['target_id'].tolist()) == [0, 1, 3]
+        assert len(supervisor.poll()) == 0
+
+        supervisor.rings[0].publish(2, 4, 4.0, 0.0, STATUS_CODES['OK'])
+        assert supervisor.poll()['target_id'].tolist() == [2]
+    finally:
+        supervisor.stop()
+
+
+def test_worker_logs_are_forwarded_instead_of_written():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    logs = queue.Queue()
+    try:
+        _forward_logging(logs, 'INFO')
+        assert [type(handler) for handler in root.handlers] == [logging.handlers.QueueHandler]
+
+        logging.getLogger('src.core.pipeline').info('çalışan kaydı')
+        logging.getLogger('src.core.pipeline').debug('filtrelenir')
+        record = logs.get_nowait()
+        assert record.getMessage() == 'çalışan kaydı' and record.name == 'src.core.pipeline'
+        assert logs.empty()
+    finally:
+        root.handlers[:] = handlers
+        root.setLevel(level)
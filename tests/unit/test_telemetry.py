@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from src.core.telemetry import Histogram, Registry, monitor_event_loop, render, timed
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram([1, 5])
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(value)
+
+    samples = {labels.get('le'): value for name, labels, value in histogram.samples('h', {})
+               if name == 'h_bucket'}
+    assert samples == {'1.0': 2, '5.0': 3, '+Inf': 4}
+    assert histogram.count == 4
+    assert histogram.sum == 14.5
+
+
+def test_labeled_children_are_cached():
+    registry = Registry()
+    family = registry.counter('requests', 'İstekler', ['backend'])
+    assert family.labels('influx') is family.labels('influx')
+    assert registry.counter('requests', 'İstekler', ['backend']) is family
+
+    with pytest.raises(AttributeError):
+        family.inc()
+
+
+def test_render_merges_sources_into_openmetrics_text():
+    dashboard, worker = Registry(), Registry()
+    dashboard.counter('checks', 'Kontroller', ['status']).labels('OK').inc(2)
+    worker.counter('checks', 'Kontroller', ['status']).labels('FAIL').inc()
+    gauge = worker.gauge('depth', 'Kuyruk "derinliği"')
+    gauge.set_function(lambda: 7)
+
+    text = render([({}, dashboard.collect()), ({'worker': '0'}, worker.collect())])
+
+    assert text.splitlines() == [
+        '# TYPE checks counter',
+        '# HELP checks Kontroller',
+        'checks_total{status="OK"} 2',
+        'checks_total{worker="0",status="FAIL"} 1',
+        '# TYPE depth gauge',
+        '# HELP depth Kuyruk \\"derinliği\\"',
+        'depth{worker="0"} 7',
+        '# EOF'
+    ]
+
+
+def test_timed_records_duration_even_on_error():
+    histogram = Histogram([1.0])
+
+    @timed(histogram)
+    def failing():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        failing()
+    assert histogram.count == 1
+
+
+@pytest.mark.asyncio
+async def test_monitor_event_loop_observes_lag():
+    histogram = Histogram([0.1])
+    ticks = []
+    task = asyncio.create_task(monitor_event_loop(histogram, 0.01, lambda: ticks.append(1)))
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert histogram.count >= 1
+    assert len(ticks) == histogram.count
@@ -0,0 +1,112 @@
+import socket
+import struct
+
+import pytest
+
+from src.core.icmp import checksum
+from src.core.probe_result import Status
+from src.core.traceroute import (ICMP_TIME_EXCEEDED, Hop, TracerouteEngine, TracerouteProbe,
+                                 build_flow_packet, parse_icmp_response)
+
+
+def _ip_header(protocol=socket.IPPROTO_ICMP):
+    return struct.pack('!BBHHHBBH4s4s', 0x45, 0, 0, 0, 0, 64, protocol, 0,
+                       socket.inet_aton('10.0.0.1'), socket.inet_aton('10.0.0.2'))
+
+
+class _Engine:
+    """Yanıtları önceden verilen, çağrıları sayan sahte yol keşif motoru."""
+
+    def __init__(self, rtts, path):
+        self.rtts = list(rtts)
+        self.path = path
+        self.traces = 0
+
+    async def ping(self, address, identifier, timeout=1.0):
+        return self.rtts.pop(0)
+
+    async def trace(self, address, identifier, max_hops=30, timeout=2.0):
+        self.traces += 1
+        hops = [Hop(ttl, hop_address, rtt) for ttl, (hop_address, rtt) in enumerate(self.path, 1)]
+        return hops, hops[-1].address == address
+
+
+def test_flow_packets_keep_checksum_constant():
+    packets = [build_flow_packet(0x4242, sequence) for sequence in (0, 1, 500, 65535)]
+
+    assert len({packet[:4] for packet in packets}) == 1
+    assert all(checksum(packet) == 0 for packet in packets)
+    assert packets[2][4:] == struct.pack('!HHH', 0x4242, 500, ~500 & 0xFFFF)
+
+
+def test_parse_time_exceeded_quotes_original_echo():
+    quoted = _ip_header() + build_flow_packet(0x4242, 7)
+    packet = _ip_header() + struct.pack('!BBHI', ICMP_TIME_EXCEEDED, 0, 0, 0) + quoted
+
+    assert parse_icmp_response(packet) == (ICMP_TIME_EXCEEDED, 0x4242, 7)
+    # UDP alıntılayan mesajlar bize ait değildir
+    udp = _ip_header() + struct.pack('!BBHI', ICMP_TIME_EXCEEDED, 0, 0, 0) + \
+        _ip_header(socket.IPPROTO_UDP) + bytes(8)
+    assert parse_icmp_response(udp) is None
+
+
+def test_parse_echo_reply_and_ignore_other_icmp():
+    reply = bytearray(build_flow_packet(0x4242, 9))
+    reply[0] = 0  # echo reply
+    assert parse_icmp_response(_ip_header() + bytes(reply)) == (0, 0x4242, 9)
+
+    redirect = _ip_header() + struct.pack('!BBHI', 5, 0, 0, 0) + bytes(28)
+    assert parse_icmp_response(redirect) is None
+
+
+@pytest.mark.asyncio
+async def test_path_is_cached_until_latency_changes():
+    engine = _Engine([10.0, 10.5, 11.0, 40.0], [('192.168.1.1', 1.0), ('1.1.1.1', 10.0)])
+    probe = TracerouteProbe('1.1.1.1', engine=engine)
+
+    first = await probe.perform_check()
+    assert first.target == 'traceroute://1.1.1.1'
+    assert first.status is Status.OK
+    assert first.extra == {'hops': 2.0, 'traced': 1.0, 'path_changed': 0.0}
+    assert probe.hop_lines(first.time_ns)[0] == (
+        'network_hops,hop=192.168.1.1,target=traceroute://1.1.1.1,ttl=1 '
+        f'rtt=1.0,lost=0.0 {first.time_ns}'
+    )
+
+    for _ in range(2):
+        assert (await probe.perform_check()).extra['traced'] == 0.0
+    assert engine.traces == 1
+
+    engine.path = [('192.168.1.1', 1.0), (None, None), ('1.1.1.1', 40.0)]
+    changed = await probe.perform_check()
+    assert engine.traces == 2
+    assert changed.extra == {'hops': 3.0, 'traced': 1.0, 'path_changed': 1.0}
+    assert probe.hop_lines(0)[1] == (
+        'network_hops,hop=*,target=traceroute://1.1.1.1,ttl=2 lost=100.0 0'
+    )
+
+
+@pytest.mark.asyncio
+async def test_unreachable_target_retraces_once():
+    engine = _Engine([None, None], [('192.168.1.1', 1.0), (None, None)])
+    probe = TracerouteProbe('1.1.1.1', engine=engine)
+
+    for _ in range(2):
+        result = await probe.perform_check()
+        assert result.status is Status.FAIL
+        assert result.packet_loss == 100.0
+    assert engine.traces == 1
+
+
+@pytest.mark.asyncio
+async def test_trace_loopback():
+    engine = TracerouteEngine()
+    try:
+        hops, reached = await engine.trace('127.0.0.1', 0x4242, max_hops=4, timeout=1.0)
+    except PermissionError:
+        pytest.skip("Raw soket yetkisi yok")
+    finally:
+        engine.close()
+
+    assert reached
+    assert [hop.address for hop in hops] == ['127.0.0.1']
@@ -0,0 +1,39 @@
+from src.core.probe_result import ProbeResult, Status
+from src.core.transitions import TransitionTracker
+
+BASE_NS = 1_700_000_000 * 10**9
+
+
+def _result(second, status, target='10.0.0.1'):
+    ok = status is Status.OK
+    return ProbeResult(target, status, latency=10.0 if ok else None,
+                       packet_loss=0.0 if ok else 100.0, time_ns=BASE_NS + second * 10**9,
+                       error=None if ok else 'timeout')
+
+
+def test_only_transitions_are_emitted_with_run_lengths():
+    tracker = TransitionTracker()
+    statuses = [Status.OK] * 10 + [Status.FAIL] * 3600 + [Status.OK] * 5
+    rows = [row for second, status in enumerate(statuses)
+            if (row := tracker.update(_result(second, status))) is not None]
+
+    assert len(rows) == 2
+    down, up = rows
+    assert down[2:6] == ('FAIL', 'OK', 10.0, 10)
+    assert down[7:9] == (100.0, 'timeout')
+    # Kesinti bitişi: süre ve kesinti boyunca alınan örnek sayısı
+    assert up[0].timestamp() == BASE_NS / 1e9 + 3610
+    assert up[2:7] == ('OK', 'FAIL', 3600.0, 3600, 10.0)
+
+
+def test_first_failure_and_status_changes_per_target():
+    tracker = TransitionTracker()
+
+    assert tracker.update(_result(0, Status.OK, 'a')) is None
+    first = tracker.update(_result(0, Status.FAIL, 'b'))
+    assert first[1:6] == ('b', 'FAIL', None, None, None)
+
+    changed = tracker.update(_result(5, Status.ERROR, 'b'))
+    assert changed[2:6] == ('ERROR', 'FAIL', 5.0, 1)
+    assert tracker.update(_result(6, Status.OK, 'a')) is None
+    assert len(tracker) == 2